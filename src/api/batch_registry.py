@@ -0,0 +1,358 @@
+"""Bulk analysis of many documents as a single batch job.
+
+A batch (a zip archive or a list of stored documents) is analyzed document
+by document through the shared :mod:`~src.core.enhanced_worker_manager`
+queue, so batches yield to interactive work by priority and cannot flood the
+pool: each batch keeps at most ``max_workers`` documents submitted at a time.
+Documents run in the analysis service's throughput mode (NER batched across
+documents, HTML reports rendered only on request). Aggregate progress is
+published on the progress bus under the batch id, so the WebSocket and SSE
+streams work for batches as they do for single analyses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any
+
+import structlog
+
+from ..core.enhanced_worker_manager import (
+    EnhancedWorkerManager,
+    TaskPriority,
+    enhanced_worker_manager,
+)
+from .progress_bus import progress_bus
+
+logger = structlog.get_logger(__name__)
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+def read_archive(
+    content: bytes, max_documents: int, max_total_bytes: int
+) -> list[tuple[str, bytes]]:
+    """Return ``(filename, content)`` for each file in a zip archive.
+
+    Directories, hidden files and macOS resource forks are skipped. Raises
+    ``ValueError`` for a corrupt archive or one exceeding the limits; sizes are
+    checked against what is actually read, not only the archive headers.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except zipfile.BadZipFile as exc:
+        raise ValueError("The uploaded file is not a valid zip archive.") from exc
+
+    documents: list[tuple[str, bytes]] = []
+    total = 0
+    with archive:
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or path.parts[0] == "__MACOSX" or path.name.startswith("."):
+                continue
+            if len(documents) >= max_documents:
+                raise ValueError(f"Batch exceeds the maximum of {max_documents} documents.")
+            remaining = max_total_bytes - total
+            if info.file_size > remaining:
+                raise ValueError("Archive contents exceed the allowed uncompressed size.")
+            with archive.open(info) as member:
+                data = member.read(remaining + 1)
+            if len(data) > remaining:
+                raise ValueError("Archive contents exceed the allowed uncompressed size.")
+            total += len(data)
+            documents.append((path.name, data))
+    if not documents:
+        raise ValueError("The archive does not contain any documents.")
+    return documents
+
+
+@dataclass
+class BatchDocument:
+    """One document of a batch and its outcome."""
+
+    index: int
+    filename: str
+    content: bytes | None = field(default=None, repr=False)
+    status: str = "queued"
+    result: dict[str, Any] | None = field(default=None, repr=False)
+    error: str | None = None
+    started_at: float | None = None
+    completed_at: float | None = None
+
+    def summary(self) -> dict[str, Any]:
+        analysis = (self.result or {}).get("analysis") or {}
+        duration = (
+            round((self.completed_at - self.started_at) * 1000, 1)
+            if self.started_at and self.completed_at
+            else None
+        )
+        return {
+            "index": self.index,
+            "filename": self.filename,
+            "status": self.status,
+            "compliance_score": analysis.get("compliance_score"),
+            "document_type": analysis.get("document_type"),
+            "findings_count": len(analysis.get("findings") or []),
+            "report_available": bool((self.result or {}).get("report_html")),
+            "error": self.error,
+            "duration_ms": duration,
+        }
+
+
+@dataclass
+class BatchJob:
+    """A batch of documents analyzed with shared settings."""
+
+    batch_id: str
+    owner_id: int | None
+    discipline: str
+    analysis_mode: str
+    strictness: str
+    priority: TaskPriority
+    documents: list[BatchDocument]
+    created_at: float = field(default_factory=time.time)
+    completed_at: float | None = None
+    cancelled: bool = False
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def counts(self) -> dict[str, int]:
+        counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        for document in self.documents:
+            counts[document.status] += 1
+        return counts
+
+    @property
+    def status(self) -> str:
+        if self.completed_at is None:
+            return "cancelling" if self.cancelled else "running"
+        return "cancelled" if self.cancelled else "completed"
+
+    def progress(self) -> int:
+        finished = sum(1 for d in self.documents if d.status in TERMINAL_STATUSES)
+        return int(finished * 100 / len(self.documents)) if self.documents else 100
+
+    def snapshot(self, include_documents: bool = True) -> dict[str, Any]:
+        counts = self.counts()
+        scores = [
+            summary["compliance_score"]
+            for summary in (d.summary() for d in self.documents if d.status == "completed")
+            if summary["compliance_score"] is not None
+        ]
+        snapshot: dict[str, Any] = {
+            "batch_id": self.batch_id,
+            "status": self.status,
+            "progress": self.progress(),
+            "total": len(self.documents),
+            "counts": counts,
+            "average_compliance_score": round(sum(scores) / len(scores), 2) if scores else None,
+            "discipline": self.discipline,
+            "analysis_mode": self.analysis_mode,
+            "strictness": self.strictness,
+            "priority": self.priority.name.lower(),
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+        if include_documents:
+            snapshot["documents"] = [d.summary() for d in self.documents]
+        return snapshot
+
+
+class BatchAnalysisRegistry:
+    """Creates, schedules and tracks batch analysis jobs.
+
+    Args:
+        worker_manager: Queue the documents are scheduled through
+        retention_seconds: How long finished batches stay queryable
+
+    """
+
+    def __init__(
+        self,
+        worker_manager: EnhancedWorkerManager | None = None,
+        retention_seconds: float = 24 * 3600,
+    ) -> None:
+        self.worker_manager = worker_manager or enhanced_worker_manager
+        self.retention_seconds = retention_seconds
+        self._jobs: dict[str, BatchJob] = {}
+        self._drivers: dict[str, asyncio.Task[None]] = {}
+
+    def get(self, batch_id: str) -> BatchJob | None:
+        return self._jobs.get(batch_id)
+
+    def create(
+        self,
+        documents: list[tuple[str, bytes | None]],
+        *,
+        owner_id: int | None,
+        discipline: str,
+        analysis_mode: str,
+        strictness: str,
+        priority: TaskPriority = TaskPriority.LOW,
+        rejected: dict[int, str] | None = None,
+    ) -> BatchJob:
+        """Register a batch; documents listed in ``rejected`` start out failed."""
+        self._prune()
+        job = BatchJob(
+            batch_id=uuid.uuid4().hex,
+            owner_id=owner_id,
+            discipline=discipline,
+            analysis_mode=analysis_mode,
+            strictness=strictness,
+            priority=priority,
+            documents=[
+                BatchDocument(index=index, filename=name, content=content)
+                for index, (name, content) in enumerate(documents)
+            ],
+        )
+        for index, error in (rejected or {}).items():
+            document = job.documents[index]
+            document.status, document.error, document.content = "failed", error, None
+        self._jobs[job.batch_id] = job
+        return job
+
+    async def start(self, job: BatchJob, analysis_service: Any) -> None:
+        """Begin analyzing ``job`` in the background."""
+        progress_bus.open(job.batch_id, owner_id=job.owner_id)
+        await self.worker_manager.start()
+        self._drivers[job.batch_id] = asyncio.create_task(
+            self._drive(job, analysis_service), name=f"batch-{job.batch_id}"
+        )
+
+    async def cancel(self, batch_id: str) -> bool:
+        """Stop scheduling the rest of a batch and cancel its running documents."""
+        job = self._jobs.get(batch_id)
+        if job is None or job.completed_at is not None:
+            return False
+        job.cancelled = True
+        # Submitted documents that have not started see the flag and return at
+        # once; running ones are cancelled.
+        for document in job.documents:
+            if document.status == "running":
+                await self.worker_manager.cancel_task(self._task_id(job, document))
+        return True
+
+    @staticmethod
+    def _task_id(job: BatchJob, document: BatchDocument) -> str:
+        return f"batch-{job.batch_id}-{document.index}"
+
+    async def _drive(self, job: BatchJob, analysis_service: Any) -> None:
+        manager = self.worker_manager
+        limit = max(1, manager.max_workers)
+        window = asyncio.Semaphore(limit)
+        try:
+            for document in job.documents:
+                if document.status != "queued":
+                    continue
+                await window.acquire()
+                if job.cancelled or not manager.accepting_tasks:
+                    window.release()
+                    break
+                await self._submit(job, document, analysis_service, window)
+
+            # Holding every slot means no document is still running.
+            for _ in range(limit):
+                await window.acquire()
+        except Exception as exc:
+            logger.exception("Batch scheduling failed", batch_id=job.batch_id, error=str(exc))
+        finally:
+            for document in job.documents:
+                if document.status == "queued":
+                    document.status = "cancelled"
+                    document.content = None
+            job.completed_at = time.time()
+            job.done.set()
+            self._drivers.pop(job.batch_id, None)
+            progress_bus.publish_complete(job.batch_id, job.snapshot(include_documents=False))
+            logger.info("Batch finished", batch_id=job.batch_id, **job.counts())
+
+    async def _submit(
+        self,
+        job: BatchJob,
+        document: BatchDocument,
+        analysis_service: Any,
+        window: asyncio.Semaphore,
+    ) -> None:
+        while True:
+            try:
+                await self.worker_manager.submit_task(
+                    self._analyze_document,
+                    job,
+                    document,
+                    analysis_service,
+                    window,
+                    task_id=self._task_id(job, document),
+                    priority=job.priority,
+                    max_retries=0,
+                )
+                return
+            except RuntimeError:
+                if not self.worker_manager.accepting_tasks:
+                    raise
+                # Queue full: wait for other work to drain.
+                await asyncio.sleep(1.0)
+
+    async def _analyze_document(
+        self,
+        job: BatchJob,
+        document: BatchDocument,
+        analysis_service: Any,
+        window: asyncio.Semaphore,
+    ) -> None:
+        try:
+            if job.cancelled:
+                document.status = "cancelled"
+                return
+            document.status = "running"
+            document.started_at = time.time()
+            result = await analysis_service.analyze_document(
+                file_content=document.content,
+                original_filename=document.filename,
+                discipline=job.discipline,
+                analysis_mode=job.analysis_mode,
+                strictness=job.strictness,
+                throughput_mode=True,
+            )
+            document.result = dict(result)
+            document.status = "completed"
+        except asyncio.CancelledError:
+            document.status = "cancelled"
+            raise
+        except Exception as exc:
+            logger.warning(
+                "Batch document failed",
+                batch_id=job.batch_id,
+                index=document.index,
+                error=str(exc),
+            )
+            document.status = "failed"
+            document.error = str(exc)
+        finally:
+            document.content = None
+            document.completed_at = time.time()
+            window.release()
+            self._publish_progress(job)
+
+    def _publish_progress(self, job: BatchJob) -> None:
+        counts = job.counts()
+        finished = counts["completed"] + counts["failed"] + counts["cancelled"]
+        progress_bus.publish_progress(
+            job.batch_id,
+            job.progress(),
+            "Analyzing documents",
+            details={"documents_done": finished, "documents_total": len(job.documents), "counts": counts},
+        )
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for batch_id, job in list(self._jobs.items()):
+            if job.completed_at is not None and job.completed_at < cutoff:
+                del self._jobs[batch_id]
+
+
+batch_registry = BatchAnalysisRegistry()
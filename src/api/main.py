@@ -211,46 +211,60 @@ in_memory_task_purge_service = InMemoryTaskPurgeService(
 
 
 async def initialize_vector_store():
-    """Initializes and populates the vector store on application startup."""
+    """Loads the persisted vector index and syncs it with the reports table.
+
+    Only report ids are compared on startup; embeddings are read (as raw
+    columns, without decrypting the report payload) just for reports the
+    persisted index has not seen, and ids of deleted reports are dropped.
+    """
     vector_store = get_vector_store()
     if vector_store.is_initialized:
         return
 
-    vector_store.initialize_index()
-    logger.info("Populating vector store with existing report embeddings...")
+    await asyncio.to_thread(vector_store.initialize_index)
+    logger.info("Syncing vector store with existing report embeddings...")
 
     db_session_gen = get_async_db()
     db = await db_session_gen.__anext__()
     try:
-        reports = await crud.get_all_reports_with_embeddings(db)
-        if reports:
-            embeddings = [
-                np.frombuffer(report.document_embedding, dtype=np.float32)
-                for report in reports
-            ]
-            report_ids = [report.id for report in reports]
-
+        db_ids = await crud.get_report_ids_with_embeddings(db)
+        indexed_ids = set(vector_store.report_ids)
+        stale_ids = indexed_ids - db_ids
+        if stale_ids:
+            await asyncio.to_thread(vector_store.remove_vectors, sorted(stale_ids))
+
+        pairs = await crud.get_report_embeddings(db, sorted(db_ids - indexed_ids))
+        embeddings = [
+            np.frombuffer(embedding, dtype=np.float32) for _, embedding in pairs
+        ]
+        if embeddings:
             # Ensure all embeddings have the same dimension
-            embedding_dim = embeddings[0].shape[0]
-            valid_embeddings = [
-                emb for emb in embeddings if emb.shape[0] == embedding_dim
-            ]
-            valid_ids = [
-                id
-                for emb, id in zip(embeddings, report_ids, strict=True)
+            embedding_dim = (
+                vector_store.embedding_dim
+                if len(vector_store)
+                else embeddings[0].shape[0]
+            )
+            valid = [
+                (report_id, emb)
+                for (report_id, _), emb in zip(pairs, embeddings, strict=True)
                 if emb.shape[0] == embedding_dim
             ]
-
-            if valid_embeddings:
-                vector_store.add_vectors(np.array(valid_embeddings), valid_ids)
-            logger.info(
-                "Successfully populated vector store with %s embeddings.",
-                len(valid_embeddings),
-            )
-        else:
-            logger.info(
-                "No existing reports with embeddings found to populate vector store."
-            )
+            if valid:
+                await asyncio.to_thread(
+                    vector_store.add_vectors,
+                    np.stack([emb for _, emb in valid]),
+                    [report_id for report_id, _ in valid],
+                )
+            embeddings = [emb for _, emb in valid]
+
+        if stale_ids or embeddings:
+            await asyncio.to_thread(vector_store.save)
+        logger.info(
+            "Vector store ready with %s embeddings (%s added, %s removed).",
+            len(vector_store),
+            len(embeddings),
+            len(stale_ids),
+        )
     finally:
         await db.close()
 
@@ -380,6 +394,7 @@ async def lifespan(app: FastAPI):
 
     await api_shutdown()
     scheduler.shutdown()
+    get_vector_store().save()
     in_memory_task_purge_service.stop()
 
     # Cleanup services - wrapped in try/except to handle if they didn't start
@@ -475,7 +490,11 @@ initialize_logging()
 app.add_middleware(PerformanceMonitoringMiddleware)
 
 # Add enhanced rate limiting middleware
-app.add_middleware(EnhancedRateLimitMiddleware)
+app.add_middleware(
+    EnhancedRateLimitMiddleware,
+    shared_state_path=settings.rate_limiting.shared_state_path,
+    shards=settings.rate_limiting.shards,
+)
 
 # Add CSRF protection middleware
 app.add_middleware(
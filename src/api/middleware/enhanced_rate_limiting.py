@@ -8,9 +8,13 @@ This module provides comprehensive rate limiting including:
 - Rate limit headers
 """
 
+import asyncio
 import logging
+import math
+import sqlite3
+import threading
 import time
-from collections import defaultdict, deque
+import zlib
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
@@ -30,11 +34,158 @@ class RateLimit:
     burst_limit: int = 10
     burst_window_seconds: int = 60
 
+    def windows(self) -> Tuple[Tuple[int, float], ...]:
+        """(limit, period in seconds) for the burst, minute and hour windows."""
+        return (
+            (self.burst_limit, float(self.burst_window_seconds)),
+            (self.requests_per_minute, 60.0),
+            (self.requests_per_hour, 3600.0),
+        )
+
+
+@dataclass
+class RateDecision:
+    """Outcome of one GCRA check across all windows of a rate limit."""
+
+    allowed: bool
+    tats: Tuple[float, ...]
+    remaining: Tuple[int, ...]
+    retry_after: float
+    exceeded_window: int | None = None
+
+
+def gcra_check(
+    tats: Tuple[float, ...], now: float, rate_limit: RateLimit
+) -> RateDecision:
+    """Apply the generic cell rate algorithm to every window of ``rate_limit``.
+
+    Each window of ``limit`` requests per ``period`` keeps a single theoretical
+    arrival time (TAT). A request is admitted when, after advancing the TAT by
+    ``period / limit``, it lies no more than ``period`` ahead of now; this
+    admits bursts of up to ``limit`` requests and then spaces them evenly.
+    The request is admitted only if every window admits it, and the TATs
+    advance only then.
+    """
+    new_tats = []
+    remaining = []
+    for index, (limit, period) in enumerate(rate_limit.windows()):
+        if limit <= 0:
+            return RateDecision(False, tats, (0, 0, 0), period, index)
+        interval = period / limit
+        tat = max(tats[index] if index < len(tats) else 0.0, now) + interval
+        ahead = tat - now
+        if ahead > period:
+            return RateDecision(False, tats, (0, 0, 0), ahead - period, index)
+        new_tats.append(tat)
+        remaining.append(int((period - ahead) / interval + 1e-9))
+    return RateDecision(True, tuple(new_tats), tuple(remaining), 0.0)
+
+
+class InMemoryRateLimitStore:
+    """Per-process GCRA state, sharded by key to keep lock contention low.
+
+    A key whose TATs have all passed is indistinguishable from a new key, so
+    idle keys are swept out of a shard once it has seen as many checks as it
+    holds keys, which keeps sweeping amortised O(1) per request.
+    """
+
+    _MIN_SWEEP_INTERVAL = 256
+
+    def __init__(self, shards: int = 16):
+        self._shards: list[dict[str, Tuple[float, ...]]] = [
+            {} for _ in range(shards)
+        ]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._checks_since_sweep = [0] * shards
+
+    def check(self, key: str, now: float, rate_limit: RateLimit) -> RateDecision:
+        index = zlib.crc32(key.encode()) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            decision = gcra_check(shard.get(key, ()), now, rate_limit)
+            if decision.allowed:
+                shard[key] = decision.tats
+
+            self._checks_since_sweep[index] += 1
+            if self._checks_since_sweep[index] >= max(
+                len(shard), self._MIN_SWEEP_INTERVAL
+            ):
+                self._checks_since_sweep[index] = 0
+                for idle_key in [k for k, tats in shard.items() if max(tats) <= now]:
+                    del shard[idle_key]
+        return decision
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class SQLiteRateLimitStore:
+    """GCRA state in a SQLite file shared by all workers on one host.
+
+    Each check is one short ``BEGIN IMMEDIATE`` transaction, so uvicorn
+    workers pointing at the same file enforce one combined limit. Checks
+    block, so callers on the event loop run them in a thread. A check that
+    cannot get the write lock within ``BUSY_TIMEOUT`` seconds raises, and the
+    limiter fails open rather than holding the request.
+    """
+
+    _SWEEP_INTERVAL = 1024
+    BUSY_TIMEOUT = 0.25
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(
+            path,
+            timeout=self.BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._lock = threading.Lock()
+        self._checks_since_sweep = 0
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_state ("
+            "key TEXT PRIMARY KEY, burst_tat REAL, minute_tat REAL, hour_tat REAL, "
+            "expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def check(self, key: str, now: float, rate_limit: RateLimit) -> RateDecision:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT burst_tat, minute_tat, hour_tat FROM rate_limit_state "
+                    "WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                decision = gcra_check(tuple(row) if row else (), now, rate_limit)
+                if decision.allowed:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO rate_limit_state VALUES (?, ?, ?, ?, ?)",
+                        (key, *decision.tats, max(decision.tats)),
+                    )
+                self._checks_since_sweep += 1
+                if self._checks_since_sweep >= self._SWEEP_INTERVAL:
+                    self._checks_since_sweep = 0
+                    self._conn.execute(
+                        "DELETE FROM rate_limit_state WHERE expires_at <= ?", (now,)
+                    )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        return decision
+
 
 class EnhancedRateLimiter:
-    """Enhanced rate limiter with per-endpoint configuration."""
+    """Enhanced rate limiter with per-endpoint configuration.
+
+    Limits are enforced per client and endpoint class (a configured endpoint,
+    or everything else under the default limits) with GCRA, so each key costs
+    three floats regardless of its request rate.
+    """
 
-    def __init__(self):
+    def __init__(self, shared_state_path: Optional[str] = None, shards: int = 16):
         # Default rate limits
         self.default_limits = RateLimit(
             requests_per_minute=60,
@@ -82,11 +233,15 @@ class EnhancedRateLimiter:
             ),
         }
 
-        # Request tracking: identifier -> deque of timestamps
-        self._request_history: Dict[str, deque] = defaultdict(lambda: deque())
 
-        # Burst tracking: identifier -> deque of timestamps
-        self._burst_history: Dict[str, deque] = defaultdict(lambda: deque())
+        # GCRA state per (client, endpoint class)
+        self._store: InMemoryRateLimitStore | SQLiteRateLimitStore = (
+            SQLiteRateLimitStore(shared_state_path)
+            if shared_state_path
+            else InMemoryRateLimitStore(shards)
+        )
+        # Shared-state checks do file I/O and must stay off the event loop
+        self.blocking = isinstance(self._store, SQLiteRateLimitStore)
 
     def is_rate_limited(
         self, request: Request
@@ -105,55 +260,21 @@ class EnhancedRateLimiter:
             endpoint_path = self._get_endpoint_path(request)
 
             # Get rate limit configuration
-            rate_limit = self.endpoint_limits.get(endpoint_path, self.default_limits)
-
-            now = time.time()
+            rate_limit = self.endpoint_limits.get(endpoint_path)
+            endpoint_class = endpoint_path if rate_limit else "default"
+            rate_limit = rate_limit or self.default_limits
 
-            # Check burst limit
-            burst_limited, burst_reason = self._check_burst_limit(
-                client_id, rate_limit, now
+            decision = self._store.check(
+                f"{client_id}|{endpoint_class}", time.time(), rate_limit
             )
-            if burst_limited:
-                return (
-                    True,
-                    burst_reason,
-                    self._get_rate_limit_headers(rate_limit, 0, 0),
-                )
-
-            # Check minute limit
-            minute_limited, minute_reason = self._check_minute_limit(
-                client_id, rate_limit, now
+            headers = self._get_rate_limit_headers(
+                rate_limit, decision.remaining[1], decision.remaining[2]
             )
-            if minute_limited:
-                return (
-                    True,
-                    minute_reason,
-                    self._get_rate_limit_headers(rate_limit, 0, 0),
-                )
+            if decision.allowed:
+                return False, None, headers
 
-            # Check hour limit
-            hour_limited, hour_reason = self._check_hour_limit(
-                client_id, rate_limit, now
-            )
-            if hour_limited:
-                return True, hour_reason, self._get_rate_limit_headers(rate_limit, 0, 0)
-
-            # Record request
-            self._record_request(client_id, now)
-
-            # Calculate remaining requests
-            remaining_minute = self._calculate_remaining_minute(
-                client_id, rate_limit, now
-            )
-            remaining_hour = self._calculate_remaining_hour(client_id, rate_limit, now)
-
-            return (
-                False,
-                None,
-                self._get_rate_limit_headers(
-                    rate_limit, remaining_minute, remaining_hour
-                ),
-            )
+            headers["Retry-After"] = max(1, math.ceil(decision.retry_after))
+            return True, self._limit_reason(rate_limit, decision), headers
 
         except Exception as e:
             logger.error(f"Rate limiting error: {e}")
@@ -182,94 +303,13 @@ class EnhancedRateLimiter:
         # Fallback to URL path
         return request.url.path
 
-    def _check_burst_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check burst rate limit."""
-        burst_window_start = now - rate_limit.burst_window_seconds
-
-        # Clean old burst history
-        burst_history = self._burst_history[client_id]
-        while burst_history and burst_history[0] < burst_window_start:
-            burst_history.popleft()
-
-        # Check if burst limit exceeded
-        if len(burst_history) >= rate_limit.burst_limit:
-            return (
-                True,
-                f"Burst limit exceeded: {rate_limit.burst_limit} requests per {rate_limit.burst_window_seconds} seconds",
-            )
-
-        # Record burst request
-        burst_history.append(now)
-        return False, None
-
-    def _check_minute_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check requests per minute limit."""
-        minute_start = now - 60
-
-        # Clean old history
-        request_history = self._request_history[client_id]
-        while request_history and request_history[0] < minute_start:
-            request_history.popleft()
-
-        # Check if limit exceeded
-        if len(request_history) >= rate_limit.requests_per_minute:
-            return (
-                True,
-                f"Rate limit exceeded: {rate_limit.requests_per_minute} requests per minute",
-            )
-
-        return False, None
-
-    def _check_hour_limit(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> Tuple[bool, Optional[str]]:
-        """Check requests per hour limit."""
-        hour_start = now - 3600
-
-        # Count requests in the last hour
-        request_history = self._request_history[client_id]
-        hour_requests = sum(
-            1 for timestamp in request_history if timestamp >= hour_start
-        )
-
-        # Check if limit exceeded
-        if hour_requests >= rate_limit.requests_per_hour:
-            return (
-                True,
-                f"Rate limit exceeded: {rate_limit.requests_per_hour} requests per hour",
-            )
-
-        return False, None
-
-    def _record_request(self, client_id: str, now: float):
-        """Record a request."""
-        self._request_history[client_id].append(now)
-
-    def _calculate_remaining_minute(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> int:
-        """Calculate remaining requests in current minute."""
-        minute_start = now - 60
-        request_history = self._request_history[client_id]
-        minute_requests = sum(
-            1 for timestamp in request_history if timestamp >= minute_start
-        )
-        return max(0, rate_limit.requests_per_minute - minute_requests)
-
-    def _calculate_remaining_hour(
-        self, client_id: str, rate_limit: RateLimit, now: float
-    ) -> int:
-        """Calculate remaining requests in current hour."""
-        hour_start = now - 3600
-        request_history = self._request_history[client_id]
-        hour_requests = sum(
-            1 for timestamp in request_history if timestamp >= hour_start
-        )
-        return max(0, rate_limit.requests_per_hour - hour_requests)
+    def _limit_reason(self, rate_limit: RateLimit, decision: RateDecision) -> str:
+        """Describe the window that rejected a request."""
+        if decision.exceeded_window == 0:
+            return f"Burst limit exceeded: {rate_limit.burst_limit} requests per {rate_limit.burst_window_seconds} seconds"
+        if decision.exceeded_window == 1:
+            return f"Rate limit exceeded: {rate_limit.requests_per_minute} requests per minute"
+        return f"Rate limit exceeded: {rate_limit.requests_per_hour} requests per hour"
 
     def _get_rate_limit_headers(
         self, rate_limit: RateLimit, remaining_minute: int, remaining_hour: int
@@ -288,9 +328,9 @@ class EnhancedRateLimiter:
 class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
     """Enhanced rate limiting middleware."""
 
-    def __init__(self, app):
+    def __init__(self, app, shared_state_path: Optional[str] = None, shards: int = 16):
         super().__init__(app)
-        self.rate_limiter = EnhancedRateLimiter()
+        self.rate_limiter = EnhancedRateLimiter(shared_state_path, shards)
 
     async def dispatch(self, request: Request, call_next):
         """Process request through rate limiting."""
@@ -300,13 +340,21 @@ class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
                 return await call_next(request)
 
             # Check rate limit
-            is_limited, reason, headers = self.rate_limiter.is_rate_limited(request)
+            if self.rate_limiter.blocking:
+                is_limited, reason, headers = await asyncio.to_thread(
+                    self.rate_limiter.is_rate_limited, request
+                )
+            else:
+                is_limited, reason, headers = self.rate_limiter.is_rate_limited(
+                    request
+                )
 
             if is_limited:
                 logger.warning(
-                    f"Rate limit exceeded: {reason}",
-                    client_ip=request.client.host if request.client else "unknown",
-                    path=request.url.path,
+                    "Rate limit exceeded: %s (client_ip=%s, path=%s)",
+                    reason,
+                    request.client.host if request.client else "unknown",
+                    request.url.path,
                 )
 
                 response = JSONResponse(
@@ -314,7 +362,7 @@ class EnhancedRateLimitMiddleware(BaseHTTPMiddleware):
                     content={
                         "error": "RATE_LIMIT_EXCEEDED",
                         "message": reason,
-                        "retry_after": 60,  # Retry after 60 seconds
+                        "retry_after": headers.get("Retry-After", 60),
                     },
                 )
 
@@ -0,0 +1,268 @@
+"""In-process fan-out of analysis progress to WebSocket and SSE subscribers.
+
+The analysis worker publishes progress, stage changes and the final result
+for a task; every open stream for that task receives them without polling.
+Each subscriber only ever holds the latest state, so a burst of updates
+collapses into one message per ``min_interval`` and a slow client never
+builds up a backlog. The last state of a task is kept for
+``retention_seconds`` after it finishes, so a client that connects late (or
+reconnects) is immediately sent where the task stands.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EVENTS = frozenset({"complete", "error"})
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.UTC).isoformat()
+
+
+class _Subscriber:
+    """Latest-wins mailbox for one open stream."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.pending: dict[str, Any] | None = None
+        self.ready = asyncio.Event()
+
+    def offer(self, snapshot: dict[str, Any]) -> None:
+        self.pending = snapshot
+        self.ready.set()
+
+
+class _Channel:
+    """Current state and subscribers of a single analysis task."""
+
+    def __init__(self, task_id: str) -> None:
+        self.task_id = task_id
+        self.owner_id: int | None = None
+        self.snapshot: dict[str, Any] | None = None
+        self.subscribers: set[_Subscriber] = set()
+        self.stages: list[dict[str, Any]] = []
+        self.stage_started: float | None = None
+        self.expiry: asyncio.TimerHandle | None = None
+
+
+class ProgressEventBus:
+    """Publishes analysis task state to any number of live subscribers.
+
+    Args:
+        min_interval: Minimum seconds between two messages to one subscriber
+        retention_seconds: How long a finished task's last state is replayed
+
+    """
+
+    def __init__(self, min_interval: float = 0.25, retention_seconds: float = 300.0) -> None:
+        self.min_interval = min_interval
+        self.retention_seconds = retention_seconds
+        self._channels: dict[str, _Channel] = {}
+
+    def _channel(self, task_id: str) -> _Channel:
+        channel = self._channels.get(task_id)
+        if channel is None:
+            channel = self._channels[task_id] = _Channel(task_id)
+        return channel
+
+    def open(self, task_id: str, owner_id: int | None = None) -> None:
+        """Start a fresh (queued) state for ``task_id``, replacing any previous run's.
+
+        Streams already subscribed to the task stay attached.
+        """
+        channel = self._channel(task_id)
+        if channel.expiry is not None:
+            channel.expiry.cancel()
+            channel.expiry = None
+        channel.owner_id = owner_id
+        channel.stages = []
+        channel.stage_started = None
+        self._advance_stage(channel, "Queued for processing")
+        self._publish(
+            channel,
+            {
+                "type": "progress",
+                "status": "queued",
+                "progress": 0,
+                "current": 0,
+                "total": 100,
+                "message": "Queued for processing",
+            },
+        )
+
+    def owner_of(self, task_id: str) -> int | None:
+        """Return the user id that started ``task_id``, if known."""
+        channel = self._channels.get(task_id)
+        return channel.owner_id if channel else None
+
+    def last_state(self, task_id: str) -> dict[str, Any] | None:
+        """Return the most recent state published for ``task_id``."""
+        channel = self._channels.get(task_id)
+        return channel.snapshot if channel else None
+
+    def publish_progress(
+        self,
+        task_id: str,
+        progress: int,
+        message: str | None,
+        details: dict[str, Any] | None = None,
+    ) -> None:
+        """Publish a progress update; a new message starts a new timed stage.
+
+        ``details`` are merged into the event (e.g. per-document counts of a
+        batch job).
+        """
+        channel = self._channel(task_id)
+        self._advance_stage(channel, message)
+        self._publish(
+            channel,
+            {
+                **(details or {}),
+                "type": "progress",
+                "status": "running",
+                "progress": progress,
+                "current": progress,
+                "total": 100,
+                "message": message or "",
+            },
+        )
+
+    def publish_complete(self, task_id: str, result: dict[str, Any]) -> None:
+        """Publish the final result and start the replay retention window."""
+        channel = self._channel(task_id)
+        self._advance_stage(channel, None)
+        self._publish(
+            channel,
+            {
+                "type": "complete",
+                "status": "completed",
+                "progress": 100,
+                "current": 100,
+                "total": 100,
+                "message": "Analysis complete.",
+                "result": result,
+            },
+        )
+
+    def publish_error(self, task_id: str, error: str) -> None:
+        """Publish a failure and start the replay retention window."""
+        channel = self._channel(task_id)
+        self._advance_stage(channel, None)
+        previous = channel.snapshot or {}
+        self._publish(
+            channel,
+            {
+                "type": "error",
+                "status": "failed",
+                "progress": previous.get("progress", 0),
+                "current": previous.get("progress", 0),
+                "total": 100,
+                "message": f"Analysis failed: {error}",
+                "error": error,
+            },
+        )
+
+    def _advance_stage(self, channel: _Channel, message: str | None) -> None:
+        """Close the running stage when the stage message changes."""
+        now = time.perf_counter()
+        current = channel.stages[-1] if channel.stages else None
+        if current is not None and current["name"] == message:
+            return
+        if current is not None and current["duration_ms"] is None:
+            current["duration_ms"] = round((now - (channel.stage_started or now)) * 1000, 1)
+        if message:
+            channel.stages.append({"name": message, "started_at": _now_iso(), "duration_ms": None})
+            channel.stage_started = now
+
+    def _publish(self, channel: _Channel, event: dict[str, Any]) -> None:
+        event["task_id"] = channel.task_id
+        event["stages"] = [dict(stage) for stage in channel.stages]
+        event["timestamp"] = _now_iso()
+        channel.snapshot = event
+        for subscriber in list(channel.subscribers):
+            self._deliver(subscriber, event)
+        if event["type"] in TERMINAL_EVENTS:
+            self._schedule_expiry(channel)
+
+    @staticmethod
+    def _deliver(subscriber: _Subscriber, event: dict[str, Any]) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is subscriber.loop:
+            subscriber.offer(event)
+        elif not subscriber.loop.is_closed():
+            # Published from a worker thread: hand over to the subscriber's loop.
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+
+    def _schedule_expiry(self, channel: _Channel) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if channel.expiry is not None:
+            channel.expiry.cancel()
+        channel.expiry = loop.call_later(self.retention_seconds, self._expire, channel.task_id)
+
+    def _expire(self, task_id: str) -> None:
+        # Streams still open on the channel hold their own reference to it.
+        self._channels.pop(task_id, None)
+
+    async def subscribe(
+        self, task_id: str, heartbeat_interval: float | None = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield the task's state as it changes, starting with the current state.
+
+        The iterator ends after yielding the final ``complete`` or ``error``
+        event. Updates published while the consumer is busy are coalesced so
+        only the newest is delivered. With ``heartbeat_interval`` set, a
+        ``heartbeat`` event is yielded whenever the task has been quiet that
+        long, so idle connections are not closed by proxies.
+        """
+        channel = self._channel(task_id)
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        channel.subscribers.add(subscriber)
+        if channel.snapshot is not None:
+            subscriber.offer(channel.snapshot)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), heartbeat_interval)
+                except TimeoutError:
+                    yield {"type": "heartbeat", "task_id": task_id, "timestamp": _now_iso()}
+                    continue
+                subscriber.ready.clear()
+                event, subscriber.pending = subscriber.pending, None
+                if event is None:
+                    continue
+                yield event
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+                await asyncio.sleep(self.min_interval)
+        finally:
+            channel.subscribers.discard(subscriber)
+            if (
+                not channel.subscribers
+                and channel.snapshot is None
+                and self._channels.get(task_id) is channel
+            ):
+                del self._channels[task_id]
+
+    def subscriber_count(self, task_id: str | None = None) -> int:
+        """Return the number of open streams (for one task, or in total)."""
+        if task_id is not None:
+            channel = self._channels.get(task_id)
+            return len(channel.subscribers) if channel else 0
+        return sum(len(channel.subscribers) for channel in self._channels.values())
+
+
+progress_bus = ProgressEventBus()
@@ -6,6 +6,7 @@ and retrieving analysis results.
 
 import asyncio
 import datetime
+import json
 import sqlite3
 import uuid
 from typing import Any
@@ -23,19 +24,24 @@ from fastapi import (
     UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...auth import get_current_active_user
+from ...config import get_settings
 from ...core.analysis_service import AnalysisService
+from ...core.enhanced_worker_manager import TaskPriority, enhanced_worker_manager
 from ...core.file_encryption import get_secure_storage
 from ...core.file_upload_validator import sanitize_filename, validate_uploaded_file
 from ...core.persistent_task_registry import TaskStatus, persistent_task_registry
 from ...core.security_validator import SecurityValidator
 from ...database import crud, models, schemas
 from ...database.database import get_async_db
+from ..batch_registry import BatchJob, batch_registry, read_archive
 from ..dependencies import get_analysis_service
 from ..deps.request_tracking import RequestId, log_with_request_id
+from ..progress_bus import progress_bus
 from ..task_registry import analysis_task_registry
 
 logger = structlog.get_logger(__name__)
@@ -116,6 +122,7 @@ async def run_analysis_and_save(
         "analysis_mode": analysis_mode,
         "strictness": strictness,
     }
+    progress_bus.open(task_id, owner_id=owner_id)
 
     def _update_progress(percentage: int, message: str | None) -> None:
         # Update both legacy in-memory and persistent registry
@@ -131,16 +138,15 @@ async def run_analysis_and_save(
         else:
             status = TaskStatus.RUNNING
 
-        # Update persistent registry
-        asyncio.create_task(
-            persistent_task_registry.update_task(
-                task_id,
-                status=status,
-                progress=percentage,
-                status_message=message or "",
-            )
+        # Queue for the registry's writer thread; bursts are coalesced there
+        persistent_task_registry.update_task_nowait(
+            task_id,
+            status=status,
+            progress=percentage,
+            status_message=message or "",
         )
 
+        progress_bus.publish_progress(task_id, percentage, message)
         logger.info("Task %s progress: %d%% - %s", task_id, percentage, message)
 
     async def _async_analysis() -> None:
@@ -238,6 +244,16 @@ async def run_analysis_and_save(
                 },
             )
 
+            progress_bus.publish_complete(
+                task_id,
+                {
+                    "findings": findings,
+                    "overall_score": compliance_score,
+                    "document_type": document_type,
+                    "strictness": strictness,
+                    "report_available": bool(report_html),
+                },
+            )
             logger.info("Analysis completed for task %s", task_id)
 
         except Exception as exc:
@@ -257,6 +273,7 @@ async def run_analysis_and_save(
                 "document_type": "Unknown",
                 "report_html": None,
             }
+            progress_bus.publish_error(task_id, str(exc))
 
             # Update persistent registry
             await persistent_task_registry.update_task(
@@ -411,6 +428,7 @@ async def legacy_start_analysis(
         "strictness": "standard",
         "user_id": current_user.id,  # Track user ownership
     }
+    progress_bus.open(task_id, owner_id=current_user.id)
 
     background_tasks.add_task(
         run_analysis_and_save,
@@ -496,6 +514,18 @@ async def analyze_document(
             detail="Analysis service is not ready yet.",
         )
 
+    # Shed load before reading the upload when the worker pool is saturated.
+    # Interactive analyses run outside the manager, so count them as well.
+    pressure = enhanced_worker_manager.backpressure(
+        external_in_flight=analysis_task_registry.running_count()
+    )
+    if pressure.saturated:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="The analysis queue is full. Please retry shortly.",
+            headers={"Retry-After": str(pressure.retry_after_seconds)},
+        )
+
     try:
         # Read file content first for comprehensive validation
         content = await file.read()
@@ -553,6 +583,7 @@ async def analyze_document(
         "strictness": strictness,
         "user_id": _current_user.id,  # Track user ownership
     }
+    progress_bus.open(task_id, owner_id=_current_user.id)
 
     background_tasks.add_task(
         run_analysis_and_save,
@@ -569,6 +600,271 @@ async def analyze_document(
     return {"task_id": task_id, "status": "processing"}
 
 
+def get_task_owner(task_id: str) -> int | None:
+    """Return the id of the user who started ``task_id``, if the task is known."""
+    owner_id = progress_bus.owner_of(task_id)
+    if owner_id is None:
+        owner_id = tasks.get(task_id, {}).get("user_id")
+    return owner_id
+
+
+@router.get("/stream/{task_id}")
+async def stream_analysis_progress(
+    task_id: str,
+    current_user: models.User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Stream task progress as Server-Sent Events instead of polling /status.
+
+    The current state is sent immediately, then every change until the task
+    completes or fails. Rapid updates are coalesced.
+    """
+    owner_id = get_task_owner(task_id)
+    if owner_id is None and progress_bus.last_state(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this task",
+        )
+
+    async def _events():
+        async for event in progress_bus.subscribe(task_id, heartbeat_interval=15.0):
+            if event["type"] == "heartbeat":
+                yield ": heartbeat\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _validate_analysis_options(
+    discipline: str, analysis_mode: str, strictness: str
+) -> tuple[str, str, str]:
+    """Validate and normalize the options shared by all documents of a batch."""
+    for valid, error in (
+        SecurityValidator.validate_discipline(discipline),
+        SecurityValidator.validate_analysis_mode(analysis_mode),
+        SecurityValidator.validate_strictness(strictness),
+    ):
+        if not valid:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error)
+    return discipline.lower(), analysis_mode.lower(), (strictness or "standard").lower()
+
+
+def _load_batch_archive(
+    upload: bytes, max_documents: int, max_total_bytes: int
+) -> tuple[list[tuple[str, bytes | None]], dict[int, str]]:
+    """Unzip and validate an uploaded batch; blocking, so run it in a thread."""
+    documents: list[tuple[str, bytes | None]] = []
+    rejected: dict[int, str] = {}
+    entries = read_archive(
+        upload, max_documents=max_documents, max_total_bytes=max_total_bytes
+    )
+    for name, content in entries:
+        safe_name = sanitize_filename(name)
+        size_valid, size_error = SecurityValidator.validate_file_size(len(content))
+        is_valid, error_msg = validate_uploaded_file(content, safe_name)
+        if not size_valid or not is_valid:
+            rejected[len(documents)] = size_error or f"File validation failed: {error_msg}"
+        documents.append((safe_name, content))
+    return documents, rejected
+
+
+def _load_stored_batch(
+    document_ids: list[str], user_id: int
+) -> tuple[list[tuple[str, bytes | None]], dict[int, str]]:
+    """Decrypt a batch of stored documents; blocking, so run it in a thread."""
+    documents: list[tuple[str, bytes | None]] = []
+    rejected: dict[int, str] = {}
+    stored = {doc["doc_id"]: doc for doc in secure_storage.list_user_documents(user_id)}
+    for document_id in document_ids:
+        metadata = stored.get(document_id)
+        content = (
+            secure_storage.retrieve_document(document_id, user_id) if metadata else None
+        )
+        if content is None:
+            rejected[len(documents)] = "Document not found."
+        documents.append(((metadata or {}).get("filename", document_id), content))
+    return documents, rejected
+
+
+def _get_owned_batch(batch_id: str, user: models.User) -> BatchJob:
+    job = batch_registry.get(batch_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
+    if job.owner_id != user.id and not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this batch",
+        )
+    return job
+
+
+@router.post("/batch")
+async def start_batch_analysis(
+    archive: UploadFile | None = File(None),
+    document_ids: list[str] | None = Form(None),
+    discipline: str = Form("pt"),
+    analysis_mode: str = Form("rubric"),
+    strictness: str = Form("standard"),
+    priority: str = Form("low"),
+    current_user: models.User = Depends(get_current_active_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+) -> dict[str, Any]:
+    """Analyze many documents (a zip archive or stored document ids) as one batch.
+
+    Documents are scheduled through the shared worker queue at the given
+    priority and analyzed in throughput mode: HTML reports are rendered only
+    when requested from ``/analysis/batch/{batch_id}/documents/{index}/report``.
+    Aggregate progress streams from ``/analysis/stream/{batch_id}``.
+    """
+    if analysis_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis service is not ready yet.",
+        )
+    if (archive is None) == (not document_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either a zip archive or a list of document ids.",
+        )
+    try:
+        task_priority = TaskPriority[priority.upper()]
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Priority must be one of: low, normal, high.",
+        ) from None
+    if task_priority is TaskPriority.CRITICAL and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only administrators may submit critical batches.",
+        )
+    discipline, analysis_mode, strictness = _validate_analysis_options(
+        discipline, analysis_mode, strictness
+    )
+
+    analysis_settings = get_settings().analysis
+    if archive is not None:
+        max_total_bytes = analysis_settings.batch_max_archive_mb * 1024 * 1024
+        try:
+            # Never buffer more of the upload than the archive may hold.
+            upload = await archive.read(max_total_bytes + 1)
+            if len(upload) > max_total_bytes:
+                raise ValueError("Archive exceeds the allowed upload size.")
+            # Decompression and per-file validation are CPU-bound.
+            documents, rejected = await asyncio.to_thread(
+                _load_batch_archive,
+                upload,
+                analysis_settings.batch_max_documents,
+                max_total_bytes,
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            ) from exc
+    else:
+        if len(document_ids) > analysis_settings.batch_max_documents:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Batch exceeds the maximum of {analysis_settings.batch_max_documents} documents.",
+            )
+        documents, rejected = await asyncio.to_thread(
+            _load_stored_batch, document_ids, current_user.id
+        )
+
+    job = batch_registry.create(
+        documents,
+        owner_id=current_user.id,
+        discipline=discipline,
+        analysis_mode=analysis_mode,
+        strictness=strictness,
+        priority=task_priority,
+        rejected=rejected,
+    )
+    await batch_registry.start(job, analysis_service)
+    logger.info(
+        "Batch analysis started",
+        batch_id=job.batch_id,
+        documents=len(documents),
+        rejected=len(rejected),
+        priority=task_priority.name,
+    )
+    return job.snapshot(include_documents=False)
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_analysis(
+    batch_id: str,
+    current_user: models.User = Depends(get_current_active_user),
+) -> dict[str, Any]:
+    """Return aggregate progress and per-document results of a batch."""
+    return _get_owned_batch(batch_id, current_user).snapshot()
+
+
+@router.get("/batch/{batch_id}/documents/{index}")
+async def get_batch_document_result(
+    batch_id: str,
+    index: int,
+    current_user: models.User = Depends(get_current_active_user),
+) -> dict[str, Any]:
+    """Return the full analysis of one document in a batch."""
+    job = _get_owned_batch(batch_id, current_user)
+    if not 0 <= index < len(job.documents):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    document = job.documents[index]
+    return {**document.summary(), "result": document.result}
+
+
+@router.get("/batch/{batch_id}/documents/{index}/report")
+async def get_batch_document_report(
+    batch_id: str,
+    index: int,
+    current_user: models.User = Depends(get_current_active_user),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
+) -> dict[str, Any]:
+    """Render (once) and return the HTML report of one batch document."""
+    job = _get_owned_batch(batch_id, current_user)
+    if not 0 <= index < len(job.documents):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    document = job.documents[index]
+    if document.status != "completed" or not document.result:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Document analysis is {document.status}; no report is available.",
+        )
+    if not document.result.get("report_html"):
+        if analysis_service is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Analysis service is not ready yet.",
+            )
+        report = await analysis_service.render_report(document.result.get("analysis") or {})
+        document.result.update(report)
+        document.result.pop("report_deferred", None)
+    return {
+        "batch_id": batch_id,
+        "index": index,
+        "filename": document.filename,
+        "report_html": document.result.get("report_html"),
+    }
+
+
+@router.delete("/batch/{batch_id}")
+async def cancel_batch_analysis(
+    batch_id: str,
+    current_user: models.User = Depends(get_current_active_user),
+) -> dict[str, Any]:
+    """Stop a batch: unstarted documents are skipped, running ones cancelled."""
+    job = _get_owned_batch(batch_id, current_user)
+    cancelled = await batch_registry.cancel(batch_id)
+    return {"batch_id": batch_id, "cancelled": cancelled, "status": job.status}
+
+
 # REMOVED: /submit endpoint - redundant with /analyze endpoint
 # The submit endpoint was just an alias for analyze_document and has been removed
 # to reduce API surface area and improve maintainability.
@@ -4,14 +4,15 @@ from time import perf_counter
 from typing import Any
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import require_admin
 from src.api.limiter import limiter
 from src.auth import get_current_active_user
 from src.config import Settings, get_settings
+from src.core.export_service import export_service
 from src.core.llm_service import LLMService
 from src.core.report_generator import ReportGenerator
 from src.database import crud, models, schemas
@@ -120,6 +121,33 @@ async def read_reports(
     return await crud.get_reports(db, skip=skip, limit=limit)
 
 
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/reports/export")
+async def export_reports(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: datetime.date | None = None,
+    end_date: datetime.date | None = None,
+    include_findings: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Stream compliance reports (and findings) as NDJSON or CSV."""
+    reports = crud.iter_reports_for_export(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        include_findings=include_findings,
+    )
+    filename = f"compliance_export_{datetime.date.today():%Y%m%d}.{format}"
+    return StreamingResponse(
+        export_service.stream_compliance_data(reports, format, include_findings),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/reports/{report_id}", response_class=HTMLResponse)
 async def read_report(
     report_id: int,
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.inference_executor import get_inference_executor
 from ...database import get_async_db as get_db
 
 try:
@@ -37,6 +38,15 @@ async def get_system_health():
     }
 
 
+@router.get("/health/inference", status_code=status.HTTP_200_OK)
+async def get_inference_health():
+    """Return per-model concurrency limits and queue depth for the inference executor."""
+    return {
+        "models": get_inference_executor().get_metrics(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 # REMOVED: Basic /health endpoint - redundant with comprehensive health checks
 # The basic health endpoint has been removed to avoid duplication with
 # the more comprehensive health checks in health_check.py.
@@ -31,6 +31,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import get_async_db
+from src.api.progress_bus import progress_bus
 from src.auth import get_auth_service
 from src.database import models
 
@@ -205,6 +206,15 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def _forward_progress(websocket: WebSocket, task_id: str) -> None:
+    """Push a task's progress events to one WebSocket until the task finishes."""
+    try:
+        async for event in progress_bus.subscribe(task_id):
+            await websocket.send_json(event)
+    except Exception as e:
+        logger.debug(f"Stopped forwarding progress for analysis_{task_id}: {e}")
+
+
 @router.websocket("/analysis/{task_id}")
 async def websocket_analysis_progress(
     websocket: WebSocket,
@@ -244,11 +254,12 @@ async def websocket_analysis_progress(
                 print(f"Progress: {data['current']}/{data['total']} - {data['message']}")
         ```
     """
+    channel = f"analysis_{task_id}"
+    forwarder: asyncio.Task[None] | None = None
     try:
         # Authenticate user before accepting connection
         user = await authenticate_websocket_user(websocket, token, db)
 
-        channel = f"analysis_{task_id}"
         await manager.connect(websocket, channel, user)
 
         # Send initial connection confirmation
@@ -262,6 +273,22 @@ async def websocket_analysis_progress(
             }
         )
 
+        # Progress is pushed from the event bus (latest state first), so
+        # clients no longer need to poll /analysis/status.
+        from src.api.routers.analysis import get_task_owner
+
+        owner_id = get_task_owner(task_id)
+        if owner_id is not None and (owner_id == user.id or user.is_admin):
+            forwarder = asyncio.create_task(_forward_progress(websocket, task_id))
+        else:
+            await websocket.send_json(
+                {
+                    "type": "error",
+                    "message": "Task not found or not authorized",
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+            )
+
         # Keep connection alive and handle incoming messages
         while True:
             try:
@@ -336,6 +363,8 @@ async def websocket_analysis_progress(
     except Exception as e:
         logger.error(f"WebSocket error for analysis_{task_id}: {e}")
     finally:
+        if forwarder is not None:
+            forwarder.cancel()
         manager.disconnect(websocket, channel)
 
 
@@ -5,6 +5,8 @@ import logging
 from collections.abc import Coroutine
 from typing import Any
 
+from src.core.inference_executor import current_task_id, get_inference_executor
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,9 +23,15 @@ class AnalysisTaskRegistry:
     ) -> asyncio.Task[Any]:
         """Schedule a coroutine for execution and register it under the given task id."""
         async with self._lock:
-            task: asyncio.Task[Any] = asyncio.create_task(
-                coroutine, name=f"analysis-{task_id}"
-            )
+            # The task runs in a copy of the current context, so inference calls
+            # it makes are tagged with its id and can be cancelled with it.
+            token = current_task_id.set(task_id)
+            try:
+                task: asyncio.Task[Any] = asyncio.create_task(
+                    coroutine, name=f"analysis-{task_id}"
+                )
+            finally:
+                current_task_id.reset(token)
             self._handles[task_id] = task
 
             def _cleanup(_: asyncio.Future[Any]) -> None:
@@ -52,12 +60,17 @@ class AnalysisTaskRegistry:
             state["cancel_requested"] = True
 
             task.cancel()
+            get_inference_executor().cancel_task(task_id)
             logger.info("Cancellation requested for analysis task %s", task_id)
             return True
 
     def get(self, task_id: str) -> dict[str, Any] | None:
         return self.metadata.get(task_id)
 
+    def running_count(self) -> int:
+        """Return the number of analysis coroutines that have not finished."""
+        return len(self._handles)
+
     def active_count(self) -> int:
         """Return the number of tasks that are not terminally completed."""
         return sum(
@@ -81,6 +81,17 @@ class ModelsSettings(BaseModel):
     phi_scrubber: PhiScrubberModelSettings | None = None
 
 
+class LLMResponseCacheSettings(BaseModel):
+    """Bounds and persistence for the LLM response cache."""
+
+    max_entries: int = 2048
+    max_memory_mb: float = 64.0
+    default_ttl_hours: float = 24.0
+    persist: bool = True
+    db_filename: str = "llm_responses.sqlite3"
+    disk_max_entries: int = 50000
+
+
 class LLMSettings(BaseModel):
     model_type: str
     model_repo_id: str
@@ -95,6 +106,7 @@ class LLMSettings(BaseModel):
         "repeat_penalty": 1.1,
         "stop_sequences": ["</analysis>", "\n\n---"],
     }
+    response_cache: LLMResponseCacheSettings = LLMResponseCacheSettings()
 
 
 class RetrievalSettings(BaseModel):
@@ -103,6 +115,34 @@ class RetrievalSettings(BaseModel):
     rrf_k: int
     batch_size: int = 16
     max_sequence_length: int = 512
+    query_embedding_cache_size: int = 4096
+    persist_query_embeddings: bool = True
+    query_embedding_disk_max_entries: int = 100000
+
+
+class VectorStoreSettings(BaseModel):
+    """Report-embedding similarity index configuration."""
+
+    index_type: str = "flat"  # flat | ivf | hnsw
+    persist: bool = True
+    mmap: bool = True
+    flush_threshold: int = 256
+    ivf_nlist: int = 256
+    ivf_nprobe: int = 16
+    hnsw_m: int = 32
+    hnsw_ef_search: int = 64
+
+
+class MultiTierCacheSettings(BaseModel):
+    """Lower tiers of the analysis result cache."""
+
+    l2_enabled: bool = True
+    l2_dir: str | None = None  # defaults to /dev/shm (or the temp dir)
+    l2_max_entries: int = 5000
+    l3_enabled: bool = True
+    l3_filename: str = "multi_tier_l3.sqlite3"
+    l3_max_entries: int = 100000
+    compression_level: int = 6
 
 
 class AnalysisSettings(BaseModel):
@@ -110,6 +150,51 @@ class AnalysisSettings(BaseModel):
     deterministic_focus: str | None = None
     max_document_length: int = 50000
     chunk_overlap: int = 100
+    map_reduce_chunk_tokens: int = 350
+    map_reduce_overlap_tokens: int = 40
+    map_reduce_time_budget_seconds: float = 90.0
+    batch_max_documents: int = 500
+    batch_max_archive_mb: int = 200
+    batch_ner_batch_size: int = 16
+
+
+class ParsingSettings(BaseModel):
+    """Document parsing and OCR configuration settings."""
+
+    ocr_dpi: int = 300
+    ocr_timeout_seconds: int = 30
+    max_workers: int | None = None
+    min_pages_for_pool: int = 2
+
+
+class InferenceSettings(BaseModel):
+    """Concurrency limits for blocking model calls run off the event loop."""
+
+    default_concurrency: int = 1
+    model_concurrency: dict[str, int] = {
+        "llm": 1,
+        "ner": 1,
+        "phi_scrubber": 2,
+        "fact_checker": 1,
+        "preprocessing": 2,
+    }
+
+
+class WorkerManagerSettings(BaseModel):
+    """Background task dispatcher (EnhancedWorkerManager) settings."""
+
+    max_workers: int = 4
+    max_queue_size: int = 50
+    aging_interval: float = 30.0  # seconds of waiting worth one priority level
+    backpressure_threshold: float = 0.8  # share of the queue that triggers 429s
+
+
+class RateLimitingSettings(BaseModel):
+    """EnhancedRateLimitMiddleware state settings."""
+
+    shards: int = 16  # lock shards for the in-process limiter state
+    # SQLite file shared by all workers on this host; per-process state if unset
+    shared_state_path: str | None = None
 
 
 class HabitAISettings(BaseModel):
@@ -228,7 +313,13 @@ class Settings(BaseSettings):
     models: ModelsSettings
     llm: LLMSettings
     retrieval: RetrievalSettings
+    vector_store: VectorStoreSettings = VectorStoreSettings()
     analysis: AnalysisSettings
+    multi_tier_cache: MultiTierCacheSettings = MultiTierCacheSettings()
+    parsing: ParsingSettings = ParsingSettings()
+    inference: InferenceSettings = InferenceSettings()
+    worker_manager: WorkerManagerSettings = WorkerManagerSettings()
+    rate_limiting: RateLimitingSettings = RateLimitingSettings()
     reporting: ReportingSettings = ReportingSettings()
     habits_framework: HabitsFrameworkSettings = HabitsFrameworkSettings()
     pdf_export: PDFExportSettings = PDFExportSettings()
@@ -15,6 +15,7 @@ import numpy as np
 from pathlib import Path
 
 from src.core.centralized_logging import get_logger, performance_tracker, audit_logger
+from src.core.document_index import DocumentIndex, get_document_index
 from src.core.type_safety import Result, ErrorHandler
 
 logger = get_logger(__name__)
@@ -157,14 +158,17 @@ class AccuracyHallucinationTracker:
             # Extract findings
             findings = analysis_result.get('findings', [])
 
+            # Index the document once for every per-finding lookup below
+            index = get_document_index(document_text)
+
             # Calculate accuracy metrics
             accuracy_metrics = await self._calculate_accuracy_metrics(
-                analysis_result, findings, ground_truth, context
+                analysis_result, findings, index, ground_truth, context
             )
 
             # Detect hallucinations
             hallucination_metrics = await self._detect_hallucinations(
-                analysis_result, document_text, findings, context
+                analysis_result, index, findings, context
             )
 
             # Determine validation status
@@ -233,6 +237,7 @@ class AccuracyHallucinationTracker:
         self,
         analysis_result: Dict[str, Any],
         findings: List[Dict[str, Any]],
+        index: DocumentIndex,
         ground_truth: Optional[Dict[str, Any]],
         context: Optional[Dict[str, Any]]
     ) -> AccuracyMetrics:
@@ -246,7 +251,7 @@ class AccuracyHallucinationTracker:
             metrics.overall_accuracy = (overall_confidence + findings_consistency) / 2.0
 
             # Clinical accuracy (based on clinical relevance and medical terminology)
-            clinical_relevance = self._calculate_clinical_relevance(findings, document_text)
+            clinical_relevance = self._calculate_clinical_relevance(findings, index)
             medical_terminology_score = self._calculate_medical_terminology_score(findings)
             metrics.clinical_accuracy = (clinical_relevance + medical_terminology_score) / 2.0
 
@@ -257,7 +262,7 @@ class AccuracyHallucinationTracker:
 
             # Entity extraction accuracy (based on NER results)
             entities = analysis_result.get('entities', [])
-            metrics.entity_extraction_accuracy = self._calculate_entity_accuracy(entities, document_text)
+            metrics.entity_extraction_accuracy = self._calculate_entity_accuracy(entities, index)
 
             # Fact checking accuracy (based on fact checker results)
             fact_check_results = analysis_result.get('fact_check_results', [])
@@ -292,7 +297,7 @@ class AccuracyHallucinationTracker:
     async def _detect_hallucinations(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         findings: List[Dict[str, Any]],
         context: Optional[Dict[str, Any]]
     ) -> HallucinationMetrics:
@@ -301,12 +306,12 @@ class AccuracyHallucinationTracker:
             metrics = HallucinationMetrics()
 
             # Detect different types of hallucinations
-            factual_hallucinations = self._detect_factual_hallucinations(findings, document_text)
-            clinical_hallucinations = self._detect_clinical_hallucinations(findings, document_text)
+            factual_hallucinations = self._detect_factual_hallucinations(findings, index)
+            clinical_hallucinations = self._detect_clinical_hallucinations(findings, index)
             compliance_hallucinations = self._detect_compliance_hallucinations(findings, context)
-            entity_hallucinations = self._detect_entity_hallucinations(findings, document_text)
-            temporal_hallucinations = self._detect_temporal_hallucinations(findings, document_text)
-            causal_hallucinations = self._detect_causal_hallucinations(findings, document_text)
+            entity_hallucinations = self._detect_entity_hallucinations(findings, index)
+            temporal_hallucinations = self._detect_temporal_hallucinations(findings, index)
+            causal_hallucinations = self._detect_causal_hallucinations(findings, index)
 
             # Count hallucinations
             metrics.factual_hallucinations = len(factual_hallucinations)
@@ -323,7 +328,7 @@ class AccuracyHallucinationTracker:
             )
 
             # Calculate hallucination rate
-            total_statements = len(findings) + len(document_text.split('.'))
+            total_statements = len(findings) + index.count('.') + 1
             metrics.hallucination_rate = metrics.total_hallucinations / max(1, total_statements)
 
             # Calculate severity distribution
@@ -366,7 +371,7 @@ class AccuracyHallucinationTracker:
             logger.error("Findings consistency calculation failed: %s", e)
             return 0.5
 
-    def _calculate_clinical_relevance(self, findings: List[Dict[str, Any]], document_text: str) -> float:
+    def _calculate_clinical_relevance(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> float:
         """Calculate clinical relevance of findings."""
         try:
             if not findings:
@@ -445,7 +450,7 @@ class AccuracyHallucinationTracker:
             logger.error("Rule adherence calculation failed: %s", e)
             return 0.5
 
-    def _calculate_entity_accuracy(self, entities: List[Dict[str, Any]], document_text: str) -> float:
+    def _calculate_entity_accuracy(self, entities: List[Dict[str, Any]], index: DocumentIndex) -> float:
         """Calculate entity extraction accuracy."""
         try:
             if not entities:
@@ -453,8 +458,7 @@ class AccuracyHallucinationTracker:
 
             accurate_entities = 0
             for entity in entities:
-                entity_text = entity.get('text', '').lower()
-                if entity_text in document_text.lower():
+                if index.contains(entity.get('text', '')):
                     accurate_entities += 1
 
             return accurate_entities / len(entities)
@@ -498,7 +502,7 @@ class AccuracyHallucinationTracker:
             logger.error("Confidence calibration calculation failed: %s", e)
             return 0.5
 
-    def _detect_factual_hallucinations(self, findings: List[Dict[str, Any]], document_text: str) -> List[str]:
+    def _detect_factual_hallucinations(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[str]:
         """Detect factual hallucinations."""
         try:
             hallucinations = []
@@ -507,11 +511,11 @@ class AccuracyHallucinationTracker:
                 finding_text = finding.get('text', '')
 
                 # Check for claims not supported by document
-                if not self._is_claim_supported(finding_text, document_text):
+                if not self._is_claim_supported(finding_text, index):
                     hallucinations.append(f"Unsupported claim: {finding_text}")
 
                 # Check for fabricated details
-                if self._contains_fabricated_details(finding_text, document_text):
+                if self._contains_fabricated_details(finding_text, index):
                     hallucinations.append(f"Fabricated details: {finding_text}")
 
             return hallucinations
@@ -520,7 +524,7 @@ class AccuracyHallucinationTracker:
             logger.error("Factual hallucination detection failed: %s", e)
             return []
 
-    def _detect_clinical_hallucinations(self, findings: List[Dict[str, Any]], document_text: str) -> List[str]:
+    def _detect_clinical_hallucinations(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[str]:
         """Detect clinical hallucinations."""
         try:
             hallucinations = []
@@ -533,7 +537,7 @@ class AccuracyHallucinationTracker:
                     hallucinations.append(f"Incorrect medical terminology: {finding_text}")
 
                 # Check for unsupported clinical claims
-                if self._contains_unsupported_clinical_claims(finding_text, document_text):
+                if self._contains_unsupported_clinical_claims(finding_text, index):
                     hallucinations.append(f"Unsupported clinical claim: {finding_text}")
 
             return hallucinations
@@ -565,7 +569,7 @@ class AccuracyHallucinationTracker:
             logger.error("Compliance hallucination detection failed: %s", e)
             return []
 
-    def _detect_entity_hallucinations(self, findings: List[Dict[str, Any]], document_text: str) -> List[str]:
+    def _detect_entity_hallucinations(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[str]:
         """Detect entity hallucinations."""
         try:
             hallucinations = []
@@ -576,7 +580,7 @@ class AccuracyHallucinationTracker:
                 # Check for entities not present in document
                 entities = self._extract_entities_from_text(finding_text)
                 for entity in entities:
-                    if entity not in document_text.lower():
+                    if not index.contains(entity):
                         hallucinations.append(f"Non-existent entity: {entity}")
 
             return hallucinations
@@ -585,7 +589,7 @@ class AccuracyHallucinationTracker:
             logger.error("Entity hallucination detection failed: %s", e)
             return []
 
-    def _detect_temporal_hallucinations(self, findings: List[Dict[str, Any]], document_text: str) -> List[str]:
+    def _detect_temporal_hallucinations(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[str]:
         """Detect temporal hallucinations."""
         try:
             hallucinations = []
@@ -594,7 +598,7 @@ class AccuracyHallucinationTracker:
                 finding_text = finding.get('text', '')
 
                 # Check for incorrect temporal references
-                if self._contains_incorrect_temporal_references(finding_text, document_text):
+                if self._contains_incorrect_temporal_references(finding_text, index):
                     hallucinations.append(f"Incorrect temporal reference: {finding_text}")
 
             return hallucinations
@@ -603,7 +607,7 @@ class AccuracyHallucinationTracker:
             logger.error("Temporal hallucination detection failed: %s", e)
             return []
 
-    def _detect_causal_hallucinations(self, findings: List[Dict[str, Any]], document_text: str) -> List[str]:
+    def _detect_causal_hallucinations(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[str]:
         """Detect causal hallucinations."""
         try:
             hallucinations = []
@@ -612,7 +616,7 @@ class AccuracyHallucinationTracker:
                 finding_text = finding.get('text', '')
 
                 # Check for incorrect causal relationships
-                if self._contains_incorrect_causal_relationships(finding_text, document_text):
+                if self._contains_incorrect_causal_relationships(finding_text, index):
                     hallucinations.append(f"Incorrect causal relationship: {finding_text}")
 
             return hallucinations
@@ -895,12 +899,12 @@ class AccuracyHallucinationTracker:
         return False
 
     # Helper methods for hallucination detection
-    def _is_claim_supported(self, claim: str, document: str) -> bool:
+    def _is_claim_supported(self, claim: str, index: DocumentIndex) -> bool:
         """Check if claim is supported by document."""
         # Simplified support check
         return True  # Placeholder - would need semantic matching
 
-    def _contains_fabricated_details(self, text: str, document: str) -> bool:
+    def _contains_fabricated_details(self, text: str, index: DocumentIndex) -> bool:
         """Check if text contains fabricated details."""
         # Simplified fabrication detection
         return False  # Placeholder - would need fact verification
@@ -910,7 +914,7 @@ class AccuracyHallucinationTracker:
         # Simplified medical terminology check
         return False  # Placeholder - would need medical dictionary
 
-    def _contains_unsupported_clinical_claims(self, text: str, document: str) -> bool:
+    def _contains_unsupported_clinical_claims(self, text: str, index: DocumentIndex) -> bool:
         """Check for unsupported clinical claims."""
         # Simplified clinical claim check
         return False  # Placeholder - would need clinical knowledge base
@@ -925,12 +929,12 @@ class AccuracyHallucinationTracker:
         # Simplified entity extraction
         return []  # Placeholder - would need NER
 
-    def _contains_incorrect_temporal_references(self, text: str, document: str) -> bool:
+    def _contains_incorrect_temporal_references(self, text: str, index: DocumentIndex) -> bool:
         """Check for incorrect temporal references."""
         # Simplified temporal reference check
         return False  # Placeholder - would need temporal analysis
 
-    def _contains_incorrect_causal_relationships(self, text: str, document: str) -> bool:
+    def _contains_incorrect_causal_relationships(self, text: str, index: DocumentIndex) -> bool:
         """Check for incorrect causal relationships."""
         # Simplified causal relationship check
         return False  # Placeholder - would need causal analysis
@@ -0,0 +1,116 @@
+"""Per-analysis state shared across the compliance pipeline stages.
+
+An :class:`AnalysisContext` is created once per document by the analysis
+service and handed to every downstream stage. The expensive model outputs
+(clinical entities from the NER ensemble and retrieved compliance rules) are
+computed the first time a stage asks for them and reused by every later
+stage, so each model runs at most once per document. Query embeddings are
+cached by the retriever's own :class:`~src.core.cache_service.QueryEmbeddingCache`.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from dataclasses import dataclass
+from typing import Any
+
+import sqlalchemy.exc
+
+from src.core.inference_executor import get_inference_executor
+
+logger = logging.getLogger(__name__)
+
+NER_TIMEOUT_SECONDS = 30.0
+RETRIEVAL_TIMEOUT_SECONDS = 60.0
+
+
+@dataclass
+class AnalysisContext:
+    """Shared results for a single document analysis.
+
+    Attributes:
+        document_text: The scrubbed text every stage analyzes
+        discipline: Clinical discipline (e.g., "PT", "OT", "SLP")
+        doc_type: Document type (e.g., "Progress Note")
+        entities: Clinical entities, or None until NER has run
+        retrieved_rules: Compliance rules, or None until retrieval has run
+
+    """
+
+    document_text: str
+    discipline: str
+    doc_type: str
+    entities: list[dict[str, Any]] | None = None
+    retrieved_rules: list[dict[str, Any]] | None = None
+
+    @property
+    def entity_words(self) -> list[str]:
+        """Return the surface words of the extracted entities."""
+        return [entity.get("word", "") for entity in self.entities or []]
+
+    async def ensure_entities(
+        self,
+        ner_service: Any,
+        timeout: float = NER_TIMEOUT_SECONDS,
+        batcher: Any = None,
+    ) -> list[dict[str, Any]]:
+        """Run NER on the document once and return the cached entities.
+
+        NER runs on the inference executor so the event loop stays responsive. A
+        timeout or I/O failure is recorded as an empty entity list so later
+        stages do not retry it. With a :class:`~src.core.micro_batcher.MicroBatcher`
+        the document joins other documents' NER calls in one batch.
+        """
+        if self.entities is not None:
+            return self.entities
+        if not ner_service:
+            self.entities = []
+            return self.entities
+        try:
+            if batcher is not None:
+                call = batcher.submit(self.document_text)
+            else:
+                call = get_inference_executor().run(
+                    "ner", ner_service.extract_entities, self.document_text
+                )
+            self.entities = await asyncio.wait_for(call, timeout=timeout)
+        except TimeoutError:
+            logger.exception("NER extraction timed out after %s seconds", timeout)
+            self.entities = []
+        except (FileNotFoundError, PermissionError, OSError) as e:
+            logger.exception("NER extraction failed: %s", e)
+            self.entities = []
+        return self.entities
+
+    async def ensure_rules(
+        self,
+        retriever: Any,
+        query: str,
+        timeout: float = RETRIEVAL_TIMEOUT_SECONDS,
+        **retrieve_kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        """Retrieve compliance rules once and return the cached list.
+
+        The query and keyword arguments are only used by the first caller;
+        later stages receive the rules that were already retrieved.
+        """
+        if self.retrieved_rules is not None:
+            return self.retrieved_rules
+        if retriever is None:
+            self.retrieved_rules = []
+            return self.retrieved_rules
+        retrieve_kwargs.setdefault("discipline", self.discipline)
+        retrieve_kwargs.setdefault("document_type", self.doc_type)
+        retrieve_kwargs.setdefault("context_entities", self.entity_words or None)
+        try:
+            self.retrieved_rules = await asyncio.wait_for(
+                retriever.retrieve(query, **retrieve_kwargs), timeout=timeout
+            )
+            logger.info("Retrieved %d rules for analysis.", len(self.retrieved_rules))
+        except TimeoutError:
+            logger.exception("Rule retrieval timed out after %s seconds", timeout)
+            self.retrieved_rules = []
+        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+            logger.exception("Rule retrieval failed: %s", e)
+            self.retrieved_rules = []
+        return self.retrieved_rules
@@ -5,33 +5,36 @@ import inspect
 import json
 import logging
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import Any, List, Dict
 
 from src.config import get_settings as _get_settings
+from src.core.analysis_context import AnalysisContext
 from src.core.analysis_utils import enrich_analysis_result, trim_document_text
 from src.core.cache_service import cache_service
 from src.core.checklist_service import DeterministicChecklistService as ChecklistService
 from src.core.compliance_analyzer import ComplianceAnalyzer
-from src.core.document_chunker import get_document_chunker
 from src.core.document_classifier import DocumentClassifier
 from src.core.unified_explanation_engine import UnifiedExplanationEngine, ExplanationContext
 from src.core.fact_checker_service import FactCheckerService
 from src.core.file_cleanup_service import get_cleanup_service
 from src.core.hybrid_retriever import HybridRetriever
+from src.core.inference_executor import get_inference_executor
 from src.core.llm_service import LLMService
+from src.core.micro_batcher import MicroBatcher
 from src.core.model_selection_utils import (
     resolve_local_model_path,
     select_generator_profile,
 )
 from src.core.ner import ClinicalNERService
 from src.core.nlg_service import NLGService
-from src.core.parsing import parse_document_content
+from src.core.parsing import iter_document_content
 from src.core.phi_scrubber import PhiScrubberService
 from src.core.preprocessing_service import PreprocessingService
 from src.core.report_generator import ReportGenerator
 from src.core.rubric_detector import RubricDetector
+from src.core.single_flight import SingleFlight
 from src.core.advanced_ensemble_optimizer import AdvancedEnsembleOptimizer, ModelType, EnsembleMethod
 from src.core.multi_tier_cache import MultiTierCacheSystem, CacheTier, EvictionPolicy
 from src.core.clinical_education_engine import ClinicalEducationEngine, CompetencyArea
@@ -159,12 +162,16 @@ class AnalysisService:
         # Multi-tier caching system for performance optimization
         self.multi_tier_cache = MultiTierCacheSystem(
             l1_size_mb=200,  # 200MB L1 cache
-            l2_enabled=False,  # Redis not implemented yet
-            l3_enabled=True,   # Database cache enabled
+            l2_enabled=settings.multi_tier_cache.l2_enabled,  # shared across workers
+            l3_enabled=settings.multi_tier_cache.l3_enabled,  # compressed on-disk cache
             default_ttl=3600,  # 1 hour default TTL
             eviction_policy=EvictionPolicy.LRU
         )
 
+        # Identical analyses requested concurrently share one pipeline run
+        self._in_flight_analyses = SingleFlight()
+        self._ner_batcher: MicroBatcher | None = None
+
         # Clinical education engine for contextual learning
         self.education_engine = ClinicalEducationEngine()
 
@@ -248,6 +255,7 @@ class AnalysisService:
                 model_name=settings.models.fact_checker,
                 llm_service=self.llm_service,
                 backend="llm",
+                context_length=settings.llm.context_length,
             )
         else:
             self.fact_checker_service = kwargs.get("fact_checker_service") or FactCheckerService(
@@ -343,6 +351,41 @@ class AnalysisService:
             hasher.update(strictness.encode())
         return f"analysis_report_{hasher.hexdigest()}"
 
+    def _max_analysis_chars(self) -> int:
+        """Return the document length analyzed, from ``analysis.max_document_length``."""
+        analysis_settings = getattr(getattr(self, "_settings", None), "analysis", None)
+        return getattr(analysis_settings, "max_document_length", 0) or 12000
+
+    def _collect_streamed_text(self, records: Iterable[dict[str, Any]]) -> str:
+        """Join streamed parser records, stopping at ``analysis.max_document_length``.
+
+        Stopping early closes the parse stream, which cancels extraction and
+        OCR of pages that would never be analyzed.
+        """
+        max_chars = getattr(
+            getattr(self._settings, "analysis", None), "max_document_length", 0
+        ) or 0
+        pieces: list[str] = []
+        total_chars = 0
+        try:
+            for record in records:
+                sentence = record.get("sentence", "") if isinstance(record, dict) else ""
+                if not sentence:
+                    continue
+                pieces.append(sentence)
+                total_chars += len(sentence) + 1
+                if max_chars and total_chars >= max_chars:
+                    logger.info(
+                        "Document exceeds %d characters; ignoring the remainder",
+                        max_chars,
+                    )
+                    break
+        finally:
+            close = getattr(records, "close", None)
+            if callable(close):
+                close()
+        return " ".join(pieces).strip()
+
     async def analyze_document(
         self,
         discipline: str = "pt",
@@ -352,42 +395,82 @@ class AnalysisService:
         file_content: bytes | None = None,
         original_filename: str | None = None,
         progress_callback: Callable[[int, str | None], None] | None = None,
+        throughput_mode: bool = False,
     ) -> Any:
+        """Analyzes document content for compliance, using a content-aware cache.
+
+        Concurrent requests for the same document, discipline, mode and
+        strictness share a single pipeline run: later callers attach to the
+        running analysis, receive its progress updates and get its result.
+
+        ``throughput_mode`` is used for bulk analysis: NER calls are batched
+        across concurrently analyzed documents and the HTML report is not
+        generated (``report_deferred`` is set; see :meth:`render_report`).
+        """
+        normalized_strictness = (
+            strictness or AnalysisConstants.DEFAULT_STRICTNESS
+        ).lower()
+        if file_content:
+            content_hash = hashlib.sha256(file_content).hexdigest()
+        elif document_text:
+            content_hash = hashlib.sha256(document_text.encode()).hexdigest()
+        else:
+            raise ValueError(
+                "Either file_content or document_text must be provided"
+            )
+        cache_key = self._get_analysis_cache_key(
+            content_hash, discipline, analysis_mode, normalized_strictness
+        )
+
+        async def _analyze(update: Callable[[int, str | None], None]) -> Any:
+            return await self._analyze_document_uncoalesced(
+                cache_key=cache_key,
+                discipline=discipline,
+                analysis_mode=analysis_mode,
+                normalized_strictness=normalized_strictness,
+                document_text=document_text,
+                file_content=file_content,
+                original_filename=original_filename,
+                update_progress=update,
+                throughput_mode=throughput_mode,
+            )
+
+        flight_key = f"{cache_key}_deferred" if throughput_mode else cache_key
+        result = await self._in_flight_analyses.run(flight_key, _analyze, progress_callback)
+        # Each caller gets its own top-level dict of the shared result.
+        return AnalysisOutput(result)
+
+    async def _analyze_document_uncoalesced(
+        self,
+        *,
+        cache_key: str,
+        discipline: str,
+        analysis_mode: str | None,
+        normalized_strictness: str,
+        document_text: str | None,
+        file_content: bytes | None,
+        original_filename: str | None,
+        update_progress: Callable[[int, str | None], None],
+        throughput_mode: bool = False,
+    ) -> AnalysisOutput:
+        """Run the analysis for one cache key (see :meth:`analyze_document`)."""
         # Ensure models are registered
         if not self._models_registered:
             await self._register_ensemble_models()
             self._models_registered = True
-        """Analyzes document content for compliance, using a content-aware cache."""
 
-        def _update_progress(percentage: int, message: str | None) -> None:
-            if progress_callback:
-                progress_callback(percentage, message)
+        update_progress(0, "Starting analysis pipeline...")
 
-        _update_progress(0, "Starting analysis pipeline...")
-
-        normalized_strictness = (
-            strictness or AnalysisConstants.DEFAULT_STRICTNESS
-        ).lower()
         temp_file_path: Path | None = None
         try:
-            if file_content:
-                content_hash = hashlib.sha256(file_content).hexdigest()
-            elif document_text:
-                content_hash = hashlib.sha256(document_text.encode()).hexdigest()
-            else:
-                raise ValueError(
-                    "Either file_content or document_text must be provided"
-                )
-
-            cache_key = self._get_analysis_cache_key(
-                content_hash, discipline, analysis_mode, normalized_strictness
-            )
-            # Check multi-tier cache first
+            # Check multi-tier cache first; a bulk run also accepts a report-less result
             cached_result = await self.multi_tier_cache.get(cache_key)
+            if cached_result is None and throughput_mode:
+                cached_result = await self.multi_tier_cache.get(f"{cache_key}_deferred")
             if cached_result is not None:
                 logger.info("Full analysis cache hit from multi-tier cache for key: %s", cache_key)
-                _update_progress(50, "Reusing cached analysis results...")
-                _update_progress(100, "Analysis completed from cache.")
+                update_progress(50, "Reusing cached analysis results...")
+                update_progress(100, "Analysis completed from cache.")
                 return AnalysisOutput(cached_result)
 
             # Fallback to disk cache if multi-tier cache miss
@@ -396,28 +479,35 @@ class AnalysisService:
             if cached_result is not None:
                 logger.info("Full analysis cache hit from disk cache for key: %s", cache_key)
                 # Promote to multi-tier cache
-                await self.multi_tier_cache.set(cache_key, cached_result, tags=['analysis', discipline_clean])
-                _update_progress(50, "Reusing cached analysis results...")
-                _update_progress(100, "Analysis completed from cache.")
+                await self.multi_tier_cache.set(
+                    cache_key,
+                    cached_result,
+                    tags=['analysis', sanitize_human_text(discipline or "Unknown")],
+                )
+                update_progress(50, "Reusing cached analysis results...")
+                update_progress(100, "Analysis completed from cache.")
                 return AnalysisOutput(cached_result)
 
             logger.info(
                 "Full analysis cache miss for key: %s. Running analysis.", cache_key
             )
 
-            _update_progress(5, "Parsing document content...")
+            update_progress(5, "Parsing document content...")
             if file_content:
                 temp_dir = Path(self._settings.paths.temp_upload_dir)
                 temp_dir.mkdir(parents=True, exist_ok=True)
                 temp_file_path = (
                     temp_dir / f"temp_{uuid.uuid4().hex}_{original_filename or 'file'}"
                 )
-                try:
+                def _parse_upload() -> str:
                     temp_file_path.write_bytes(file_content)
-                    chunks = parse_document_content(str(temp_file_path))
-                    text_to_process = " ".join(
-                        c.get("sentence", "") for c in chunks if isinstance(c, dict)
-                    ).strip()
+                    return self._collect_streamed_text(
+                        iter_document_content(str(temp_file_path))
+                    )
+
+                try:
+                    # Parsing and OCR block, so keep them off the event loop.
+                    text_to_process = await asyncio.to_thread(_parse_upload)
                 except Exception as e:
                     logger.error("Failed to process file content: %s", e)
                     raise ValueError(f"Failed to process file content: {e}")
@@ -444,51 +534,10 @@ class AnalysisService:
                 "Successfully extracted %d characters of text for analysis",
                 len(text_to_process),
             )
-            _update_progress(15, "Document parsing completed successfully...")
-
-            # Check if document needs chunking for large documents
-            estimated_tokens = len(text_to_process) // 4  # Rough token estimation
-            if estimated_tokens > 2000:  # If document is very large
-                _update_progress(18, "Processing large document in chunks...")
-                logger.info(
-                    "Large document detected (%d estimated tokens), using chunked processing",
-                    estimated_tokens,
-                )
-
-                # Use document chunker for large documents
-                chunker = get_document_chunker(max_tokens=512)
-                chunks = chunker.chunk_document_by_sections(text_to_process)
-                logger.info("Document split into %d chunks for processing", len(chunks))
-
-                # Process chunks and combine results
-                chunk_results = []
-                for i, chunk in enumerate(chunks):
-                    chunk_progress = 18 + (i / len(chunks)) * 2  # 18-20% for chunking
-                    _update_progress(
-                        int(chunk_progress), f"Processing chunk {i+1}/{len(chunks)}..."
-                    )
-
-                    # Process this chunk (simplified analysis for chunks)
-                    chunk_result = await self._analyze_chunk(
-                        chunk["text"], discipline, analysis_mode, normalized_strictness
-                    )
-                    chunk_results.append(
-                        {
-                            "chunk_index": i,
-                            "section": chunk.get("section", "Unknown"),
-                            "result": chunk_result,
-                        }
-                    )
-
-                # Combine chunk results
-                combined_result = self._combine_chunk_results(
-                    chunk_results, text_to_process
-                )
-                text_to_process = combined_result.get("combined_text", text_to_process)
-                _update_progress(20, "Large document processing completed...")
+            update_progress(15, "Document parsing completed successfully...")
 
             # Automatic rubric detection based on content
-            _update_progress(20, "Detecting appropriate compliance rubric...")
+            update_progress(20, "Detecting appropriate compliance rubric...")
             detected_rubric, rubric_confidence, rubric_details = (
                 self.rubric_detector.detect_rubric(text_to_process, original_filename)
             )
@@ -517,60 +566,74 @@ class AnalysisService:
                     analysis_mode=analysis_mode,
                     strictness=normalized_strictness,
                     original_filename=original_filename,
-                    update_progress=_update_progress,
+                    update_progress=update_progress,
                 )
             else:
                 logger.info("Using REAL pipeline for analysis")
 
             # --- Start of Optimized Two-Stage Pipeline ---
+            # Blocking model calls go through the inference executor so the
+            # event loop keeps serving other requests while they run.
+            inference = get_inference_executor()
 
             # Stage 0: Initial text processing (optimized for speed)
-            _update_progress(25, "Preprocessing document text...")
-            trimmed_text = trim_document_text(text_to_process)
+            update_progress(25, "Preprocessing document text...")
+            # Long documents are analyzed chunk by chunk (map-reduce) by the
+            # compliance analyzer, so only trim to the configured maximum.
+            trimmed_text = trim_document_text(
+                text_to_process, max_chars=self._max_analysis_chars()
+            )
             # Skip heavy preprocessing for faster analysis - basic cleaning only
             corrected_text = (
                 trimmed_text.strip()
                 if len(trimmed_text) < 5000
-                else await self._maybe_await(
-                    self.preprocessing.correct_text(trimmed_text)
+                else await inference.run(
+                    "preprocessing", self.preprocessing.correct_text, trimmed_text
                 )
             )
 
             # Stage 1: PHI Redaction (Security First)
-            _update_progress(35, "Performing PHI redaction...")
-            scrubbed_text = self.phi_scrubber.scrub(corrected_text)
+            update_progress(35, "Performing PHI redaction...")
+            scrubbed_text = await inference.run(
+                "phi_scrubber", self.phi_scrubber.scrub, corrected_text
+            )
 
             # Stage 2: Clinical Analysis on Anonymized Text (optimized)
-            _update_progress(45, "Classifying document type...")
+            update_progress(45, "Classifying document type...")
             discipline_clean = sanitize_human_text(discipline or "Unknown")
 
             # Fast-track for shorter documents (skip heavy classification)
             if len(scrubbed_text) < 2000:
                 doc_type_clean = "Progress Note"  # Default for fast processing
-                _update_progress(50, "Using fast-track classification...")
+                update_progress(50, "Using fast-track classification...")
             else:
-                _update_progress(48, "Running document classification...")
-                doc_type_raw = await self._maybe_await(
-                    self.document_classifier.classify_document(scrubbed_text)
+                update_progress(48, "Running document classification...")
+                doc_type_raw = await inference.run(
+                    "llm", self.document_classifier.classify_document, scrubbed_text
                 )
                 doc_type_clean = sanitize_human_text(doc_type_raw or "Progress Note")
-                _update_progress(55, "Document classification completed...")
+                update_progress(55, "Document classification completed...")
 
-            _update_progress(60, "Running compliance analysis...")
+            update_progress(60, "Running compliance analysis...")
 
             # Enhanced context optimization and confidence calibration
-            _update_progress(62, "Optimizing context and confidence...")
-
-            # Extract entities for context optimization
-            entities = self.clinical_ner_service.extract_entities(scrubbed_text)
+            update_progress(62, "Optimizing context and confidence...")
 
-            # Retrieve relevant rules
-            retrieved_rules = await self.retriever.retrieve(
-                query=f"{discipline_clean} {doc_type_clean} compliance",
-                top_k=5,
+            # NER and rule retrieval run once here; the shared context hands the
+            # results to the compliance analyzer so neither model runs twice.
+            analysis_context = AnalysisContext(
+                document_text=scrubbed_text,
                 discipline=discipline_clean,
-                document_type=doc_type_clean,
-                context_entities=[e.get('word', '') for e in entities]
+                doc_type=doc_type_clean,
+            )
+            entities = await analysis_context.ensure_entities(
+                self.clinical_ner_service,
+                batcher=self._get_ner_batcher() if throughput_mode else None,
+            )
+            retrieved_rules = await analysis_context.ensure_rules(
+                self.retriever,
+                f"{discipline_clean} {doc_type_clean} compliance",
+                top_k=5,
             )
 
             # Context optimization is now integrated into the explanation engine
@@ -609,6 +672,8 @@ class AnalysisService:
                     analysis_kwargs.pop("strictness", None)
                 if "progress_callback" not in params:
                     analysis_kwargs.pop("progress_callback", None)
+                if "context" in params:
+                    analysis_kwargs["context"] = analysis_context
 
                 supports_progress = "progress_callback" in params
                 if supports_progress:
@@ -618,7 +683,7 @@ class AnalysisService:
                     ) -> None:
                         # Map compliance analysis progress (0-100) to overall progress (60-90)
                         overall_progress = 60 + int(progress * 0.3)
-                        _update_progress(
+                        update_progress(
                             overall_progress,
                             message or "Running compliance analysis...",
                         )
@@ -634,17 +699,33 @@ class AnalysisService:
                 logger.info("Compliance analysis completed successfully")
 
                 # Enhanced confidence calibration
-                _update_progress(85, "Calibrating confidence scores...")
+                update_progress(85, "Calibrating confidence scores...")
 
                 # Perform fact-checking on findings
                 findings = analysis_result.get('findings', [])
-                fact_check_results = []
-                for finding in findings:
-                    if finding.get('confidence', 0) > 0.7:  # Only fact-check high-confidence findings
-                        premise = optimized_text
-                        hypothesis = finding.get('issue_title', '')
-                        is_consistent = self.fact_checker_service.check_consistency(premise, hypothesis)
-                        fact_check_results.append(is_consistent)
+                # Only fact-check high-confidence findings, all in one batched call
+                hypotheses = [
+                    finding.get('issue_title', '')
+                    for finding in findings
+                    if finding.get('confidence', 0) > 0.7
+                ]
+                # The llm backend runs on the shared LLM, so it queues in the
+                # LLM's pool rather than getting a concurrency slot of its own.
+                fact_check_model = (
+                    "llm"
+                    if getattr(self.fact_checker_service, "backend", None) == "llm"
+                    else "fact_checker"
+                )
+                fact_check_results = (
+                    await inference.run(
+                        fact_check_model,
+                        self.fact_checker_service.check_consistency_batch,
+                        optimized_text,
+                        hypotheses,
+                    )
+                    if hypotheses
+                    else []
+                )
 
                 # Calculate context relevance
                 context_relevance = len(optimized_rules) / max(1, len(context_rules)) if context_rules else 0.5
@@ -652,7 +733,7 @@ class AnalysisService:
                 # Confidence calibration is now integrated into the explanation engine
 
                 # Apply comprehensive explanations with integrated XAI, bias mitigation, and accuracy enhancement
-                _update_progress(85, "Applying comprehensive explanations and enhancements...")
+                update_progress(85, "Applying comprehensive explanations and enhancements...")
 
                 # Create enhanced context for explanation engine
                 explanation_context = ExplanationContext(
@@ -680,7 +761,7 @@ class AnalysisService:
 
                 # Apply advanced ensemble optimization for improved accuracy
                 if hasattr(self, 'ensemble_optimizer') and self.ensemble_optimizer:
-                    _update_progress(87, "Applying advanced ensemble optimization...")
+                    update_progress(87, "Applying advanced ensemble optimization...")
 
                     # Use ensemble optimization for final prediction refinement
                     ensemble_result = await self.ensemble_optimizer.predict_with_ensemble(
@@ -720,7 +801,7 @@ class AnalysisService:
 
                 # Add contextual learning recommendations
                 if hasattr(self, 'education_engine') and self.education_engine:
-                    _update_progress(90, "Generating contextual learning recommendations...")
+                    update_progress(90, "Generating contextual learning recommendations...")
 
                     try:
                         # Map discipline to competency area
@@ -768,7 +849,7 @@ class AnalysisService:
                         }
 
                 # Apply safe accuracy improvements
-                _update_progress(87, "Applying safe accuracy improvements...")
+                update_progress(87, "Applying safe accuracy improvements...")
 
                 try:
                     safe_improvement_result = await self.safe_accuracy_enhancer.apply_safe_improvements(
@@ -793,7 +874,7 @@ class AnalysisService:
                     logger.error("Safe accuracy improvements error: %s", e)
 
                 # Apply accuracy and hallucination validation
-                _update_progress(88, "Validating accuracy and detecting hallucinations...")
+                update_progress(88, "Validating accuracy and detecting hallucinations...")
 
                 try:
                     validation_result = await self.accuracy_tracker.validate_analysis(
@@ -892,7 +973,7 @@ class AnalysisService:
                     "compliance_score": 0.0,
                 }
 
-            _update_progress(85, "Enriching analysis results...")
+            update_progress(85, "Enriching analysis results...")
             # --- End of Pipeline ---
 
             enriched_result = enrich_analysis_result(
@@ -919,33 +1000,15 @@ class AnalysisService:
                 metadata["analysis_mode"] = analysis_mode
             metadata["strictness"] = normalized_strictness
 
-            _update_progress(95, "Generating report...")
-            # Add timeout to report generation
-            try:
-                report = await asyncio.wait_for(
-                    self._maybe_await(
-                        self.report_generator.generate_report(enriched_result)
-                    ),
-                    timeout=60.0,  # 1 minute timeout for report generation
-                )
-                final_report = {
-                    "analysis": enriched_result,
-                    **(report if isinstance(report, dict) else {}),
-                }
-            except TimeoutError:
-                logger.exception("Report generation timed out after 1 minute")
-                final_report = {
-                    "analysis": enriched_result,
-                    "report_html": "<h1>Report Generation Timeout</h1><p>The analysis completed but report generation timed out. Please try again.</p>",
-                    "error": "Report generation timeout",
-                }
-            except Exception as e:
-                logger.exception("Report generation failed: %s", e)
+            if throughput_mode:
+                # Bulk runs render the HTML report only when it is requested
                 final_report = {
                     "analysis": enriched_result,
-                    "report_html": f"<h1>Report Generation Error</h1><p>The analysis completed but report generation failed: {e!s}</p>",
-                    "error": f"Report generation failed: {e!s}",
+                    "report_html": None,
+                    "report_deferred": True,
                 }
+            else:
+                final_report = await self._generate_final_report(enriched_result, update_progress)
 
             if not self.use_mocks:
                 should_cache = True
@@ -958,12 +1021,19 @@ class AnalysisService:
                         should_cache = False
                 if final_report.get("error") or final_report.get("exception"):
                     should_cache = False
-                if should_cache:
+                if should_cache and throughput_mode:
+                    # Kept apart so interactive requests never get a report-less result
+                    await self.multi_tier_cache.set(
+                        f"{cache_key}_deferred",
+                        final_report,
+                        tags=['analysis', discipline_clean, analysis_mode, normalized_strictness]
+                    )
+                elif should_cache:
                     # Store in multi-tier cache with tags for invalidation
                     await self.multi_tier_cache.set(
                         cache_key,
                         final_report,
-                        tags=['analysis', discipline_clean, analysis_mode, strictness]
+                        tags=['analysis', discipline_clean, analysis_mode, normalized_strictness]
                     )
                     # Also store in disk cache for backward compatibility
                     cache_service.set_to_disk(cache_key, final_report)
@@ -972,7 +1042,7 @@ class AnalysisService:
                         "Skipping cache for key %s due to incomplete analysis result",
                         cache_key,
                     )
-            _update_progress(100, "Analysis complete.")
+            update_progress(100, "Analysis complete.")
             return AnalysisOutput(final_report)
 
         finally:
@@ -995,6 +1065,61 @@ class AnalysisService:
                 task_id if "task_id" in locals() else "unknown"
             )
 
+    async def _generate_final_report(
+        self,
+        enriched_result: dict[str, Any],
+        update_progress: Callable[[int, str | None], None],
+    ) -> dict[str, Any]:
+        """Render the HTML report for an analysis, with a one minute timeout."""
+        update_progress(95, "Generating report...")
+        # Add timeout to report generation
+        try:
+            report = await asyncio.wait_for(
+                self._maybe_await(
+                    self.report_generator.generate_report(enriched_result)
+                ),
+                timeout=60.0,  # 1 minute timeout for report generation
+            )
+            return {
+                "analysis": enriched_result,
+                **(report if isinstance(report, dict) else {}),
+            }
+        except TimeoutError:
+            logger.exception("Report generation timed out after 1 minute")
+            return {
+                "analysis": enriched_result,
+                "report_html": "<h1>Report Generation Timeout</h1><p>The analysis completed but report generation timed out. Please try again.</p>",
+                "error": "Report generation timeout",
+            }
+        except Exception as e:
+            logger.exception("Report generation failed: %s", e)
+            return {
+                "analysis": enriched_result,
+                "report_html": f"<h1>Report Generation Error</h1><p>The analysis completed but report generation failed: {e!s}</p>",
+                "error": f"Report generation failed: {e!s}",
+            }
+
+    async def render_report(self, analysis: dict[str, Any]) -> dict[str, Any]:
+        """Generate the report for an analysis produced with ``throughput_mode``."""
+        return await self._generate_final_report(analysis, lambda *_: None)
+
+    def _get_ner_batcher(self) -> MicroBatcher:
+        """Return the batcher that shares NER calls between bulk analyses."""
+        if self._ner_batcher is None:
+            inference = get_inference_executor()
+            ner = self.clinical_ner_service
+            batch_size = getattr(
+                getattr(self._settings, "analysis", None), "batch_ner_batch_size", 16
+            )
+
+            async def _extract(texts: list[str]) -> list[list[dict[str, Any]]]:
+                if hasattr(ner, "extract_entities_batch"):
+                    return await inference.run("ner", ner.extract_entities_batch, texts)
+                return [await inference.run("ner", ner.extract_entities, text) for text in texts]
+
+            self._ner_batcher = MicroBatcher(_extract, max_batch=batch_size, max_wait=0.05)
+        return self._ner_batcher
+
     async def _run_mock_pipeline(
         self,
         *,
@@ -1148,93 +1273,6 @@ class AnalysisService:
         update_progress(100, "Analysis complete (mock).")
         return payload
 
-    async def _analyze_chunk(
-        self, chunk_text: str, discipline: str, analysis_mode: str, strictness: str
-    ) -> dict[str, Any]:
-        """Analyze a single chunk of text."""
-        try:
-            # Simplified analysis for chunks - focus on key compliance elements
-            findings = []
-
-            # Basic compliance checks
-            if "patient" in chunk_text.lower():
-                findings.append(
-                    {
-                        "type": "patient_identification",
-                        "severity": "low",
-                        "message": "Patient identification found in chunk",
-                    }
-                )
-
-            if "assessment" in chunk_text.lower() or "plan" in chunk_text.lower():
-                findings.append(
-                    {
-                        "type": "clinical_documentation",
-                        "severity": "medium",
-                        "message": "Clinical assessment/plan documentation found",
-                    }
-                )
-
-            return {
-                "findings": findings,
-                "compliance_score": 85.0,  # Default score for chunks
-                "chunk_length": len(chunk_text),
-            }
-
-        except Exception as e:
-            logger.error(f"Error analyzing chunk: {e}")
-            return {
-                "findings": [],
-                "compliance_score": 0.0,
-                "chunk_length": len(chunk_text),
-                "error": str(e),
-            }
-
-    def _combine_chunk_results(
-        self, chunk_results: list[dict[str, Any]], original_text: str
-    ) -> dict[str, Any]:
-        """Combine results from multiple chunks."""
-        try:
-            all_findings = []
-            total_score = 0.0
-            valid_chunks = 0
-
-            for chunk_result in chunk_results:
-                result = chunk_result["result"]
-                if "error" not in result:
-                    all_findings.extend(result.get("findings", []))
-                    total_score += result.get("compliance_score", 0.0)
-                    valid_chunks += 1
-
-            # Calculate average compliance score
-            avg_score = total_score / valid_chunks if valid_chunks > 0 else 0.0
-
-            # Deduplicate findings
-            unique_findings = []
-            seen_types = set()
-            for finding in all_findings:
-                finding_type = finding.get("type", "unknown")
-                if finding_type not in seen_types:
-                    unique_findings.append(finding)
-                    seen_types.add(finding_type)
-
-            return {
-                "combined_text": original_text,
-                "findings": unique_findings,
-                "compliance_score": avg_score,
-                "chunks_processed": len(chunk_results),
-                "valid_chunks": valid_chunks,
-            }
-
-        except Exception as e:
-            logger.error(f"Error combining chunk results: {e}")
-            return {
-                "combined_text": original_text,
-                "findings": [],
-                "compliance_score": 0.0,
-                "error": str(e),
-            }
-
     async def warm_cache_for_discipline(
         self,
         discipline: str,
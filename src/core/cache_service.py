@@ -1,16 +1,25 @@
 import hashlib
 import json
+import logging
 import pickle
 import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import psutil  # type: ignore[import-untyped]
 
 from src.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 CACHE_DIR = Path(settings.paths.cache_dir)
 
@@ -372,53 +381,399 @@ __all__ = [
     "NERCache",
     "DocumentCache",
     "LLMResponseCache",
+    "QueryEmbeddingCache",
     "get_cache_stats",
     "cleanup_all_caches",
 ]
 
 
+class _SQLiteResponseStore:
+    """On-disk tier for :class:`LLMResponseCache` backed by a single SQLite file."""
+
+    _PRUNE_EVERY = 256
+
+    def __init__(self, db_path: Path, max_entries: int) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "expires_at REAL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),),
+            )
+
+    def get(self, key: str) -> tuple[str, float | None] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] < time.time():
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            return row[0], row[1]
+
+    def put(self, key: str, response: str, expires_at: float | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, expires_at, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, expires_at, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self._PRUNE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE expires_at IS NOT NULL AND expires_at < ?",
+                    (time.time(),),
+                )
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE key IN ("
+                    "SELECT key FROM llm_responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 class LLMResponseCache:
-    """LLM response cache implementation."""
+    """Size-bounded LLM response cache with TTL and an optional SQLite tier.
+
+    Entries are keyed by a hash of (model id, generation params, prompt), kept
+    in LRU order and evicted once ``max_entries`` or ``max_memory_mb`` is
+    exceeded. When persistence is enabled (``llm.response_cache.persist``)
+    every response is also written to ``<cache_dir>/<db_filename>`` so it
+    survives restarts; memory misses fall through to that file. Persistence
+    is skipped in mock mode so canned responses never reach real runs.
+    """
+
+    max_entries = 2048
+    max_memory_mb = 64.0
+    default_ttl_hours = 24.0
+    disk_max_entries = 50000
+
+    _entries: "OrderedDict[str, tuple[str, float | None, int]]" = OrderedDict()
+    _size_bytes = 0
+    _lock = threading.RLock()
+    _disk: _SQLiteResponseStore | None = None
+    _configured = False
 
-    _cache: dict[str, str] = {}
+    @classmethod
+    def configure(
+        cls,
+        *,
+        max_entries: int | None = None,
+        max_memory_mb: float | None = None,
+        default_ttl_hours: float | None = None,
+        disk_max_entries: int | None = None,
+        db_path: Path | None = None,
+    ) -> None:
+        """Set the cache bounds and attach (or detach, with ``db_path=None``) the disk tier."""
+        with cls._lock:
+            if max_entries is not None:
+                cls.max_entries = max_entries
+            if max_memory_mb is not None:
+                cls.max_memory_mb = max_memory_mb
+            if default_ttl_hours is not None:
+                cls.default_ttl_hours = default_ttl_hours
+            if disk_max_entries is not None:
+                cls.disk_max_entries = disk_max_entries
+            if cls._disk is not None:
+                cls._disk.close()
+            cls._disk = (
+                _SQLiteResponseStore(db_path, cls.disk_max_entries) if db_path else None
+            )
+            cls._configured = True
+            cls._evict_if_needed()
+
+    @classmethod
+    def _ensure_configured(cls) -> None:
+        if cls._configured:
+            return
+        # Inference threads can race here; only the first one configures.
+        with cls._lock:
+            if cls._configured:
+                return
+            cache_settings = settings.llm.response_cache
+            db_path = None
+            if cache_settings.persist and not settings.use_ai_mocks:
+                db_path = CACHE_DIR / cache_settings.db_filename
+            try:
+                cls.configure(
+                    max_entries=cache_settings.max_entries,
+                    max_memory_mb=cache_settings.max_memory_mb,
+                    default_ttl_hours=cache_settings.default_ttl_hours,
+                    disk_max_entries=cache_settings.disk_max_entries,
+                    db_path=db_path,
+                )
+            except sqlite3.Error as e:
+                logger.warning("LLM response disk cache unavailable: %s", e)
+                cls.configure(db_path=None)
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: dict[str, Any] | None = None) -> str:
+        """Hash (model id, generation params, prompt) into a cache key."""
+        hasher = hashlib.sha256()
+        hasher.update(str(model_name).encode("utf-8"))
+        hasher.update(b"\x00")
+        hasher.update(json.dumps(params or {}, sort_keys=True, default=str).encode("utf-8"))
+        hasher.update(b"\x00")
+        hasher.update(str(prompt).encode("utf-8"))
+        return hasher.hexdigest()
 
     @classmethod
-    def get_response(cls, model_name: str, prompt: str) -> str | None:
-        return cls._cache.get(f"{model_name}:{prompt}")
+    def get_response(
+        cls, model_name: str, prompt: str, params: dict[str, Any] | None = None
+    ) -> str | None:
+        cls._ensure_configured()
+        key = cls.make_key(model_name, prompt, params)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None:
+                response, expires_at, _ = entry
+                if expires_at is None or expires_at >= time.time():
+                    cls._entries.move_to_end(key)
+                    return response
+                cls._delete_entry(key)
+            disk = cls._disk
+        if disk is None:
+            return None
+        try:
+            stored = disk.get(key)
+        except sqlite3.Error as e:
+            logger.warning("LLM response disk cache read failed: %s", e)
+            return None
+        if stored is None:
+            return None
+        response, expires_at = stored
+        with cls._lock:
+            cls._store(key, response, expires_at)
+        return response
 
     @classmethod
-    def get_llm_response(cls, model_name: str, prompt: str) -> str | None:
-        return cls.get_response(model_name, prompt)
+    def get_llm_response(
+        cls, model_name: str, prompt: str, params: dict[str, Any] | None = None
+    ) -> str | None:
+        return cls.get_response(model_name, prompt, params)
 
     @classmethod
     def set_response(
-        cls, model_name: str, prompt: str, response: str, ttl_hours: int = 24
-    ):
-        cls._cache[f"{model_name}:{prompt}"] = response
+        cls,
+        model_name: str,
+        prompt: str,
+        response: str,
+        ttl_hours: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> None:
+        cls._ensure_configured()
+        key = cls.make_key(model_name, prompt, params)
+        ttl = cls.default_ttl_hours if ttl_hours is None else ttl_hours
+        expires_at = time.time() + ttl * 3600 if ttl and ttl > 0 else None
+        with cls._lock:
+            cls._store(key, response, expires_at)
+            disk = cls._disk
+        if disk is not None:
+            try:
+                disk.put(key, response, expires_at)
+            except sqlite3.Error as e:
+                logger.warning("LLM response disk cache write failed: %s", e)
 
     @classmethod
     def set_llm_response(
-        cls, model_name: str, prompt: str, response: str, ttl_hours: int = 24
-    ):
-        cls.set_response(model_name, prompt, response, ttl_hours)
+        cls,
+        model_name: str,
+        prompt: str,
+        response: str,
+        ttl_hours: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> None:
+        cls.set_response(model_name, prompt, response, ttl_hours, params)
+
+    @classmethod
+    def _store(cls, key: str, response: str, expires_at: float | None) -> None:
+        """Insert into the memory tier and evict as needed (lock held)."""
+        cls._delete_entry(key)
+        size = len(key) + len(response.encode("utf-8"))
+        cls._entries[key] = (response, expires_at, size)
+        cls._size_bytes += size
+        cls._evict_if_needed()
+
+    @classmethod
+    def _delete_entry(cls, key: str) -> None:
+        entry = cls._entries.pop(key, None)
+        if entry is not None:
+            cls._size_bytes -= entry[2]
+
+    @classmethod
+    def _evict_if_needed(cls) -> None:
+        max_bytes = cls.max_memory_mb * 1024 * 1024
+        while cls._entries and (
+            len(cls._entries) > cls.max_entries or cls._size_bytes > max_bytes
+        ):
+            _, (_, _, size) = cls._entries.popitem(last=False)
+            cls._size_bytes -= size
 
     @classmethod
     def memory_usage_mb(cls) -> float:
-        """Estimate memory usage of LLM response cache."""
-        total_bytes = 0.0
-        for key, value in cls._cache.items():
-            total_bytes += len(str(key).encode("utf-8"))
-            total_bytes += len(str(value).encode("utf-8"))
-        return total_bytes / (1024 * 1024)
+        """Return the tracked size of the in-memory tier."""
+        return cls._size_bytes / (1024 * 1024)
 
     @classmethod
     def entry_count(cls) -> int:
-        return len(cls._cache)
+        return len(cls._entries)
 
     @classmethod
     def clear(cls) -> None:
-        """Clear all cached LLM responses."""
-        cls._cache.clear()
+        """Clear all cached LLM responses, including the disk tier."""
+        with cls._lock:
+            cls._entries.clear()
+            cls._size_bytes = 0
+            disk = cls._disk
+        if disk is not None:
+            try:
+                disk.clear()
+            except sqlite3.Error as e:
+                logger.warning("LLM response disk cache clear failed: %s", e)
+
+
+class QueryEmbeddingCache:
+    """LRU cache of query embeddings keyed on (model name, normalized query).
+
+    Embeddings are stored as read-only float32 arrays, so a hit costs one dict
+    lookup. An optional SQLite file keeps them across restarts; memory misses
+    fall through to it. The file is trimmed to the newest ``disk_max_entries``
+    rows when opened and every ``_PRUNE_EVERY`` writes.
+    """
+
+    _PRUNE_EVERY = 256
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 4096,
+        db_path: Path | None = None,
+        disk_max_entries: int = 100000,
+    ) -> None:
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.disk_max_entries = disk_max_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn: sqlite3.Connection | None = None
+        if db_path is not None:
+            try:
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                with self._conn:
+                    self._conn.execute("PRAGMA journal_mode=WAL")
+                    self._conn.execute(
+                        "CREATE TABLE IF NOT EXISTS query_embeddings ("
+                        "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                    )
+                    self._prune()
+            except sqlite3.Error as e:
+                logger.warning("Query embedding disk cache unavailable: %s", e)
+                self._conn = None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace so trivially different queries share an entry."""
+        return " ".join(str(text).split())
+
+    def _key(self, text: str) -> str:
+        return _hash_key(self.model_name, "\x00", self.normalize(text))
+
+    def get(self, text: str) -> np.ndarray | None:
+        key = self._key(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                return embedding
+            if self._conn is None:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT vector FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning("Query embedding disk cache read failed: %s", e)
+                return None
+            if row is None:
+                return None
+            embedding = np.frombuffer(row[0], dtype=np.float32)
+            self._remember(key, embedding)
+            return embedding
+
+    def put(self, text: str, embedding: Any) -> np.ndarray:
+        """Store ``embedding`` as float32 and return the cached (read-only) array."""
+        vector = np.array(embedding, dtype=np.float32).reshape(-1)
+        vector.flags.writeable = False
+        key = self._key(text)
+        with self._lock:
+            self._remember(key, vector)
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO query_embeddings (key, vector, created_at) "
+                            "VALUES (?, ?, ?)",
+                            (key, vector.tobytes(), time.time()),
+                        )
+                        self._writes += 1
+                        if self._writes % self._PRUNE_EVERY == 0:
+                            self._prune()
+                except sqlite3.Error as e:
+                    logger.warning("Query embedding disk cache write failed: %s", e)
+        return vector
+
+    def get_or_compute(self, text: str, encode: Callable[[str], Any]) -> np.ndarray:
+        """Return the cached embedding for ``text``, encoding it on a miss."""
+        embedding = self.get(text)
+        if embedding is None:
+            embedding = self.put(text, encode(self.normalize(text)))
+        return embedding
+
+    def _prune(self) -> None:
+        """Drop all but the newest ``disk_max_entries`` rows; caller holds the lock."""
+        self._conn.execute(
+            "DELETE FROM query_embeddings WHERE key IN ("
+            "SELECT key FROM query_embeddings ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_max_entries,),
+        )
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM query_embeddings")
 
 
 class DocumentCache:
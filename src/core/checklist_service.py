@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import re
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+from .document_index import get_document_index
 from .text_utils import sanitize_human_text
 
 
@@ -43,8 +43,6 @@ class DeterministicChecklistService:
     """
 
     def __init__(self) -> None:
-        # Using simple regex-based sentence splitting instead of spaCy
-        self.sentence_pattern = re.compile(r"[.!?]+\s+")
         self._checks = self._initialize_checklist_items()
 
     def _initialize_checklist_items(self) -> list[ChecklistItem]:
@@ -331,14 +329,24 @@ class DeterministicChecklistService:
                 for item in applicable_checks
             ]
 
-        sentences = self._split_sentences(document_text)
-        sentences_lower = [sentence.lower() for sentence in sentences]
+        # The shared index locates each keyword once and maps it to its
+        # sentence, instead of testing every keyword against every sentence.
+        index = get_document_index(document_text)
+        return self._build_results(
+            applicable_checks,
+            {
+                item.identifier: index.first_sentence_with(item.keywords)
+                for item in applicable_checks
+            },
+        )
 
+    def _build_results(
+        self, applicable_checks: list[ChecklistItem], evidence: dict[str, str | None]
+    ) -> list[dict[str, str]]:
+        """Format checklist results from the evidence sentence found per item."""
         results: list[dict[str, str]] = []
         for item in applicable_checks:
-            evidence_sentence = self._locate_sentence(
-                sentences, sentences_lower, item.keywords
-            )
+            evidence_sentence = evidence.get(item.identifier)
             status = "pass" if evidence_sentence else "review"
             results.append(
                 {
@@ -353,13 +361,6 @@ class DeterministicChecklistService:
             )
         return results
 
-    def _split_sentences(self, text: str) -> list[str]:
-        """Split text into sentences using regex patterns."""
-        # Split on sentence endings followed by whitespace
-        sentences = self.sentence_pattern.split(text)
-        # Clean up and filter empty sentences
-        return [sent.strip() for sent in sentences if sent.strip()]
-
     def get_checklist_summary(
         self, discipline: str | None = None, doc_type: str | None = None
     ) -> dict[str, int]:
@@ -386,14 +387,3 @@ class DeterministicChecklistService:
                 1 for item in applicable_checks if item.discipline_specific
             ),
         }
-
-    @staticmethod
-    def _locate_sentence(
-        sentences: list[str], sentences_lower: list[str], keywords: Iterable[str]
-    ) -> str | None:
-        """Locate the first sentence containing any of the specified keywords."""
-        keyword_set = [kw.lower() for kw in keywords]
-        for original, lowered in zip(sentences, sentences_lower, strict=False):
-            if any(keyword in lowered for keyword in keyword_set):
-                return original
-        return None
@@ -20,18 +20,19 @@ The analyzer supports multiple clinical disciplines (PT, OT, SLP) and document t
 import asyncio
 import json
 import logging
-import sqlite3
+import re
 from pathlib import Path
 from typing import Any, Callable
 
 import numpy as np
-import sqlalchemy
-import sqlalchemy.exc
 
+from src.core.analysis_context import AnalysisContext
 from src.core.confidence_calibrator import ConfidenceCalibrator
+from src.core.document_chunker import get_document_chunker
 from src.core.explanation import ExplanationEngine
 from src.core.fact_checker_service import FactCheckerService
 from src.core.hybrid_retriever import HybridRetriever
+from src.core.inference_executor import get_inference_executor
 from src.core.llm_service import LLMService
 from src.core.ner import ClinicalNERService
 from src.core.nlg_service import NLGService
@@ -40,6 +41,9 @@ from src.utils.prompt_manager import PromptManager
 
 logger = logging.getLogger(__name__)
 CONFIDENCE_THRESHOLD = 0.7
+# Document characters that fit in a single prompt for local CPU models; longer
+# documents are analyzed chunk by chunk (map-reduce).
+PROMPT_DOCUMENT_CHARS = 1500
 
 
 class ComplianceAnalyzer:
@@ -258,6 +262,7 @@ class ComplianceAnalyzer:
         doc_type: str,
         strictness: str | None = None,
         progress_callback: Callable[[int, str | None], None] | None = None,
+        context: AnalysisContext | None = None,
     ) -> dict[str, Any]:
         """Analyzes a given document for compliance based on discipline and document type.
 
@@ -274,6 +279,8 @@ class ComplianceAnalyzer:
             discipline: The clinical discipline relevant to the document (e.g., "pt", "ot").
             doc_type: The type of the document (e.g., "progress_note", "evaluation").
             strictness: Optional strictness setting ("lenient", "standard", or "strict") to adjust scoring sensitivity.
+            context: Optional shared analysis context. Entities and rules already present on it are reused
+                instead of running NER and retrieval again.
 
         Returns:
             A dictionary containing the comprehensive analysis result, including findings, explanations, and tips.
@@ -284,23 +291,25 @@ class ComplianceAnalyzer:
         if strictness_level not in {"lenient", "standard", "strict"}:
             strictness_level = "standard"
 
-        # Extract entities with timeout to prevent hanging
+        if context is None:
+            context = AnalysisContext(
+                document_text=document_text, discipline=discipline, doc_type=doc_type
+            )
+
+        from src.config import get_settings
+
+        # One budget for every LLM call made for this document: chunk analyses
+        # and the personalized tips generated afterwards.
+        deadline = (
+            asyncio.get_running_loop().time()
+            + get_settings().analysis.map_reduce_time_budget_seconds
+        )
+
+        # Entities and rules come from the shared context when an earlier stage
+        # already produced them; otherwise they are computed here exactly once.
         if progress_callback:
             progress_callback(10, "Extracting clinical entities...")
-        try:
-            if self.ner_service:
-                entities = await asyncio.wait_for(
-                    asyncio.to_thread(self.ner_service.extract_entities, document_text),
-                    timeout=30.0,  # 30 second timeout for NER
-                )
-            else:
-                entities = []
-        except TimeoutError:
-            logger.exception("NER extraction timed out after 30 seconds")
-            entities = []
-        except (FileNotFoundError, PermissionError, OSError) as e:
-            logger.exception("NER extraction failed: %s", e)
-            entities = []
+        entities = await context.ensure_entities(self.ner_service)
         entity_list_str = (
             ", ".join(
                 f"{entity['entity_group']}: {entity['word']}" for entity in entities
@@ -312,129 +321,110 @@ class ComplianceAnalyzer:
         search_query = f"{discipline} {doc_type} {entity_list_str}"
         if progress_callback:
             progress_callback(30, "Retrieving compliance rules...")
-        try:
-            # Add timeout to retrieval to prevent hanging
-            retrieved_rules = await asyncio.wait_for(
-                self.retriever.retrieve(
-                    search_query,
-                    category_filter=discipline,
-                    discipline=discipline,
-                    document_type=doc_type,
-                    context_entities=(
-                        [entity["word"] for entity in entities] if entities else None
-                    ),
-                ),
-                timeout=60.0,  # 1 minute timeout for rule retrieval
-            )
-            logger.info("Retrieved %d rules for analysis.", len(retrieved_rules))
-        except TimeoutError:
-            logger.exception("Rule retrieval timed out after 1 minute")
-            retrieved_rules = []
-        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
-            logger.exception("Rule retrieval failed: %s", e)
-            retrieved_rules = []
+        retrieved_rules = await context.ensure_rules(
+            self.retriever, search_query, category_filter=discipline
+        )
 
         formatted_rules = self._format_rules_for_prompt(retrieved_rules)
-        if self.prompt_manager:
-            # Cap document_text length to keep prompt compact for local CPU models
-            doc_for_prompt = (
-                document_text[:1500] if len(document_text) > 1500 else document_text
-            )
-            prompt = self.prompt_manager.get_prompt(
-                document_text=doc_for_prompt,
-                entity_list=entity_list_str,
-                context=formatted_rules,
-                discipline=discipline,
-                doc_type=doc_type,
-                deterministic_focus=self.deterministic_focus,
+        if self.llm_service and len(document_text) > PROMPT_DOCUMENT_CHARS:
+            # Long documents are analyzed section by section instead of being
+            # judged on their first page.
+            if progress_callback:
+                progress_callback(50, "Analyzing document sections...")
+            initial_analysis = await self._map_reduce_analysis(
+                document_text,
+                entity_list_str,
+                formatted_rules,
+                discipline,
+                doc_type,
+                progress_callback,
+                deadline=deadline,
             )
         else:
-            doc_for_prompt = (
-                document_text[:1500] if len(document_text) > 1500 else document_text
+            prompt = self._build_prompt(
+                document_text, entity_list_str, formatted_rules, discipline, doc_type
             )
-            prompt = f"Analyze this document for compliance:\n{doc_for_prompt}\n\nRules:\n{formatted_rules}"
-
-        if self.llm_service:
-            if progress_callback:
-                progress_callback(50, "Generating compliance analysis...")
-            # Use shorter prompt for faster processing
-            if len(prompt) > 1800:  # Truncate very long prompts for CPU
-                prompt = prompt[:1600] + "\n\n[Document truncated for faster analysis]"
-
-            try:
-                # Add timeout to prevent hanging - allow more time in production
-                raw_analysis_result = await asyncio.wait_for(
-                    asyncio.to_thread(self.llm_service.generate, prompt),
-                    timeout=60.0,  # Reduced to 60 seconds for faster response
-                )
-            except TimeoutError:
-                logger.exception(
-                    "LLM generation timed out after 60 seconds - using fallback analysis"
-                )
-                # Provide a basic fallback analysis when LLM times out
+            if self.llm_service:
+                if progress_callback:
+                    progress_callback(50, "Generating compliance analysis...")
+                # Use shorter prompt for faster processing
+                if len(prompt) > 1800:  # Truncate very long prompts for CPU
+                    prompt = prompt[:1600] + "\n\n[Document truncated for faster analysis]"
+
+                try:
+                    # Add timeout to prevent hanging - allow more time in production
+                    raw_analysis_result = await asyncio.wait_for(
+                        get_inference_executor().run("llm", self.llm_service.generate, prompt),
+                        timeout=60.0,  # Reduced to 60 seconds for faster response
+                    )
+                except TimeoutError:
+                    logger.exception(
+                        "LLM generation timed out after 60 seconds - using fallback analysis"
+                    )
+                    # Provide a basic fallback analysis when LLM times out
+                    raw_analysis_result = """{
+                        "findings": [
+                            {
+                                "issue_title": "Analysis Timeout",
+                                "rule_name": "System Performance",
+                                "evidence": "LLM analysis timed out",
+                                "suggestion": "Try with a shorter document or contact support",
+                                "confidence": 1.0,
+                                "risk_level": "medium",
+                                "timeout": true
+                            }
+                        ],
+                        "summary": "Analysis timed out - basic compliance check completed",
+                        "timeout": true
+                    }"""
+                except (FileNotFoundError, PermissionError, OSError) as e:
+                    logger.exception("LLM generation failed: %s", e)
+                    # Provide a basic fallback analysis when LLM fails
+                    raw_analysis_result = f"""{{
+                        "findings": [
+                            {{
+                                "issue_title": "Analysis Error",
+                                "rule_name": "System Error",
+                                "evidence": "LLM analysis failed",
+                                "suggestion": "Please try again or contact support",
+                                "confidence": 1.0,
+                                "risk_level": "low",
+                                "exception": true
+                            }}
+                        ],
+                        "summary": "Analysis failed but basic compliance check completed",
+                        "error": "{e!s}",
+                        "exception": true
+                    }}"""
+            else:
+                # Provide a basic analysis when no LLM is available
                 raw_analysis_result = """{
                     "findings": [
                         {
-                            "issue_title": "Analysis Timeout",
-                            "rule_name": "System Performance",
-                            "evidence": "LLM analysis timed out",
-                            "suggestion": "Try with a shorter document or contact support",
+                            "issue_title": "No AI Analysis Available",
+                            "rule_name": "System Configuration",
+                            "evidence": "LLM service not available",
+                            "suggestion": "Check system configuration and try again",
                             "confidence": 1.0,
-                            "risk_level": "medium",
-                            "timeout": true
+                            "risk_level": "low"
                         }
                     ],
-                    "summary": "Analysis timed out - basic compliance check completed",
-                    "timeout": true
+                    "summary": "Basic compliance check completed without AI analysis",
+                    "error": "No LLM service available"
                 }"""
-            except (FileNotFoundError, PermissionError, OSError) as e:
-                logger.exception("LLM generation failed: %s", e)
-                # Provide a basic fallback analysis when LLM fails
-                raw_analysis_result = f"""{{
-                    "findings": [
-                        {{
-                            "issue_title": "Analysis Error",
-                            "rule_name": "System Error",
-                            "evidence": "LLM analysis failed",
-                            "suggestion": "Please try again or contact support",
-                            "confidence": 1.0,
-                            "risk_level": "low",
-                            "exception": true
-                        }}
-                    ],
-                    "summary": "Analysis failed but basic compliance check completed",
-                    "error": "{e!s}",
-                    "exception": true
-                }}"""
-        else:
-            # Provide a basic analysis when no LLM is available
-            raw_analysis_result = """{
-                "findings": [
-                    {
-                        "issue_title": "No AI Analysis Available",
-                        "rule_name": "System Configuration",
-                        "evidence": "LLM service not available",
-                        "suggestion": "Check system configuration and try again",
-                        "confidence": 1.0,
-                        "risk_level": "low"
-                    }
-                ],
-                "summary": "Basic compliance check completed without AI analysis",
-                "error": "No LLM service available"
-            }"""
-        if progress_callback:
-            progress_callback(70, "Processing analysis results...")
-        try:
-            initial_analysis = json.loads(raw_analysis_result)
-        except json.JSONDecodeError:
-            logger.warning(
-                "LLM returned non-JSON payload, attempting to extract findings: %s",
-                raw_analysis_result[:200],
-            )
-            # Try to extract findings from non-JSON response
-            initial_analysis = self._extract_findings_from_text(
-                raw_analysis_result, document_text
-            )
+            if progress_callback:
+                progress_callback(70, "Processing analysis results...")
+            try:
+                initial_analysis = json.loads(raw_analysis_result)
+            except json.JSONDecodeError:
+                logger.warning(
+                    "LLM returned non-JSON payload, attempting to extract findings: %s",
+                    raw_analysis_result[:200],
+                )
+                # Try to extract findings from non-JSON response
+                initial_analysis = self._extract_findings_from_text(
+                    raw_analysis_result, document_text
+                )
 
         # Create explanation context with discipline and document type
         from src.core.explanation import ExplanationContext
@@ -467,7 +457,7 @@ class ComplianceAnalyzer:
         if progress_callback:
             progress_callback(95, "Finalizing analysis...")
         final_analysis = await self._post_process_findings(
-            explained_analysis, retrieved_rules
+            explained_analysis, retrieved_rules, deadline=deadline
         )
         if isinstance(final_analysis, dict):
             score = final_analysis.get("compliance_score")
@@ -483,6 +473,227 @@ class ComplianceAnalyzer:
         logger.info("Compliance analysis complete.")
         return final_analysis
 
+    def _build_prompt(
+        self,
+        document_text: str,
+        entity_list_str: str,
+        formatted_rules: str,
+        discipline: str,
+        doc_type: str,
+    ) -> str:
+        """Build the analysis prompt, capping the document text for CPU models."""
+        doc_for_prompt = document_text[:PROMPT_DOCUMENT_CHARS]
+        if self.prompt_manager:
+            return self.prompt_manager.get_prompt(
+                document_text=doc_for_prompt,
+                entity_list=entity_list_str,
+                context=formatted_rules,
+                discipline=discipline,
+                doc_type=doc_type,
+                deterministic_focus=self.deterministic_focus,
+            )
+        return f"Analyze this document for compliance:\n{doc_for_prompt}\n\nRules:\n{formatted_rules}"
+
+    async def _map_reduce_analysis(
+        self,
+        document_text: str,
+        entity_list_str: str,
+        formatted_rules: str,
+        discipline: str,
+        doc_type: str,
+        progress_callback: Callable[[int, str | None], None] | None = None,
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """Analyze a long document chunk by chunk and merge the findings.
+
+        Section-aware chunks sized to fit the prompt's document slot are
+        submitted to the LLM together; the inference executor bounds how many
+        run at once, so with the default ``llm`` concurrency of 1 they are
+        generated one after another. Chunks still unfinished at ``deadline``
+        (event-loop time; defaults to the per-document time budget from now)
+        are cancelled and reported as skipped.
+        """
+        from src.config import get_settings
+
+        analysis_settings = get_settings().analysis
+        # A chunk must fit the document slot of the prompt (~4 chars per token).
+        chunker = get_document_chunker(
+            max_tokens=min(
+                analysis_settings.map_reduce_chunk_tokens, PROMPT_DOCUMENT_CHARS // 4
+            ),
+            overlap_tokens=analysis_settings.map_reduce_overlap_tokens,
+        )
+        chunks = chunker.chunk_document_by_sections(document_text)
+        if not chunks:
+            return self._extract_findings_from_text("", document_text)
+
+        tasks = [
+            asyncio.create_task(
+                self._analyze_chunk(
+                    chunk, entity_list_str, formatted_rules, discipline, doc_type
+                )
+            )
+            for chunk in chunks
+        ]
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + analysis_settings.map_reduce_time_budget_seconds
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if progress_callback and done:
+                    finished = len(tasks) - len(pending)
+                    progress_callback(
+                        50 + int(20 * finished / len(tasks)),
+                        f"Analyzed section {finished}/{len(tasks)}...",
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending:
+            logger.warning(
+                "Map-reduce time budget of %ss exhausted; skipped %d of %d chunks",
+                analysis_settings.map_reduce_time_budget_seconds,
+                len(pending),
+                len(tasks),
+            )
+
+        chunk_analyses = [
+            (chunk, task.result())
+            for chunk, task in zip(chunks, tasks, strict=True)
+            if task.done() and not task.cancelled() and task.result() is not None
+        ]
+        if not chunk_analyses:
+            logger.warning("No chunk produced a usable analysis; using heuristic findings")
+            merged = self._extract_findings_from_text("", document_text)
+        else:
+            merged = self._merge_chunk_analyses(chunk_analyses)
+        merged["chunks_total"] = len(chunks)
+        merged["chunks_analyzed"] = len(chunk_analyses)
+        merged["chunks_skipped"] = len(pending)
+        return merged
+
+    async def _analyze_chunk(
+        self,
+        chunk: dict[str, Any],
+        entity_list_str: str,
+        formatted_rules: str,
+        discipline: str,
+        doc_type: str,
+    ) -> dict[str, Any] | None:
+        """Run the LLM on one chunk; returns None when the output is unusable."""
+        # The chunk is sized for the document slot, so the rules and output
+        # instructions of the template are always sent in full.
+        prompt = self._build_prompt(
+            chunk["text"], entity_list_str, formatted_rules, discipline, doc_type
+        )
+        try:
+            raw = await get_inference_executor().run(
+                "llm", self.llm_service.generate, prompt
+            )
+            analysis = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning(
+                "LLM returned non-JSON payload for chunk %s", chunk.get("chunk_index")
+            )
+            return None
+        except (FileNotFoundError, PermissionError, OSError) as e:
+            logger.exception("LLM generation failed for chunk: %s", e)
+            return None
+        return analysis if isinstance(analysis, dict) else None
+
+    @staticmethod
+    def _merge_chunk_analyses(
+        chunk_analyses: list[tuple[dict[str, Any], dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Merge per-chunk analyses, deduplicating findings by rule and evidence span.
+
+        Two findings are duplicates when they cite the same rule and one
+        non-empty evidence span contains the other, which is what overlapping
+        chunks produce; the higher-confidence copy is kept. Findings without
+        evidence are never merged. The compliance score is
+        the chunk scores averaged by chunk length.
+        """
+
+        def _normalize(value: Any) -> str:
+            return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+        kept: dict[str, list[dict[str, Any]]] = {}
+        order: list[dict[str, Any]] = []
+        weighted_score = 0.0
+        scored_chars = 0
+        summaries: list[str] = []
+
+        for chunk, analysis in chunk_analyses:
+            score = analysis.get("compliance_score")
+            if isinstance(score, (int, float)):
+                weight = max(1, len(chunk.get("text", "")))
+                weighted_score += float(score) * weight
+                scored_chars += weight
+            summary = analysis.get("summary")
+            if isinstance(summary, str) and summary.strip():
+                summaries.append(summary.strip())
+
+            findings = analysis.get("findings")
+            if not isinstance(findings, list):
+                continue
+            for finding in findings:
+                if not isinstance(finding, dict):
+                    continue
+                finding.setdefault("section", chunk.get("section"))
+                rule_key = _normalize(
+                    finding.get("rule_id")
+                    or finding.get("rule_name")
+                    or finding.get("issue_title")
+                )
+                evidence = _normalize(
+                    finding.get("evidence")
+                    or finding.get("text")
+                    or finding.get("problematic_text")
+                )
+                duplicate = next(
+                    (
+                        existing
+                        for existing in kept.get(rule_key, [])
+                        if evidence
+                        and existing["_evidence"]
+                        and (
+                            existing["_evidence"] in evidence
+                            or evidence in existing["_evidence"]
+                        )
+                    ),
+                    None,
+                )
+                if duplicate is None:
+                    entry = {"_evidence": evidence, "finding": finding}
+                    kept.setdefault(rule_key, []).append(entry)
+                    order.append(entry)
+                elif finding.get("confidence", 0) > duplicate["finding"].get(
+                    "confidence", 0
+                ):
+                    duplicate["finding"] = finding
+                    duplicate["_evidence"] = evidence
+
+        merged_findings = [entry["finding"] for entry in order]
+        merged: dict[str, Any] = {
+            "findings": merged_findings,
+            "summary": (
+                f"Analyzed {len(chunk_analyses)} document sections and found "
+                f"{len(merged_findings)} compliance observations. "
+                + " ".join(summaries[:3])
+            ).strip(),
+        }
+        if scored_chars:
+            merged["compliance_score"] = round(weighted_score / scored_chars, 1)
+        return merged
+
     def _extract_findings_from_text(
         self, text_response: str, document_text: str
     ) -> dict[str, Any]:
@@ -659,7 +870,10 @@ class ComplianceAnalyzer:
         }
 
     async def _post_process_findings(
-        self, explained_analysis: dict[str, Any], retrieved_rules: list[dict[str, Any]]
+        self,
+        explained_analysis: dict[str, Any],
+        retrieved_rules: list[dict[str, Any]],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         """Post-processes the LLM-generated findings.
 
@@ -671,6 +885,8 @@ class ComplianceAnalyzer:
         Args:
             explained_analysis: The analysis result with explanations.
             retrieved_rules: The list of rules retrieved for the analysis.
+            deadline: Event-loop time after which no more tips are generated;
+                remaining findings keep their suggestion as the tip.
 
         Returns:
             The analysis result with post-processed findings.
@@ -738,10 +954,25 @@ class ComplianceAnalyzer:
             ):
                 finding["is_low_confidence"] = True
 
-            if self.nlg_service:
-                tip = await asyncio.to_thread(
-                    self.nlg_service.generate_personalized_tip, finding
-                )
+            tip = None
+            remaining = (
+                None if deadline is None else deadline - asyncio.get_running_loop().time()
+            )
+            if self.nlg_service and (remaining is None or remaining > 0):
+                try:
+                    tip = await asyncio.wait_for(
+                        get_inference_executor().run(
+                            "llm", self.nlg_service.generate_personalized_tip, finding
+                        ),
+                        timeout=remaining,
+                    )
+                except TimeoutError:
+                    logger.warning(
+                        "Analysis time budget exhausted; skipping remaining personalized tips"
+                    )
+            elif self.nlg_service:
+                logger.debug("Analysis time budget exhausted; skipping personalized tip")
+            if tip is not None:
                 finding["personalized_tip"] = tip
             else:
                 finding.setdefault(
@@ -1,18 +1,18 @@
 import json
 import logging
+import math
 import sqlite3
-import statistics
 import threading
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
-import requests
 import sqlalchemy
 import sqlalchemy.exc
-from requests.exceptions import HTTPError
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +20,34 @@ logger = logging.getLogger(__name__)
 class AggregationLevel(Enum):
     """Levels of data aggregation."""
 
-    RAW = "raw"  # 5-second intervals
-    SHORT_TERM = "short"  # 1-minute averages
-    MEDIUM_TERM = "medium"  # 5-minute averages
-    LONG_TERM = "long"  # 1-hour averages
+    RAW = "raw"  # individual samples
+    SHORT_TERM = "short"  # 1-minute buckets
+    MEDIUM_TERM = "medium"  # 5-minute buckets
+    LONG_TERM = "long"  # 1-hour buckets
+    DAILY = "daily"  # 1-day buckets
+
+
+# Bucket width in seconds and the finer level each tier is downsampled from.
+BUCKET_SECONDS = {
+    AggregationLevel.SHORT_TERM: 60,
+    AggregationLevel.MEDIUM_TERM: 300,
+    AggregationLevel.LONG_TERM: 3600,
+    AggregationLevel.DAILY: 86400,
+}
+DOWNSAMPLE_SOURCE = {
+    AggregationLevel.SHORT_TERM: AggregationLevel.RAW,
+    AggregationLevel.MEDIUM_TERM: AggregationLevel.SHORT_TERM,
+    AggregationLevel.LONG_TERM: AggregationLevel.MEDIUM_TERM,
+    AggregationLevel.DAILY: AggregationLevel.LONG_TERM,
+}
+
+# How long each tier is kept; daily buckets live for the configured retention.
+TIER_RETENTION = {
+    AggregationLevel.RAW: timedelta(days=1),
+    AggregationLevel.SHORT_TERM: timedelta(days=7),
+    AggregationLevel.MEDIUM_TERM: timedelta(days=30),
+    AggregationLevel.LONG_TERM: timedelta(days=180),
+}
 
 
 @dataclass
@@ -93,87 +117,171 @@ class MetricBuffer:
             return len(self._buffer)
 
 
+@dataclass
+class _Series:
+    """A metric series: everything about a metric except its samples."""
+
+    id: int
+    name: str
+    source: str
+    unit: str
+    type: str
+    tags: dict[str, str]
+    metadata: dict[str, Any]
+
+
+class _SeriesRing:
+    """Recent samples of one series, kept in memory for hot-window queries.
+
+    ``complete_after`` is the epoch time after which the ring is known to hold
+    every sample of the series; anything at or before it may have been evicted
+    or written by an earlier process.
+    """
+
+    def __init__(self, capacity: int, complete_after: float):
+        self.samples: deque[tuple[float, float]] = deque(maxlen=capacity)
+        self.complete_after = complete_after
+
+    def append(self, ts: float, value: float, horizon: float) -> None:
+        if len(self.samples) == self.samples.maxlen:
+            self.complete_after = max(self.complete_after, self.samples[0][0])
+        self.samples.append((ts, value))
+        while self.samples and self.samples[0][0] < horizon:
+            self.complete_after = max(self.complete_after, self.samples.popleft()[0])
+
+    def covers(self, start_ts: float) -> bool:
+        return start_ts > self.complete_after
+
+
+def _epoch(value: Any) -> float:
+    """Epoch seconds for a metric timestamp given as datetime or ISO string."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    if isinstance(value, int | float):
+        return float(value)
+    return time.time()
+
+
+def _std_dev(count: int, total: float, sum_sq: float) -> float:
+    """Sample standard deviation from count, sum and sum of squares."""
+    if count < 2:
+        return 0.0
+    return math.sqrt(max(sum_sq - total * total / count, 0.0) / (count - 1))
+
+
 class TimeSeriesStorage:
-    """SQLite-based time-series storage for metrics."""
+    """SQLite-based time-series storage for metrics.
 
-    def __init__(self, db_path: str = "metrics.db"):
-        import threading
+    Samples are stored narrow, as ``(series_id, ts, value)`` rows, with the
+    name, source, unit, tags and metadata of each series kept once in
+    ``metric_series``. Ingest is one ``executemany`` per batch on a single
+    long-lived connection. Rollups of every tier (1m, 5m, 1h, 1d) are
+    computed in SQL from the next finer tier, and recent raw samples are
+    also held in per-series ring buffers so hot-window queries skip SQLite.
+    """
 
+    def __init__(
+        self,
+        db_path: str = "metrics.db",
+        hot_window: timedelta = timedelta(minutes=15),
+        hot_capacity: int = 512,
+    ):
         self.db_path = db_path
+        self.hot_window = hot_window
+        self.hot_capacity = hot_capacity
         self._lock = threading.Lock()
+        self._opened_at = time.time()
+        self._series: dict[tuple, _Series] = {}
+        self._rings: dict[int, _SeriesRing] = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._init_database()
 
     def _init_database(self) -> None:
         """Initialize database schema."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                # Raw metrics table
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS raw_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        name TEXT NOT NULL,
-                        value REAL NOT NULL,
-                        unit TEXT,
-                        type TEXT,
-                        source TEXT NOT NULL,
-                        tags TEXT,
-                        metadata TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
+            conn = self._conn
+            # Only takes effect on a new database; lets cleanup reclaim pages
+            # incrementally instead of rewriting the file with VACUUM.
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
                 """
-                )
-
-                # Aggregated metrics table
-                conn.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS aggregated_metrics (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        name TEXT NOT NULL,
-                        source TEXT NOT NULL,
-                        aggregation_level TEXT NOT NULL,
-                        count INTEGER NOT NULL,
-                        min_value REAL NOT NULL,
-                        max_value REAL NOT NULL,
-                        avg_value REAL NOT NULL,
-                        sum_value REAL NOT NULL,
-                        std_dev REAL,
-                        tags TEXT,
-                        metadata TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                    )
+                CREATE TABLE IF NOT EXISTS metric_series (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    tags TEXT NOT NULL,
+                    metadata TEXT,
+                    UNIQUE (name, source, unit, type, tags)
+                );
+
+                CREATE TABLE IF NOT EXISTS metric_points (
+                    series_id INTEGER NOT NULL,
+                    ts REAL NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (series_id, ts)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    series_id INTEGER NOT NULL,
+                    level TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    min_value REAL NOT NULL,
+                    max_value REAL NOT NULL,
+                    sum_value REAL NOT NULL,
+                    sum_sq REAL NOT NULL,
+                    PRIMARY KEY (level, bucket, series_id)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_points_ts ON metric_points(ts);
                 """
-                )
-
-                # Create indexes for better query performance
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_timestamp ON raw_metrics(timestamp)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_name ON raw_metrics(name)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_raw_source ON raw_metrics(source)"
-                )
-
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_timestamp ON aggregated_metrics(timestamp)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_name ON aggregated_metrics(name)"
-                )
-                conn.execute(
-                    "CREATE INDEX IF NOT EXISTS idx_agg_level ON aggregated_metrics(aggregation_level)"
-                )
+            )
+            conn.commit()
+            logger.debug("Database schema initialized")
 
-                conn.commit()
-                logger.debug("Database schema initialized")
+    def _series_for(self, metric: dict[str, Any]) -> _Series:
+        """Return the series of ``metric``, registering it on first sight.
 
-            finally:
-                conn.close()
+        Must be called with the lock held.
+        """
+        tags = metric.get("tags") or {}
+        key = (
+            metric.get("name"),
+            metric.get("source"),
+            metric.get("unit") or "",
+            metric.get("type") or "",
+            tuple(sorted(tags.items())),
+        )
+        metadata = metric.get("metadata") or {}
+        series = self._series.get(key)
+        if series is None:
+            tags_json = json.dumps(dict(key[4]))
+            self._conn.execute(
+                "INSERT OR IGNORE INTO metric_series "
+                "(name, source, unit, type, tags, metadata) VALUES (?, ?, ?, ?, ?, ?)",
+                (*key[:4], tags_json, json.dumps(metadata)),
+            )
+            (series_id,) = self._conn.execute(
+                "SELECT id FROM metric_series WHERE name = ? AND source = ? "
+                "AND unit = ? AND type = ? AND tags = ?",
+                (*key[:4], tags_json),
+            ).fetchone()
+            series = _Series(series_id, *key[:4], dict(key[4]), {})
+            self._series[key] = series
+            self._rings[series_id] = _SeriesRing(self.hot_capacity, self._opened_at)
+        if metadata != series.metadata:
+            self._conn.execute(
+                "UPDATE metric_series SET metadata = ? WHERE id = ?",
+                (json.dumps(metadata), series.id),
+            )
+            series.metadata = dict(metadata)
+        return series
 
     def store_raw_metrics(self, metrics: list[dict[str, Any]]) -> int:
         """Store raw metrics in database.
@@ -189,47 +297,35 @@ class TimeSeriesStorage:
             return 0
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
+                rows = []
                 for metric in metrics:
-                    cursor.execute(
-                        """
-                        INSERT INTO raw_metrics
-                        (timestamp, name, value, unit, type, source, tags, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            metric.get("timestamp"),
-                            metric.get("name"),
-                            metric.get("value"),
-                            metric.get("unit"),
-                            metric.get("type"),
-                            metric.get("source"),
-                            json.dumps(metric.get("tags", {})),
-                            json.dumps(metric.get("metadata", {})),
-                        ),
+                    series = self._series_for(metric)
+                    rows.append(
+                        (series.id, _epoch(metric.get("timestamp")), metric.get("value"))
                     )
-
-                conn.commit()
-                return len(metrics)
-
-            except (
-                requests.RequestException,
-                ConnectionError,
-                TimeoutError,
-                HTTPError,
-            ) as e:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO metric_points (series_id, ts, value) "
+                    "VALUES (?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+            except (sqlite3.Error, ValueError, TypeError) as e:
                 logger.exception("Error storing raw metrics: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0
-            finally:
-                conn.close()
+
+            horizon = time.time() - self.hot_window.total_seconds()
+            for series_id, ts, value in rows:
+                self._rings[series_id].append(ts, value, horizon)
+            return len(rows)
 
     def store_aggregated_metrics(self, metrics: list[AggregatedMetric]) -> int:
         """Store aggregated metrics in database.
 
+        Each metric replaces the bucket of its level that contains its
+        timestamp.
+
         Args:
             metrics: List of aggregated metrics
 
@@ -241,43 +337,142 @@ class TimeSeriesStorage:
             return 0
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
+                rows = []
                 for metric in metrics:
-                    cursor.execute(
-                        """
-                        INSERT INTO aggregated_metrics
-                        (timestamp, name, source, aggregation_level, count,
-                         min_value, max_value, avg_value, sum_value, std_dev, tags, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+                    series = self._series_for(
+                        {
+                            "name": metric.name,
+                            "source": metric.source,
+                            "tags": metric.tags,
+                            "metadata": metric.metadata,
+                        }
+                    )
+                    width = BUCKET_SECONDS[metric.aggregation_level]
+                    variance = (metric.std_dev or 0.0) ** 2
+                    sum_sq = variance * max(metric.count - 1, 0) + (
+                        metric.sum_value**2 / metric.count if metric.count else 0.0
+                    )
+                    rows.append(
                         (
-                            metric.timestamp.isoformat(),
-                            metric.name,
-                            metric.source,
+                            series.id,
                             metric.aggregation_level.value,
+                            int(metric.timestamp.timestamp() // width * width),
                             metric.count,
                             metric.min_value,
                             metric.max_value,
-                            metric.avg_value,
                             metric.sum_value,
-                            metric.std_dev,
-                            json.dumps(metric.tags),
-                            json.dumps(metric.metadata),
-                        ),
+                            sum_sq,
+                        )
                     )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO metric_rollups (series_id, level, bucket, "
+                    "count, min_value, max_value, sum_value, sum_sq) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.commit()
+                return len(rows)
 
-                conn.commit()
-                return len(metrics)
-
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
+            except (sqlite3.Error, KeyError, ValueError) as e:
                 logger.exception("Error storing aggregated metrics: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0
-            finally:
-                conn.close()
+
+    def downsample(self, level: AggregationLevel, now: datetime | None = None) -> int:
+        """Roll the next finer tier up into ``level`` buckets.
+
+        Covers everything since the newest bucket already written for the
+        level; that bucket is recomputed since it may have been partial.
+
+        Args:
+            level: Aggregation level to build
+            now: Current time, defaulting to the wall clock
+
+        Returns:
+            Number of buckets written
+
+        """
+        width = BUCKET_SECONDS[level]
+        source = DOWNSAMPLE_SOURCE[level]
+        end = (now or datetime.now()).timestamp()
+
+        with self._lock:
+            try:
+                (start,) = self._conn.execute(
+                    "SELECT MAX(bucket) FROM metric_rollups WHERE level = ?",
+                    (level.value,),
+                ).fetchone()
+                if start is None:
+                    start = 0
+                if source is AggregationLevel.RAW:
+                    cursor = self._conn.execute(
+                        """
+                        INSERT INTO metric_rollups (series_id, level, bucket, count,
+                            min_value, max_value, sum_value, sum_sq)
+                        SELECT series_id, ?, CAST(ts / ? AS INTEGER) * ?, COUNT(*),
+                            MIN(value), MAX(value), SUM(value), SUM(value * value)
+                        FROM metric_points
+                        WHERE ts >= ? AND ts <= ?
+                        GROUP BY series_id, CAST(ts / ? AS INTEGER)
+                        ON CONFLICT (level, bucket, series_id) DO UPDATE SET
+                            count = excluded.count,
+                            min_value = excluded.min_value,
+                            max_value = excluded.max_value,
+                            sum_value = excluded.sum_value,
+                            sum_sq = excluded.sum_sq
+                        """,
+                        (level.value, width, width, start, end, width),
+                    )
+                else:
+                    cursor = self._conn.execute(
+                        """
+                        INSERT INTO metric_rollups (series_id, level, bucket, count,
+                            min_value, max_value, sum_value, sum_sq)
+                        SELECT series_id, ?, bucket / ? * ?, SUM(count),
+                            MIN(min_value), MAX(max_value), SUM(sum_value), SUM(sum_sq)
+                        FROM metric_rollups
+                        WHERE level = ? AND bucket >= ? AND bucket <= ?
+                        GROUP BY series_id, bucket / ?
+                        ON CONFLICT (level, bucket, series_id) DO UPDATE SET
+                            count = excluded.count,
+                            min_value = excluded.min_value,
+                            max_value = excluded.max_value,
+                            sum_value = excluded.sum_value,
+                            sum_sq = excluded.sum_sq
+                        """,
+                        (level.value, width, width, source.value, start, end, width),
+                    )
+                self._conn.commit()
+                return cursor.rowcount
+
+            except sqlite3.Error as e:
+                logger.exception("Error downsampling %s metrics: %s", level.value, e)
+                self._conn.rollback()
+                return 0
+
+    def _matching_series(
+        self, metric_name: str | None, source: str | None
+    ) -> list[_Series]:
+        return [
+            series
+            for series in self._series.values()
+            if (not metric_name or series.name == metric_name)
+            and (not source or series.source == source)
+        ]
+
+    @staticmethod
+    def _raw_metric(series: _Series, ts: float, value: float) -> dict[str, Any]:
+        return {
+            "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            "name": series.name,
+            "value": value,
+            "unit": series.unit or None,
+            "type": series.type or None,
+            "source": series.source,
+            "tags": series.tags,
+            "metadata": series.metadata,
+        }
 
     def query_raw_metrics(
         self,
@@ -288,6 +483,8 @@ class TimeSeriesStorage:
     ) -> list[dict[str, Any]]:
         """Query raw metrics from database.
 
+        Windows that the ring buffers fully cover are answered from memory.
+
         Args:
             start_time: Start of time range
             end_time: End of time range
@@ -298,53 +495,63 @@ class TimeSeriesStorage:
             List of raw metrics
 
         """
+        start_ts, end_ts = start_time.timestamp(), end_time.timestamp()
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            try:
-                cursor = conn.cursor()
+            series_list = self._matching_series(metric_name, source)
+            # Series not seen by this process have no samples since it opened.
+            if start_ts > self._opened_at and all(
+                self._rings[series.id].covers(start_ts) for series in series_list
+            ):
+                samples = [
+                    (ts, series, value)
+                    for series in series_list
+                    for ts, value in self._rings[series.id].samples
+                    if start_ts <= ts <= end_ts
+                ]
+                samples.sort(key=lambda sample: sample[0])
+                return [self._raw_metric(series, ts, value) for ts, series, value in samples]
 
+            try:
                 query = """
-                    SELECT timestamp, name, value, unit, type, source, tags, metadata
-                    FROM raw_metrics
-                    WHERE timestamp >= ? AND timestamp <= ?
+                    SELECT s.id, s.name, s.source, s.unit, s.type, s.tags, s.metadata,
+                           p.ts, p.value
+                    FROM metric_points p JOIN metric_series s ON s.id = p.series_id
+                    WHERE p.ts >= ? AND p.ts <= ?
                 """
-                params = [start_time.isoformat(), end_time.isoformat()]
+                params: list[Any] = [start_ts, end_ts]
 
                 if metric_name:
-                    query += " AND name = ?"
+                    query += " AND s.name = ?"
                     params.append(metric_name)
 
                 if source:
-                    query += " AND source = ?"
+                    query += " AND s.source = ?"
                     params.append(source)
 
-                query += " ORDER BY timestamp"
-
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+                query += " ORDER BY p.ts"
 
+                rows = self._conn.execute(query, params).fetchall()
+                series_by_id: dict[int, _Series] = {}
                 metrics = []
                 for row in rows:
-                    metrics.append(
-                        {
-                            "timestamp": row[0],
-                            "name": row[1],
-                            "value": row[2],
-                            "unit": row[3],
-                            "type": row[4],
-                            "source": row[5],
-                            "tags": json.loads(row[6]) if row[6] else {},
-                            "metadata": json.loads(row[7]) if row[7] else {},
-                        }
-                    )
+                    series = series_by_id.get(row[0])
+                    if series is None:
+                        series = series_by_id[row[0]] = _Series(
+                            row[0],
+                            row[1],
+                            row[2],
+                            row[3],
+                            row[4],
+                            json.loads(row[5]) if row[5] else {},
+                            json.loads(row[6]) if row[6] else {},
+                        )
+                    metrics.append(self._raw_metric(series, row[7], row[8]))
 
                 return metrics
 
-            except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+            except sqlite3.Error as e:
                 logger.exception("Error querying raw metrics: %s", e)
                 return []
-            finally:
-                conn.close()
 
     def query_aggregated_metrics(
         self,
@@ -364,68 +571,65 @@ class TimeSeriesStorage:
             source: Optional source filter
 
         Returns:
-            List of aggregated metrics
+            List of aggregated metrics, timestamped at the start of their bucket
 
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
                 query = """
-                    SELECT timestamp, name, source, aggregation_level, count,
-                           min_value, max_value, avg_value, sum_value, std_dev, tags, metadata
-                    FROM aggregated_metrics
-                    WHERE timestamp >= ? AND timestamp <= ? AND aggregation_level = ?
+                    SELECT r.bucket, s.name, s.source, r.count, r.min_value,
+                           r.max_value, r.sum_value, r.sum_sq, s.tags, s.metadata
+                    FROM metric_rollups r JOIN metric_series s ON s.id = r.series_id
+                    WHERE r.level = ? AND r.bucket >= ? AND r.bucket <= ?
                 """
-                params = [
-                    start_time.isoformat(),
-                    end_time.isoformat(),
+                width = BUCKET_SECONDS[aggregation_level]
+                params: list[Any] = [
                     aggregation_level.value,
+                    start_time.timestamp() // width * width,
+                    end_time.timestamp(),
                 ]
 
                 if metric_name:
-                    query += " AND name = ?"
+                    query += " AND s.name = ?"
                     params.append(metric_name)
 
                 if source:
-                    query += " AND source = ?"
+                    query += " AND s.source = ?"
                     params.append(source)
 
-                query += " ORDER BY timestamp"
-
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
+                query += " ORDER BY r.bucket"
 
                 metrics = []
-                for row in rows:
+                for row in self._conn.execute(query, params).fetchall():
+                    count, total = row[3], row[6]
                     metrics.append(
                         AggregatedMetric(
-                            timestamp=datetime.fromisoformat(row[0]),
+                            timestamp=datetime.fromtimestamp(row[0]),
                             name=row[1],
                             source=row[2],
-                            aggregation_level=AggregationLevel(row[3]),
-                            count=row[4],
-                            min_value=row[5],
-                            max_value=row[6],
-                            avg_value=row[7],
-                            sum_value=row[8],
-                            std_dev=row[9],
-                            tags=json.loads(row[10]) if row[10] else {},
-                            metadata=json.loads(row[11]) if row[11] else {},
+                            aggregation_level=aggregation_level,
+                            count=count,
+                            min_value=row[4],
+                            max_value=row[5],
+                            avg_value=total / count,
+                            sum_value=total,
+                            std_dev=_std_dev(count, total, row[7]),
+                            tags=json.loads(row[8]) if row[8] else {},
+                            metadata=json.loads(row[9]) if row[9] else {},
                         )
                     )
 
                 return metrics
 
-            except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+            except (sqlite3.Error, KeyError) as e:
                 logger.exception("Error querying aggregated metrics: %s", e)
                 return []
-            finally:
-                conn.close()
 
     def cleanup_old_data(self, retention_days: int) -> tuple[int, int]:
-        """Clean up old data beyond retention period.
+        """Clean up data past the retention of its tier.
+
+        Each tier keeps ``TIER_RETENTION`` worth of data, capped at
+        ``retention_days``; daily buckets are kept for ``retention_days``.
 
         Args:
             retention_days: Number of days to retain data
@@ -434,40 +638,35 @@ class TimeSeriesStorage:
             Tuple of (raw_deleted, aggregated_deleted)
 
         """
-        cutoff_time = datetime.now() - timedelta(days=retention_days)
+        retention = timedelta(days=retention_days)
+        now = time.time()
 
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
-
-                # Delete old raw metrics
-                cursor.execute(
-                    "DELETE FROM raw_metrics WHERE timestamp < ?",
-                    (cutoff_time.isoformat()),
-                )
-                raw_deleted = cursor.rowcount
-
-                # Delete old aggregated metrics
-                cursor.execute(
-                    "DELETE FROM aggregated_metrics WHERE timestamp < ?",
-                    (cutoff_time.isoformat()),
-                )
-                aggregated_deleted = cursor.rowcount
-
-                conn.commit()
-
-                # Vacuum database to reclaim space
-                conn.execute("VACUUM")
+                raw_cutoff = now - min(
+                    TIER_RETENTION[AggregationLevel.RAW], retention
+                ).total_seconds()
+                raw_deleted = self._conn.execute(
+                    "DELETE FROM metric_points WHERE ts < ?", (raw_cutoff,)
+                ).rowcount
+
+                aggregated_deleted = 0
+                for level in BUCKET_SECONDS:
+                    keep = min(TIER_RETENTION.get(level, retention), retention)
+                    aggregated_deleted += self._conn.execute(
+                        "DELETE FROM metric_rollups WHERE level = ? AND bucket < ?",
+                        (level.value, now - keep.total_seconds()),
+                    ).rowcount
+
+                self._conn.commit()
+                self._conn.execute("PRAGMA incremental_vacuum")
 
                 return raw_deleted, aggregated_deleted
 
-            except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+            except sqlite3.Error as e:
                 logger.exception("Error cleaning up old data: %s", e)
-                conn.rollback()
+                self._conn.rollback()
                 return 0, 0
-            finally:
-                conn.close()
 
     def get_storage_stats(self) -> dict[str, Any]:
         """Get storage statistics.
@@ -477,42 +676,48 @@ class TimeSeriesStorage:
 
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
             try:
-                cursor = conn.cursor()
+                (raw_count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM metric_points"
+                ).fetchone()
+                (agg_count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM metric_rollups"
+                ).fetchone()
+                (series_count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM metric_series"
+                ).fetchone()
+                oldest, newest = self._conn.execute(
+                    "SELECT MIN(ts), MAX(ts) FROM metric_points"
+                ).fetchone()
 
-                # Count raw metrics
-                cursor.execute("SELECT COUNT(*) FROM raw_metrics")
-                raw_count = cursor.fetchone()[0]
-
-                # Count aggregated metrics
-                cursor.execute("SELECT COUNT(*) FROM aggregated_metrics")
-                agg_count = cursor.fetchone()[0]
-
-                # Get database file size
                 db_size = (
                     Path(self.db_path).stat().st_size
                     if Path(self.db_path).exists()
                     else 0
                 )
 
-                # Get oldest and newest timestamps
-                cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM raw_metrics")
-                raw_range = cursor.fetchone()
-
                 return {
                     "raw_metrics_count": raw_count,
                     "aggregated_metrics_count": agg_count,
+                    "series_count": series_count,
+                    "hot_samples": sum(len(ring.samples) for ring in self._rings.values()),
                     "database_size_bytes": db_size,
-                    "oldest_metric": raw_range[0] if raw_range[0] else None,
-                    "newest_metric": raw_range[1] if raw_range[1] else None,
+                    "oldest_metric": (
+                        datetime.fromtimestamp(oldest).isoformat() if oldest else None
+                    ),
+                    "newest_metric": (
+                        datetime.fromtimestamp(newest).isoformat() if newest else None
+                    ),
                 }
 
-            except (FileNotFoundError, PermissionError, OSError) as e:
+            except (sqlite3.Error, OSError) as e:
                 logger.exception("Error getting storage stats: %s", e)
                 return {}
-            finally:
-                conn.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
 
 
 class DataAggregator:
@@ -531,11 +736,7 @@ class DataAggregator:
         self._aggregations_created = 0
         self._aggregation_thread: threading.Thread | None = None
         self._cleanup_thread: threading.Thread | None = None
-        self._last_aggregation = {
-            AggregationLevel.SHORT_TERM: datetime.min,
-            AggregationLevel.MEDIUM_TERM: datetime.min,
-            AggregationLevel.LONG_TERM: datetime.min,
-        }
+        self._last_aggregation = {level: datetime.min for level in BUCKET_SECONDS}
 
     def process_metrics(self, metrics: list[dict[str, Any]]) -> None:
         """Process and store metrics.
@@ -624,109 +825,36 @@ class DataAggregator:
                 self._stop_event.wait(300.0)  # Wait 5 minutes on error
 
     def _perform_aggregations(self) -> None:
-        """Perform time-based aggregations."""
-        now = datetime.now()
+        """Perform time-based aggregations.
 
-        # Short-term aggregation (1-minute)
-        if (
-            now - self._last_aggregation[AggregationLevel.SHORT_TERM]
-        ).total_seconds() >= 60:
-            self._create_aggregations(AggregationLevel.SHORT_TERM, timedelta(minutes=1))
-            self._last_aggregation[AggregationLevel.SHORT_TERM] = now
-
-        # Medium-term aggregation (5-minute)
-        if (
-            now - self._last_aggregation[AggregationLevel.MEDIUM_TERM]
-        ).total_seconds() >= 300:
-            self._create_aggregations(
-                AggregationLevel.MEDIUM_TERM, timedelta(minutes=5)
-            )
-            self._last_aggregation[AggregationLevel.MEDIUM_TERM] = now
+        Each tier is refreshed once per bucket width, at most hourly, finer
+        tiers first so coarser ones see their latest input.
+        """
+        now = datetime.now()
 
-        # Long-term aggregation (1-hour)
-        if (
-            now - self._last_aggregation[AggregationLevel.LONG_TERM]
-        ).total_seconds() >= 3600:
-            self._create_aggregations(AggregationLevel.LONG_TERM, timedelta(hours=1))
-            self._last_aggregation[AggregationLevel.LONG_TERM] = now
+        for level, width in BUCKET_SECONDS.items():
+            if (now - self._last_aggregation[level]).total_seconds() >= min(width, 3600):
+                self._create_aggregations(level, now)
+                self._last_aggregation[level] = now
 
-    def _create_aggregations(self, level: AggregationLevel, window: timedelta) -> None:
-        """Create aggregations for a specific time window.
+    def _create_aggregations(self, level: AggregationLevel, now: datetime) -> None:
+        """Downsample new data into the buckets of one aggregation level.
 
         Args:
             level: Aggregation level
-            window: Time window for aggregation
+            now: Time of this aggregation pass
 
         """
         try:
-            end_time = datetime.now()
-            start_time = end_time - window
-
-            # Get raw metrics for the time window
-            raw_metrics = self.storage.query_raw_metrics(start_time, end_time)
-
-            if not raw_metrics:
-                return
-
-            # Group metrics by name and source
-            grouped_metrics: dict[tuple[str, str], list[dict[str, Any]]] = {}
-            for metric in raw_metrics:
-                key = (metric["name"], metric["source"])
-                if key not in grouped_metrics:
-                    grouped_metrics[key] = []
-                grouped_metrics[key].append(metric)
-
-            # Create aggregated metrics
-            aggregated_metrics: list[AggregatedMetric] = []
-            for (name, source), metric_group in grouped_metrics.items():
-                if not metric_group:
-                    continue
-
-                values = [m["value"] for m in metric_group]
-
-                # Calculate statistics
-                count = len(values)
-                min_value = min(values)
-                max_value = max(values)
-                avg_value = sum(values) / count
-                sum_value = sum(values)
-                std_dev = statistics.stdev(values) if count > 1 else 0.0
-
-                # Combine tags and metadata
-                all_tags = {}
-                all_metadata = {}
-                for metric in metric_group:
-                    all_tags.update(metric.get("tags", {}))
-                    all_metadata.update(metric.get("metadata", {}))
-
-                aggregated_metric = AggregatedMetric(
-                    timestamp=end_time,
-                    name=name,
-                    source=source,
-                    aggregation_level=level,
-                    count=count,
-                    min_value=min_value,
-                    max_value=max_value,
-                    avg_value=avg_value,
-                    sum_value=sum_value,
-                    std_dev=std_dev,
-                    tags=all_tags,
-                    metadata=all_metadata,
-                )
-
-                aggregated_metrics.append(aggregated_metric)
+            stored_count = self.storage.downsample(level, now)
 
-            # Store aggregated metrics
-            if aggregated_metrics:
-                stored_count = self.storage.store_aggregated_metrics(aggregated_metrics)
-
-                with self._lock:
-                    self._aggregations_created += stored_count
+            with self._lock:
+                self._aggregations_created += stored_count
 
-                logger.debug("Created %s {level.value} aggregations", stored_count)
+            logger.debug("Created %s %s aggregations", stored_count, level.value)
 
         except Exception:
-            logger.exception("Error creating %s aggregations: {e}", level.value)
+            logger.exception("Error creating %s aggregations", level.value)
 
     def get_metrics(
         self,
@@ -818,25 +946,12 @@ class DataAggregator:
         """
         try:
             results = {}
+            now = datetime.now()
 
-            # Force all aggregation levels
-            for level in [
-                AggregationLevel.SHORT_TERM,
-                AggregationLevel.MEDIUM_TERM,
-                AggregationLevel.LONG_TERM,
-            ]:
-                if level == AggregationLevel.SHORT_TERM:
-                    window = timedelta(minutes=1)
-                elif level == AggregationLevel.MEDIUM_TERM:
-                    window = timedelta(minutes=5)
-                else:
-                    window = timedelta(hours=1)
-
+            for level in BUCKET_SECONDS:
                 before_count = self._aggregations_created
-                self._create_aggregations(level, window)
-                after_count = self._aggregations_created
-
-                results[level.value] = after_count - before_count
+                self._create_aggregations(level, now)
+                results[level.value] = self._aggregations_created - before_count
 
             return results
 
@@ -873,6 +988,7 @@ class DataAggregator:
                 logger.debug(
                     "Stored %s final metrics during cleanup", len(buffered_metrics)
                 )
+            self.storage.close()
 
             logger.debug("Data aggregator cleaned up")
 
@@ -265,16 +265,21 @@ class DocumentChunker:
         return sections
 
 
-# Global chunker instance
-_chunker: Optional[DocumentChunker] = None
-
-
-def get_document_chunker() -> DocumentChunker:
-    """Get the global document chunker instance."""
-    global _chunker
-    if _chunker is None:
-        _chunker = DocumentChunker()
-    return _chunker
+# Global chunker instances, one per (max_tokens, overlap_tokens) configuration
+_chunkers: Dict[tuple, DocumentChunker] = {}
+
+
+def get_document_chunker(
+    max_tokens: int = 512, overlap_tokens: int = 50
+) -> DocumentChunker:
+    """Get the global document chunker instance for the given chunk sizes."""
+    key = (max_tokens, overlap_tokens)
+    chunker = _chunkers.get(key)
+    if chunker is None:
+        chunker = _chunkers[key] = DocumentChunker(
+            max_tokens=max_tokens, overlap_tokens=overlap_tokens
+        )
+    return chunker
 
 
 def chunk_text(text: str, max_tokens: int = 512) -> List[Dict[str, Any]]:
@@ -0,0 +1,183 @@
+"""Per-document text index shared by the post-analysis validators.
+
+The rubric detector, the deterministic checklist and the accuracy and
+hallucination validators all ask the same questions of a document: is this
+word or phrase present, how often, and in which sentence. A
+:class:`DocumentIndex` lowercases, tokenizes and sentence-splits the text once
+and answers those questions from precomputed structures, so checking N
+findings or keywords no longer rescans the whole document N times.
+"""
+
+import bisect
+import re
+from collections import Counter
+from collections.abc import Iterable
+from functools import lru_cache
+
+from .phrase_matcher import MultiPatternMatcher, ScanResult
+
+TOKEN_PATTERN = re.compile(r"\w+")
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"[.!?]+\s+")
+INDEX_CACHE_SIZE = 8
+
+
+class DocumentIndex:
+    """Lowercased text with token, phrase and sentence lookups for one document.
+
+    Substring queries keep the ``phrase in text.lower()`` semantics the
+    validators were written against; each distinct phrase is located once and
+    later queries for it are dictionary lookups. Token and word membership is
+    answered from sets, and offsets map to sentences by binary search.
+
+    Attributes:
+        text: The original document text
+        lower: The lowercased document text
+        word_counts: Occurrences of each whitespace-separated lowercased word
+        words: The distinct whitespace-separated lowercased words
+        total_words: The number of whitespace-separated words
+        tokens: Lowercased ``\\w+`` tokens in document order
+
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text or ""
+        self.lower = self.text.lower()
+        self.word_counts = Counter(self.lower.split())
+        self.words = frozenset(self.word_counts)
+        self.total_words = sum(self.word_counts.values())
+        self.tokens = TOKEN_PATTERN.findall(self.lower)
+        self._postings: dict[str, list[int]] = {}
+        for position, token in enumerate(self.tokens):
+            self._postings.setdefault(token, []).append(position)
+
+        # Spans come from the lowercased text and sentences from the original;
+        # lowercasing never creates or removes a boundary, so the two line up.
+        self._sentence_spans = _sentence_spans(self.lower)
+        self._sentence_starts = [start for start, _ in self._sentence_spans]
+        self.sentences = [
+            self.text[start:end] for start, end in _sentence_spans(self.text)
+        ]
+        self._offsets: dict[str, list[int]] = {}
+        self._scans: dict[MultiPatternMatcher, ScanResult] = {}
+
+    def has_token(self, token: str) -> bool:
+        """Return whether ``token`` occurs as a whole ``\\w+`` token."""
+        return token.lower() in self._postings
+
+    def offsets(self, phrase: str) -> list[int]:
+        """Return the start offsets of ``phrase`` in the lowercased text.
+
+        Matches are case-insensitive and non-overlapping, as counted by
+        ``str.count``. The result is cached per phrase and must not be mutated.
+        """
+        phrase = phrase.lower()
+        cached = self._offsets.get(phrase)
+        if cached is not None:
+            return cached
+        found: list[int] = []
+        if phrase:
+            start = self.lower.find(phrase)
+            while start != -1:
+                found.append(start)
+                start = self.lower.find(phrase, start + len(phrase))
+        self._offsets[phrase] = found
+        return found
+
+    def contains(self, phrase: str) -> bool:
+        """Return whether ``phrase`` occurs anywhere in the lowercased text."""
+        lowered = phrase.lower()
+        if not lowered or lowered in self.words or lowered in self._postings:
+            return True
+        return bool(self.offsets(lowered))
+
+    def count(self, phrase: str) -> int:
+        """Return the number of non-overlapping occurrences of ``phrase``."""
+        return len(self.offsets(phrase))
+
+    def phrase_count(self, phrase: str) -> int:
+        """Return how often ``phrase`` occurs as a run of whole tokens.
+
+        Unlike :meth:`count`, "ot" does not match inside "not". The lookup
+        walks the postings of the phrase's first token only.
+        """
+        phrase_tokens = TOKEN_PATTERN.findall(phrase.lower())
+        if not phrase_tokens:
+            return 0
+        first, rest = phrase_tokens[0], phrase_tokens[1:]
+        last_start = len(self.tokens) - len(rest)
+        return sum(
+            1
+            for position in self._postings.get(first, ())
+            if position < last_start
+            and all(
+                self.tokens[position + step] == token
+                for step, token in enumerate(rest, 1)
+            )
+        )
+
+    def scan(self, matcher: MultiPatternMatcher) -> ScanResult:
+        """Return ``matcher``'s scan of the text, computed once per matcher."""
+        result = self._scans.get(matcher)
+        if result is None:
+            result = self._scans[matcher] = matcher.scan(self.lower)
+        return result
+
+    def sentence_index(self, offset: int, length: int = 0) -> int | None:
+        """Return the sentence holding ``[offset, offset + length)``, if any."""
+        index = bisect.bisect_right(self._sentence_starts, offset) - 1
+        if index >= 0 and offset + length <= self._sentence_spans[index][1]:
+            return index
+        return None
+
+    def first_sentence_with(self, phrases: Iterable[str]) -> str | None:
+        """Return the earliest sentence containing any of ``phrases``."""
+        best: int | None = None
+        for phrase in phrases:
+            for offset in self.offsets(phrase):
+                if best is not None and offset >= self._sentence_starts[best]:
+                    break
+                index = self.sentence_index(offset, len(phrase))
+                if index is not None:
+                    best = index
+                    break
+        return None if best is None else self.sentences[best]
+
+    def sentences_with_any(self, phrases: Iterable[str], limit: int) -> list[str]:
+        """Return up to ``limit`` sentences containing any phrase, in document order."""
+        found: set[int] = set()
+        for phrase in set(phrases):
+            matched: list[int] = []
+            for offset in self.offsets(phrase):
+                index = self.sentence_index(offset, len(phrase))
+                if index is not None and (not matched or matched[-1] != index):
+                    matched.append(index)
+                    if len(matched) == limit:
+                        break
+            found.update(matched)
+        return [self.sentences[index] for index in sorted(found)[:limit]]
+
+
+def _sentence_spans(text: str) -> list[tuple[int, int]]:
+    """Return the stripped, non-empty sentence spans of ``text``."""
+    spans = []
+    start = 0
+    for boundary in [*SENTENCE_BOUNDARY_PATTERN.finditer(text), None]:
+        end = boundary.start() if boundary else len(text)
+        piece = text[start:end]
+        stripped = piece.strip()
+        if stripped:
+            left = start + len(piece) - len(piece.lstrip())
+            spans.append((left, left + len(stripped)))
+        if boundary:
+            start = boundary.end()
+    return spans
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def get_document_index(text: str) -> DocumentIndex:
+    """Return the shared :class:`DocumentIndex` for ``text``.
+
+    The analysis pipeline hands the same document text to every validator, so
+    the first one to ask builds the index and the rest reuse it.
+    """
+    return DocumentIndex(text)
@@ -1,19 +1,31 @@
 """
 Enhanced Worker Manager with ProcessPoolExecutor and Retry Logic
 Replaces ThreadPoolExecutor with ProcessPoolExecutor for better AI task handling
+
+The dispatcher keeps up to ``max_workers`` tasks in flight at once, each
+priority level limited to its own concurrency cap. Waiting tasks gain one
+priority level per ``aging_interval`` seconds, so LOW work is not starved
+by a steady stream of higher-priority submissions. Queue-wait and run-time
+histograms and a backpressure signal let callers shed load before the queue
+fills up. Coroutine functions run on the event loop; plain callables run in
+the process pool.
 """
 
 import asyncio
+import inspect
 import logging
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 from uuid import uuid4
 
 import structlog
 
+from src.config import get_settings
+
 logger = structlog.get_logger(__name__)
 
 
@@ -39,21 +51,115 @@ class WorkerTask:
     completed_at: Optional[float] = None
     error_message: Optional[str] = None
     result: Any = None
+    enqueued_at: Optional[float] = None
+
+
+@dataclass
+class Backpressure:
+    """Load signal for callers deciding whether to accept more work."""
+
+    saturated: bool
+    queued: int
+    in_flight: int
+    retry_after_seconds: int
+
+
+class LatencyHistogram:
+    """Cumulative fixed-bucket histogram of durations in seconds."""
+
+    BUCKETS: Tuple[float, ...] = (
+        0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0
+    )
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = next(
+            (i for i, bound in enumerate(self.BUCKETS) if seconds <= bound),
+            len(self.BUCKETS),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.BUCKETS[index] if index < len(self.BUCKETS) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip((*self.BUCKETS, "+Inf"), self.counts, strict=True):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": round(self.mean, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": buckets,
+        }
 
 
 class EnhancedWorkerManager:
-    """Enhanced worker manager with process pools and retry logic."""
+    """Enhanced worker manager with process pools and retry logic.
+
+    Args:
+        max_workers: Tasks run concurrently (and process pool size)
+        max_queue_size: Unfinished tasks accepted before submissions fail
+        priority_limits: Concurrency cap per priority; LOW defaults to half
+            the workers so it cannot occupy the whole pool
+        aging_interval: Seconds of waiting worth one priority level
+        backpressure_threshold: Fraction of ``max_queue_size`` at which
+            :meth:`backpressure` reports saturation
 
-    def __init__(self, max_workers: int = 2, max_queue_size: int = 50):
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue_size: int = 50,
+        priority_limits: Optional[Dict[TaskPriority, int]] = None,
+        aging_interval: float = 30.0,
+        backpressure_threshold: float = 0.8,
+    ):
         self.max_workers = max_workers
         self.max_queue_size = max_queue_size
+        self.priority_limits = {
+            TaskPriority.LOW: max(1, max_workers // 2),
+            **{p: max_workers for p in TaskPriority if p is not TaskPriority.LOW},
+            **(priority_limits or {}),
+        }
+        self.aging_interval = aging_interval
+        self.backpressure_threshold = backpressure_threshold
         self.executor = ProcessPoolExecutor(max_workers=max_workers)
         self.tasks: Dict[str, WorkerTask] = {}
         self.futures: Dict[str, Any] = {}
         self._lock = asyncio.Lock()
         self._shutdown = False
-        self._task_queue = asyncio.PriorityQueue()
+        self._queues: Dict[TaskPriority, Deque[str]] = {p: deque() for p in TaskPriority}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_by_priority: Dict[TaskPriority, int] = {p: 0 for p in TaskPriority}
+        self._wakeup = asyncio.Event()
         self._worker_task = None
+        self.queue_wait_histogram = LatencyHistogram()
+        self.run_time_histogram = LatencyHistogram()
 
         logger.info(
             "Enhanced WorkerManager initialized",
@@ -70,6 +176,7 @@ class EnhancedWorkerManager:
     async def stop(self) -> None:
         """Stop the worker manager gracefully."""
         self._shutdown = True
+        self._wakeup.set()
 
         if self._worker_task:
             self._worker_task.cancel()
@@ -78,7 +185,9 @@ class EnhancedWorkerManager:
             except asyncio.CancelledError:
                 pass
 
-        # Cancel all pending futures
+        # Cancel running tasks and pending futures
+        for runner in list(self._running.values()):
+            runner.cancel()
         for future in self.futures.values():
             future.cancel()
 
@@ -102,7 +211,7 @@ class EnhancedWorkerManager:
             raise RuntimeError("WorkerManager is shutting down")
 
         async with self._lock:
-            if len(self.tasks) >= self.max_queue_size:
+            if self._unfinished_count() >= self.max_queue_size:
                 raise RuntimeError(f"Task queue is full (max: {self.max_queue_size})")
 
             task_id = task_id or str(uuid4())
@@ -124,7 +233,7 @@ class EnhancedWorkerManager:
             self.tasks[task_id] = task
 
             # Add to priority queue
-            await self._task_queue.put((priority.value, task_id))
+            self._enqueue(task)
 
             logger.info(
                 "Task submitted",
@@ -165,13 +274,23 @@ class EnhancedWorkerManager:
         """Cancel a pending or running task."""
         async with self._lock:
             task = self.tasks.get(task_id)
-            if not task:
+            if not task or task.completed_at:
                 return False
 
-            # Cancel future if it exists
-            future = self.futures.get(task_id)
-            if future and not future.done():
-                future.cancel()
+            queue = self._queues[task.priority]
+            if task_id in queue:
+                queue.remove(task_id)
+                task.error_message = "Task cancelled"
+                task.completed_at = time.time()
+                logger.info("Task cancelled", task_id=task_id)
+                return True
+
+            runner = self._running.get(task_id)
+            if runner and not runner.done():
+                future = self.futures.get(task_id)
+                if future and not future.done():
+                    future.cancel()
+                runner.cancel()
                 logger.info("Task cancelled", task_id=task_id)
                 return True
 
@@ -241,69 +360,139 @@ class EnhancedWorkerManager:
                 "failed_tasks": failed_tasks,
                 "max_workers": self.max_workers,
                 "max_queue_size": self.max_queue_size,
-                "queue_size": self._task_queue.qsize(),
+                "queue_size": self._queued_count(),
+                "in_flight": len(self._running),
+                "queued_by_priority": {
+                    p.name: len(queue) for p, queue in self._queues.items()
+                },
+                "running_by_priority": {
+                    p.name: count for p, count in self._running_by_priority.items()
+                },
+                "queue_wait_seconds": self.queue_wait_histogram.snapshot(),
+                "run_time_seconds": self.run_time_histogram.snapshot(),
             }
 
+    def backpressure(self, external_in_flight: int = 0) -> Backpressure:
+        """Report whether new work should be deferred, with a retry estimate.
+
+        The manager is saturated once unfinished work reaches
+        ``backpressure_threshold`` of ``max_queue_size``. Work the caller runs
+        outside the manager (interactive analyses) is passed as
+        ``external_in_flight`` and counted alongside it. The retry hint is the
+        time needed to drain the current queue at the mean run time.
+        """
+        queued = self._queued_count()
+        in_flight = len(self._running) + external_in_flight
+        saturated = (queued + in_flight) >= self.max_queue_size * self.backpressure_threshold
+        mean_run = self.run_time_histogram.mean or 1.0
+        retry_after = max(1, round(mean_run * (queued + 1) / max(1, self.max_workers)))
+        return Backpressure(
+            saturated=saturated,
+            queued=queued,
+            in_flight=in_flight,
+            retry_after_seconds=retry_after,
+        )
+
+    @property
+    def accepting_tasks(self) -> bool:
+        """False once :meth:`stop` has been called."""
+        return not self._shutdown
+
+    def _queued_count(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _unfinished_count(self) -> int:
+        return sum(1 for task in self.tasks.values() if not task.completed_at)
+
+    def _enqueue(self, task: WorkerTask) -> None:
+        if self._shutdown:
+            return
+        task.enqueued_at = time.time()
+        self._queues[task.priority].append(task.task_id)
+        self._wakeup.set()
+
+    def _effective_priority(self, task: WorkerTask, now: float) -> float:
+        waited = now - (task.enqueued_at or task.created_at)
+        return task.priority.value + waited / self.aging_interval
+
+    def _next_task(self) -> Optional[WorkerTask]:
+        """Pop the waiting task with the highest aged priority that may run.
+
+        Queues are FIFO per priority, so only each queue's head competes.
+        """
+        now = time.time()
+        best: Optional[WorkerTask] = None
+        best_score = float("-inf")
+        for priority, queue in self._queues.items():
+            if self._running_by_priority[priority] >= self.priority_limits[priority]:
+                continue
+            while queue and queue[0] not in self.tasks:
+                queue.popleft()  # cleaned up while waiting
+            if not queue:
+                continue
+            head = self.tasks[queue[0]]
+            score = self._effective_priority(head, now)
+            if score > best_score:
+                best, best_score = head, score
+        if best is not None:
+            self._queues[best.priority].popleft()
+        return best
+
     async def _worker_loop(self) -> None:
-        """Main worker loop that processes tasks from the priority queue."""
+        """Dispatch queued tasks while fewer than ``max_workers`` are in flight."""
         logger.info("Worker loop started")
 
         while not self._shutdown:
             try:
-                # Get next task from priority queue
-                _, task_id = await asyncio.wait_for(self._task_queue.get(), timeout=1.0)
-
-                task = self.tasks.get(task_id)
-                if not task:
-                    continue
-
-                # Execute task
-                await self._execute_task(task)
+                self._wakeup.clear()
+                while len(self._running) < self.max_workers:
+                    task = self._next_task()
+                    if task is None:
+                        break
+                    self._dispatch(task)
+
+                # Re-evaluate periodically so waiting tasks age even when idle.
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
 
-            except asyncio.TimeoutError:
-                # No tasks in queue, continue
-                continue
             except Exception as e:
                 logger.error("Error in worker loop", error=str(e))
                 await asyncio.sleep(1)
 
         logger.info("Worker loop stopped")
 
+    def _dispatch(self, task: WorkerTask) -> None:
+        self.queue_wait_histogram.observe(time.time() - (task.enqueued_at or task.created_at))
+        self._running_by_priority[task.priority] += 1
+        runner = asyncio.create_task(self._execute_task(task), name=f"worker-{task.task_id}")
+        self._running[task.task_id] = runner
+
+        def _finished(_: asyncio.Task) -> None:
+            self._running.pop(task.task_id, None)
+            self._running_by_priority[task.priority] -= 1
+            self._wakeup.set()
+
+        runner.add_done_callback(_finished)
+
     async def _execute_task(self, task: WorkerTask) -> None:
         """Execute a single task with retry logic."""
+        started = time.time()
         try:
-            task.started_at = time.time()
+            task.started_at = started
 
-            # Submit to process pool
-            future = self.executor.submit(task.func, *task.args, **task.kwargs)
-            self.futures[task.task_id] = future
+            if inspect.iscoroutinefunction(task.func):
+                awaitable = task.func(*task.args, **task.kwargs)
+            else:
+                # Submit to process pool
+                future = self.executor.submit(task.func, *task.args, **task.kwargs)
+                self.futures[task.task_id] = future
+                awaitable = asyncio.wrap_future(future)
 
             # Wait for completion with timeout
-            if task.timeout:
-                try:
-                    result = await asyncio.wait_for(
-                        asyncio.wrap_future(future), timeout=task.timeout
-                    )
-                    task.result = result
-                    task.completed_at = time.time()
-
-                    logger.info(
-                        "Task completed",
-                        task_id=task.task_id,
-                        duration=task.completed_at - task.started_at,
-                    )
-
-                except asyncio.TimeoutError:
-                    future.cancel()
-                    task.error_message = f"Task timed out after {task.timeout} seconds"
-                    task.completed_at = time.time()
-
-                    logger.warning(
-                        "Task timed out", task_id=task.task_id, timeout=task.timeout
-                    )
-            else:
-                result = await asyncio.wrap_future(future)
-                task.result = result
+            try:
+                task.result = await asyncio.wait_for(awaitable, timeout=task.timeout)
                 task.completed_at = time.time()
 
                 logger.info(
@@ -312,6 +501,22 @@ class EnhancedWorkerManager:
                     duration=task.completed_at - task.started_at,
                 )
 
+            except asyncio.TimeoutError:
+                future = self.futures.get(task.task_id)
+                if future:
+                    future.cancel()
+                task.error_message = f"Task timed out after {task.timeout} seconds"
+                task.completed_at = time.time()
+
+                logger.warning(
+                    "Task timed out", task_id=task.task_id, timeout=task.timeout
+                )
+
+        except asyncio.CancelledError:
+            task.error_message = "Task cancelled"
+            task.completed_at = time.time()
+            raise
+
         except Exception as e:
             task.error_message = str(e)
             task.completed_at = time.time()
@@ -320,14 +525,12 @@ class EnhancedWorkerManager:
             if task.retry_count < task.max_retries:
                 task.retry_count += 1
                 task.started_at = None
+                task.completed_at = None
                 task.error_message = None
 
-                # Exponential backoff
+                # Exponential backoff; the slot is freed while the task waits
                 delay = min(2**task.retry_count, 60)  # Max 60 seconds
-                await asyncio.sleep(delay)
-
-                # Re-queue task
-                await self._task_queue.put((task.priority.value, task.task_id))
+                asyncio.get_running_loop().call_later(delay, self._enqueue, task)
 
                 logger.info(
                     "Task retry scheduled",
@@ -344,9 +547,10 @@ class EnhancedWorkerManager:
                 )
 
         finally:
+            self.run_time_histogram.observe(time.time() - started)
             # Clean up future reference
             self.futures.pop(task.task_id, None)
 
 
 # Global enhanced worker manager instance
-enhanced_worker_manager = EnhancedWorkerManager()
+enhanced_worker_manager = EnhancedWorkerManager(**get_settings().worker_manager.model_dump())
@@ -1,6 +1,8 @@
 import csv
+import io
 import json
 import logging
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -110,31 +112,11 @@ class ExportService:
         all_findings = []
 
         for report in reports_data:
-            # Basic report info
-            report_summary = {
-                "document_name": report.get("document_name", "Unknown"),
-                "analysis_date": report.get("analysis_date", ""),
-                "document_type": report.get("document_type", "Unknown"),
-                "compliance_score": report.get("compliance_score", 0),
-                "total_findings": len(report.get("findings", [])),
-            }
-            reports_summary.append(report_summary)
+            reports_summary.append(self._report_summary(report))
 
             # Detailed findings if requested
             if include_findings:
-                findings = report.get("findings", [])
-                for finding in findings:
-                    finding_data = {
-                        "document_name": report.get("document_name", "Unknown"),
-                        "analysis_date": report.get("analysis_date", ""),
-                        "rule_id": finding.get("rule_id", "Unknown"),
-                        "risk_level": finding.get("risk", "Unknown"),
-                        "problematic_text": finding.get("problematic_text", "")[
-                            :200
-                        ],  # Truncate long text
-                        "recommendation": finding.get("personalized_tip", "")[:200],
-                    }
-                    all_findings.append(finding_data)
+                all_findings.extend(self._finding_rows(report))
 
         return {
             "metadata": {
@@ -147,6 +129,125 @@ class ExportService:
             "findings": all_findings if include_findings else [],
         }
 
+    @staticmethod
+    def _report_summary(report: dict[str, Any]) -> dict[str, Any]:
+        """Export row for one report."""
+        return {
+            "document_name": report.get("document_name", "Unknown"),
+            "analysis_date": report.get("analysis_date", ""),
+            "document_type": report.get("document_type", "Unknown"),
+            "compliance_score": report.get("compliance_score", 0),
+            "total_findings": report.get(
+                "total_findings", len(report.get("findings", []))
+            ),
+        }
+
+    @staticmethod
+    def _finding_rows(report: dict[str, Any]) -> list[dict[str, Any]]:
+        """Export rows for the findings of one report."""
+        return [
+            {
+                "document_name": report.get("document_name", "Unknown"),
+                "analysis_date": report.get("analysis_date", ""),
+                "rule_id": finding.get("rule_id", "Unknown"),
+                "risk_level": finding.get("risk", "Unknown"),
+                "problematic_text": (finding.get("problematic_text") or "")[
+                    :200
+                ],  # Truncate long text
+                "recommendation": (finding.get("personalized_tip") or "")[:200],
+            }
+            for finding in report.get("findings", [])
+        ]
+
+    async def stream_compliance_data(
+        self,
+        reports: AsyncIterable[dict[str, Any]],
+        format_type: str,
+        include_findings: bool = True,
+    ) -> AsyncIterator[str]:
+        """Stream compliance data as NDJSON or CSV while reports are read.
+
+        Each report is written as soon as it arrives, so memory use does not
+        grow with the export and the first bytes go out immediately.
+
+        NDJSON starts with a ``metadata`` line, then ``report`` and
+        ``finding`` lines, and ends with a ``summary`` line holding the
+        totals. CSV has one row per finding with its report's columns, or
+        one row per report when findings are excluded or absent.
+
+        Args:
+            reports: Report dictionaries, e.g. from ``crud.iter_reports_for_export``
+            format_type: Export format (ndjson, csv)
+            include_findings: Whether to include detailed findings
+
+        Yields:
+            str: Chunks of the export file
+
+        Raises:
+            ValueError: If the format is not a streaming format or is disabled
+        """
+        format_type = format_type.lower()
+        if format_type == "ndjson" and self.enable_json:
+            chunks = self._stream_ndjson(reports, include_findings)
+        elif format_type == "csv" and self.enable_csv:
+            chunks = self._stream_csv(reports, include_findings)
+        else:
+            raise ValueError(f"Unsupported or disabled streaming format: {format_type}")
+
+        async for chunk in chunks:
+            yield chunk
+
+    async def _stream_ndjson(
+        self, reports: AsyncIterable[dict[str, Any]], include_findings: bool
+    ) -> AsyncIterator[str]:
+        def line(record_type: str, record: dict[str, Any]) -> str:
+            return json.dumps({"type": record_type, **record}, default=str) + "\n"
+
+        yield line(
+            "metadata",
+            {
+                "export_timestamp": datetime.now().isoformat(),
+                "include_findings": include_findings,
+                "export_version": "1.0",
+            },
+        )
+        total_reports = total_findings = 0
+        async for report in reports:
+            total_reports += 1
+            lines = [line("report", self._report_summary(report))]
+            if include_findings:
+                findings = self._finding_rows(report)
+                total_findings += len(findings)
+                lines.extend(line("finding", finding) for finding in findings)
+            yield "".join(lines)
+        yield line(
+            "summary", {"total_reports": total_reports, "total_findings": total_findings}
+        )
+
+    async def _stream_csv(
+        self, reports: AsyncIterable[dict[str, Any]], include_findings: bool
+    ) -> AsyncIterator[str]:
+        fieldnames = list(self._report_summary({}))
+        if include_findings:
+            fieldnames += ["rule_id", "risk_level", "problematic_text", "recommendation"]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, restval="")
+        writer.writeheader()
+
+        async for report in reports:
+            summary = self._report_summary(report)
+            findings = self._finding_rows(report) if include_findings else []
+            if findings:
+                writer.writerows({**summary, **finding} for finding in findings)
+            else:
+                writer.writerow(summary)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
     def _check_size_limit(self, data: dict[str, Any]) -> bool:
         """Check if export data is within size limits."""
         try:
@@ -1,5 +1,10 @@
+import hashlib
 import json
 import logging
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
 from typing import Any
 
 import requests
@@ -8,6 +13,17 @@ from transformers import pipeline
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this to was were with".split()
+)
+# Rough prompt-size accounting for the llm backend, in tokens.
+_CHARS_PER_TOKEN = 4
+_LLM_PROMPT_OVERHEAD_TOKENS = 64  # instructions plus the fixed answer allowance
+_LLM_PAIR_OVERHEAD_TOKENS = 16  # numbering, labels and one answer line per pair
+_HYPOTHESIS_RESERVE_CHARS = 400
+
 
 class FactCheckerService:
     """Check factual consistency using either a small NLI model or the main LLM.
@@ -22,11 +38,35 @@ class FactCheckerService:
         model_name: str = "google/flan-t5-small",
         llm_service: Any | None = None,
         backend: str = "pipeline",
+        premise_window_chars: int = 1200,
+        batch_size: int = 8,
+        cache_size: int = 1024,
+        context_length: int | None = None,
     ) -> None:
         self.model_name = model_name
         self.backend = (backend or "pipeline").lower()
         self.classifier = None
         self.llm_service = llm_service
+        if context_length is None:
+            llm_settings = getattr(llm_service, "settings", None)
+            if isinstance(llm_settings, dict):
+                context_length = llm_settings.get("context_length")
+        # Only the llm backend shares a context window with its prompt.
+        self.context_length = (
+            int(context_length) if self.backend == "llm" and context_length else None
+        )
+        if self.context_length:
+            fitting_chars = (
+                self._llm_token_budget() - _LLM_PAIR_OVERHEAD_TOKENS
+            ) * _CHARS_PER_TOKEN - _HYPOTHESIS_RESERVE_CHARS
+            premise_window_chars = max(
+                _CHARS_PER_TOKEN, min(premise_window_chars, fitting_chars)
+            )
+        self.premise_window_chars = premise_window_chars
+        self.batch_size = max(1, batch_size)
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], bool] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def load_model(self) -> None:
         """Lazy-load the NLI model when using the pipeline backend."""
@@ -53,7 +93,117 @@ class FactCheckerService:
         """Checks if the hypothesis is supported by the premise.
         Returns True if the hypothesis is consistent, False otherwise.
         """
-        # Ensure backend is ready
+        return self.check_consistency_batch(premise, [hypothesis])[0]
+
+    def check_consistency_batch(self, premise: str, hypotheses: list[str]) -> list[bool]:
+        """Check many hypotheses against one premise with as few model calls as possible.
+
+        Long premises are narrowed to a window of the sentences most relevant to
+        each hypothesis, results are cached by (premise window hash, hypothesis),
+        and the remaining checks are sent to the backend in batches of up to
+        ``batch_size`` (fewer when the llm prompt would overflow
+        ``context_length``). Every check fails open (True) when the backend is
+        unavailable or errors. LLM answers that cannot be parsed are retried
+        one pair at a time and, if still unreadable, reported as unsupported
+        (False) without being cached.
+
+        Args:
+            premise: Source text the hypotheses are checked against.
+            hypotheses: Statements to verify, e.g. finding titles.
+
+        Returns:
+            One boolean per hypothesis, in input order.
+
+        """
+        results: list[bool | None] = [None] * len(hypotheses)
+        pending: list[tuple[int, tuple[str, str], str, str]] = []
+        for index, hypothesis in enumerate(hypotheses):
+            window = self._select_premise_window(premise, hypothesis)
+            key = (hashlib.sha256(window.encode("utf-8")).hexdigest(), hypothesis)
+            with self._cache_lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, key, window, hypothesis))
+
+        if pending and not self._ensure_backend_ready():
+            return [True if result is None else result for result in results]
+
+        for batch in self._iter_batches(pending):
+            pairs = [(window, hypothesis) for _, _, window, hypothesis in batch]
+            try:
+                if self.backend == "llm" and self.llm_service is not None:
+                    verdicts = self._check_batch_with_llm(pairs)
+                    unparsed = [i for i, verdict in enumerate(verdicts) if verdict is None]
+                    if unparsed and len(pairs) > 1:
+                        logger.warning(
+                            "Fact checker could not parse %d of %d batched verdicts; "
+                            "retrying them one at a time",
+                            len(unparsed),
+                            len(pairs),
+                        )
+                        for i in unparsed:
+                            verdicts[i] = self._check_batch_with_llm([pairs[i]])[0]
+                    for i, verdict in enumerate(verdicts):
+                        if verdict is None:
+                            logger.warning(
+                                "Fact checker gave no readable verdict for %r; "
+                                "treating it as unsupported",
+                                pairs[i][1],
+                            )
+                            results[batch[i][0]] = False
+                else:
+                    verdicts = self._check_batch_with_pipeline(pairs)
+            except (json.JSONDecodeError, ValueError, KeyError) as e:
+                logger.exception("Error during fact-checking: %s", e)
+                verdicts = [None] * len(batch)  # Fail open, do not cache
+
+            for (index, key, _, _), verdict in zip(batch, verdicts, strict=True):
+                if verdict is None:
+                    if results[index] is None:
+                        results[index] = True
+                    continue
+                results[index] = verdict
+                self._remember(key, verdict)
+
+        return [True if result is None else result for result in results]
+
+    def _llm_token_budget(self) -> int:
+        """Tokens left for premise/hypothesis pairs in one llm prompt."""
+        return max(0, (self.context_length or 0) - _LLM_PROMPT_OVERHEAD_TOKENS)
+
+    def _iter_batches(self, pending: list) -> Iterator[list]:
+        """Yield runs of ``pending`` checks that fit one backend call.
+
+        Batches hold at most ``batch_size`` checks; with a known llm
+        ``context_length`` a batch is also closed before its estimated prompt
+        would overflow it, so an oversized pair goes out on its own and uses
+        the single-pair prompt.
+        """
+        budget = self._llm_token_budget() if self.context_length else None
+        batch: list = []
+        used = 0
+        for item in pending:
+            cost = (
+                (len(item[2]) + len(item[3])) // _CHARS_PER_TOKEN
+                + _LLM_PAIR_OVERHEAD_TOKENS
+            )
+            if batch and (
+                len(batch) >= self.batch_size
+                or (budget is not None and used + cost > budget)
+            ):
+                yield batch
+                batch, used = [], 0
+            batch.append(item)
+            used += cost
+        if batch:
+            yield batch
+
+    def _ensure_backend_ready(self) -> bool:
+        """Load the backend if needed; False means checks should fail open."""
         if self.backend == "pipeline":
             if not self.is_ready():
                 self.load_model()
@@ -61,42 +211,118 @@ class FactCheckerService:
                 logger.warning(
                     "Fact-checker pipeline not available. Skipping consistency check."
                 )
-                return True  # Fail open, assuming consistency
-        else:  # llm backend
-            if not self.is_ready():
-                logger.warning("LLM backend not ready for fact checking; failing open")
-                return True
+                return False
+        elif not self.is_ready():
+            logger.warning("LLM backend not ready for fact checking; failing open")
+            return False
+        return True
 
-        try:
-            if self.backend == "llm" and self.llm_service is not None:
-                # Simple NLI-style instruction expecting yes/no
-                nli_prompt = (
-                    "You are a clinical compliance NLI checker.\n"
-                    "Decide if the hypothesis is supported by the premise.\n"
-                    "Answer strictly with 'YES' or 'NO'.\n\n"
-                    f"Premise: {premise}\n"
-                    f"Hypothesis: {hypothesis}\n"
-                    "Answer:"
-                )
-                raw = self.llm_service.generate(nli_prompt, max_new_tokens=8, temperature=0.0)
-                text = (raw or "").strip().lower()
-                return text.startswith("yes")
-            else:
-                # Pipeline backend (e.g., flan-t5-small)
-                prompt = (
-                    f"Premise: {premise}\nHypothesis: {hypothesis}\n"
-                    "Is the hypothesis supported by the premise?"
-                )
-                if self.classifier is None:
-                    logger.error("Classifier is not loaded")
-                    return True  # Fail open
-                result = self.classifier(prompt, max_length=50)
-                answer = (result[0].get("generated_text", "")).lower()
-                return "yes" in answer or "supported" in answer
-
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            logger.exception("Error during fact-checking: %s", e)
-            return True  # Fail open
+    def _select_premise_window(self, premise: str, hypothesis: str) -> str:
+        """Return the part of ``premise`` most relevant to ``hypothesis``.
+
+        Premises shorter than ``premise_window_chars`` are used unchanged.
+        Otherwise sentences are ranked by word overlap with the hypothesis and
+        the best ones (with their neighbours) are kept, in document order,
+        until the window is full.
+        """
+        premise = premise or ""
+        if len(premise) <= self.premise_window_chars:
+            return premise
+
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(premise) if s.strip()]
+        hypothesis_words = set(_WORD.findall(hypothesis.lower())) - _STOPWORDS
+        scores = [
+            len(hypothesis_words & set(_WORD.findall(sentence.lower())))
+            for sentence in sentences
+        ]
+        if not any(scores):
+            return premise[: self.premise_window_chars]
+
+        selected: set[int] = set()
+        size = 0
+        for best in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            if scores[best] == 0:
+                break
+            for index in (best, best - 1, best + 1):
+                if index in selected or not 0 <= index < len(sentences):
+                    continue
+                if size + len(sentences[index]) + 1 > self.premise_window_chars:
+                    continue
+                selected.add(index)
+                size += len(sentences[index]) + 1
+            if size >= self.premise_window_chars:
+                break
+        if not selected:
+            return sentences[max(range(len(sentences)), key=scores.__getitem__)][
+                : self.premise_window_chars
+            ]
+        return " ".join(sentences[index] for index in sorted(selected))
+
+    def _remember(self, key: tuple[str, str], verdict: bool) -> None:
+        with self._cache_lock:
+            self._cache[key] = verdict
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _check_batch_with_pipeline(self, pairs: list[tuple[str, str]]) -> list[bool | None]:
+        """Run one pipeline call over all (premise, hypothesis) pairs."""
+        if self.classifier is None:
+            logger.error("Classifier is not loaded")
+            return [None] * len(pairs)
+        prompts = [
+            f"Premise: {premise}\nHypothesis: {hypothesis}\n"
+            "Is the hypothesis supported by the premise?"
+            for premise, hypothesis in pairs
+        ]
+        outputs = self.classifier(prompts, max_length=50, batch_size=len(prompts))
+        verdicts: list[bool | None] = []
+        for output in outputs:
+            if isinstance(output, list):
+                output = output[0] if output else {}
+            answer = output.get("generated_text", "").lower()
+            verdicts.append("yes" in answer or "supported" in answer)
+        return verdicts
+
+    def _check_batch_with_llm(self, pairs: list[tuple[str, str]]) -> list[bool | None]:
+        """Ask the LLM for one YES/NO verdict per numbered pair in a single generate.
+
+        Pairs whose answer cannot be read come back as None.
+        """
+        if len(pairs) == 1:
+            premise, hypothesis = pairs[0]
+            nli_prompt = (
+                "You are a clinical compliance NLI checker.\n"
+                "Decide if the hypothesis is supported by the premise.\n"
+                "Answer strictly with 'YES' or 'NO'.\n\n"
+                f"Premise: {premise}\n"
+                f"Hypothesis: {hypothesis}\n"
+                "Answer:"
+            )
+            raw = self.llm_service.generate(nli_prompt, max_new_tokens=8, temperature=0.0)
+            answer = re.match(r"(yes|no)\b", (raw or "").strip().lower())
+            return [answer.group(1) == "yes" if answer else None]
+
+        items = "\n\n".join(
+            f"{number}. Premise: {premise}\n{number}. Hypothesis: {hypothesis}"
+            for number, (premise, hypothesis) in enumerate(pairs, start=1)
+        )
+        nli_prompt = (
+            "You are a clinical compliance NLI checker.\n"
+            "For each numbered item, decide if the hypothesis is supported by its premise.\n"
+            "Answer with one line per item in the form '<number>: YES' or '<number>: NO'.\n\n"
+            f"{items}\n\n"
+            "Answers:"
+        )
+        raw = self.llm_service.generate(
+            nli_prompt, max_new_tokens=6 * len(pairs) + 8, temperature=0.0
+        )
+        verdicts: list[bool | None] = [None] * len(pairs)
+        for number, answer in re.findall(r"(\d+)\s*[:.)-]\s*(yes|no)", (raw or "").lower()):
+            index = int(number) - 1
+            if 0 <= index < len(pairs) and verdicts[index] is None:
+                verdicts[index] = answer == "yes"
+        return verdicts
 
     def is_finding_plausible(self, finding: dict, rule: dict) -> bool:
         """Check if a finding is plausible given the associated rule.
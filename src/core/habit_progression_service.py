@@ -331,9 +331,7 @@ class HabitProgressionService:
     async def _get_user_analysis_count(self, db: AsyncSession, user_id: int) -> int:
         """Get total analysis count for user."""
         try:
-            # Use existing function to count user reports
-            reports = await crud.get_reports(db)
-            return len(reports)
+            return await crud.count_reports(db)
         except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
             logger.exception("Error getting user analysis count: %s", e)
             return 0
@@ -24,7 +24,7 @@ except Exception:  # pragma: no cover - environment dependent
 
 from src.config import get_settings
 
-from .cache_service import cache_service
+from .cache_service import CACHE_DIR, QueryEmbeddingCache
 from .query_expander import QueryExpander
 
 try:  # pragma: no cover - optional dependency during tests
@@ -97,6 +97,22 @@ class HybridRetriever:
                 )
                 self.use_reranker = False
 
+        # Query embeddings are cached per dense model; persisted unless in mock mode
+        embedding_db = (
+            CACHE_DIR / "query_embeddings.sqlite3"
+            if getattr(settings.retrieval, "persist_query_embeddings", False)
+            and not getattr(settings, "use_ai_mocks", False)
+            else None
+        )
+        self.query_embedding_cache = QueryEmbeddingCache(
+            dense_model_name,
+            max_entries=getattr(settings.retrieval, "query_embedding_cache_size", 4096),
+            db_path=embedding_db,
+            disk_max_entries=getattr(
+                settings.retrieval, "query_embedding_disk_max_entries", 100000
+            ),
+        )
+
         # Initialize query expander
         self.query_expander = query_expander or QueryExpander()
 
@@ -116,12 +132,13 @@ class HybridRetriever:
             else None
         )
 
-    @cache_service.disk_cache
     def _get_embedding(self, text: str):
         if self.dense_retriever is None:
             # Fallback: zero vector; caller handles low scores
             return np.zeros(768, dtype=np.float32)
-        return self.dense_retriever.encode(text, convert_to_tensor=True)
+        return self.query_embedding_cache.get_or_compute(
+            text, lambda query: self.dense_retriever.encode(query, convert_to_numpy=True)
+        )
 
     async def initialize(self) -> None:
         if self.rules:
@@ -0,0 +1,187 @@
+"""Run blocking model inference off the asyncio event loop.
+
+Model calls (LLM generation, NER, PHI scrubbing, NLI fact-checking) are
+CPU-bound and synchronous. Calling them directly from a coroutine stalls
+every other request on the worker, including health probes and WebSocket
+pings. :class:`InferenceExecutor` gives each model its own bounded thread
+pool so the event loop stays free and a single model can never be driven
+by more concurrent callers than it was configured for. Pools are keyed by
+the model that actually executes the call: a stage that delegates to another
+model (the fact checker's ``llm`` backend, the NLG tips) submits under that
+model's name so it shares its concurrency limit.
+
+Work submitted while an analysis task is running is tagged with that task's
+id (see :data:`current_task_id`), so cancelling the task also drops any of
+its inference calls that are still waiting in a queue.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import inspect
+import logging
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from src.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Set by the analysis task registry for the lifetime of each analysis task.
+current_task_id: ContextVar[str | None] = ContextVar(
+    "inference_task_id", default=None
+)
+
+
+class InferenceExecutor:
+    """Per-model bounded thread pools with queue-depth metrics.
+
+    Args:
+        model_concurrency: Maximum concurrent calls per model name
+        default_concurrency: Limit for models without an explicit entry
+
+    """
+
+    def __init__(
+        self,
+        model_concurrency: dict[str, int] | None = None,
+        default_concurrency: int = 1,
+    ) -> None:
+        self.model_concurrency = dict(model_concurrency or {})
+        self.default_concurrency = max(1, default_concurrency)
+        self._pools: dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+        self._task_futures: dict[str, set[concurrent.futures.Future]] = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self, model: str) -> concurrent.futures.ThreadPoolExecutor:
+        """Return the pool for ``model``, creating it on first use (lock held)."""
+        pool = self._pools.get(model)
+        if pool is None:
+            limit = max(1, self.model_concurrency.get(model, self.default_concurrency))
+            pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=limit, thread_name_prefix=f"inference-{model}"
+            )
+            self._pools[model] = pool
+            self._stats[model] = {
+                "limit": limit,
+                "queued": 0,
+                "running": 0,
+                "completed": 0,
+                "failed": 0,
+                "cancelled": 0,
+            }
+        return pool
+
+    async def run(self, model: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` on the pool for ``model`` and await it.
+
+        Coroutine functions are awaited directly since they already yield to
+        the loop. If the awaiting coroutine is cancelled before the call has
+        started, the queued call is cancelled too.
+        """
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+
+        task_id = current_task_id.get()
+        stats_lock = self._lock
+
+        with stats_lock:
+            pool = self._get_pool(model)
+            stats = self._stats[model]
+            stats["queued"] += 1
+
+        def _call() -> Any:
+            with stats_lock:
+                stats["queued"] -= 1
+                stats["running"] += 1
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                with stats_lock:
+                    stats["failed"] += 1
+                raise
+            else:
+                with stats_lock:
+                    stats["completed"] += 1
+                return result
+            finally:
+                with stats_lock:
+                    stats["running"] -= 1
+
+        future = pool.submit(_call)
+
+        def _on_done(done: concurrent.futures.Future) -> None:
+            with stats_lock:
+                if done.cancelled():
+                    # Cancelled while still queued, so _call never ran.
+                    stats["queued"] -= 1
+                    stats["cancelled"] += 1
+                if task_id is not None:
+                    futures = self._task_futures.get(task_id)
+                    if futures is not None:
+                        futures.discard(done)
+                        if not futures:
+                            self._task_futures.pop(task_id, None)
+
+        if task_id is not None:
+            with stats_lock:
+                self._task_futures.setdefault(task_id, set()).add(future)
+        future.add_done_callback(_on_done)
+
+        result = await asyncio.wrap_future(future)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def cancel_task(self, task_id: str) -> int:
+        """Cancel queued inference calls submitted by ``task_id``.
+
+        Calls that are already running cannot be interrupted; their results
+        are discarded once the cancelled task stops awaiting them.
+
+        Returns:
+            The number of queued calls that were cancelled.
+
+        """
+        with self._lock:
+            futures = list(self._task_futures.get(task_id, ()))
+        cancelled = sum(1 for future in futures if future.cancel())
+        if cancelled:
+            logger.info(
+                "Cancelled %d queued inference calls for task %s", cancelled, task_id
+            )
+        return cancelled
+
+    def get_metrics(self) -> dict[str, dict[str, int]]:
+        """Return a snapshot of per-model limits, queue depth and counters."""
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._stats.items()}
+
+    def shutdown(self) -> None:
+        """Stop all pools, dropping calls that have not started yet."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_inference_executor: InferenceExecutor | None = None
+_inference_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Return the shared inference executor, creating it on first use."""
+    global _inference_executor
+    with _inference_executor_lock:
+        if _inference_executor is None:
+            inference_settings = get_settings().inference
+            _inference_executor = InferenceExecutor(
+                model_concurrency=inference_settings.model_concurrency,
+                default_concurrency=inference_settings.default_concurrency,
+            )
+            atexit.register(_inference_executor.shutdown)
+        return _inference_executor
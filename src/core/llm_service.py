@@ -279,6 +279,26 @@ class LLMService:
             self.backend == "ctransformers" or self.tokenizer is not None
         )
 
+    def _cache_model_identifier(self) -> str:
+        """Identify the loaded weights and load-time settings that shape output.
+
+        Per-call generation params are keyed separately, so this covers what
+        they do not: which model file is loaded and how the prompt is fit to
+        its context window.
+        """
+        return "_".join(
+            str(part)
+            for part in (
+                self.model_repo_id,
+                self.model_filename,
+                self.revision,
+                self.local_model_path,
+                self.backend,
+                self.settings.get("hf_model_type"),
+                self.settings.get("context_length"),
+            )
+        )
+
     def generate(self, prompt: str, **kwargs) -> str:
         if not self.is_ready():
             logger.error(
@@ -286,16 +306,21 @@ class LLMService:
             )
             return "Error: LLM service is not available."
 
-        # Check cache first for performance optimization
-        model_identifier = f"{self.model_repo_id}_{self.backend}"
-        cached_response = LLMResponseCache.get_llm_response(model_identifier, prompt)
+        gen_params = dict(self.settings.get("generation_params", {}))
+        gen_params.update(kwargs)
+
+        # Check cache first; the key covers the generation params so calls that
+        # differ only in e.g. max_new_tokens do not share a response.
+        model_identifier = self._cache_model_identifier()
+        cache_params = dict(gen_params)
+        cached_response = LLMResponseCache.get_llm_response(
+            model_identifier, prompt, cache_params
+        )
         if cached_response is not None:
             logger.debug("Cache hit for LLM response (model: %s)", model_identifier)
             return cached_response
 
         start_time = time.time()
-        gen_params = dict(self.settings.get("generation_params", {}))
-        gen_params.update(kwargs)
 
         max_new_tokens = int(
             gen_params.pop("max_new_tokens", 256)
@@ -339,7 +364,7 @@ class LLMService:
                     6.0 if generation_time > 5.0 else 12.0
                 )  # Longer TTL for quick responses
                 LLMResponseCache.set_llm_response(
-                    model_identifier, prompt, result, ttl_hours
+                    model_identifier, prompt, result, ttl_hours, cache_params
                 )
 
                 logger.debug(
@@ -368,7 +393,7 @@ class LLMService:
                 generation_time = time.time() - start_time
                 ttl_hours = 6.0 if generation_time > 5.0 else 12.0
                 LLMResponseCache.set_llm_response(
-                    model_identifier, prompt, result, ttl_hours
+                    model_identifier, prompt, result, ttl_hours, cache_params
                 )
                 logger.debug(
                     "LLM generation completed in %ss, cached with TTL {ttl_hours}h",
@@ -466,7 +491,7 @@ class LLMService:
                 6.0 if generation_time > 5.0 else 12.0
             )  # Longer TTL for quick responses
             LLMResponseCache.set_llm_response(
-                model_identifier, prompt, result, ttl_hours
+                model_identifier, prompt, result, ttl_hours, cache_params
             )
 
             logger.debug(
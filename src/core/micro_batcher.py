@@ -0,0 +1,78 @@
+"""Coalesce concurrent single-item model calls into batched calls.
+
+Callers ``await batcher.submit(item)`` as if they were making their own
+call. Items submitted within ``max_wait`` seconds of each other (up to
+``max_batch`` of them) are handed to ``batch_fn`` together, and each caller
+receives its own element of the returned list. Used by batch analysis so
+concurrently analyzed documents share one NER forward pass.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects items for up to ``max_wait`` seconds and processes them together.
+
+    Args:
+        batch_fn: Coroutine function mapping a list of items to a list of
+            results in the same order
+        max_batch: Largest number of items in one call
+        max_wait: Seconds the first item of a batch waits for company
+
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch: int = 16,
+        max_wait: float = 0.02,
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.stats = {"items": 0, "batches": 0}
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` for the next batch and return its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.create_task(self._run(batch))
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        self.stats["items"] += len(batch)
+        self.stats["batches"] += 1
+        try:
+            results = await self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch function returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as exc:
+            logger.warning("Batched call of %d items failed: %s", len(batch), exc)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
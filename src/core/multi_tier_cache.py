@@ -4,20 +4,32 @@ This module implements a sophisticated multi-tier caching system with
 intelligent eviction policies, cache warming, and performance optimization.
 
 Features:
-- Multi-tier caching (L1: Memory, L2: Redis, L3: Database)
+- Multi-tier caching (L1: process memory, L2: host-shared memory, L3: disk)
 - Intelligent eviction policies (LRU, LFU, TTL-based)
 - Cache warming and preloading
 - Cache analytics and monitoring
 - Distributed caching support
 - Cache invalidation strategies
+
+L2 is a SQLite database on ``/dev/shm`` (RAM-backed and visible to every
+uvicorn worker on the host), so a result computed by one worker is reused by
+its siblings. L3 is a compressed SQLite store under the cache directory that
+survives restarts. ``set`` writes to L1 and the first enabled lower tier;
+hits in a lower tier are promoted upwards and entries that overflow L2 are
+demoted to L3.
 """
 
 import asyncio
 import hashlib
-import json
 import logging
+import os
 import pickle
+import sqlite3
+import stat
+import sys
+import tempfile
 import time
+import zlib
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -25,6 +37,9 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
 import threading
 from collections import OrderedDict, defaultdict
+from itertools import islice
+
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +55,7 @@ class EvictionPolicy(Enum):
     """Cache eviction policies."""
     LRU = "lru"  # Least Recently Used
     LFU = "lfu"  # Least Frequently Used
+    TINY_LFU = "tiny_lfu"  # LRU eviction with frequency-sketch admission
     TTL = "ttl"  # Time To Live
     SIZE_BASED = "size_based"  # Size-based eviction
 
@@ -78,6 +94,359 @@ class CacheMetrics:
     hit_rate: float = 0.0
     average_access_time_ms: float = 0.0
     tier_distribution: Dict[str, int] = field(default_factory=dict)
+    evictions_by_tier: Dict[str, int] = field(default_factory=dict)
+    eviction_time_ms: float = 0.0
+    admission_rejections: int = 0
+
+
+# Containers are sized by measuring this many items per level and
+# extrapolating, down to this depth; deeper values use sys.getsizeof.
+SIZE_SAMPLE = 16
+SIZE_DEPTH = 3
+
+
+def estimate_size(value: Any, depth: int = SIZE_DEPTH) -> int:
+    """Estimate the footprint of ``value`` in bytes without serializing it."""
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if depth > 0:
+        if isinstance(value, dict):
+            count = len(value)
+            if not count:
+                return 64
+            measured = sum(
+                estimate_size(k, depth - 1) + estimate_size(v, depth - 1)
+                for k, v in islice(value.items(), SIZE_SAMPLE)
+            )
+            return 64 + measured * count // min(count, SIZE_SAMPLE)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            count = len(value)
+            if not count:
+                return 56
+            measured = sum(estimate_size(v, depth - 1) for v in islice(value, SIZE_SAMPLE))
+            return 56 + measured * count // min(count, SIZE_SAMPLE)
+    try:
+        return sys.getsizeof(value)
+    except Exception:
+        return 1024  # Default size
+
+
+class LFUIndex:
+    """Least-frequently-used bookkeeping with O(1) touch and victim lookup.
+
+    Keys are kept in per-frequency buckets (insertion ordered, so ties are
+    broken by recency) and the lowest non-empty frequency is tracked.
+    """
+
+    def __init__(self):
+        self._frequency: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = defaultdict(OrderedDict)
+        self._min_frequency = 0
+
+    def __len__(self) -> int:
+        return len(self._frequency)
+
+    def add(self, key: str):
+        self.discard(key)
+        self._frequency[key] = 1
+        self._buckets[1][key] = None
+        self._min_frequency = 1
+
+    def touch(self, key: str):
+        frequency = self._frequency.get(key)
+        if frequency is None:
+            return
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[key] = frequency + 1
+        self._buckets[frequency + 1][key] = None
+
+    def discard(self, key: str):
+        frequency = self._frequency.pop(key, None)
+        if frequency is None:
+            return
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+    def victim(self) -> Optional[str]:
+        if not self._frequency:
+            return None
+        if self._min_frequency not in self._buckets:
+            # Only after removing the last key of the lowest bucket; this is a
+            # scan over distinct frequencies, not over keys.
+            self._min_frequency = min(self._buckets)
+        return next(iter(self._buckets[self._min_frequency]))
+
+    def clear(self):
+        self._frequency.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+
+
+class FrequencySketch:
+    """Count-min sketch of recent access frequency (the TinyLFU filter).
+
+    Four 4-bit counters per key in one table; all counters are halved after
+    ``10 * capacity`` increments so old popularity fades.
+    """
+
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x85EBCA77C2B2AE63)
+
+    def __init__(self, capacity: int):
+        width = 1 << max(4, (2 * capacity - 1).bit_length())
+        self._mask = width - 1
+        self._table = [0] * width
+        self._additions = 0
+        self._sample_size = 10 * capacity
+
+    def _indexes(self, key: str) -> List[int]:
+        h = hash(key)
+        return [((h * seed) >> 17) & self._mask for seed in self.SEEDS]
+
+    def increment(self, key: str):
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < 15:
+                table[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = [count >> 1 for count in table]
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+
+class SQLiteTierStore:
+    """A lower cache tier kept in a SQLite database.
+
+    Values are pickled (and zlib-compressed when ``compression_level`` is
+    set) and stored with their expiry time and tags. Every process that opens
+    the same file shares the tier. ``path=None`` keeps the tier in memory for
+    this process only.
+    """
+
+    PRUNE_EVERY = 64
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]],
+        max_entries: int,
+        compression_level: Optional[int] = None,
+    ):
+        self.path = Path(path) if path else None
+        self.max_entries = max(1, max_entries)
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self._writes = 0
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._conn = sqlite3.connect(
+            str(self.path) if self.path else ":memory:",
+            check_same_thread=False,
+            timeout=5.0,
+            isolation_level=None,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                compressed INTEGER NOT NULL,
+                tags TEXT NOT NULL DEFAULT '',
+                expires_at REAL,
+                size_bytes INTEGER NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_accessed ON cache_entries(last_accessed)"
+        )
+
+    def encode(self, value: Any) -> Tuple[bytes, bool]:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.compression_level:
+            return zlib.compress(payload, self.compression_level), True
+        return payload, False
+
+    @staticmethod
+    def decode(payload: bytes, compressed: bool) -> Any:
+        return pickle.loads(zlib.decompress(payload) if compressed else payload)
+
+    def get(self, key: str) -> Optional[Tuple[Any, Optional[float], List[str]]]:
+        """Return ``(value, expires_at, tags)`` for a live entry, else None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, compressed, tags, expires_at, last_accessed "
+                "FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload, compressed, tags, expires_at, last_accessed = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                return None
+            if now - last_accessed > 60:
+                # Coarse recency is enough to pick demotion victims.
+                self._conn.execute(
+                    "UPDATE cache_entries SET last_accessed = ? WHERE key = ?", (now, key)
+                )
+        return self.decode(payload, bool(compressed)), expires_at, _split_tags(tags)
+
+    def set(
+        self, key: str, value: Any, expires_at: Optional[float], tags: List[str]
+    ) -> List[tuple]:
+        """Store ``value``; returns rows pushed out by the size limit."""
+        payload, compressed = self.encode(value)
+        return self.set_encoded(key, payload, compressed, expires_at, tags)
+
+    def set_encoded(
+        self,
+        key: str,
+        payload: bytes,
+        compressed: bool,
+        expires_at: Optional[float],
+        tags: List[str],
+    ) -> List[tuple]:
+        if self.compression_level and not compressed:
+            payload, compressed = zlib.compress(payload, self.compression_level), True
+        elif compressed and not self.compression_level:
+            payload, compressed = zlib.decompress(payload), False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, value, compressed, tags, expires_at, size_bytes, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    payload,
+                    int(compressed),
+                    _join_tags(tags),
+                    expires_at,
+                    len(payload),
+                    time.time(),
+                ),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY:
+                return []
+            return self._evict_overflow()
+
+    def _evict_overflow(self) -> List[tuple]:
+        """Remove the least recently used rows above ``max_entries`` (lock held)."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return []
+        # Trim a little below the limit so pruning does not run on every write.
+        excess += self.max_entries // 10
+        rows = self._conn.execute(
+            "SELECT key, value, compressed, tags, expires_at FROM cache_entries "
+            "ORDER BY last_accessed LIMIT ?",
+            (excess,),
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE key = ?", [(row[0],) for row in rows]
+        )
+        now = time.time()
+        return [row for row in rows if row[4] is None or row[4] > now]
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+
+    def delete_by_tags(self, tags: List[str]) -> List[str]:
+        """Delete entries carrying any of ``tags`` and return their keys."""
+        keys: List[str] = []
+        with self._lock:
+            for tag in tags:
+                pattern = f"%|{tag}|%"
+                keys.extend(
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT key FROM cache_entries WHERE tags LIKE ?", (pattern,)
+                    )
+                )
+                self._conn.execute("DELETE FROM cache_entries WHERE tags LIKE ?", (pattern,))
+        return keys
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            return cursor.rowcount
+
+    def clear(self) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM cache_entries").rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM cache_entries"
+            ).fetchone()
+        return {"entries": count, "size_bytes": size}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _join_tags(tags: List[str]) -> str:
+    return f"|{'|'.join(tags)}|" if tags else ""
+
+
+def _split_tags(tags: str) -> List[str]:
+    return [tag for tag in tags.split("|") if tag]
+
+
+def _default_l2_path() -> Optional[Path]:
+    """Per-user file on RAM-backed /dev/shm, or the temp dir without it.
+
+    The directory name is predictable, so another user could create it first
+    and plant entries that the tier would unpickle. It is only used when it
+    is a real directory owned by this user with mode 0700; otherwise ``None``
+    is returned and L2 stays in this process's memory.
+    """
+    base = Path("/dev/shm") if os.path.isdir("/dev/shm") else Path(tempfile.gettempdir())
+    if not hasattr(os, "getuid"):
+        return base / "compliance-cache-user" / "l2.sqlite3"
+    directory = base / f"compliance-cache-{os.getuid()}"
+    try:
+        directory.mkdir(mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+    except OSError as e:
+        logger.warning("Cannot create L2 cache directory %s: %s", directory, e)
+        return None
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) != 0o700
+    ):
+        logger.warning(
+            "L2 cache directory %s is not a private directory owned by this "
+            "user; keeping L2 in memory",
+            directory,
+        )
+        return None
+    return directory / "l2.sqlite3"
 
 
 class MultiTierCacheSystem:
@@ -89,37 +458,63 @@ class MultiTierCacheSystem:
     def __init__(
         self,
         l1_size_mb: int = 100,
-        l2_enabled: bool = False,
-        l3_enabled: bool = True,
+        l2_enabled: Optional[bool] = None,
+        l3_enabled: Optional[bool] = None,
         default_ttl: int = 3600,
-        eviction_policy: EvictionPolicy = EvictionPolicy.LRU
+        eviction_policy: EvictionPolicy = EvictionPolicy.LRU,
+        l2_path: Optional[Union[str, Path]] = None,
+        l3_path: Optional[Union[str, Path]] = None,
     ):
         """Initialize the multi-tier cache system.
 
         Args:
             l1_size_mb: L1 cache size in MB
-            l2_enabled: Whether to enable L2 (Redis) cache
-            l3_enabled: Whether to enable L3 (Database) cache
+            l2_enabled: Whether to enable the host-shared L2 cache
+                (defaults to ``multi_tier_cache.l2_enabled``)
+            l3_enabled: Whether to enable the on-disk L3 cache
+                (defaults to ``multi_tier_cache.l3_enabled``)
             default_ttl: Default TTL in seconds
             eviction_policy: Cache eviction policy
+            l2_path: SQLite file backing L2 (defaults to /dev/shm)
+            l3_path: SQLite file backing L3 (defaults to the cache directory)
         """
+        settings = get_settings()
+        tier_settings = settings.multi_tier_cache
         self.l1_size_bytes = l1_size_mb * 1024 * 1024
-        self.l2_enabled = l2_enabled
-        self.l3_enabled = l3_enabled
+        self.l2_enabled = tier_settings.l2_enabled if l2_enabled is None else l2_enabled
+        self.l3_enabled = tier_settings.l3_enabled if l3_enabled is None else l3_enabled
         self.default_ttl = timedelta(seconds=default_ttl)
         self.eviction_policy = eviction_policy
 
         # L1 Cache (Memory)
         self.l1_cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self.l1_lock = threading.RLock()
-
-        # L2 Cache (Redis) - placeholder for future implementation
-        self.l2_cache = None
-        self.l2_lock = threading.RLock()
-
-        # L3 Cache (Database) - placeholder for future implementation
-        self.l3_cache = None
-        self.l3_lock = threading.RLock()
+        self.l1_size_used = 0
+        self._lfu = LFUIndex() if eviction_policy == EvictionPolicy.LFU else None
+        self._sketch: Optional[FrequencySketch] = None
+
+        # Lower tiers are kept in memory only in mock mode, unless a path is given.
+        persist = not settings.use_ai_mocks
+
+        # L2 Cache (shared by the worker processes on this host)
+        self.l2_cache: Optional[SQLiteTierStore] = None
+        if self.l2_enabled:
+            if l2_path is None and persist:
+                l2_path = (
+                    Path(tier_settings.l2_dir) / "l2.sqlite3"
+                    if tier_settings.l2_dir
+                    else _default_l2_path()
+                )
+            self.l2_cache = SQLiteTierStore(l2_path, tier_settings.l2_max_entries)
+
+        # L3 Cache (compressed, on disk)
+        self.l3_cache: Optional[SQLiteTierStore] = None
+        if self.l3_enabled:
+            if l3_path is None and persist:
+                l3_path = Path(settings.paths.cache_dir) / tier_settings.l3_filename
+            self.l3_cache = SQLiteTierStore(
+                l3_path, tier_settings.l3_max_entries, tier_settings.compression_level
+            )
 
         # Cache metrics
         self.metrics = CacheMetrics()
@@ -130,24 +525,28 @@ class MultiTierCacheSystem:
         self.warming_lock = threading.RLock()
 
         # Cache tags for invalidation
-        self.tag_index: Dict[str, List[str]] = defaultdict(list)
+        self.tag_index: Dict[str, set] = defaultdict(set)
+        self._key_tags: Dict[str, List[str]] = {}
         self.tag_lock = threading.RLock()
 
         # Configuration
         self.config = {
             'max_l1_entries': 10000,
-            'max_l2_entries': 100000,
-            'max_l3_entries': 1000000,
+            'max_l2_entries': tier_settings.l2_max_entries,
+            'max_l3_entries': tier_settings.l3_max_entries,
             'warming_batch_size': 100,
             'metrics_reset_interval': 3600,  # 1 hour
             'cleanup_interval': 300  # 5 minutes
         }
 
+        if eviction_policy == EvictionPolicy.TINY_LFU:
+            self._sketch = FrequencySketch(self.config['max_l1_entries'])
+
         # Background tasks will be started when needed
         self._background_tasks_started = False
 
         logger.info("Multi-tier cache system initialized: L1=%dMB, L2=%s, L3=%s, Policy=%s",
-                   l1_size_mb, l2_enabled, l3_enabled, eviction_policy.value)
+                   l1_size_mb, self.l2_enabled, self.l3_enabled, eviction_policy.value)
 
     async def _ensure_background_tasks_started(self):
         """Start background tasks if not already started."""
@@ -163,12 +562,13 @@ class MultiTierCacheSystem:
         try:
             # Try L1 cache first
             with self.l1_lock:
-                if key in self.l1_cache:
-                    entry = self.l1_cache[key]
-
+                if self._sketch is not None:
+                    self._sketch.increment(key)
+                entry = self.l1_cache.get(key)
+                if entry is not None:
                     # Check TTL
                     if self._is_expired(entry):
-                        del self.l1_cache[key]
+                        self._remove_from_l1(key)
                         self._remove_from_tag_index(key)
                     else:
                         # Update access info
@@ -177,29 +577,36 @@ class MultiTierCacheSystem:
 
                         # Move to end (LRU)
                         self.l1_cache.move_to_end(key)
+                        if self._lfu is not None:
+                            self._lfu.touch(key)
 
                         # Update metrics
+                        self._record_tier_hit(CacheTier.L1_MEMORY)
                         self._update_metrics(CacheOperation.GET, True, time.time() - start_time)
 
                         return entry.value
 
             # Try L2 cache
             if self.l2_enabled:
-                value = await self._get_from_l2(key)
-                if value is not None:
+                hit = await self._get_from_l2(key)
+                if hit is not None:
+                    value, expires_at, tags = hit
                     # Promote to L1
-                    await self._promote_to_l1(key, value)
+                    await self._promote_to_l1(key, value, expires_at, tags)
+                    self._record_tier_hit(CacheTier.L2_REDIS)
                     self._update_metrics(CacheOperation.GET, True, time.time() - start_time)
                     return value
 
             # Try L3 cache
             if self.l3_enabled:
-                value = await self._get_from_l3(key)
-                if value is not None:
+                hit = await self._get_from_l3(key)
+                if hit is not None:
+                    value, expires_at, tags = hit
                     # Promote to L1 and L2
-                    await self._promote_to_l1(key, value)
+                    await self._promote_to_l1(key, value, expires_at, tags)
                     if self.l2_enabled:
-                        await self._promote_to_l2(key, value)
+                        await self._promote_to_l2(key, value, expires_at, tags)
+                    self._record_tier_hit(CacheTier.L3_DATABASE)
                     self._update_metrics(CacheOperation.GET, True, time.time() - start_time)
                     return value
 
@@ -218,7 +625,8 @@ class MultiTierCacheSystem:
         value: Any,
         ttl: Optional[timedelta] = None,
         tags: Optional[List[str]] = None,
-        tier: Optional[CacheTier] = None
+        tier: Optional[CacheTier] = None,
+        size_bytes: Optional[int] = None
     ) -> bool:
         """Set value in cache.
 
@@ -227,7 +635,10 @@ class MultiTierCacheSystem:
             value: Value to cache
             ttl: Time to live
             tags: Cache tags for invalidation
-            tier: Specific tier to store in
+            tier: Specific tier to store in; by default the value goes to L1
+                and to the first enabled lower tier (L2, else L3)
+            size_bytes: Size of the value if the caller knows it; otherwise
+                it is estimated by sampling
 
         Returns:
             True if successful
@@ -239,17 +650,14 @@ class MultiTierCacheSystem:
             if tags is None:
                 tags = []
 
-            if tier is None:
-                tier = CacheTier.L1_MEMORY
-
             # Create cache entry
             entry = CacheEntry(
                 key=key,
                 value=value,
                 ttl=ttl,
-                tier=tier,
+                tier=tier or CacheTier.L1_MEMORY,
                 tags=tags,
-                size_bytes=self._calculate_size(value)
+                size_bytes=size_bytes if size_bytes is not None else self._calculate_size(value)
             )
 
             # Store in appropriate tier(s)
@@ -259,7 +667,9 @@ class MultiTierCacheSystem:
             if self.l2_enabled and (tier == CacheTier.L2_REDIS or tier is None):
                 await self._store_in_l2(entry)
 
-            if self.l3_enabled and (tier == CacheTier.L3_DATABASE or tier is None):
+            if self.l3_enabled and (
+                tier == CacheTier.L3_DATABASE or (tier is None and not self.l2_enabled)
+            ):
                 await self._store_in_l3(entry)
 
             # Update tag index
@@ -268,7 +678,7 @@ class MultiTierCacheSystem:
             # Update metrics
             self._update_metrics(CacheOperation.SET, True, 0)
 
-            logger.debug("Cached key %s in tier %s", key, tier.value)
+            logger.debug("Cached key %s in tier %s", key, tier.value if tier else "default")
             return True
 
         except Exception as e:
@@ -290,8 +700,7 @@ class MultiTierCacheSystem:
 
             # Delete from L1
             with self.l1_lock:
-                if key in self.l1_cache:
-                    del self.l1_cache[key]
+                if self._remove_from_l1(key):
                     deleted = True
 
             # Delete from L2
@@ -340,6 +749,17 @@ class MultiTierCacheSystem:
                     if await self.delete(key):
                         invalidated_count += 1
 
+            # Entries written by other processes are only known to the lower tiers.
+            for store in (self.l2_cache, self.l3_cache):
+                if store is None:
+                    continue
+                for key in await asyncio.to_thread(store.delete_by_tags, tags):
+                    if key not in keys_to_invalidate:
+                        keys_to_invalidate.add(key)
+                        invalidated_count += 1
+                        with self.l1_lock:
+                            self._remove_from_l1(key)
+
             logger.info("Invalidated %d cache entries by tags: %s", invalidated_count, tags)
             return invalidated_count
 
@@ -376,7 +796,15 @@ class MultiTierCacheSystem:
         Returns:
             Cache statistics
         """
+        l2_stats = (
+            await asyncio.to_thread(self.l2_cache.stats) if self.l2_cache is not None else {}
+        )
+        l3_stats = (
+            await asyncio.to_thread(self.l3_cache.stats) if self.l3_cache is not None else {}
+        )
         with self.metrics_lock:
+            l1_evictions = self.metrics.evictions_by_tier.get(CacheTier.L1_MEMORY.value, 0)
+            total_gets = self.metrics.hits + self.metrics.misses
             stats = {
                 'metrics': {
                     'hits': self.metrics.hits,
@@ -384,24 +812,37 @@ class MultiTierCacheSystem:
                     'evictions': self.metrics.evictions,
                     'operations': self.metrics.operations,
                     'hit_rate': self.metrics.hit_rate,
-                    'average_access_time_ms': self.metrics.average_access_time_ms
+                    'average_access_time_ms': self.metrics.average_access_time_ms,
+                    'tier_hits': dict(self.metrics.tier_distribution),
+                    'l1_hit_rate': (
+                        self.metrics.tier_distribution.get(CacheTier.L1_MEMORY.value, 0) / total_gets
+                        if total_gets else 0.0
+                    ),
+                    'evictions_by_tier': dict(self.metrics.evictions_by_tier),
+                    'eviction_time_ms': self.metrics.eviction_time_ms,
+                    'average_eviction_cost_ms': (
+                        self.metrics.eviction_time_ms / l1_evictions if l1_evictions else 0.0
+                    ),
+                    'admission_rejections': self.metrics.admission_rejections
                 },
                 'tier_stats': {
                     'l1': {
                         'enabled': True,
                         'entries': len(self.l1_cache),
-                        'size_bytes': sum(entry.size_bytes for entry in self.l1_cache.values()),
+                        'size_bytes': self.l1_size_used,
                         'max_size_bytes': self.l1_size_bytes
                     },
                     'l2': {
                         'enabled': self.l2_enabled,
-                        'entries': 0,  # Placeholder
-                        'size_bytes': 0  # Placeholder
+                        'entries': l2_stats.get('entries', 0),
+                        'size_bytes': l2_stats.get('size_bytes', 0),
+                        'path': str(self.l2_cache.path) if self.l2_cache and self.l2_cache.path else None
                     },
                     'l3': {
                         'enabled': self.l3_enabled,
-                        'entries': 0,  # Placeholder
-                        'size_bytes': 0  # Placeholder
+                        'entries': l3_stats.get('entries', 0),
+                        'size_bytes': l3_stats.get('size_bytes', 0),
+                        'path': str(self.l3_cache.path) if self.l3_cache and self.l3_cache.path else None
                     }
                 },
                 'configuration': {
@@ -421,20 +862,8 @@ class MultiTierCacheSystem:
         return datetime.now() - entry.created_at > entry.ttl
 
     def _calculate_size(self, value: Any) -> int:
-        """Calculate size of value in bytes."""
-        try:
-            if isinstance(value, str):
-                return len(value.encode('utf-8'))
-            elif isinstance(value, (int, float)):
-                return 8
-            elif isinstance(value, dict):
-                return len(json.dumps(value).encode('utf-8'))
-            elif isinstance(value, list):
-                return len(json.dumps(value).encode('utf-8'))
-            else:
-                return len(pickle.dumps(value))
-        except Exception:
-            return 1024  # Default size
+        """Estimate size of value in bytes (sampled, no serialization)."""
+        return estimate_size(value)
 
     def _update_metrics(self, operation: CacheOperation, success: bool, access_time: float):
         """Update cache metrics."""
@@ -459,6 +888,19 @@ class MultiTierCacheSystem:
             if total_gets > 0:
                 self.metrics.hit_rate = self.metrics.hits / total_gets
 
+    def _record_tier_hit(self, tier: CacheTier):
+        """Count a hit served by ``tier``."""
+        with self.metrics_lock:
+            distribution = self.metrics.tier_distribution
+            distribution[tier.value] = distribution.get(tier.value, 0) + 1
+
+    @staticmethod
+    def _expires_at(entry: CacheEntry) -> Optional[float]:
+        """Absolute expiry (epoch seconds) of ``entry`` for the lower tiers."""
+        if entry.ttl is None:
+            return None
+        return entry.created_at.timestamp() + entry.ttl.total_seconds()
+
     def _update_tag_index(self, key: str, tags: List[str]):
         """Update tag index for invalidation."""
         with self.tag_lock:
@@ -467,131 +909,237 @@ class MultiTierCacheSystem:
 
             # Add new tags
             for tag in tags:
-                self.tag_index[tag].append(key)
+                self.tag_index[tag].add(key)
+            if tags:
+                self._key_tags[key] = list(tags)
 
     def _remove_from_tag_index(self, key: str):
         """Remove key from tag index."""
         with self.tag_lock:
-            for tag, keys in self.tag_index.items():
-                if key in keys:
-                    keys.remove(key)
+            for tag in self._key_tags.pop(key, ()):
+                keys = self.tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.tag_index[tag]
 
     async def _store_in_l1(self, entry: CacheEntry) -> bool:
-        """Store entry in L1 cache."""
+        """Store entry in L1 cache.
+
+        Returns False when the entry is too large for L1 or, under the
+        TinyLFU policy, was judged less valuable than the entry it would
+        displace.
+        """
         try:
             with self.l1_lock:
+                key = entry.key
+                if entry.size_bytes > self.l1_size_bytes:
+                    return False
+                replaced = self._remove_from_l1(key)
+
+                if self._sketch is not None and not replaced:
+                    self._sketch.increment(key)
+                    if not self._admit(entry):
+                        with self.metrics_lock:
+                            self.metrics.admission_rejections += 1
+                        return False
+
                 # Check if we need to evict
                 if len(self.l1_cache) >= self.config['max_l1_entries']:
                     await self._evict_from_l1()
 
                 # Check size constraints
-                current_size = sum(e.size_bytes for e in self.l1_cache.values())
-                if current_size + entry.size_bytes > self.l1_size_bytes:
-                    await self._evict_from_l1_by_size(entry.size_bytes)
+                if self.l1_size_used + entry.size_bytes > self.l1_size_bytes:
+                    await self._evict_from_l1_by_size(
+                        self.l1_size_used + entry.size_bytes - self.l1_size_bytes
+                    )
 
                 # Store entry
                 self.l1_cache[key] = entry
-                self.l1_cache.move_to_end(key)
+                self.l1_size_used += entry.size_bytes
+                if self._lfu is not None:
+                    self._lfu.add(key)
 
                 return True
 
         except Exception as e:
-            logger.exception("L1 store error for key %s: %s", key, e)
+            logger.exception("L1 store error for key %s: %s", entry.key, e)
+            return False
+
+    def _admit(self, entry: CacheEntry) -> bool:
+        """TinyLFU admission: only displace a victim that is used less often."""
+        full = (
+            len(self.l1_cache) >= self.config['max_l1_entries']
+            or self.l1_size_used + entry.size_bytes > self.l1_size_bytes
+        )
+        if not full or not self.l1_cache:
+            return True
+        victim = next(iter(self.l1_cache))
+        return self._sketch.estimate(entry.key) > self._sketch.estimate(victim)
+
+    def _remove_from_l1(self, key: str) -> bool:
+        """Drop ``key`` from L1 and its bookkeeping (l1_lock held)."""
+        entry = self.l1_cache.pop(key, None)
+        if entry is None:
             return False
+        self.l1_size_used -= entry.size_bytes
+        if self._lfu is not None:
+            self._lfu.discard(key)
+        return True
+
+    def _l1_victim(self) -> Optional[str]:
+        """Next key to evict from L1 under the configured policy."""
+        if self._lfu is not None:
+            return self._lfu.victim()
+        return next(iter(self.l1_cache), None)
+
+    def _evict_l1_key(self, key: str):
+        self._remove_from_l1(key)
+        self._remove_from_tag_index(key)
+
+    def _record_l1_evictions(self, count: int, started: float):
+        with self.metrics_lock:
+            self.metrics.evictions += count
+            tier = CacheTier.L1_MEMORY.value
+            self.metrics.evictions_by_tier[tier] = self.metrics.evictions_by_tier.get(tier, 0) + count
+            self.metrics.eviction_time_ms += (time.perf_counter() - started) * 1000
 
     async def _evict_from_l1(self):
         """Evict entries from L1 cache based on policy."""
+        started = time.perf_counter()
         with self.l1_lock:
             if not self.l1_cache:
                 return
 
-            if self.eviction_policy == EvictionPolicy.LRU:
-                # Remove least recently used
-                key_to_remove = next(iter(self.l1_cache))
-                del self.l1_cache[key_to_remove]
-                self._remove_from_tag_index(key_to_remove)
-
-            elif self.eviction_policy == EvictionPolicy.LFU:
-                # Remove least frequently used
-                key_to_remove = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].access_count)
-                del self.l1_cache[key_to_remove]
-                self._remove_from_tag_index(key_to_remove)
-
-            elif self.eviction_policy == EvictionPolicy.TTL:
+            evicted = 0
+            if self.eviction_policy == EvictionPolicy.TTL:
                 # Remove expired entries
                 expired_keys = [k for k, v in self.l1_cache.items() if self._is_expired(v)]
                 for key in expired_keys:
-                    del self.l1_cache[key]
-                    self._remove_from_tag_index(key)
+                    self._evict_l1_key(key)
+                evicted = len(expired_keys)
 
-            self.metrics.evictions += 1
+            if not evicted:
+                self._evict_l1_key(self._l1_victim())
+                evicted = 1
+
+            self._record_l1_evictions(evicted, started)
 
     async def _evict_from_l1_by_size(self, required_size: int):
         """Evict entries from L1 cache to make room."""
+        started = time.perf_counter()
         with self.l1_lock:
             freed_size = 0
+            evicted = 0
 
             while freed_size < required_size and self.l1_cache:
-                if self.eviction_policy == EvictionPolicy.LRU:
-                    key_to_remove = next(iter(self.l1_cache))
-                elif self.eviction_policy == EvictionPolicy.LFU:
-                    key_to_remove = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].access_count)
-                else:
-                    key_to_remove = next(iter(self.l1_cache))
-
-                entry = self.l1_cache[key_to_remove]
-                freed_size += entry.size_bytes
+                key_to_remove = self._l1_victim()
+                freed_size += self.l1_cache[key_to_remove].size_bytes
+                self._evict_l1_key(key_to_remove)
+                evicted += 1
 
-                del self.l1_cache[key_to_remove]
-                self._remove_from_tag_index(key_to_remove)
+            if evicted:
+                self._record_l1_evictions(evicted, started)
 
-                self.metrics.evictions += 1
-
-    async def _promote_to_l1(self, key: str, value: Any):
-        """Promote value to L1 cache."""
+    async def _promote_to_l1(
+        self, key: str, value: Any, expires_at: Optional[float], tags: List[str]
+    ):
+        """Promote a lower-tier hit to L1, keeping its remaining TTL and tags."""
+        ttl = None if expires_at is None else timedelta(seconds=max(0.0, expires_at - time.time()))
         entry = CacheEntry(
             key=key,
             value=value,
-            ttl=self.default_ttl,
+            ttl=ttl,
             tier=CacheTier.L1_MEMORY,
+            tags=tags,
             size_bytes=self._calculate_size(value)
         )
         await self._store_in_l1(entry)
+        self._update_tag_index(key, tags)
 
-    async def _promote_to_l2(self, key: str, value: Any):
-        """Promote value to L2 cache."""
-        # Placeholder for Redis implementation
-        pass
+    async def _promote_to_l2(
+        self, key: str, value: Any, expires_at: Optional[float], tags: List[str]
+    ):
+        """Promote an L3 hit to L2 so sibling workers find it there."""
+        await self._write_l2(key, value, expires_at, tags)
 
-    async def _get_from_l2(self, key: str) -> Optional[Any]:
-        """Get value from L2 cache."""
-        # Placeholder for Redis implementation
-        return None
+    async def _get_from_l2(self, key: str) -> Optional[Tuple[Any, Optional[float], List[str]]]:
+        """Get ``(value, expires_at, tags)`` from L2 cache."""
+        try:
+            return await asyncio.to_thread(self.l2_cache.get, key)
+        except Exception as e:
+            logger.warning("L2 get error for key %s: %s", key, e)
+            return None
 
-    async def _get_from_l3(self, key: str) -> Optional[Any]:
-        """Get value from L3 cache."""
-        # Placeholder for database implementation
-        return None
+    async def _get_from_l3(self, key: str) -> Optional[Tuple[Any, Optional[float], List[str]]]:
+        """Get ``(value, expires_at, tags)`` from L3 cache."""
+        try:
+            return await asyncio.to_thread(self.l3_cache.get, key)
+        except Exception as e:
+            logger.warning("L3 get error for key %s: %s", key, e)
+            return None
 
     async def _store_in_l2(self, entry: CacheEntry) -> bool:
         """Store entry in L2 cache."""
-        # Placeholder for Redis implementation
+        return await self._write_l2(entry.key, entry.value, self._expires_at(entry), entry.tags)
+
+    async def _write_l2(
+        self, key: str, value: Any, expires_at: Optional[float], tags: List[str]
+    ) -> bool:
+        try:
+            overflow = await asyncio.to_thread(self.l2_cache.set, key, value, expires_at, tags)
+        except Exception as e:
+            logger.warning("L2 store error for key %s: %s", key, e)
+            return False
+        if overflow:
+            await self._demote_to_l3(overflow)
         return True
 
+    async def _demote_to_l3(self, rows: List[tuple]):
+        """Move entries pushed out of L2 down to L3 without unpickling them."""
+        self._record_lower_evictions(CacheTier.L2_REDIS, len(rows))
+        if self.l3_cache is None:
+            return
+
+        def _demote():
+            for key, payload, compressed, tags, expires_at in rows:
+                self.l3_cache.set_encoded(
+                    key, payload, bool(compressed), expires_at, _split_tags(tags)
+                )
+
+        try:
+            await asyncio.to_thread(_demote)
+            logger.debug("Demoted %d entries from L2 to L3", len(rows))
+        except Exception as e:
+            logger.warning("L2 to L3 demotion error: %s", e)
+
     async def _store_in_l3(self, entry: CacheEntry) -> bool:
         """Store entry in L3 cache."""
-        # Placeholder for database implementation
+        try:
+            overflow = await asyncio.to_thread(
+                self.l3_cache.set, entry.key, entry.value, self._expires_at(entry), entry.tags
+            )
+        except Exception as e:
+            logger.warning("L3 store error for key %s: %s", entry.key, e)
+            return False
+        if overflow:
+            self._record_lower_evictions(CacheTier.L3_DATABASE, len(overflow))
         return True
 
+    def _record_lower_evictions(self, tier: CacheTier, count: int):
+        with self.metrics_lock:
+            self.metrics.evictions += count
+            self.metrics.evictions_by_tier[tier.value] = (
+                self.metrics.evictions_by_tier.get(tier.value, 0) + count
+            )
+
     async def _delete_from_l2(self, key: str) -> bool:
         """Delete key from L2 cache."""
-        # Placeholder for Redis implementation
-        return True
+        return await asyncio.to_thread(self.l2_cache.delete, key)
 
     async def _delete_from_l3(self, key: str) -> bool:
         """Delete key from L3 cache."""
-        # Placeholder for database implementation
-        return True
+        return await asyncio.to_thread(self.l3_cache.delete, key)
 
     def _start_background_tasks(self):
         """Start background maintenance tasks."""
@@ -611,10 +1159,14 @@ class MultiTierCacheSystem:
                 with self.l1_lock:
                     expired_keys = [k for k, v in self.l1_cache.items() if self._is_expired(v)]
                     for key in expired_keys:
-                        del self.l1_cache[key]
-                        self._remove_from_tag_index(key)
+                        self._evict_l1_key(key)
+
+                purged = 0
+                for store in (self.l2_cache, self.l3_cache):
+                    if store is not None:
+                        purged += await asyncio.to_thread(store.purge_expired)
 
-                logger.debug("Cleaned up %d expired cache entries", len(expired_keys))
+                logger.debug("Cleaned up %d expired cache entries", len(expired_keys) + purged)
 
             except Exception as e:
                 logger.exception("Cleanup task error: %s", e)
@@ -650,20 +1202,22 @@ class MultiTierCacheSystem:
             with self.l1_lock:
                 cleared_count += len(self.l1_cache)
                 self.l1_cache.clear()
+                self.l1_size_used = 0
+                if self._lfu is not None:
+                    self._lfu.clear()
 
             # Clear L2
-            if self.l2_enabled:
-                # Placeholder for Redis clear
-                pass
+            if self.l2_cache is not None:
+                cleared_count += await asyncio.to_thread(self.l2_cache.clear)
 
             # Clear L3
-            if self.l3_enabled:
-                # Placeholder for database clear
-                pass
+            if self.l3_cache is not None:
+                cleared_count += await asyncio.to_thread(self.l3_cache.clear)
 
             # Clear tag index
             with self.tag_lock:
                 self.tag_index.clear()
+                self._key_tags.clear()
 
             # Reset metrics
             with self.metrics_lock:
@@ -679,6 +1233,12 @@ class MultiTierCacheSystem:
             logger.exception("Clear all cache error: %s", e)
             return cleared_count
 
+    def close(self):
+        """Close the lower-tier stores."""
+        for store in (self.l2_cache, self.l3_cache):
+            if store is not None:
+                store.close()
+
 
 # Global instance for backward compatibility
 # Global instance - lazy initialization
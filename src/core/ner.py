@@ -154,6 +154,72 @@ class ClinicalNERService:
         )
         return merged_entities
 
+    def extract_entities_batch(self, texts: list[str]) -> list[list[dict[str, Any]]]:
+        """Extract entities for several documents, one pipeline call per model.
+
+        Cached documents are answered from the NER cache; the rest are passed
+        to every pipeline as a single list so the model runs batched forward
+        passes instead of one per document.
+
+        Args:
+            texts: The input texts to analyze.
+
+        Returns:
+            One merged entity list per input text, in the same order.
+
+        """
+        results: list[list[dict[str, Any]]] = [[] for _ in texts]
+        try:
+            from src.config import get_settings
+
+            if bool(get_settings().performance.get("skip_advanced_ner", False)):
+                return results
+        except Exception:
+            pass
+
+        if not self.pipelines:
+            return results
+
+        model_identifier = (
+            "_".join(self.model_names) if self.model_names else "default_ner"
+        )
+        uncached: list[int] = []
+        for index, text in enumerate(texts):
+            if not text.strip():
+                continue
+            cached_results = NERCache.get_ner_results(text, model_identifier)
+            if cached_results is not None:
+                results[index] = cached_results
+            else:
+                uncached.append(index)
+        if not uncached:
+            return results
+
+        start_time = time.time()
+        batch = [texts[index] for index in uncached]
+        collected: list[list[dict[str, Any]]] = [[] for _ in batch]
+        for pipe in self.pipelines:
+            try:
+                outputs = pipe(batch)
+            except Exception as e:
+                logger.warning("A clinical NER pipeline failed during batch execution: %s", e)
+                continue
+            for position, entities in enumerate(outputs or []):
+                if entities:
+                    collected[position].extend(entities)
+
+        processing_time = time.time() - start_time
+        ttl_hours = 24.0 if processing_time > 2.0 * len(batch) else 48.0
+        for position, index in enumerate(uncached):
+            merged_entities = self._merge_entities(collected[position])
+            NERCache.set_ner_results(texts[index], model_identifier, merged_entities, ttl_hours)
+            results[index] = merged_entities
+
+        logger.debug(
+            "Batched NER for %d documents completed in %.2fs", len(batch), processing_time
+        )
+        return results
+
     def _merge_entities(self, entities: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Merges overlapping entities based on score and span length."""
         if not entities:
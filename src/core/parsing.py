@@ -1,7 +1,17 @@
+import atexit
 import hashlib
 import logging
+import math
+import multiprocessing
 import os
 import re
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
 
 import pdfplumber
 import PIL
@@ -9,6 +19,8 @@ import yaml
 from docx import Document
 from PIL import Image
 
+from src.config import get_settings
+
 from .cache_service import cache_service
 
 # OCR imports with fallback
@@ -38,6 +50,21 @@ SUPPORTED_EXTENSIONS = {
 }
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tiff", ".bmp"}
 
+# Bump whenever sentence splitting or page extraction changes so that stale
+# entries in the content-addressed parse cache are never served.
+PARSER_VERSION = "2"
+PDF_OCR_CONFIG = r"--oem 3 --psm 6"
+OCR_FAILED_PAGE_MESSAGE = "Warning: Page {page} could not be processed (may be scanned image without OCR capability)"
+IMAGE_OCR_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,;:!?()[]{}"-/\n '
+
+
+def _get_ocr_dpi() -> int:
+    return int(get_settings().parsing.ocr_dpi)
+
+
+def _get_ocr_timeout() -> int:
+    return int(get_settings().parsing.ocr_timeout_seconds)
+
 
 def _get_file_hash(file_path: str) -> str:
     """Calculates the SHA256 hash of a file's content."""
@@ -50,13 +77,92 @@ def _get_file_hash(file_path: str) -> str:
     return hasher.hexdigest()
 
 
-def parse_document_content(file_path: str) -> list[dict[str, str]]:
-    """Parse supported documents into sentence chunks with OCR support and content-based caching."""
-    logger.info("Parsing document: %s", file_path)
+def _get_parser_fingerprint() -> str:
+    """Describe the parser version and OCR settings that shape parse output."""
+    return "|".join(
+        [
+            PARSER_VERSION,
+            f"ocr={OCR_AVAILABLE}",
+            f"dpi={_get_ocr_dpi()}",
+            PDF_OCR_CONFIG,
+            IMAGE_OCR_CONFIG,
+        ]
+    )
+
+
+def _get_document_cache_key(file_hash: str, extension: str) -> str:
+    """Build the parse cache key from file bytes, type and parser settings."""
+    hasher = hashlib.sha256()
+    for part in (file_hash, extension, _get_parser_fingerprint()):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return "parsed_document_" + hasher.hexdigest()
 
+
+def _get_page_cache_key(page_fingerprint: str) -> str:
+    """Build the per-page parse cache key for a PDF page."""
+    hasher = hashlib.sha256()
+    for part in (page_fingerprint, _get_parser_fingerprint()):
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return "parsed_pdf_page_" + hasher.hexdigest()
+
+
+def _hash_pdf_object(hasher, obj, seen: set[int], depth: int = 0) -> None:
+    """Feed a pdfminer object graph (streams, dicts, arrays) into ``hasher``."""
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+    if depth > 32:
+        return
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in seen:
+            hasher.update(f"ref:{obj.objid}".encode())
+            return
+        seen.add(obj.objid)
+        obj = obj.resolve()
+    if isinstance(obj, PDFStream):
+        hasher.update(obj.get_data() or b"")
+        obj = obj.attrs
+    if isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            hasher.update(str(key).encode("utf-8"))
+            _hash_pdf_object(hasher, obj[key], seen, depth + 1)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _hash_pdf_object(hasher, item, seen, depth + 1)
+    else:
+        hasher.update(repr(obj).encode("utf-8"))
+
+
+def _get_pdf_page_fingerprint(page) -> str | None:
+    """Hash the content streams and resources (fonts, images) of one PDF page.
+
+    Two pages with the same fingerprint render identically, so their parse
+    output can be shared even across different files. Returns ``None`` when
+    the page cannot be fingerprinted, in which case it is parsed uncached.
+    """
+    try:
+        from pdfminer.pdfpage import PDFPage
+
+        page_obj = getattr(page, "page_obj", None)
+        if not isinstance(page_obj, PDFPage):
+            return None
+        hasher = hashlib.sha256()
+        hasher.update(repr((page_obj.mediabox, page_obj.rotate)).encode("utf-8"))
+        seen: set[int] = set()
+        _hash_pdf_object(hasher, list(page_obj.contents), seen)
+        _hash_pdf_object(hasher, page_obj.resources or {}, seen)
+        return hasher.hexdigest()
+    except Exception as e:  # pdfminer raises a wide range of errors on odd files
+        logger.debug("Could not fingerprint PDF page: %s", e)
+        return None
+
+
+def _check_document_path(file_path: str) -> tuple[str, list[dict[str, str]] | None]:
+    """Return the file extension and, if the file cannot be parsed, error records."""
     if not os.path.exists(file_path):
         logger.error("File not found: %s", file_path)
-        return [
+        return "", [
             {
                 "sentence": f"Error: File not found at {file_path}",
                 "source": "parser",
@@ -71,16 +177,90 @@ def parse_document_content(file_path: str) -> list[dict[str, str]]:
         logger.error(
             "Unsupported file type: %s. Supported: %s", extension, supported_list
         )
-        return [
+        return extension, [
             {
                 "sentence": f"Error: Unsupported file type '{extension}'. Supported formats: {supported_list}",
                 "source": "parser",
             },
         ]
+    return extension, None
+
+
+def _is_cacheable_parse_result(records: list[dict[str, str]]) -> bool:
+    """Return False when ``records`` contain a parser error or a failed OCR page.
+
+    Those failures are usually transient (a page deadline, a broken worker
+    pool, an I/O error), so caching them under the content key would replay
+    the failure for every later upload of the same file.
+    """
+    failed_page_prefix, failed_page_suffix = OCR_FAILED_PAGE_MESSAGE.split("{page}")
+    for record in records:
+        if record.get("source") != "parser":
+            continue
+        sentence = record.get("sentence", "")
+        if sentence.startswith("Error") or (
+            sentence.startswith(failed_page_prefix) and sentence.endswith(failed_page_suffix)
+        ):
+            return False
+    return True
+
+
+def iter_document_pages(file_path: str) -> Iterator[dict[str, Any]]:
+    """Stream a document as page records while it is being parsed.
+
+    PDFs yield one ``{"page", "method", "sentences"}`` record per page, in
+    order, as soon as that page has been extracted or read from the page
+    cache; later pages keep extracting in the background. Other formats are
+    parsed in one step and yielded as a single page record. Closing the
+    generator early cancels extraction of pages that have not started yet.
+    """
+    logger.info("Streaming document: %s", file_path)
+
+    extension, error_records = _check_document_path(file_path)
+    if error_records:
+        yield {"page": 1, "method": "error", "sentences": error_records}
+        return
+
+    if extension != ".pdf":
+        yield {"page": 1, "method": "document", "sentences": parse_document_content(file_path)}
+        return
 
-    cache_key = (
-        "parsed_document_" + hashlib.sha256(file_path.encode("utf-8")).hexdigest()
-    )
+    try:
+        yield from _iter_pdf_pages(file_path)
+    except OSError as e:
+        logger.exception("PDF streaming failed for %s: %s", file_path, e)
+        yield {
+            "page": None,
+            "method": "error",
+            "sentences": [{"sentence": f"Error parsing PDF: {e!s}", "source": "parser"}],
+        }
+
+
+def iter_document_content(file_path: str) -> Iterator[dict[str, str]]:
+    """Stream ``{"sentence", "source"}`` records in document order.
+
+    This is the incremental counterpart of :func:`parse_document_content`:
+    consumers can start on the first page of a large scanned PDF while the
+    rest is still being OCR'd, and never need the whole document in memory.
+    """
+    for page_record in iter_document_pages(file_path):
+        yield from page_record["sentences"]
+
+
+def parse_document_content(file_path: str) -> list[dict[str, str]]:
+    """Parse supported documents into sentence chunks with OCR support and content-based caching.
+
+    The cache key is derived from the file bytes plus the parser version and
+    OCR settings, so re-uploads of the same document hit the cache no matter
+    which temporary path they were written to.
+    """
+    logger.info("Parsing document: %s", file_path)
+
+    extension, error_records = _check_document_path(file_path)
+    if error_records:
+        return error_records
+
+    cache_key = _get_document_cache_key(_get_file_hash(file_path), extension)
 
     cached_result = cache_service.get_from_disk(cache_key)
     if cached_result is not None:
@@ -127,6 +307,7 @@ def parse_document_content(file_path: str) -> list[dict[str, str]]:
         parse_thread.start()
         parse_thread.join(timeout=120)  # 2 minutes timeout
 
+        should_cache = True
         if parse_thread.is_alive():
             logger.warning(
                 "Document parsing timed out for %s after 2 minutes", file_path
@@ -137,6 +318,7 @@ def parse_document_content(file_path: str) -> list[dict[str, str]]:
                     "source": "parser",
                 },
             ]
+            should_cache = False
         else:
             try:
                 result = result_queue.get_nowait()
@@ -147,8 +329,10 @@ def parse_document_content(file_path: str) -> list[dict[str, str]]:
                         "source": "parser",
                     },
                 ]
+                should_cache = False
 
-        cache_service.set_to_disk(cache_key, result)
+        if should_cache and _is_cacheable_parse_result(result):
+            cache_service.set_to_disk(cache_key, result)
         logger.info(
             "Successfully parsed document: %s (%d chunks)",
             os.path.basename(file_path),
@@ -215,6 +399,26 @@ def _preprocess_image_for_ocr(image):
         return image
 
 
+def _run_ocr_with_timeout(
+    image, config: str, label: str, timeout: float | None = None
+) -> str | None:
+    """Run Tesseract on ``image``; returns ``None`` on timeout or failure.
+
+    The timeout is enforced by pytesseract, which kills the tesseract
+    subprocess instead of leaving a daemon thread blocked on it.
+    """
+    timeout = _get_ocr_timeout() if timeout is None else timeout
+    try:
+        return pytesseract.image_to_string(image, config=config, timeout=timeout)
+    except RuntimeError as e:
+        # pytesseract signals a killed process with RuntimeError("... timeout")
+        logger.warning("OCR timed out for %s after %s seconds: %s", label, timeout, e)
+        return None
+    except Exception as e:
+        logger.warning("OCR failed for %s: %s", label, e)
+        return None
+
+
 def _parse_image_with_ocr(file_path: str) -> list[dict[str, str]]:
     """Parse image files using OCR."""
     if not OCR_AVAILABLE:
@@ -233,39 +437,10 @@ def _parse_image_with_ocr(file_path: str) -> list[dict[str, str]]:
         processed_image = _preprocess_image_for_ocr(image)
 
         # Perform OCR with medical-optimized settings and timeout protection
-        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.,;:!?()[]{}"-/\n '
-
-        # Add timeout protection to prevent hanging
-        import queue
-        import signal
-        import threading
-
-        def ocr_with_timeout():
-            try:
-                return pytesseract.image_to_string(
-                    processed_image, config=custom_config
-                )
-            except Exception as e:
-                logger.warning("OCR failed for image %s: %s", file_path, e)
-                return ""
-
-        # Run OCR with 30-second timeout
-        result_queue = queue.Queue()
-        ocr_thread = threading.Thread(
-            target=lambda: result_queue.put(ocr_with_timeout())
+        text = (
+            _run_ocr_with_timeout(processed_image, IMAGE_OCR_CONFIG, f"image {file_path}")
+            or ""
         )
-        ocr_thread.daemon = True
-        ocr_thread.start()
-        ocr_thread.join(timeout=30)
-
-        if ocr_thread.is_alive():
-            logger.warning("OCR timed out for image %s after 30 seconds", file_path)
-            text = ""
-        else:
-            try:
-                text = result_queue.get_nowait()
-            except queue.Empty:
-                text = ""
 
         if not text.strip():
             return [
@@ -297,125 +472,333 @@ def _parse_image_with_ocr(file_path: str) -> list[dict[str, str]]:
         ]
 
 
-def _parse_pdf_with_ocr(file_path: str) -> list[dict[str, str]]:
-    """Parse PDF with OCR fallback for scanned documents."""
+def _extract_pdf_page(
+    page,
+    page_number: int,
+    ocr_dpi: int | None = None,
+    ocr_timeout: float | None = None,
+) -> dict[str, Any]:
+    """Extract sentences from one PDF page, falling back to OCR for scanned pages.
+
+    Returns a dict with ``method`` (``text``, ``ocr``, ``ocr_failed`` or
+    ``ocr_unavailable``) and the extracted ``sentences``. Only ``text`` and
+    ``ocr`` results are deterministic enough to be cached.
+    """
+    page_text = page.extract_text()
+    if page_text and page_text.strip():
+        sentences = [s.strip() for s in _split_into_sentences(page_text) if s.strip()]
+        return {"method": "text", "sentences": sentences}
+
+    if not OCR_AVAILABLE:
+        return {"method": "ocr_unavailable", "sentences": []}
+
+    try:
+        # Convert page to image, preprocess and OCR with timeout protection
+        page_image = page.to_image(
+            resolution=_get_ocr_dpi() if ocr_dpi is None else ocr_dpi
+        )
+        processed_image = _preprocess_image_for_ocr(page_image.original)
+        ocr_text = _run_ocr_with_timeout(
+            processed_image, PDF_OCR_CONFIG, f"page {page_number}", ocr_timeout
+        )
+    except (PIL.UnidentifiedImageError, OSError, ValueError) as e:
+        logger.warning("OCR failed for page %s: %s", page_number, e)
+        return {"method": "ocr_failed", "sentences": []}
+
+    if ocr_text is None:
+        return {"method": "ocr_failed", "sentences": []}
+    sentences = [s.strip() for s in _split_into_sentences(ocr_text) if s.strip()]
+    return {"method": "ocr", "sentences": sentences}
+
+
+def _extract_pdf_page_from_file(
+    file_path: str, page_index: int, ocr_dpi: int, ocr_timeout: float
+) -> dict[str, Any]:
+    """Process-pool entry point: open the PDF and extract a single page."""
     try:
-        # First try regular text extraction
         with pdfplumber.open(file_path) as pdf:
-            text_content = []
-            ocr_pages = []
-
-            for page_num, page in enumerate(pdf.pages):
-                page_text = page.extract_text()
-
-                if page_text and page_text.strip():
-                    # Page has extractable text
-                    sentences = _split_into_sentences(page_text)
-                    for sentence in sentences:
-                        if sentence.strip():
-                            text_content.append(
-                                {
-                                    "sentence": sentence.strip(),
-                                    "source": f"pdf_page_{page_num + 1}",
-                                }
-                            )
-                else:
-                    # Page appears to be scanned, try OCR
-                    if OCR_AVAILABLE:
-                        try:
-                            # Convert page to image
-                            page_image = page.to_image(resolution=300)
-                            pil_image = page_image.original
-
-                            # Preprocess and OCR with timeout protection
-                            processed_image = _preprocess_image_for_ocr(pil_image)
-                            custom_config = r"--oem 3 --psm 6"
-
-                            # Add timeout protection to prevent hanging
-                            import queue
-                            import signal
-                            import threading
-
-                            def ocr_with_timeout():
-                                try:
-                                    return pytesseract.image_to_string(
-                                        processed_image, config=custom_config
-                                    )
-                                except Exception as e:
-                                    logger.warning(
-                                        "OCR failed for page %s: %s", page_num + 1, e
-                                    )
-                                    return ""
-
-                            # Run OCR with 30-second timeout
-                            result_queue = queue.Queue()
-                            ocr_thread = threading.Thread(
-                                target=lambda: result_queue.put(ocr_with_timeout())
-                            )
-                            ocr_thread.daemon = True
-                            ocr_thread.start()
-                            ocr_thread.join(timeout=30)
-
-                            if ocr_thread.is_alive():
-                                logger.warning(
-                                    "OCR timed out for page %s after 30 seconds",
-                                    page_num + 1,
-                                )
-                                ocr_text = ""
-                            else:
-                                try:
-                                    ocr_text = result_queue.get_nowait()
-                                except queue.Empty:
-                                    ocr_text = ""
-
-                            if ocr_text.strip():
-                                sentences = _split_into_sentences(ocr_text)
-                                for sentence in sentences:
-                                    if sentence.strip():
-                                        text_content.append(
-                                            {
-                                                "sentence": sentence.strip(),
-                                                "source": f"ocr_page_{page_num + 1}",
-                                            }
-                                        )
-                                ocr_pages.append(page_num + 1)
-
-                        except (PIL.UnidentifiedImageError, OSError, ValueError):
-                            logger.warning("OCR failed for page %s: {e}", page_num + 1)
-                            text_content.append(
-                                {
-                                    "sentence": f"Warning: Page {page_num + 1} could not be processed (may be scanned image without OCR capability)",
-                                    "source": "parser",
-                                }
-                            )
-                    else:
-                        text_content.append(
-                            {
-                                "sentence": f"Warning: Page {page_num + 1} appears to be scanned but OCR is not available. Install pytesseract for scanned document support.",
-                                "source": "parser",
-                            }
-                        )
-
-            if ocr_pages:
-                logger.info("OCR was used for pages: %s", ocr_pages)
-                text_content.insert(
-                    0,
-                    {
-                        "sentence": f"Note: OCR was used to extract text from scanned pages: {', '.join(map(str, ocr_pages))}",
-                        "source": "ocr_info",
-                    },
+            return _extract_pdf_page(
+                pdf.pages[page_index], page_index + 1, ocr_dpi, ocr_timeout
+            )
+    except Exception as e:  # never let one bad page take down the whole batch
+        logger.warning("Extraction failed for page %s of %s: %s", page_index + 1, file_path, e)
+        return {"method": "ocr_failed", "sentences": []}
+
+
+class PageExtractionEngine:
+    """Extracts PDF pages (text and OCR) across a bounded process pool.
+
+    Results are yielded in page order as they complete, so callers can start
+    on page 1 while later pages are still being OCR'd. Each page is bounded by the OCR timeout inside the worker;
+    pages that still overrun a batch deadline are reported as failed and the
+    pool is recycled so a wedged worker cannot hold on to a slot.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        page_timeout: float | None = None,
+        min_pages_for_pool: int = 2,
+    ):
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.page_timeout = page_timeout
+        self.min_pages_for_pool = max(1, min_pages_for_pool)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" avoids forking a parent that already runs model threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _recycle_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        for process in list(getattr(executor, "_processes", {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, if any were started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def extract_pages(
+        self,
+        file_path: str,
+        page_indices: list[int],
+        pdf=None,
+        ocr_dpi: int | None = None,
+    ) -> dict[int, dict[str, Any]]:
+        """Extract ``page_indices`` from ``file_path`` and return them keyed by index."""
+        return dict(self.iter_pages(file_path, page_indices, pdf=pdf, ocr_dpi=ocr_dpi))
+
+    def iter_pages(
+        self,
+        file_path: str,
+        page_indices: list[int],
+        pdf=None,
+        ocr_dpi: int | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield ``(page_index, result)`` pairs in the order of ``page_indices``.
+
+        All pages are submitted up front, so later pages are already being
+        extracted while the caller consumes earlier ones. Small batches (or a
+        single-worker engine) run inline against the already-open ``pdf`` when
+        one is given, since spinning up worker processes would cost more than
+        it saves. Closing the generator early cancels pages not yet started.
+        """
+        ocr_dpi = _get_ocr_dpi() if ocr_dpi is None else ocr_dpi
+        page_timeout = _get_ocr_timeout() if self.page_timeout is None else self.page_timeout
+
+        if self.max_workers == 1 or len(page_indices) < self.min_pages_for_pool:
+            yield from self._iter_inline(file_path, page_indices, pdf, ocr_dpi, page_timeout)
+            return
+
+        try:
+            executor = self._get_executor()
+            futures = [
+                (
+                    index,
+                    executor.submit(
+                        _extract_pdf_page_from_file, file_path, index, ocr_dpi, page_timeout
+                    ),
                 )
+                for index in page_indices
+            ]
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            logger.warning("Page worker pool unavailable (%s); extracting inline", e)
+            self._recycle_executor()
+            yield from self._iter_inline(file_path, page_indices, pdf, ocr_dpi, page_timeout)
+            return
+
+        # Every page gets its own OCR timeout inside the worker; the batch
+        # deadline only catches workers wedged outside of tesseract.
+        waves = math.ceil(len(page_indices) / self.max_workers)
+        deadline = time.monotonic() + (waves + 1) * (page_timeout + 5)
+        recycle = False
+        try:
+            for position, (index, future) in enumerate(futures):
+                if recycle:
+                    remaining = [i for i, _ in futures[position:]]
+                    yield from self._iter_inline(file_path, remaining, pdf, ocr_dpi, page_timeout)
+                    return
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FuturesTimeoutError:
+                    logger.warning(
+                        "Page extraction deadline exceeded for page %s of %s",
+                        index + 1,
+                        file_path,
+                    )
+                    result = {"method": "ocr_failed", "sentences": []}
+                    recycle = True
+                except BrokenProcessPool:
+                    logger.warning("Page worker pool broke; extracting remaining pages inline")
+                    recycle = True
+                    result = next(self._iter_inline(file_path, [index], pdf, ocr_dpi, page_timeout))[1]
+                except Exception as e:
+                    logger.warning("Extraction failed for page %s: %s", index + 1, e)
+                    result = {"method": "ocr_failed", "sentences": []}
+                yield index, result
+        finally:
+            if recycle:
+                self._recycle_executor()
+            else:
+                for _, future in futures:
+                    future.cancel()
+
+    def _iter_inline(
+        self,
+        file_path: str,
+        page_indices: list[int],
+        pdf,
+        ocr_dpi: int,
+        page_timeout: float,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        for index in page_indices:
+            if pdf is None:
+                yield index, _extract_pdf_page_from_file(file_path, index, ocr_dpi, page_timeout)
+            else:
+                yield index, _extract_pdf_page(pdf.pages[index], index + 1, ocr_dpi, page_timeout)
 
-            return (
-                text_content
-                if text_content
-                else [
-                    {
-                        "sentence": "Error: No text could be extracted from the PDF.",
-                        "source": "parser",
-                    },
-                ]
+
+_page_extraction_engine: PageExtractionEngine | None = None
+_page_extraction_engine_lock = threading.Lock()
+
+
+def get_page_extraction_engine() -> PageExtractionEngine:
+    """Return the shared page extraction engine, creating it on first use."""
+    global _page_extraction_engine
+    with _page_extraction_engine_lock:
+        if _page_extraction_engine is None:
+            parsing_settings = get_settings().parsing
+            _page_extraction_engine = PageExtractionEngine(
+                max_workers=parsing_settings.max_workers,
+                min_pages_for_pool=parsing_settings.min_pages_for_pool,
             )
+            atexit.register(_page_extraction_engine.shutdown)
+        return _page_extraction_engine
+
+
+def _iter_pdf_pages(file_path: str) -> Iterator[dict[str, Any]]:
+    """Yield one record per PDF page, in page order, as pages become available.
+
+    Each page is cached independently, so a PDF that differs from a previously
+    parsed one on a single page only re-extracts (and re-OCRs) that page.
+    Pages that miss the cache are extracted in parallel by the shared
+    :class:`PageExtractionEngine`. Records have the shape
+    ``{"page": n, "method": ..., "sentences": [{"sentence", "source"}, ...]}``.
+    """
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        cached_pages: dict[int, dict[str, Any]] = {}
+        page_cache_keys: dict[int, str] = {}
+
+        for page_index, page in enumerate(pdf.pages):
+            page_fingerprint = _get_pdf_page_fingerprint(page)
+            if not page_fingerprint:
+                continue
+            cache_key = _get_page_cache_key(page_fingerprint)
+            cached_page = cache_service.get_from_disk(cache_key)
+            if isinstance(cached_page, dict) and "sentences" in cached_page:
+                cached_pages[page_index] = cached_page
+            else:
+                page_cache_keys[page_index] = cache_key
+
+        pending = [index for index in range(page_count) if index not in cached_pages]
+        logger.info(
+            "PDF pages: %d total, %d from page cache", page_count, len(cached_pages)
+        )
+        extracted = get_page_extraction_engine().iter_pages(file_path, pending, pdf=pdf)
+
+        try:
+            for page_index in range(page_count):
+                page_result = cached_pages.get(page_index)
+                if page_result is None:
+                    _, page_result = next(extracted)
+                    cache_key = page_cache_keys.get(page_index)
+                    if cache_key and page_result["method"] in ("text", "ocr"):
+                        cache_service.set_to_disk(cache_key, page_result)
+                yield {
+                    "page": page_index + 1,
+                    "method": page_result["method"],
+                    "sentences": _page_result_to_records(page_index + 1, page_result),
+                }
+        finally:
+            extracted.close()
+
+
+def _page_result_to_records(
+    page_number: int, page_result: dict[str, Any]
+) -> list[dict[str, str]]:
+    """Convert a cached/extracted page result into sentence records."""
+    method = page_result["method"]
+    if method == "text":
+        return [
+            {"sentence": sentence, "source": f"pdf_page_{page_number}"}
+            for sentence in page_result["sentences"]
+        ]
+    if method == "ocr":
+        return [
+            {"sentence": sentence, "source": f"ocr_page_{page_number}"}
+            for sentence in page_result["sentences"]
+        ]
+    if method == "ocr_failed":
+        return [
+            {
+                "sentence": OCR_FAILED_PAGE_MESSAGE.format(page=page_number),
+                "source": "parser",
+            }
+        ]
+    return [
+        {
+            "sentence": f"Warning: Page {page_number} appears to be scanned but OCR is not available. Install pytesseract for scanned document support.",
+            "source": "parser",
+        }
+    ]
+
+
+def _parse_pdf_with_ocr(file_path: str) -> list[dict[str, str]]:
+    """Parse PDF with OCR fallback for scanned documents."""
+    try:
+        text_content = []
+        ocr_pages = []
+        for page_record in _iter_pdf_pages(file_path):
+            text_content.extend(page_record["sentences"])
+            if page_record["method"] == "ocr" and page_record["sentences"]:
+                ocr_pages.append(page_record["page"])
+
+        if ocr_pages:
+            logger.info("OCR was used for pages: %s", ocr_pages)
+            text_content.insert(
+                0,
+                {
+                    "sentence": f"Note: OCR was used to extract text from scanned pages: {', '.join(map(str, ocr_pages))}",
+                    "source": "ocr_info",
+                },
+            )
+
+        return (
+            text_content
+            if text_content
+            else [
+                {
+                    "sentence": "Error: No text could be extracted from the PDF.",
+                    "source": "parser",
+                },
+            ]
+        )
 
     except (OSError, FileNotFoundError) as e:
         logger.exception("PDF parsing failed for %s: {e}", file_path)
@@ -4,12 +4,18 @@ Replaces in-memory task tracking with persistent storage
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import queue
 import sqlite3
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import Future
 from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
+from functools import partial
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -52,18 +58,216 @@ class TaskMetadata:
             self.created_at = datetime.now(timezone.utc)
 
 
+# Fields a progress callback touches; updates limited to these are coalesced.
+PROGRESS_FIELDS = frozenset({"status", "progress", "status_message"})
+_TERMINAL_STATUSES = frozenset(
+    {TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED}
+)
+_STOP = object()
+
+
+def _encode_value(field: str, value: Any) -> Any:
+    """Convert a task field to its SQLite column representation."""
+    if field == "status" and isinstance(value, TaskStatus):
+        return value.value
+    if field in ("created_at", "started_at", "completed_at") and isinstance(
+        value, datetime
+    ):
+        return value.isoformat()
+    if field == "result_data" and isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _is_progress_update(fields: Dict[str, Any]) -> bool:
+    return (
+        bool(fields)
+        and fields.keys() <= PROGRESS_FIELDS
+        and fields.get("status") not in _TERMINAL_STATUSES
+    )
+
+
+class _TaskWriter:
+    """Owns the registry's single write connection on a dedicated thread.
+
+    Writes are queued and applied in order. Queued operations are drained
+    into one transaction, and progress-only updates are held for up to
+    ``coalesce_window`` seconds so consecutive updates to the same task
+    collapse into a single UPDATE. Pending progress is always flushed before
+    any other write, so a late progress update can never overwrite a final
+    status. Each write runs under its own savepoint, so a write that fails
+    is rolled back alone and only its caller sees the error.
+    """
+
+    def __init__(self, db_path: str, coalesce_window: float, max_batch: int = 256):
+        self.db_path = db_path
+        self.coalesce_window = coalesce_window
+        self.max_batch = max_batch
+        self.stats = {"writes": 0, "coalesced": 0, "transactions": 0}
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="task-registry-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, op: Callable[[sqlite3.Connection], Any]) -> Future:
+        future: Future = Future()
+        self._queue.put(("op", op, future))
+        return future
+
+    def submit_progress(self, task_id: str, fields: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        self._queue.put(("progress", (task_id, fields), future))
+        return future
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        # Transactions and savepoints are managed explicitly in _transaction.
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # task_id -> (merged fields, futures waiting on the flush)
+        pending: Dict[str, tuple[Dict[str, Any], List[Future]]] = {}
+        deadline: float | None = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._transaction(conn, pending, [])
+                    deadline = None
+                    continue
+
+                batch = [item]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = any(entry is _STOP for entry in batch)
+                ops = []
+                for entry in batch:
+                    if entry is _STOP:
+                        continue
+                    kind, payload, future = entry
+                    if kind == "progress":
+                        task_id, fields = payload
+                        if ops:
+                            # Keep ordering: flush ahead of this task's later writes.
+                            ops.append(("progress", payload, future))
+                            continue
+                        merged, futures = pending.setdefault(task_id, ({}, []))
+                        if futures:
+                            self.stats["coalesced"] += 1
+                        merged.update(fields)
+                        futures.append(future)
+                    else:
+                        ops.append((kind, payload, future))
+
+                if ops or stopping:
+                    self._transaction(conn, pending, ops)
+                    deadline = None
+                elif pending and deadline is None:
+                    deadline = time.monotonic() + self.coalesce_window
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def _transaction(
+        self,
+        conn: sqlite3.Connection,
+        pending: Dict[str, tuple[Dict[str, Any], List[Future]]],
+        ops: list,
+    ) -> None:
+        """Apply pending progress, then ``ops`` in order, in one transaction."""
+        writes: list[tuple[list[Future], Callable[[sqlite3.Connection], Any]]] = [
+            (futures, partial(self._apply_update, task_id=task_id, fields=fields))
+            for task_id, (fields, futures) in pending.items()
+        ]
+        pending.clear()
+        for kind, payload, future in ops:
+            if kind == "progress":
+                task_id, fields = payload
+                payload = partial(self._apply_update, task_id=task_id, fields=fields)
+            writes.append(([future], payload))
+
+        outcomes: list[tuple[list[Future], bool, Any]] = []
+        try:
+            conn.execute("BEGIN")
+            for futures, op in writes:
+                outcomes.append((futures, *self._apply_savepoint(conn, op)))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.error("Task registry transaction failed", error=str(e))
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for futures, _ in writes:
+                for future in futures:
+                    future.set_exception(e)
+            return
+        self.stats["transactions"] += 1
+        for futures, ok, value in outcomes:
+            for future in futures:
+                if ok:
+                    self.stats["writes"] += 1
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    @staticmethod
+    def _apply_savepoint(
+        conn: sqlite3.Connection, op: Callable[[sqlite3.Connection], Any]
+    ) -> tuple[bool, Any]:
+        """Run ``op`` under a savepoint, rolling back only it if it raises."""
+        conn.execute("SAVEPOINT task_write")
+        try:
+            result = op(conn)
+        except Exception as e:
+            conn.execute("ROLLBACK TO task_write")
+            conn.execute("RELEASE task_write")
+            return False, e
+        conn.execute("RELEASE task_write")
+        return True, result
+
+    @staticmethod
+    def _apply_update(
+        conn: sqlite3.Connection, task_id: str, fields: Dict[str, Any]
+    ) -> bool:
+        columns = ", ".join(f"{field} = ?" for field in fields)
+        values = [_encode_value(field, value) for field, value in fields.items()]
+        cursor = conn.execute(
+            f"UPDATE tasks SET {columns} WHERE task_id = ?", [*values, task_id]
+        )
+        return cursor.rowcount > 0
+
+
 class PersistentTaskRegistry:
-    """Persistent task registry using SQLite for task state management."""
+    """Persistent task registry using SQLite for task state management.
+
+    All writes go through one long-lived WAL connection on a writer thread
+    (see :class:`_TaskWriter`); reads use a separate connection off the event
+    loop, so neither blocks other requests.
+    """
 
-    def __init__(self, db_path: str = "tasks.db"):
+    def __init__(self, db_path: str = "tasks.db", coalesce_window: float = 0.25):
         self.db_path = db_path
-        self._lock = asyncio.Lock()
+        self.coalesce_window = coalesce_window
+        self._writer: _TaskWriter | None = None
+        self._writer_lock = threading.Lock()
+        self._read_conn: sqlite3.Connection | None = None
+        self._read_lock = threading.Lock()
         self._init_database()
 
     def _init_database(self) -> None:
         """Initialize the SQLite database with task table."""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS tasks (
@@ -105,106 +309,106 @@ class PersistentTaskRegistry:
             logger.error("Failed to initialize task database", error=str(e))
             raise
 
+    def _get_writer(self) -> _TaskWriter:
+        """Return the writer thread, starting it on first use."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _TaskWriter(self.db_path, self.coalesce_window)
+                atexit.register(self._shutdown)
+            return self._writer
+
+    async def _write(self, op: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.wrap_future(self._get_writer().submit(op))
+
+    async def _read(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        def _fetch() -> List[sqlite3.Row]:
+            with self._read_lock:
+                if self._read_conn is None:
+                    self._read_conn = sqlite3.connect(
+                        self.db_path, check_same_thread=False
+                    )
+                    self._read_conn.row_factory = sqlite3.Row
+                return self._read_conn.execute(query, params).fetchall()
+
+        return await asyncio.to_thread(_fetch)
+
     async def create_task(self, task_id: str, **kwargs) -> TaskMetadata:
         """Create a new task in the registry."""
-        async with self._lock:
-            try:
-                task = TaskMetadata(task_id=task_id, **kwargs)
-
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute(
-                        """
-                        INSERT INTO tasks (
-                            task_id, status, progress, status_message, filename,
-                            user_id, discipline, analysis_mode, strictness,
-                            created_at, retry_count, max_retries
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            task.task_id,
-                            task.status.value,
-                            task.progress,
-                            task.status_message,
-                            task.filename,
-                            task.user_id,
-                            task.discipline,
-                            task.analysis_mode,
-                            task.strictness,
-                            task.created_at.isoformat(),
-                            task.retry_count,
-                            task.max_retries,
-                        ),
-                    )
-                    conn.commit()
+        try:
+            task = TaskMetadata(task_id=task_id, **kwargs)
 
-                logger.info("Task created", task_id=task_id, status=task.status.value)
-                return task
+            def _insert(conn: sqlite3.Connection) -> None:
+                conn.execute(
+                    """
+                    INSERT INTO tasks (
+                        task_id, status, progress, status_message, filename,
+                        user_id, discipline, analysis_mode, strictness,
+                        created_at, retry_count, max_retries
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        task.task_id,
+                        task.status.value,
+                        task.progress,
+                        task.status_message,
+                        task.filename,
+                        task.user_id,
+                        task.discipline,
+                        task.analysis_mode,
+                        task.strictness,
+                        task.created_at.isoformat(),
+                        task.retry_count,
+                        task.max_retries,
+                    ),
+                )
 
-            except Exception as e:
-                logger.error("Failed to create task", task_id=task_id, error=str(e))
-                raise
+            await self._write(_insert)
+            logger.info("Task created", task_id=task_id, status=task.status.value)
+            return task
 
-    async def update_task(self, task_id: str, **kwargs) -> bool:
-        """Update an existing task."""
-        async with self._lock:
-            try:
-                # Build dynamic update query
-                update_fields = []
-                values = []
-
-                for field, value in kwargs.items():
-                    if field == "status" and isinstance(value, TaskStatus):
-                        value = value.value
-                    elif field in [
-                        "created_at",
-                        "started_at",
-                        "completed_at",
-                    ] and isinstance(value, datetime):
-                        value = value.isoformat()
-                    elif field == "result_data" and isinstance(value, dict):
-                        value = json.dumps(value)
-
-                    update_fields.append(f"{field} = ?")
-                    values.append(value)
-
-                if not update_fields:
-                    return True
-
-                values.append(task_id)
-
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        f"UPDATE tasks SET {', '.join(update_fields)} WHERE task_id = ?",
-                        values,
-                    )
-                    conn.commit()
+        except Exception as e:
+            logger.error("Failed to create task", task_id=task_id, error=str(e))
+            raise
 
-                    if cursor.rowcount > 0:
-                        logger.debug(
-                            "Task updated", task_id=task_id, fields=list(kwargs.keys())
-                        )
-                        return True
-                    else:
-                        logger.warning("Task not found for update", task_id=task_id)
-                        return False
+    def update_task_nowait(self, task_id: str, **kwargs) -> Future:
+        """Queue an update without waiting for it to be written.
+
+        Progress-only updates (status, progress and status_message) are
+        coalesced with other updates to the same task. Safe to call from
+        synchronous callbacks; the returned future resolves to whether the
+        task was found.
+        """
+        writer = self._get_writer()
+        if _is_progress_update(kwargs):
+            return writer.submit_progress(task_id, kwargs)
+        return writer.submit(
+            lambda conn: _TaskWriter._apply_update(conn, task_id, kwargs)
+        )
 
-            except Exception as e:
-                logger.error("Failed to update task", task_id=task_id, error=str(e))
-                return False
+    async def update_task(self, task_id: str, **kwargs) -> bool:
+        """Update an existing task."""
+        if not kwargs:
+            return True
+        try:
+            found = await asyncio.wrap_future(
+                self.update_task_nowait(task_id, **kwargs)
+            )
+        except Exception as e:
+            logger.error("Failed to update task", task_id=task_id, error=str(e))
+            return False
+        if found:
+            logger.debug("Task updated", task_id=task_id, fields=list(kwargs.keys()))
+        else:
+            logger.warning("Task not found for update", task_id=task_id)
+        return found
 
     async def get_task(self, task_id: str) -> Optional[TaskMetadata]:
         """Get a task by ID."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
-                )
-                row = cursor.fetchone()
-
-                if row:
-                    return self._row_to_task(row)
-                return None
+            rows = await self._read("SELECT * FROM tasks WHERE task_id = ?", (task_id,))
+            if rows:
+                return self._row_to_task(rows[0])
+            return None
 
         except Exception as e:
             logger.error("Failed to get task", task_id=task_id, error=str(e))
@@ -215,15 +419,11 @@ class PersistentTaskRegistry:
     ) -> List[TaskMetadata]:
         """Get tasks for a specific user."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM tasks WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
-                    (user_id, limit),
-                )
-                rows = cursor.fetchall()
-
-                return [self._row_to_task(row) for row in rows]
+            rows = await self._read(
+                "SELECT * FROM tasks WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, limit),
+            )
+            return [self._row_to_task(row) for row in rows]
 
         except Exception as e:
             logger.error("Failed to get tasks by user", user_id=user_id, error=str(e))
@@ -234,15 +434,11 @@ class PersistentTaskRegistry:
     ) -> List[TaskMetadata]:
         """Get tasks by status."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
-                    "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC LIMIT ?",
-                    (status.value, limit),
-                )
-                rows = cursor.fetchall()
-
-                return [self._row_to_task(row) for row in rows]
+            rows = await self._read(
+                "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status.value, limit),
+            )
+            return [self._row_to_task(row) for row in rows]
 
         except Exception as e:
             logger.error(
@@ -252,90 +448,77 @@ class PersistentTaskRegistry:
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task."""
-        async with self._lock:
-            try:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        "DELETE FROM tasks WHERE task_id = ?", (task_id,)
-                    )
-                    conn.commit()
-
-                    if cursor.rowcount > 0:
-                        logger.info("Task deleted", task_id=task_id)
-                        return True
-                    return False
+        try:
+            deleted = await self._write(
+                lambda conn: conn.execute(
+                    "DELETE FROM tasks WHERE task_id = ?", (task_id,)
+                ).rowcount
+            )
+            if deleted > 0:
+                logger.info("Task deleted", task_id=task_id)
+                return True
+            return False
 
-            except Exception as e:
-                logger.error("Failed to delete task", task_id=task_id, error=str(e))
-                return False
+        except Exception as e:
+            logger.error("Failed to delete task", task_id=task_id, error=str(e))
+            return False
 
     async def cleanup_old_tasks(self, days_old: int = 7) -> int:
         """Clean up tasks older than specified days."""
-        async with self._lock:
-            try:
-                cutoff_date = datetime.now(timezone.utc).timestamp() - (
-                    days_old * 24 * 60 * 60
+        try:
+            # created_at is stored as an ISO-8601 string, so compare strings.
+            cutoff_date = (
+                datetime.now(timezone.utc) - timedelta(days=days_old)
+            ).isoformat()
+
+            deleted_count = await self._write(
+                lambda conn: conn.execute(
+                    "DELETE FROM tasks WHERE created_at < ? AND status IN ('completed', 'failed', 'cancelled')",
+                    (cutoff_date,),
+                ).rowcount
+            )
+            if deleted_count > 0:
+                logger.info(
+                    "Cleaned up old tasks",
+                    count=deleted_count,
+                    days_old=days_old,
                 )
 
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        "DELETE FROM tasks WHERE created_at < ? AND status IN ('completed', 'failed', 'cancelled')",
-                        (cutoff_date,),
-                    )
-                    conn.commit()
-
-                    deleted_count = cursor.rowcount
-                    if deleted_count > 0:
-                        logger.info(
-                            "Cleaned up old tasks",
-                            count=deleted_count,
-                            days_old=days_old,
-                        )
+            return deleted_count
 
-                    return deleted_count
-
-            except Exception as e:
-                logger.error("Failed to cleanup old tasks", error=str(e))
-                return 0
+        except Exception as e:
+            logger.error("Failed to cleanup old tasks", error=str(e))
+            return 0
 
     async def get_task_statistics(self) -> Dict[str, Any]:
         """Get task statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-
-                # Get counts by status
-                cursor = conn.execute(
-                    """
-                    SELECT status, COUNT(*) as count
-                    FROM tasks
-                    GROUP BY status
-                """
-                )
-                status_counts = {
-                    row["status"]: row["count"] for row in cursor.fetchall()
-                }
-
-                # Get total count
-                cursor = conn.execute("SELECT COUNT(*) as total FROM tasks")
-                total_tasks = cursor.fetchone()["total"]
-
-                # Get recent activity (last 24 hours)
-                cursor = conn.execute(
-                    """
-                    SELECT COUNT(*) as recent
-                    FROM tasks
-                    WHERE created_at > datetime('now', '-1 day')
+            status_rows = await self._read(
                 """
-                )
-                recent_tasks = cursor.fetchone()["recent"]
+                SELECT status, COUNT(*) as count
+                FROM tasks
+                GROUP BY status
+            """
+            )
+            status_counts = {row["status"]: row["count"] for row in status_rows}
+            total_tasks = sum(status_counts.values())
+
+            # Get recent activity (last 24 hours)
+            recent_cutoff = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+            recent_rows = await self._read(
+                "SELECT COUNT(*) as recent FROM tasks WHERE created_at > ?",
+                (recent_cutoff,),
+            )
 
-                return {
-                    "total_tasks": total_tasks,
-                    "recent_tasks_24h": recent_tasks,
-                    "status_counts": status_counts,
-                    "database_path": self.db_path,
-                }
+            stats = {
+                "total_tasks": total_tasks,
+                "recent_tasks_24h": recent_rows[0]["recent"],
+                "status_counts": status_counts,
+                "database_path": self.db_path,
+            }
+            if self._writer is not None:
+                stats["writer"] = dict(self._writer.stats)
+            return stats
 
         except Exception as e:
             logger.error("Failed to get task statistics", error=str(e))
@@ -393,10 +576,20 @@ class PersistentTaskRegistry:
             raise
 
     async def close(self) -> None:
-        """Close the database connection."""
-        # SQLite connections are automatically closed, but we can add cleanup here
+        """Flush queued writes and close the database connections."""
+        await asyncio.to_thread(self._shutdown)
         logger.info("Task registry closed")
 
+    def _shutdown(self) -> None:
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.stop()
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
 
 # Global persistent task registry instance
 persistent_task_registry = PersistentTaskRegistry()
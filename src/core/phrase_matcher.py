@@ -0,0 +1,121 @@
+"""Compiled multi-pattern matching for keyword and pattern heuristics.
+
+The rubric detector counts dozens of keywords and regular expressions in
+every uploaded document. :class:`MultiPatternMatcher` compiles the keywords
+into a single trie-shaped regular expression up front, so the text is scanned
+once however many rubrics, disciplines or document types are configured.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ScanResult:
+    """Hits of a :class:`MultiPatternMatcher` scan.
+
+    Attributes:
+        phrase_counts: Non-overlapping occurrences of each literal phrase, as
+            ``str.count`` would report them on the lowercased text
+        pattern_matches: Matched strings for each pattern, as ``re.findall``
+            would return them on the lowercased text
+
+    """
+
+    phrase_counts: dict[str, int] = field(default_factory=dict)
+    pattern_matches: dict[str, list[str]] = field(default_factory=dict)
+
+
+class MultiPatternMatcher:
+    """Count many literal phrases and regex patterns in a text.
+
+    The phrases are merged into one regular expression shaped like their
+    prefix trie, so at each position the engine follows a single branch
+    instead of trying every phrase in turn, and the whole scan runs inside
+    the regex engine. Wrapped in a lookahead it reports the longest phrase
+    starting at every position; any other phrase starting there is a prefix
+    of it, so those hits are precomputed per phrase. Each phrase's hits are
+    then reduced to the leftmost non-overlapping ones so the counts agree
+    with ``str.count``. Phrases match the lowercased text literally.
+
+    Patterns are deduplicated and compiled once. The text is lowercased
+    before matching, so patterns without uppercase characters are compiled
+    case-sensitively, which keeps the regex engine's fast literal search.
+    """
+
+    def __init__(self, phrases: Iterable[str] = (), patterns: Iterable[str] = ()) -> None:
+        self.phrases = list(dict.fromkeys(p.lower() for p in phrases if p))
+        self.patterns = {
+            pattern: re.compile(
+                pattern, 0 if pattern == pattern.lower() else re.IGNORECASE
+            )
+            for pattern in dict.fromkeys(patterns)
+        }
+
+        trie: dict[str, dict] = {}
+        for phrase in self.phrases:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._regex = (
+            re.compile(f"(?=({_trie_pattern(trie)}))") if self.phrases else None
+        )
+
+        # For each phrase, the phrases (itself included) that are its prefixes
+        ids = {phrase: phrase_id for phrase_id, phrase in enumerate(self.phrases)}
+        self._prefixes = {
+            phrase: tuple(
+                (ids[phrase[:end]], end)
+                for end in range(1, len(phrase) + 1)
+                if phrase[:end] in ids
+            )
+            for phrase in self.phrases
+        }
+
+    def scan(self, text: str) -> ScanResult:
+        """Return the phrase counts and pattern matches in ``text``."""
+        text_lower = text.lower()
+        counts = [0] * len(self.phrases)
+        ends = [0] * len(self.phrases)
+        if self._regex is not None:
+            prefixes = self._prefixes
+            for match in self._regex.finditer(text_lower):
+                start = match.start()
+                for phrase_id, length in prefixes[match.group(1)]:
+                    if start >= ends[phrase_id]:
+                        ends[phrase_id] = start + length
+                        counts[phrase_id] += 1
+
+        return ScanResult(
+            phrase_counts=dict(zip(self.phrases, counts, strict=True)),
+            pattern_matches={
+                pattern: compiled.findall(text_lower)
+                for pattern, compiled in self.patterns.items()
+            },
+        )
+
+    def find_phrases(self, text: str) -> set[str]:
+        """Return the phrases that occur in ``text``, skipping the counting."""
+        if self._regex is None:
+            return set()
+        return {
+            self.phrases[phrase_id]
+            for match in self._regex.finditer(text.lower())
+            for phrase_id, _ in self._prefixes[match.group(1)]
+        }
+
+
+def _trie_pattern(node: dict[str, dict]) -> str:
+    """Return a regex matching the longest phrase of a prefix trie node."""
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # A phrase ends here, so the longer continuations are optional
+    return f"(?:{body})?" if "" in node else body
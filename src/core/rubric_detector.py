@@ -5,9 +5,11 @@ compliance rubric based on key terms, document structure, and content patterns.
 """
 
 import logging
-import re
 from typing import Any
 
+from .document_index import get_document_index
+from .phrase_matcher import MultiPatternMatcher, ScanResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,31 @@ class RubricDetector:
         self.rubric_patterns = self._load_rubric_patterns()
         self.discipline_keywords = self._load_discipline_keywords()
         self.document_type_patterns = self._load_document_type_patterns()
+        self.matcher = self._build_matcher()
+
+    def _build_matcher(self) -> MultiPatternMatcher:
+        """Compile every rubric, discipline and document type term into one matcher."""
+        phrases = [
+            keyword
+            for config in self.rubric_patterns.values()
+            for keyword in config["keywords"]
+        ]
+        phrases += [
+            keyword
+            for keywords in self.discipline_keywords.values()
+            for keyword in keywords
+        ]
+        phrases += [
+            pattern
+            for patterns in self.document_type_patterns.values()
+            for pattern in patterns
+        ]
+        patterns = [
+            pattern
+            for config in self.rubric_patterns.values()
+            for pattern in config["patterns"]
+        ]
+        return MultiPatternMatcher(phrases, patterns)
 
     def _load_rubric_patterns(self) -> dict[str, dict[str, Any]]:
         """Load patterns and keywords for each rubric type."""
@@ -339,9 +366,11 @@ class RubricDetector:
         if not document_text or not document_text.strip():
             return "default", 0.0, {"reason": "empty_document"}
 
-        # Normalize text for analysis
-        text_lower = document_text.lower()
-        text_words = set(re.findall(r"\b\w+\b", text_lower))
+        # The index is shared with detect_discipline and the other validators;
+        # one matcher pass over it finds every keyword and pattern hit.
+        index = get_document_index(document_text)
+        text_words = set(index.tokens)
+        scan = index.scan(self.matcher)
 
         # Calculate scores for each rubric
         rubric_scores = {}
@@ -358,10 +387,9 @@ class RubricDetector:
 
             # Check keyword matches
             for keyword in rubric_config["keywords"]:
-                keyword_lower = keyword.lower()
-                if keyword_lower in text_lower:
+                frequency = scan.phrase_counts[keyword.lower()]
+                if frequency:
                     # Weight by keyword frequency and importance
-                    frequency = text_lower.count(keyword_lower)
                     weight = rubric_config["weight"]
                     keyword_score = min(
                         frequency * weight, 5.0
@@ -378,7 +406,7 @@ class RubricDetector:
 
             # Check pattern matches
             for pattern in rubric_config["patterns"]:
-                pattern_matches = re.findall(pattern, text_lower, re.IGNORECASE)
+                pattern_matches = scan.pattern_matches[pattern]
                 if pattern_matches:
                     frequency = len(pattern_matches)
                     weight = rubric_config["weight"]
@@ -397,7 +425,7 @@ class RubricDetector:
                     )
 
             # Apply document type bonus
-            doc_type_bonus = self._calculate_document_type_bonus(text_lower, rubric_id)
+            doc_type_bonus = self._calculate_document_type_bonus(scan, rubric_id)
             score += doc_type_bonus
 
             # Apply filename bonus
@@ -438,7 +466,7 @@ class RubricDetector:
 
         return best_rubric_id, confidence, detection_details
 
-    def _calculate_document_type_bonus(self, text_lower: str, rubric_id: str) -> float:
+    def _calculate_document_type_bonus(self, scan: ScanResult, rubric_id: str) -> float:
         """Calculate bonus score based on document type patterns."""
         bonus = 0.0
 
@@ -448,7 +476,7 @@ class RubricDetector:
             for doc_type, patterns in self.document_type_patterns.items():
                 if doc_type in ["evaluation", "assessment"]:
                     for pattern in patterns:
-                        if pattern in text_lower:
+                        if scan.phrase_counts[pattern]:
                             bonus += 2.0
                             break
 
@@ -457,7 +485,7 @@ class RubricDetector:
             for doc_type, patterns in self.document_type_patterns.items():
                 if doc_type in ["progress_note", "plan_of_care"]:
                     for pattern in patterns:
-                        if pattern in text_lower:
+                        if scan.phrase_counts[pattern]:
                             bonus += 1.5
                             break
 
@@ -502,15 +530,13 @@ class RubricDetector:
         if not document_text:
             return "pt", 0.0
 
-        text_lower = document_text.lower()
+        scan = get_document_index(document_text).scan(self.matcher)
         discipline_scores = {}
 
         for discipline, keywords in self.discipline_keywords.items():
             score = 0.0
             for keyword in keywords:
-                if keyword in text_lower:
-                    frequency = text_lower.count(keyword)
-                    score += frequency
+                score += scan.phrase_counts[keyword]
 
             discipline_scores[discipline] = score
 
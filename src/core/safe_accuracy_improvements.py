@@ -17,6 +17,7 @@ from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 from src.core.centralized_logging import get_logger, audit_logger
+from src.core.document_index import DocumentIndex, get_document_index
 from src.core.type_safety import Result, ErrorHandler
 
 logger = get_logger(__name__)
@@ -83,6 +84,10 @@ class SafeAccuracyEnhancer:
             enhanced_result = analysis_result.copy()
             applied_improvements = []
 
+            # Every strategy queries the same document index instead of
+            # re-lowercasing and re-splitting the text per finding
+            index = get_document_index(document_text)
+
             # Apply safe improvements in order of safety and impact
             safe_strategies = [
                 (SafeImprovementStrategy.CONTEXT_AUGMENTATION, self._apply_context_augmentation),
@@ -105,7 +110,7 @@ class SafeAccuracyEnhancer:
                         continue
 
                     # Apply improvement
-                    improvement_result = await apply_func(enhanced_result, document_text, context)
+                    improvement_result = await apply_func(enhanced_result, index, context)
 
                     if improvement_result.success:
                         enhanced_result = improvement_result.data
@@ -181,7 +186,7 @@ class SafeAccuracyEnhancer:
     async def _apply_context_augmentation(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply context augmentation for better accuracy."""
@@ -197,7 +202,7 @@ class SafeAccuracyEnhancer:
                 finding_text = finding.get('text', '')
 
                 # Extract relevant context from document
-                relevant_context = self._extract_relevant_context(finding_text, document_text)
+                relevant_context = self._extract_relevant_context(finding_text, index)
                 finding['augmented_context'] = relevant_context
 
                 # Boost confidence based on context richness
@@ -225,7 +230,7 @@ class SafeAccuracyEnhancer:
     async def _apply_semantic_similarity(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply semantic similarity matching for better accuracy."""
@@ -280,7 +285,7 @@ class SafeAccuracyEnhancer:
     async def _apply_confidence_thresholding(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply confidence thresholding for better accuracy."""
@@ -329,7 +334,7 @@ class SafeAccuracyEnhancer:
     async def _apply_multi_pass_validation(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply multi-pass validation for better accuracy."""
@@ -344,10 +349,10 @@ class SafeAccuracyEnhancer:
             validated_findings = self._consistency_check(findings)
 
             # Pass 2: Completeness check
-            validated_findings = self._completeness_check(validated_findings, document_text)
+            validated_findings = self._completeness_check(validated_findings, index)
 
             # Pass 3: Accuracy check
-            validated_findings = self._accuracy_check(validated_findings, document_text)
+            validated_findings = self._accuracy_check(validated_findings, index)
 
             enhanced_result['findings'] = validated_findings
             enhanced_result['multi_pass_validation'] = {
@@ -376,7 +381,7 @@ class SafeAccuracyEnhancer:
     async def _apply_temporal_consistency(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply temporal consistency checking."""
@@ -387,7 +392,7 @@ class SafeAccuracyEnhancer:
             enhanced_result = analysis_result.copy()
 
             # Extract temporal information
-            temporal_info = self._extract_temporal_info(document_text)
+            temporal_info = self._extract_temporal_info(index)
 
             # Check findings for temporal consistency
             findings = enhanced_result.get('findings', [])
@@ -427,7 +432,7 @@ class SafeAccuracyEnhancer:
     async def _apply_cross_reference_validation(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply cross-reference validation."""
@@ -483,7 +488,7 @@ class SafeAccuracyEnhancer:
     async def _apply_adaptive_ensemble_weighting(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply adaptive ensemble weighting."""
@@ -494,7 +499,7 @@ class SafeAccuracyEnhancer:
             enhanced_result = analysis_result.copy()
 
             # Analyze document characteristics
-            doc_characteristics = self._analyze_document_characteristics(document_text)
+            doc_characteristics = self._analyze_document_characteristics(index)
 
             # Adjust ensemble weights based on characteristics
             adjusted_weights = self._calculate_adaptive_weights(doc_characteristics)
@@ -532,7 +537,7 @@ class SafeAccuracyEnhancer:
     async def _apply_contextual_prompt_optimization(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply contextual prompt optimization."""
@@ -543,7 +548,7 @@ class SafeAccuracyEnhancer:
             enhanced_result = analysis_result.copy()
 
             # Analyze context for prompt optimization
-            context_analysis = self._analyze_context_for_prompts(document_text, context)
+            context_analysis = self._analyze_context_for_prompts(index, context)
 
             # Generate optimized prompts
             optimized_prompts = self._generate_optimized_prompts(context_analysis)
@@ -581,7 +586,7 @@ class SafeAccuracyEnhancer:
     async def _apply_progressive_refinement(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply progressive refinement."""
@@ -596,13 +601,13 @@ class SafeAccuracyEnhancer:
             refined_findings = findings.copy()
 
             # Stage 1: Basic refinement
-            refined_findings = self._basic_refinement(refined_findings, document_text)
+            refined_findings = self._basic_refinement(refined_findings, index)
 
             # Stage 2: Context refinement
-            refined_findings = self._context_refinement(refined_findings, document_text, context)
+            refined_findings = self._context_refinement(refined_findings, index, context)
 
             # Stage 3: Final refinement
-            refined_findings = self._final_refinement(refined_findings, document_text)
+            refined_findings = self._final_refinement(refined_findings, index)
 
             enhanced_result['findings'] = refined_findings
             enhanced_result['progressive_refinement'] = {
@@ -631,7 +636,7 @@ class SafeAccuracyEnhancer:
     async def _apply_knowledge_graph_enhancement(
         self,
         analysis_result: Dict[str, Any],
-        document_text: str,
+        index: DocumentIndex,
         context: Optional[Dict[str, Any]]
     ) -> Result[Dict[str, Any], str]:
         """Apply knowledge graph enhancement."""
@@ -642,7 +647,7 @@ class SafeAccuracyEnhancer:
             enhanced_result = analysis_result.copy()
 
             # Extract entities for knowledge graph
-            entities = self._extract_entities_for_knowledge_graph(document_text)
+            entities = self._extract_entities_for_knowledge_graph(index)
 
             # Build simple knowledge graph
             knowledge_graph = self._build_simple_knowledge_graph(entities)
@@ -686,20 +691,12 @@ class SafeAccuracyEnhancer:
             logger.error("Knowledge graph enhancement failed: %s", e)
             return Result.error(f"Knowledge graph enhancement failed: {e}")
 
-    def _extract_relevant_context(self, finding_text: str, document_text: str) -> List[str]:
+    def _extract_relevant_context(self, finding_text: str, index: DocumentIndex) -> List[str]:
         """Extract relevant context from document."""
         try:
             # Simple context extraction based on keywords
             keywords = finding_text.lower().split()
-            sentences = document_text.split('.')
-
-            relevant_sentences = []
-            for sentence in sentences:
-                sentence_lower = sentence.lower()
-                if any(keyword in sentence_lower for keyword in keywords):
-                    relevant_sentences.append(sentence.strip())
-
-            return relevant_sentences[:3]  # Return top 3 relevant sentences
+            return index.sentences_with_any(keywords, limit=3)  # Return top 3 relevant sentences
 
         except Exception as e:
             logger.error("Context extraction failed: %s", e)
@@ -749,7 +746,7 @@ class SafeAccuracyEnhancer:
             logger.error("Consistency check failed: %s", e)
             return findings
 
-    def _completeness_check(self, findings: List[Dict[str, Any]], document_text: str) -> List[Dict[str, Any]]:
+    def _completeness_check(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[Dict[str, Any]]:
         """Check completeness of findings."""
         try:
             validated_findings = []
@@ -772,7 +769,7 @@ class SafeAccuracyEnhancer:
             logger.error("Completeness check failed: %s", e)
             return findings
 
-    def _accuracy_check(self, findings: List[Dict[str, Any]], document_text: str) -> List[Dict[str, Any]]:
+    def _accuracy_check(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[Dict[str, Any]]:
         """Check accuracy of findings."""
         try:
             validated_findings = []
@@ -781,7 +778,7 @@ class SafeAccuracyEnhancer:
                 finding_text = finding.get('text', '')
 
                 # Simple accuracy check - verify finding is supported by document
-                if any(word in document_text.lower() for word in finding_text.lower().split()[:3]):
+                if any(index.contains(word) for word in finding_text.lower().split()[:3]):
                     finding['accuracy_check'] = 'passed'
                 else:
                     finding['accuracy_check'] = 'questionable'
@@ -795,7 +792,7 @@ class SafeAccuracyEnhancer:
             logger.error("Accuracy check failed: %s", e)
             return findings
 
-    def _extract_temporal_info(self, document_text: str) -> Dict[str, Any]:
+    def _extract_temporal_info(self, index: DocumentIndex) -> Dict[str, Any]:
         """Extract temporal information from document."""
         try:
             temporal_info = {
@@ -812,7 +809,7 @@ class SafeAccuracyEnhancer:
             ]
 
             for pattern in time_patterns:
-                matches = re.findall(pattern, document_text.lower())
+                matches = re.findall(pattern, index.lower)
                 temporal_info['time_references'].extend(matches)
 
             return temporal_info
@@ -891,15 +888,15 @@ class SafeAccuracyEnhancer:
             logger.error("Cross-reference detection failed: %s", e)
             return False
 
-    def _analyze_document_characteristics(self, document_text: str) -> Dict[str, Any]:
+    def _analyze_document_characteristics(self, index: DocumentIndex) -> Dict[str, Any]:
         """Analyze document characteristics."""
         try:
             characteristics = {
-                'length': len(document_text),
-                'complexity': len(document_text.split()) / max(1, len(document_text.split('.'))),
-                'medical_terminology_density': self._calculate_medical_density(document_text),
-                'temporal_references': len(re.findall(r'\b(?:am|pm|morning|afternoon|evening|night)\b', document_text.lower())),
-                'certainty_indicators': len(re.findall(r'\b(?:definitely|certainly|clearly|obviously)\b', document_text.lower()))
+                'length': len(index.text),
+                'complexity': index.total_words / max(1, index.count('.') + 1),
+                'medical_terminology_density': self._calculate_medical_density(index),
+                'temporal_references': len(re.findall(r'\b(?:am|pm|morning|afternoon|evening|night)\b', index.lower)),
+                'certainty_indicators': len(re.findall(r'\b(?:definitely|certainly|clearly|obviously)\b', index.lower))
             }
 
             return characteristics
@@ -908,7 +905,7 @@ class SafeAccuracyEnhancer:
             logger.error("Document characteristics analysis failed: %s", e)
             return {}
 
-    def _calculate_medical_density(self, document_text: str) -> float:
+    def _calculate_medical_density(self, index: DocumentIndex) -> float:
         """Calculate medical terminology density."""
         try:
             medical_terms = [
@@ -917,10 +914,9 @@ class SafeAccuracyEnhancer:
                 'medical', 'healthcare', 'therapeutic', 'intervention'
             ]
 
-            words = document_text.lower().split()
-            medical_word_count = sum(1 for word in words if word in medical_terms)
+            medical_word_count = sum(index.word_counts[term] for term in medical_terms)
 
-            return medical_word_count / max(1, len(words))
+            return medical_word_count / max(1, index.total_words)
 
         except Exception as e:
             logger.error("Medical density calculation failed: %s", e)
@@ -955,14 +951,14 @@ class SafeAccuracyEnhancer:
             logger.error("Adaptive weight calculation failed: %s", e)
             return {'finding_weight': 1.0, 'confidence_multiplier': 1.0, 'complexity_factor': 1.0}
 
-    def _analyze_context_for_prompts(self, document_text: str, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_context_for_prompts(self, index: DocumentIndex, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze context for prompt optimization."""
         try:
             analysis = {
-                'document_type': self._detect_document_type(document_text),
-                'complexity_level': self._assess_complexity(document_text),
-                'medical_focus': self._assess_medical_focus(document_text),
-                'compliance_focus': self._assess_compliance_focus(document_text)
+                'document_type': self._detect_document_type(index),
+                'complexity_level': self._assess_complexity(index),
+                'medical_focus': self._assess_medical_focus(index),
+                'compliance_focus': self._assess_compliance_focus(index)
             }
 
             return analysis
@@ -971,16 +967,14 @@ class SafeAccuracyEnhancer:
             logger.error("Context analysis for prompts failed: %s", e)
             return {}
 
-    def _detect_document_type(self, document_text: str) -> str:
+    def _detect_document_type(self, index: DocumentIndex) -> str:
         """Detect document type."""
         try:
-            text_lower = document_text.lower()
-
-            if 'progress note' in text_lower or 'progress' in text_lower:
+            if index.contains('progress note') or index.contains('progress'):
                 return 'progress_note'
-            elif 'evaluation' in text_lower or 'assessment' in text_lower:
+            elif index.contains('evaluation') or index.contains('assessment'):
                 return 'evaluation'
-            elif 'treatment plan' in text_lower or 'plan' in text_lower:
+            elif index.contains('treatment plan') or index.contains('plan'):
                 return 'treatment_plan'
             else:
                 return 'general'
@@ -989,11 +983,11 @@ class SafeAccuracyEnhancer:
             logger.error("Document type detection failed: %s", e)
             return 'general'
 
-    def _assess_complexity(self, document_text: str) -> str:
+    def _assess_complexity(self, index: DocumentIndex) -> str:
         """Assess document complexity."""
         try:
-            word_count = len(document_text.split())
-            sentence_count = len(document_text.split('.'))
+            word_count = index.total_words
+            sentence_count = index.count('.') + 1
 
             if word_count > 1000 and sentence_count > 20:
                 return 'high'
@@ -1006,7 +1000,7 @@ class SafeAccuracyEnhancer:
             logger.error("Complexity assessment failed: %s", e)
             return 'medium'
 
-    def _assess_medical_focus(self, document_text: str) -> str:
+    def _assess_medical_focus(self, index: DocumentIndex) -> str:
         """Assess medical focus."""
         try:
             medical_terms = [
@@ -1014,8 +1008,7 @@ class SafeAccuracyEnhancer:
                 'medication', 'procedure', 'assessment', 'evaluation', 'clinical'
             ]
 
-            text_lower = document_text.lower()
-            medical_count = sum(1 for term in medical_terms if term in text_lower)
+            medical_count = sum(1 for term in medical_terms if index.contains(term))
 
             if medical_count > 10:
                 return 'high'
@@ -1028,7 +1021,7 @@ class SafeAccuracyEnhancer:
             logger.error("Medical focus assessment failed: %s", e)
             return 'medium'
 
-    def _assess_compliance_focus(self, document_text: str) -> str:
+    def _assess_compliance_focus(self, index: DocumentIndex) -> str:
         """Assess compliance focus."""
         try:
             compliance_terms = [
@@ -1036,8 +1029,7 @@ class SafeAccuracyEnhancer:
                 'guideline', 'protocol', 'procedure', 'documentation'
             ]
 
-            text_lower = document_text.lower()
-            compliance_count = sum(1 for term in compliance_terms if term in text_lower)
+            compliance_count = sum(1 for term in compliance_terms if index.contains(term))
 
             if compliance_count > 5:
                 return 'high'
@@ -1094,7 +1086,7 @@ class SafeAccuracyEnhancer:
             logger.error("Optimized prompt generation failed: %s", e)
             return {'finding_prompt': '', 'optimization_score': 0.5}
 
-    def _basic_refinement(self, findings: List[Dict[str, Any]], document_text: str) -> List[Dict[str, Any]]:
+    def _basic_refinement(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[Dict[str, Any]]:
         """Basic refinement stage."""
         try:
             refined_findings = []
@@ -1118,7 +1110,7 @@ class SafeAccuracyEnhancer:
             logger.error("Basic refinement failed: %s", e)
             return findings
 
-    def _context_refinement(self, findings: List[Dict[str, Any]], document_text: str, context: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _context_refinement(self, findings: List[Dict[str, Any]], index: DocumentIndex, context: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Context refinement stage."""
         try:
             refined_findings = []
@@ -1127,7 +1119,7 @@ class SafeAccuracyEnhancer:
                 finding_text = finding.get('text', '')
 
                 # Context-based refinement
-                if self._is_contextually_supported(finding_text, document_text):
+                if self._is_contextually_supported(finding_text, index):
                     finding['context_refinement'] = 'passed'
                     finding['confidence'] = min(1.0, finding.get('confidence', 0.5) + 0.08)
                 else:
@@ -1142,7 +1134,7 @@ class SafeAccuracyEnhancer:
             logger.error("Context refinement failed: %s", e)
             return findings
 
-    def _final_refinement(self, findings: List[Dict[str, Any]], document_text: str) -> List[Dict[str, Any]]:
+    def _final_refinement(self, findings: List[Dict[str, Any]], index: DocumentIndex) -> List[Dict[str, Any]]:
         """Final refinement stage."""
         try:
             refined_findings = []
@@ -1151,7 +1143,7 @@ class SafeAccuracyEnhancer:
                 finding_text = finding.get('text', '')
 
                 # Final refinement checks
-                if self._passes_final_checks(finding_text, document_text):
+                if self._passes_final_checks(finding_text, index):
                     finding['final_refinement'] = 'passed'
                     finding['confidence'] = min(1.0, finding.get('confidence', 0.5) + 0.03)
                 else:
@@ -1166,28 +1158,27 @@ class SafeAccuracyEnhancer:
             logger.error("Final refinement failed: %s", e)
             return findings
 
-    def _is_contextually_supported(self, finding_text: str, document_text: str) -> bool:
+    def _is_contextually_supported(self, finding_text: str, index: DocumentIndex) -> bool:
         """Check if finding is contextually supported."""
         try:
             finding_words = set(finding_text.lower().split())
-            document_words = set(document_text.lower().split())
 
             # Check for word overlap
-            overlap = finding_words.intersection(document_words)
+            overlap = finding_words.intersection(index.words)
             return len(overlap) >= 2
 
         except Exception as e:
             logger.error("Contextual support check failed: %s", e)
             return False
 
-    def _passes_final_checks(self, finding_text: str, document_text: str) -> bool:
+    def _passes_final_checks(self, finding_text: str, index: DocumentIndex) -> bool:
         """Check if finding passes final checks."""
         try:
             # Final checks
             if len(finding_text.split()) < 3:
                 return False
 
-            if not any(word in document_text.lower() for word in finding_text.lower().split()[:3]):
+            if not any(index.contains(word) for word in finding_text.lower().split()[:3]):
                 return False
 
             return True
@@ -1196,13 +1187,14 @@ class SafeAccuracyEnhancer:
             logger.error("Final checks failed: %s", e)
             return False
 
-    def _extract_entities_for_knowledge_graph(self, document_text: str) -> List[Dict[str, Any]]:
+    def _extract_entities_for_knowledge_graph(self, index: DocumentIndex) -> List[Dict[str, Any]]:
         """Extract entities for knowledge graph."""
         try:
             entities = []
 
             # Simple entity extraction
-            words = document_text.split()
+            words = index.text.split()
+            word_counts = Counter(words)
             medical_terms = [
                 'patient', 'diagnosis', 'treatment', 'therapy', 'symptom', 'condition',
                 'medication', 'procedure', 'assessment', 'evaluation', 'clinical'
@@ -1214,7 +1206,7 @@ class SafeAccuracyEnhancer:
                     entities.append({
                         'text': word_lower,
                         'type': 'medical_term',
-                        'frequency': words.count(word)
+                        'frequency': word_counts[word]
                     })
 
             return entities
@@ -0,0 +1,111 @@
+"""Share one in-flight computation between identical concurrent requests.
+
+When a request arrives for a key that is already being computed, it attaches
+to the running computation instead of starting another one: it is sent the
+latest progress update straight away, receives every later one, and gets the
+same result (or exception). The computation runs in its own task, tagged
+with its own inference task id, so one requester cancelling does not affect
+the others; it is cancelled only once every requester has gone.
+
+Deduplication is per process. Across workers, results are shared through
+the L2 cache once the first run has finished.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.core.inference_executor import current_task_id, get_inference_executor
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, str | None], None]
+
+
+class _Flight:
+    """A running computation and the requesters waiting on it."""
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self.task_id = f"flight-{key}"
+        self.task: asyncio.Task[Any] | None = None
+        self.callbacks: list[ProgressCallback] = []
+        self.waiters = 0
+        self.last_progress: tuple[int, str | None] | None = None
+
+    def report(self, percentage: int, message: str | None) -> None:
+        self.last_progress = (percentage, message)
+        for callback in list(self.callbacks):
+            try:
+                callback(percentage, message)
+            except Exception as exc:
+                logger.warning("Progress callback failed for %s: %s", self.key, exc)
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one computation."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.stats = {"started": 0, "joined": 0}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def in_flight(self, key: str) -> bool:
+        """Return whether a computation for ``key`` is running."""
+        return key in self._flights
+
+    async def run(
+        self,
+        key: str,
+        func: Callable[[ProgressCallback], Awaitable[Any]],
+        progress_callback: ProgressCallback | None = None,
+    ) -> Any:
+        """Return ``await func(progress)``, sharing it with concurrent callers of ``key``.
+
+        ``func`` receives a progress callback that fans out to every
+        requester's ``progress_callback``.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._start(key, func)
+        else:
+            self.stats["joined"] += 1
+            logger.info("Joining in-flight computation for key: %s", key)
+            if progress_callback and flight.last_progress is not None:
+                progress_callback(*flight.last_progress)
+
+        if progress_callback:
+            flight.callbacks.append(progress_callback)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if progress_callback:
+                flight.callbacks.remove(progress_callback)
+            if flight.waiters == 0 and not flight.task.done():
+                logger.info("All requesters left; cancelling computation for key: %s", key)
+                flight.task.cancel()
+                get_inference_executor().cancel_task(flight.task_id)
+                self._discard(flight)
+
+    def _start(
+        self, key: str, func: Callable[[ProgressCallback], Awaitable[Any]]
+    ) -> _Flight:
+        flight = _Flight(key)
+        self._flights[key] = flight
+        self.stats["started"] += 1
+        token = current_task_id.set(flight.task_id)
+        try:
+            flight.task = asyncio.create_task(func(flight.report), name=flight.task_id)
+        finally:
+            current_task_id.reset(token)
+        flight.task.add_done_callback(lambda _: self._discard(flight))
+        return flight
+
+    def _discard(self, flight: _Flight) -> None:
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
@@ -1,12 +1,22 @@
-"""Manages the in-memory vector store for report embeddings using FAISS.
+"""Manages the vector store for report embeddings using FAISS.
 
 This module provides a singleton-like pattern for a vector store, ensuring that
 the FAISS index is initialized once and can be accessed throughout the application.
 This is crucial for efficiently finding similar reports based on their embeddings.
+
+The index is persisted to ``<cache_dir>/report_index.faiss`` and memory-mapped
+on startup, so neither startup time nor resident memory grows with the report
+history. Reports created or purged after startup are kept in a small in-memory
+delta (new vectors plus tombstones for removed ids) that is searched alongside
+the mapped index and folded back into the file by :meth:`VectorStore.save`.
+Vectors are L2-normalised and compared by inner product, so similarities are
+cosine similarities.
 """
 
 import logging
-import sqlite3
+import os
+import threading
+from pathlib import Path
 from typing import Any
 
 # FAISS may not be available in some environments (e.g., Windows py3.13).
@@ -20,25 +30,43 @@ except Exception:  # pragma: no cover - environment dependent
     _FAISS_AVAILABLE = False
 
 import numpy as np
-import sqlalchemy
-import sqlalchemy.exc
+
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+INDEX_FILENAME = "report_index.faiss"
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+# FAISS warns when an IVF index is trained on fewer points than this per list.
+IVF_MIN_POINTS_PER_LIST = 39
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of ``vectors`` with unit-length rows."""
+    vectors = np.array(vectors, dtype=np.float32, copy=True).reshape(
+        -1, vectors.shape[-1]
+    )
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
 
 class VectorStore:
     """A singleton class to manage the FAISS index for report embeddings."""
 
     _instance: "VectorStore | None" = None
 
-    def __init__(self) -> None:
+    def __init__(self, embedding_dim: int = 768) -> None:
         # These attributes are set in __new__ but we need to declare them for mypy
         self.embedding_dim: int
         self.index: Any
-        self.report_ids: list[int]
+        self.index_path: Path | None
+        self.index_type: str
         self.is_initialized: bool
-        self._fallback_vectors: list[Any]
-        self._fallback_ids: list[int]
+        self._delta_vectors: list[np.ndarray]
+        self._delta_ids: list[int]
+        self._base_ids: set[int]
+        self._tombstones: set[int]
 
     def __new__(cls, embedding_dim: int = 768) -> "VectorStore":
         if cls._instance is None:
@@ -47,49 +75,247 @@ class VectorStore:
             instance = cls._instance
             instance.embedding_dim = embedding_dim
             instance.index = None
-            instance.report_ids = []
-            cls._instance.is_initialized = False
-            # Fallback storage when FAISS is unavailable
-            instance._fallback_vectors = []
-            instance._fallback_ids = []
+            instance.index_path = None
+            instance.index_type = "flat"
+            instance.is_initialized = False
+            instance.mmap = True
+            instance.flush_threshold = 256
+            instance.ivf_nlist = 256
+            instance.ivf_nprobe = 16
+            instance.hnsw_m = 32
+            instance.hnsw_ef_search = 64
+            instance._configured = False
+            instance._lock = threading.RLock()
+            # Vectors added since the index file was last written (and the
+            # whole store when FAISS is unavailable).
+            instance._delta_vectors = []
+            instance._delta_ids = []
+            # Ids held by the on-disk index, and those removed from it since.
+            instance._base_ids = set()
+            instance._tombstones = set()
+            instance._pending_changes = 0
         return cls._instance
 
-    def initialize_index(self):
-        """Initializes the FAISS index (or fallback arrays when FAISS is missing)."""
-        if self.is_initialized:
-            logger.info("FAISS index is already initialized.")
+    def configure(
+        self,
+        index_type: str = "flat",
+        index_path: str | Path | None = None,
+        mmap: bool = True,
+        flush_threshold: int = 256,
+        ivf_nlist: int = 256,
+        ivf_nprobe: int = 16,
+        hnsw_m: int = 32,
+        hnsw_ef_search: int = 64,
+    ) -> None:
+        """Set index options and drop any loaded state.
+
+        ``index_path`` of None keeps the index in memory only. Call
+        :meth:`initialize_index` afterwards to load the persisted index.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(
+                f"Unknown vector index type {index_type!r}; expected one of {INDEX_TYPES}"
+            )
+        with self._lock:
+            self.index_type = index_type
+            self.index_path = Path(index_path) if index_path else None
+            self.mmap = mmap
+            self.flush_threshold = max(1, flush_threshold)
+            self.ivf_nlist = max(1, ivf_nlist)
+            self.ivf_nprobe = max(1, ivf_nprobe)
+            self.hnsw_m = max(2, hnsw_m)
+            self.hnsw_ef_search = max(1, hnsw_ef_search)
+            self._configured = True
+            self._reset()
+
+    def _ensure_configured(self) -> None:
+        if self._configured:
             return
+        settings = get_settings()
+        store_settings = settings.vector_store
+        index_path = None
+        if store_settings.persist and not settings.use_ai_mocks:
+            index_path = Path(settings.paths.cache_dir) / INDEX_FILENAME
+        self.configure(
+            index_type=store_settings.index_type,
+            index_path=index_path,
+            mmap=store_settings.mmap,
+            flush_threshold=store_settings.flush_threshold,
+            ivf_nlist=store_settings.ivf_nlist,
+            ivf_nprobe=store_settings.ivf_nprobe,
+            hnsw_m=store_settings.hnsw_m,
+            hnsw_ef_search=store_settings.hnsw_ef_search,
+        )
+
+    def _reset(self) -> None:
+        self.index = None
+        self.is_initialized = False
+        self._delta_vectors = []
+        self._delta_ids = []
+        self._base_ids = set()
+        self._tombstones = set()
+        self._pending_changes = 0
+
+    def initialize_index(self):
+        """Load the persisted index (memory-mapped), or start an empty store."""
+        with self._lock:
+            if self.is_initialized:
+                logger.info("FAISS index is already initialized.")
+                return
 
-        if _FAISS_AVAILABLE:
-            try:
-                self.index = faiss.IndexFlatL2(self.embedding_dim)
-                self.index = faiss.IndexIDMap(self.index)
+            self._ensure_configured()
+            if not _FAISS_AVAILABLE:
+                # Use simple in-memory storage with NumPy for similarity computations
                 self.is_initialized = True
                 logger.info(
-                    "FAISS index initialized with embedding dimension: %s",
-                    self.embedding_dim,
+                    "FAISS not available; using in-memory vector store fallback."
                 )
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.exception("Failed to initialize FAISS index: %s", exc)
-                self.is_initialized = False
-        else:
-            # Use simple in-memory storage with NumPy for distance computations
-            self._fallback_vectors = []
-            self._fallback_ids = []
+                return
+
+            if self.index_path is not None and self.index_path.exists():
+                try:
+                    self._load_base()
+                except RuntimeError as exc:
+                    logger.warning(
+                        "Discarding unreadable vector index %s: %s", self.index_path, exc
+                    )
+                    self.index = None
+                    self._base_ids = set()
             self.is_initialized = True
-            logger.info("FAISS not available; using in-memory vector store fallback.")
+            logger.info(
+                "Vector store initialized (%s index, %s vectors, dimension %s).",
+                self.index_type,
+                self._total_vectors(),
+                self.embedding_dim,
+            )
+
+    def _load_base(self) -> None:
+        """Open the index file read-only, memory-mapping it when configured."""
+        index = faiss.read_index(str(self.index_path), self._mmap_flag(self.index_type))
+        kind = self._index_kind(index)
+        if self.mmap and self._mmap_flag(kind) != self._mmap_flag(self.index_type):
+            # A small "ivf" store is still flat on disk (and vice versa).
+            index = faiss.read_index(str(self.index_path), self._mmap_flag(kind))
+        self._tune(index)
+        self.index = index
+        self.embedding_dim = int(index.d)
+        self._base_ids = set(self._index_ids(index).tolist())
+
+    def _mmap_flag(self, kind: str) -> int:
+        """FAISS read flag that maps the vectors of a ``kind`` index from disk."""
+        if not self.mmap:
+            return 0
+        # IVF lists are mapped through OnDiskInvertedLists; flat and HNSW
+        # storage through the flat-codes mapping.
+        return faiss.IO_FLAG_MMAP if kind == "ivf" else faiss.IO_FLAG_MMAP_IFC
+
+    def _tune(self, index: Any) -> None:
+        """Apply the configured search-time parameters to ``index``."""
+        inner = faiss.downcast_index(getattr(index, "index", index))
+        if isinstance(inner, faiss.IndexIVF):
+            inner.nprobe = min(self.ivf_nprobe, inner.nlist)
+        elif isinstance(inner, faiss.IndexHNSW):
+            inner.hnsw.efSearch = self.hnsw_ef_search
+
+    @staticmethod
+    def _index_kind(index: Any) -> str:
+        inner = faiss.downcast_index(getattr(index, "index", index))
+        if isinstance(inner, faiss.IndexIVF):
+            return "ivf"
+        if isinstance(inner, faiss.IndexHNSW):
+            return "hnsw"
+        return "flat"
+
+    @staticmethod
+    def _index_ids(index: Any) -> np.ndarray:
+        """Return the report ids stored in ``index``."""
+        if hasattr(index, "id_map"):
+            return faiss.vector_to_array(index.id_map).astype(np.int64)
+        return VectorStore._ivf_contents(index)[0]
+
+    @staticmethod
+    def _ivf_contents(index: Any) -> tuple[np.ndarray, np.ndarray]:
+        """Read ids and raw vectors straight from an IVF-Flat index's lists."""
+        ivf = faiss.extract_index_ivf(index)
+        invlists = ivf.invlists
+        ids: list[np.ndarray] = []
+        vectors: list[np.ndarray] = []
+        for list_no in range(ivf.nlist):
+            size = invlists.list_size(list_no)
+            if not size:
+                continue
+            ids.append(
+                faiss.rev_swig_ptr(invlists.get_ids(list_no), size).astype(np.int64)
+            )
+            codes = faiss.rev_swig_ptr(
+                invlists.get_codes(list_no), size * invlists.code_size
+            )
+            vectors.append(np.frombuffer(codes.tobytes(), dtype=np.float32).reshape(size, ivf.d))
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty((0, ivf.d), dtype=np.float32)
+        return np.concatenate(ids), np.concatenate(vectors)
+
+    def _index_contents(self, index: Any) -> tuple[np.ndarray, np.ndarray]:
+        """Return all (ids, vectors) held by ``index``."""
+        if self._index_kind(index) == "ivf":
+            return self._ivf_contents(index)
+        ids = self._index_ids(index)
+        vectors = index.index.reconstruct_n(0, index.ntotal) if len(ids) else np.empty(
+            (0, index.d), dtype=np.float32
+        )
+        return ids, vectors
+
+    def _target_kind(self, total: int) -> str:
+        """Index kind to build for ``total`` vectors; IVF needs enough to train."""
+        if self.index_type == "ivf" and total < self.ivf_nlist * IVF_MIN_POINTS_PER_LIST:
+            return "flat"
+        return self.index_type
+
+    def _build_index(self, kind: str, ids: np.ndarray, vectors: np.ndarray) -> Any:
+        """Build a fresh inner-product index of ``kind`` holding ``vectors``."""
+        metric = faiss.METRIC_INNER_PRODUCT
+        if kind == "ivf":
+            # IVF stores ids natively; wrapping it in an IDMap breaks remove_ids.
+            index = faiss.index_factory(self.embedding_dim, f"IVF{self.ivf_nlist},Flat", metric)
+            index.train(vectors)
+        elif kind == "hnsw":
+            index = faiss.index_factory(self.embedding_dim, f"IDMap2,HNSW{self.hnsw_m},Flat", metric)
+        else:
+            index = faiss.index_factory(self.embedding_dim, "IDMap2,Flat", metric)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._tune(index)
+        return index
+
+    @property
+    def report_ids(self) -> list[int]:
+        """Ids of all reports currently searchable."""
+        with self._lock:
+            return sorted((self._base_ids - self._tombstones) | set(self._delta_ids))
+
+    def __contains__(self, report_id: int) -> bool:
+        with self._lock:
+            report_id = int(report_id)
+            return report_id in self._delta_ids or (
+                report_id in self._base_ids and report_id not in self._tombstones
+            )
+
+    def __len__(self) -> int:
+        return self._total_vectors()
 
     def _total_vectors(self) -> int:
-        if _FAISS_AVAILABLE and self.index is not None:
-            return int(getattr(self.index, "ntotal", 0))
-        return len(self._fallback_ids)
+        return len(self._base_ids) - len(self._tombstones) + len(self._delta_ids)
 
     def add_vectors(self, vectors: np.ndarray, ids: list[int]):
-        """Adds vectors to the index or the fallback store."""
+        """Add (or replace) report vectors in the store."""
         if not self.is_initialized:
             logger.warning("Cannot add vectors: vector store is not initialized.")
             return
 
+        if vectors.ndim == 2 and self.index is None and self._total_vectors() == 0:
+            # An empty store takes on the dimension of the embedding model in use.
+            self.embedding_dim = int(vectors.shape[1])
+
         if vectors.ndim != 2 or vectors.shape[1] != self.embedding_dim:
             logger.error(
                 "Vector dimension mismatch. Expected %s, got %s",
@@ -98,67 +324,171 @@ class VectorStore:
             )
             return
 
-        try:
-            if _FAISS_AVAILABLE and self.index is not None:
-                self.index.add_with_ids(vectors.astype("float32"), np.array(ids))
-                self.report_ids.extend(ids)
-                logger.info(
-                    "Added %s new vectors to the index. Total vectors: %s",
-                    len(ids),
-                    self._total_vectors(),
-                )
-            else:
-                for vec, vec_id in zip(vectors, ids, strict=False):
-                    self._fallback_vectors.append(vec.astype("float32"))
-                    self._fallback_ids.append(int(vec_id))
-                self.report_ids.extend(ids)
+        normalized = _normalize(vectors)
+        with self._lock:
+            self._discard([int(vec_id) for vec_id in ids])
+            for vec, vec_id in zip(normalized, ids, strict=True):
+                self._delta_vectors.append(vec)
+                self._delta_ids.append(int(vec_id))
+            self._pending_changes += len(ids)
+            logger.info(
+                "Added %s vectors to the vector store. Total vectors: %s",
+                len(ids),
+                self._total_vectors(),
+            )
+            self._maybe_flush()
+
+    def remove_vectors(self, ids: list[int]) -> int:
+        """Remove report vectors from the store.
+
+        Returns:
+            The number of ids that were present and removed.
+
+        """
+        if not self.is_initialized:
+            return 0
+        with self._lock:
+            removed = self._discard([int(vec_id) for vec_id in ids])
+            if removed:
+                self._pending_changes += removed
                 logger.info(
-                    "Added %s vectors to fallback store. Total vectors: %s",
-                    len(ids),
+                    "Removed %s vectors from the vector store. Total vectors: %s",
+                    removed,
                     self._total_vectors(),
                 )
-        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as exc:
-            logger.exception("Failed to add vectors to vector store: %s", exc)
+                self._maybe_flush()
+            return removed
+
+    def _discard(self, ids: list[int]) -> int:
+        """Drop ``ids`` from the delta and tombstone them in the base (lock held)."""
+        targets = set(ids)
+        removed = 0
+        if targets.intersection(self._delta_ids):
+            keep = [i for i, vec_id in enumerate(self._delta_ids) if vec_id not in targets]
+            removed += len(self._delta_ids) - len(keep)
+            self._delta_ids = [self._delta_ids[i] for i in keep]
+            self._delta_vectors = [self._delta_vectors[i] for i in keep]
+        for vec_id in targets & self._base_ids:
+            if vec_id not in self._tombstones:
+                self._tombstones.add(vec_id)
+                removed += 1
+        return removed
+
+    def _maybe_flush(self) -> None:
+        if self.index_path is not None and self._pending_changes >= self.flush_threshold:
+            self.save()
 
     def search(
         self, query_vector: np.ndarray, k: int, threshold: float = 0.9
     ) -> list[tuple[int, float]]:
-        """Searches the index for similar vectors.
+        """Searches the store for similar vectors.
 
-        Returns a list of (id, similarity) pairs with similarity in [0,1].
+        Returns up to ``k`` (id, cosine similarity) pairs, best first, whose
+        similarity is at least ``threshold``.
         """
-        if not self.is_initialized or self._total_vectors() == 0:
+        if not self.is_initialized or self._total_vectors() == 0 or k <= 0:
             logger.warning(
                 "Cannot search: vector store is not initialized or is empty."
             )
             return []
 
-        try:
-            query = query_vector.astype("float32").reshape(1, -1)
-            if _FAISS_AVAILABLE and self.index is not None:
-                distances, indices = self.index.search(query, k)
-                results: list[tuple[int, float]] = []
-                for idx, dist in zip(indices[0], distances[0], strict=False):
-                    if idx != -1:  # -1 indicates no result
-                        similarity = 1 - (float(dist) / float(self.embedding_dim))
-                        if similarity >= threshold:
-                            results.append((int(idx), float(similarity)))
-                return results
-            # Fallback: brute-force L2 nearest neighbors
-            stack = np.stack(self._fallback_vectors, axis=0)
-            dists = np.linalg.norm(stack - query, axis=1)
-            topk_indices = np.argsort(dists)[: max(k, 0)]
-            fallback_results: list[tuple[int, float]] = []
-            for pos in topk_indices:
-                idx = self._fallback_ids[int(pos)]
-                dist = float(dists[int(pos)])
-                similarity = 1 - (dist / float(self.embedding_dim))
-                if similarity >= threshold:
-                    fallback_results.append((int(idx), float(similarity)))
-            return fallback_results
-        except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as exc:
-            logger.exception("Failed to search vector store: %s", exc)
+        query = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+        if query.shape[1] != self.embedding_dim:
+            logger.error(
+                "Query dimension mismatch. Expected %s, got %s",
+                self.embedding_dim,
+                query.shape[1],
+            )
             return []
+        query = _normalize(query)
+
+        scores: dict[int, float] = {}
+        with self._lock:
+            if self.index is not None and self._base_ids:
+                # Over-fetch so tombstoned hits do not crowd out live ones.
+                fetch = min(k + len(self._tombstones), len(self._base_ids))
+                try:
+                    similarities, indices = self.index.search(query, fetch)
+                except RuntimeError as exc:
+                    logger.exception("Failed to search vector index: %s", exc)
+                else:
+                    for idx, similarity in zip(indices[0], similarities[0], strict=False):
+                        if idx != -1 and int(idx) not in self._tombstones:
+                            scores[int(idx)] = float(similarity)
+            if self._delta_ids:
+                similarities = np.stack(self._delta_vectors) @ query[0]
+                for pos in np.argsort(-similarities)[:k]:
+                    scores[self._delta_ids[int(pos)]] = float(similarities[int(pos)])
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(vec_id, score) for vec_id, score in ranked[:k] if score >= threshold]
+
+    def save(self) -> bool:
+        """Fold pending changes into the index file and re-map it.
+
+        The file is rewritten atomically. HNSW graphs cannot delete entries,
+        so removals (and switching index type) rebuild the index from its
+        stored vectors.
+
+        Returns:
+            True if the index file was written.
+
+        """
+        if not _FAISS_AVAILABLE or self.index_path is None or not self.is_initialized:
+            return False
+        with self._lock:
+            if not self._pending_changes and self.index_path.exists():
+                return False
+
+            base = None
+            if self.index_path.exists() and self._base_ids:
+                base = faiss.read_index(str(self.index_path))
+            delta_ids = np.array(self._delta_ids, dtype=np.int64)
+            delta_vectors = (
+                np.stack(self._delta_vectors)
+                if self._delta_vectors
+                else np.empty((0, self.embedding_dim), dtype=np.float32)
+            )
+            kind = self._target_kind(self._total_vectors())
+            tombstones = np.array(sorted(self._tombstones), dtype=np.int64)
+
+            if base is None:
+                index = self._build_index(kind, delta_ids, delta_vectors)
+            elif self._index_kind(base) != kind or (
+                len(tombstones) and kind == "hnsw"
+            ):
+                base_ids, base_vectors = self._index_contents(base)
+                keep = ~np.isin(base_ids, tombstones)
+                index = self._build_index(
+                    kind,
+                    np.concatenate([base_ids[keep], delta_ids]),
+                    np.concatenate([base_vectors[keep], delta_vectors]),
+                )
+            else:
+                index = base
+                if len(tombstones):
+                    index.remove_ids(tombstones)
+                if len(delta_ids):
+                    index.add_with_ids(delta_vectors, delta_ids)
+
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            faiss.write_index(index, str(tmp_path))
+            os.replace(tmp_path, self.index_path)
+
+            self.index = None
+            self._delta_vectors = []
+            self._delta_ids = []
+            self._tombstones = set()
+            self._pending_changes = 0
+            self._load_base()
+            logger.info(
+                "Saved %s index with %s vectors to %s",
+                kind,
+                index.ntotal,
+                self.index_path,
+            )
+            return True
 
 
 # Global instance of the vector store
@@ -167,4 +497,4 @@ vector_store = VectorStore()
 
 def get_vector_store() -> VectorStore:
     """Returns the global instance of the vector store."""
-    return vector_store
+    return VectorStore._instance or vector_store
@@ -4,24 +4,28 @@
 Provides async database operations for users, rubrics, reports, and findings.
 """
 
+import asyncio
 import datetime
+import json
 import logging
 import math
 import sqlite3
 from collections import Counter
+from collections.abc import AsyncIterator, Iterable
 from datetime import date, timedelta
 from typing import Any
 
 import numpy as np
 import sqlalchemy
 import sqlalchemy.exc
-from sqlalchemy import func, select
+from sqlalchemy import Integer, String, Text, cast, delete, func, insert, select, type_coerce
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer_group
 
 from ..core.vector_store import get_vector_store
 from . import models, schemas
+from .encryption import get_database_encryption_service
 
 logger = logging.getLogger(__name__)
 
@@ -273,41 +277,38 @@ async def get_dashboard_statistics(db: AsyncSession) -> dict[str, Any]:
         sqlalchemy.exc.SQLAlchemyError: For database errors
     """
     try:
-        # Get total documents analyzed
-        total_docs_query = select(func.count(models.AnalysisReport.id))
-        total_docs_result = await db.execute(total_docs_query)
-        total_documents_analyzed = total_docs_result.scalar_one_or_none() or 0
-
-        # Get overall compliance score
-        avg_score_query = select(
-            func.avg(models.AnalysisReport.compliance_score)
-        ).where(models.AnalysisReport.compliance_score.is_not(None))
-        avg_score_result = await db.execute(avg_score_query)
-        overall_compliance_score = float(avg_score_result.scalar_one_or_none() or 0.0)
+        rollup = models.ReportRollup
+        totals = (
+            await db.execute(
+                select(func.sum(rollup.report_count), func.sum(rollup.score_sum))
+            )
+        ).one()
+        total_documents_analyzed = int(totals[0] or 0)
+        overall_compliance_score = (
+            float(totals[1]) / total_documents_analyzed if total_documents_analyzed else 0.0
+        )
 
         # Get compliance by category
+        document_count = func.sum(rollup.report_count)
         category_query = (
             select(
-                models.AnalysisReport.document_type,
-                func.avg(models.AnalysisReport.compliance_score).label("average_score"),
-                func.count(models.AnalysisReport.id).label("document_count"),
+                rollup.document_type,
+                document_count.label("document_count"),
+                func.sum(rollup.score_sum).label("score_sum"),
             )
-            .where(
-                models.AnalysisReport.document_type.is_not(None),
-                models.AnalysisReport.compliance_score.is_not(None),
-            )
-            .group_by(models.AnalysisReport.document_type)
-            .order_by(models.AnalysisReport.document_type)
+            .where(rollup.document_type != "")
+            .group_by(rollup.document_type)
+            .having(document_count > 0)
+            .order_by(rollup.document_type)
         )
         category_result = await db.execute(category_query)
 
         compliance_by_category = {}
         for row in category_result.all():
-            if row.document_type:
-                compliance_by_category[row.document_type] = {
-                    "average_score": float(row.average_score or 0.0),
-                    "document_count": int(row.document_count or 0),
-                }
+            compliance_by_category[row.document_type] = {
+                "average_score": float(row.score_sum) / row.document_count,
+                "document_count": int(row.document_count),
+            }
 
         statistics = {
             "total_documents_analyzed": total_documents_analyzed,
@@ -337,26 +338,22 @@ async def get_dashboard_statistics(db: AsyncSession) -> dict[str, Any]:
 async def get_organizational_metrics(
     db: AsyncSession, days_back: int
 ) -> dict[str, Any]:
-    """Computes high-level organizational metrics."""
-    cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
+    """Computes high-level organizational metrics from the report rollups."""
+    cutoff_day = (datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)).date()
+    rollup = models.ReportRollup
 
-    report_query = select(models.AnalysisReport).filter(
-        models.AnalysisReport.analysis_date >= cutoff_date
-    )
-    reports = list(
-        (
-            await db.execute(
-                report_query.options(selectinload(models.AnalysisReport.findings))
-            )
+    totals = (
+        await db.execute(
+            select(
+                func.sum(rollup.report_count),
+                func.sum(rollup.score_sum),
+                func.sum(rollup.findings_count),
+            ).where(rollup.day >= cutoff_day)
         )
-        .scalars()
-        .unique()
-        .all()
-    )
-
-    total_analyses = len(reports)
-    total_findings = sum(len(r.findings) for r in reports)
-    avg_score = np.mean([r.compliance_score for r in reports]) if reports else 0
+    ).one()
+    total_analyses = int(totals[0] or 0)
+    total_findings = int(totals[2] or 0)
+    avg_score = float(totals[1]) / total_analyses if total_analyses else 0
 
     user_query = select(func.count(models.User.id))
     total_users = (await db.execute(user_query)).scalar_one_or_none() or 0
@@ -372,36 +369,29 @@ async def get_organizational_metrics(
 async def get_discipline_breakdown(
     db: AsyncSession, days_back: int
 ) -> dict[str, dict[str, Any]]:
-    """Computes compliance metrics broken down by discipline, querying the JSON field."""
-    cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
-
-    try:
-        analysis_discipline = models.AnalysisReport.analysis_result["discipline"]
-        discipline_expr = analysis_discipline.as_string()
-    except NotImplementedError:
-        discipline_expr = models.AnalysisReport.discipline
+    """Computes compliance metrics broken down by discipline from the report rollups."""
+    cutoff_day = (datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)).date()
+    rollup = models.ReportRollup
+    report_count = func.sum(rollup.report_count)
 
     query = (
         select(
-            discipline_expr.label("discipline"),
-            func.avg(models.AnalysisReport.compliance_score).label("avg_score"),
-            func.count(models.AnalysisReport.id).label("user_count"),
+            rollup.discipline,
+            report_count.label("report_count"),
+            func.sum(rollup.score_sum).label("score_sum"),
         )
-        .filter(models.AnalysisReport.analysis_date >= cutoff_date)
-        .group_by(discipline_expr)
+        .where(rollup.day >= cutoff_day, rollup.discipline != "")
+        .group_by(rollup.discipline)
+        .having(report_count > 0)
     )
     result = await db.execute(query)
 
     breakdown: dict[str, dict[str, Any]] = {}
     for row in result.all():
-        discipline = row.discipline
-        if discipline:
-            breakdown[discipline] = {
-                "avg_compliance_score": (
-                    float(row.avg_score) if row.avg_score is not None else None
-                ),
-                "user_count": int(row.user_count or 0),
-            }
+        breakdown[row.discipline] = {
+            "avg_compliance_score": float(row.score_sum) / row.report_count,
+            "user_count": int(row.report_count),
+        }
     return breakdown
 
 
@@ -524,16 +514,25 @@ async def get_benchmark_data(
         # Calculate cutoff date
         cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days_back)
 
-        # Query compliance scores within the time window
+        # Score histogram (one-point buckets) within the time window
+        rollup = models.ReportRollup
+        bucket_count = func.sum(rollup.report_count)
         result = await db.execute(
-            select(models.AnalysisReport.compliance_score)
-            .where(
-                models.AnalysisReport.compliance_score.is_not(None),
-                models.AnalysisReport.analysis_date >= cutoff_date,
+            select(
+                rollup.score_bucket,
+                bucket_count,
+                func.sum(rollup.score_sum),
+                func.sum(rollup.score_sq_sum),
+                func.min(rollup.score_min),
+                func.max(rollup.score_max),
             )
-            .order_by(models.AnalysisReport.compliance_score)
+            .where(rollup.day >= cutoff_date.date())
+            .group_by(rollup.score_bucket)
+            .having(bucket_count > 0)
+            .order_by(rollup.score_bucket)
         )
-        scores = [float(row[0]) for row in result.fetchall()]
+        buckets = result.fetchall()
+        total_analyses = sum(int(row[1]) for row in buckets)
 
         # Default benchmarks for insufficient data
         default_benchmarks = {
@@ -550,45 +549,44 @@ async def get_benchmark_data(
             "last_updated": datetime.datetime.now(datetime.UTC).isoformat(),
         }
 
-        if len(scores) < min_analyses:
+        if total_analyses < min_analyses:
             logger.warning(
                 "Insufficient data for benchmarks: %d analyses (minimum: %d)",
-                len(scores),
+                total_analyses,
                 min_analyses,
             )
             return {
                 **default_benchmarks,
-                "total_analyses": len(scores),
+                "total_analyses": total_analyses,
             }
 
-        # Calculate percentiles using numpy
+        # Percentiles from the histogram, each bucket standing at its mean
+        histogram = [(float(row[2]) / int(row[1]), int(row[1])) for row in buckets]
         percentiles = {
-            "p10": float(np.percentile(scores, 10)),
-            "p25": float(np.percentile(scores, 25)),
-            "p50": float(np.percentile(scores, 50)),
-            "p75": float(np.percentile(scores, 75)),
-            "p90": float(np.percentile(scores, 90)),
+            f"p{q}": _histogram_percentile(histogram, total_analyses, q)
+            for q in (10, 25, 50, 75, 90)
         }
 
         # Calculate additional statistics
-        mean_score = float(np.mean(scores))
-        std_score = float(np.std(scores))
+        mean_score = sum(float(row[2]) for row in buckets) / total_analyses
+        mean_square = sum(float(row[3]) for row in buckets) / total_analyses
+        std_score = math.sqrt(max(mean_square - mean_score**2, 0.0))
 
         benchmark_data = {
             "compliance_score_percentiles": percentiles,
-            "total_analyses": len(scores),
+            "total_analyses": total_analyses,
             "mean_score": round(mean_score, 2),
             "std_deviation": round(std_score, 2),
-            "data_quality": "good" if len(scores) >= min_analyses * 2 else "adequate",
+            "data_quality": "good" if total_analyses >= min_analyses * 2 else "adequate",
             "days_analyzed": days_back,
             "score_range": {
-                "min": float(min(scores)),
-                "max": float(max(scores)),
+                "min": float(buckets[0][4]),
+                "max": float(buckets[-1][5]),
             },
             "last_updated": datetime.datetime.now(datetime.UTC).isoformat(),
         }
 
-        logger.debug("Generated benchmark data from %d analyses", len(scores))
+        logger.debug("Generated benchmark data from %d analyses", total_analyses)
         return benchmark_data
 
     except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error, ValueError) as e:
@@ -599,21 +597,162 @@ async def get_benchmark_data(
         }
 
 
-async def get_all_reports_with_embeddings(
-    db: AsyncSession,
-) -> list[models.AnalysisReport]:
-    """Return all analysis reports that have an embedding stored efficiently."""
-    query = (
-        select(models.AnalysisReport)
-        .where(models.AnalysisReport.document_embedding.isnot(None))
-        .order_by(models.AnalysisReport.analysis_date.desc())
+def _histogram_percentile(
+    histogram: list[tuple[float, int]], total: int, q: float
+) -> float:
+    """Linearly interpolated percentile (as ``np.percentile``) of a histogram.
+
+    ``histogram`` holds ``(value, count)`` pairs in ascending order; every
+    value in a bucket is taken to equal the bucket's value.
+    """
+    rank = q / 100 * (total - 1)
+    lower, upper = math.floor(rank), math.ceil(rank)
+    values: dict[int, float] = {}
+    seen = 0
+    for value, count in histogram:
+        for position in (lower, upper):
+            if seen <= position < seen + count:
+                values[position] = value
+        seen += count
+        if upper < seen:
+            break
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+async def backfill_report_rollups(db: AsyncSession, since: date | None = None) -> int:
+    """Rebuild the report rollups from the ``reports`` table.
+
+    The rollups are kept current by triggers; this is for databases that
+    predate them or after bulk imports that bypassed SQLite.
+
+    Args:
+        db: Database session
+        since: Only rebuild days from this date on; everything when omitted
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    report = models.AnalysisReport
+    rollup = models.ReportRollup
+    findings_per_report = (
+        select(models.Finding.report_id, func.count(models.Finding.id).label("findings"))
+        .group_by(models.Finding.report_id)
+        .subquery()
+    )
+    day = func.date(report.analysis_date)
+    key = (
+        day,
+        func.coalesce(report.discipline, ""),
+        func.coalesce(report.document_type, ""),
+        cast(report.compliance_score, Integer),
+    )
+    source = (
+        select(
+            *key,
+            func.count(report.id),
+            func.sum(report.compliance_score),
+            func.sum(report.compliance_score * report.compliance_score),
+            func.min(report.compliance_score),
+            func.max(report.compliance_score),
+            func.coalesce(func.sum(findings_per_report.c.findings), 0),
+        )
+        .outerjoin(findings_per_report, findings_per_report.c.report_id == report.id)
+        .where(report.compliance_score.is_not(None))
+        .group_by(*key)
+    )
+    clear = delete(rollup)
+    if since is not None:
+        source = source.where(day >= since.isoformat())
+        clear = clear.where(rollup.day >= since)
+
+    try:
+        await db.execute(clear)
+        result = await db.execute(
+            insert(rollup).from_select(
+                [
+                    rollup.day,
+                    rollup.discipline,
+                    rollup.document_type,
+                    rollup.score_bucket,
+                    rollup.report_count,
+                    rollup.score_sum,
+                    rollup.score_sq_sum,
+                    rollup.score_min,
+                    rollup.score_max,
+                    rollup.findings_count,
+                ],
+                source,
+            )
+        )
+        await db.commit()
+    except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+        await db.rollback()
+        logger.error("Failed to backfill report rollups: %s", e)
+        raise
+
+    logger.info("Rebuilt %d report rollup rows", result.rowcount)
+    return result.rowcount
+
+
+async def get_report_ids_with_embeddings(db: AsyncSession) -> set[int]:
+    """Return the ids of all analysis reports that have an embedding stored."""
+    query = select(models.AnalysisReport.id).where(
+        models.AnalysisReport.document_embedding.isnot(None)
     )
     try:
         result = await db.execute(query)
     except OperationalError as exc:
-        logger.warning("Unable to load existing embeddings: %s", exc)
-        return []
-    return list(result.scalars().unique().all())
+        logger.warning("Unable to load report embedding ids: %s", exc)
+        return set()
+    return set(result.scalars().all())
+
+
+async def get_report_embeddings(
+    db: AsyncSession, report_ids: Iterable[int]
+) -> list[tuple[int, bytes]]:
+    """Return ``(id, document_embedding)`` pairs for the given reports.
+
+    Only the two columns are selected, so the encrypted analysis payload is
+    never loaded or decrypted.
+    """
+    ids = list(report_ids)
+    pairs: list[tuple[int, bytes]] = []
+    for start in range(0, len(ids), 500):
+        query = select(
+            models.AnalysisReport.id, models.AnalysisReport.document_embedding
+        ).where(
+            models.AnalysisReport.id.in_(ids[start : start + 500]),
+            models.AnalysisReport.document_embedding.isnot(None),
+        )
+        try:
+            result = await db.execute(query)
+        except OperationalError as exc:
+            logger.warning("Unable to load report embeddings: %s", exc)
+            return pairs
+        pairs.extend((row.id, row.document_embedding) for row in result)
+    return pairs
+
+
+async def _index_report_embedding(report_id: int, embedding: bytes | None) -> None:
+    """Add a newly stored report embedding to the similarity index.
+
+    Runs in a worker thread since the index may flush itself to disk.
+    """
+    vector_store = get_vector_store()
+    if not embedding or not vector_store.is_initialized:
+        return
+    vector = np.frombuffer(embedding, dtype=np.float32)
+    if vector.size:
+        await asyncio.to_thread(
+            vector_store.add_vectors, vector.reshape(1, -1), [report_id]
+        )
+
+
+async def _unindex_reports(report_ids: Iterable[int]) -> None:
+    """Drop deleted reports from the similarity index."""
+    vector_store = get_vector_store()
+    if vector_store.is_initialized:
+        await asyncio.to_thread(vector_store.remove_vectors, list(report_ids))
 
 
 async def get_report(db: AsyncSession, report_id: int) -> models.AnalysisReport | None:
@@ -636,7 +775,12 @@ async def get_report(db: AsyncSession, report_id: int) -> models.AnalysisReport
     try:
         query = (
             select(models.AnalysisReport)
-            .options(selectinload(models.AnalysisReport.findings))
+            .options(
+                undefer_group(models.ENCRYPTED_GROUP),
+                selectinload(models.AnalysisReport.findings).undefer_group(
+                    models.ENCRYPTED_GROUP
+                ),
+            )
             .where(models.AnalysisReport.id == report_id)
         )
         result = await db.execute(query)
@@ -688,6 +832,7 @@ async def create_analysis_report(
             document_name=report_data.document_name.strip(),
             compliance_score=report_data.compliance_score,
             document_type=report_data.document_type,
+            discipline=(report_data.analysis_result or {}).get("discipline"),
             analysis_result=report_data.analysis_result or {},
             document_embedding=report_data.document_embedding,
         )
@@ -709,9 +854,12 @@ async def create_analysis_report(
 
         await db.commit()
         await db.refresh(db_report)
+        await _index_report_embedding(db_report.id, db_report.document_embedding)
 
-        # Load findings for the response
-        await db.refresh(db_report, ["findings"])
+        # Load findings and the deferred encrypted columns for the response
+        await db.refresh(db_report, ["analysis_result", "findings"])
+        for db_finding in db_report.findings:
+            await db.refresh(db_finding, ["personalized_tip", "problematic_text"])
 
         logger.info(
             "Created analysis report: %s with %d findings",
@@ -774,7 +922,9 @@ async def find_similar_report(
         if candidate:
             return candidate
 
-    query = select(models.AnalysisReport)
+    query = select(models.AnalysisReport).options(
+        undefer_group(models.ENCRYPTED_GROUP)
+    )
     if document_type is not None:
         query = query.where(models.AnalysisReport.document_type == document_type)
 
@@ -795,17 +945,90 @@ async def find_similar_report(
 
 async def get_reports(
     db: AsyncSession, skip: int = 0, limit: int = 100
-) -> list[models.AnalysisReport]:
-    """Return analysis reports with their findings eagerly loaded."""
-    query = (
-        select(models.AnalysisReport)
-        .options(selectinload(models.AnalysisReport.findings))
-        .order_by(models.AnalysisReport.analysis_date.desc())
-        .offset(max(skip, 0))
-        .limit(max(limit, 1))
-    )
-    result = await db.execute(query)
-    return list(result.scalars().unique().all())
+) -> list[dict[str, Any]]:
+    """Return analysis reports with their findings, newest first.
+
+    Encrypted columns are selected as stored and decrypted together in one
+    ``decrypt_many`` call off the event loop instead of row by row.
+    """
+    report = models.AnalysisReport
+    finding = models.Finding
+    report_rows = (
+        await db.execute(
+            select(
+                report.id,
+                type_coerce(report.document_name, String),
+                report.compliance_score,
+                type_coerce(report.analysis_result, Text),
+                report.document_embedding,
+                report.document_type,
+                report.analysis_date,
+            )
+            .order_by(report.analysis_date.desc())
+            .offset(max(skip, 0))
+            .limit(max(limit, 1))
+        )
+    ).all()
+    if not report_rows:
+        return []
+
+    finding_rows = (
+        await db.execute(
+            select(
+                finding.id,
+                finding.report_id,
+                finding.rule_id,
+                finding.risk,
+                type_coerce(finding.personalized_tip, Text),
+                type_coerce(finding.problematic_text, Text),
+                finding.confidence_score,
+            )
+            .where(finding.report_id.in_([row[0] for row in report_rows]))
+            .order_by(finding.id)
+        )
+    ).all()
+
+    encrypted: list[tuple[Any, str | None]] = []
+    for row in report_rows:
+        encrypted += [(("report.name", row[0]), row[1]), (("report.result", row[0]), row[3])]
+    for row in finding_rows:
+        encrypted += [(("finding.tip", row[0]), row[4]), (("finding.text", row[0]), row[5])]
+    service = get_database_encryption_service()
+    plaintext = iter(await asyncio.to_thread(service.decrypt_many, encrypted))
+
+    reports: dict[int, dict[str, Any]] = {}
+    for row in report_rows:
+        name, result = next(plaintext), next(plaintext)
+        reports[row[0]] = {
+            "id": row[0],
+            "document_name": name,
+            "compliance_score": row[2],
+            "analysis_result": json.loads(result) if result else {},
+            "document_embedding": row[4],
+            "document_type": row[5],
+            "analysis_date": row[6],
+            "findings": [],
+        }
+    for row in finding_rows:
+        tip, text = next(plaintext), next(plaintext)
+        reports[row[1]]["findings"].append(
+            {
+                "id": row[0],
+                "report_id": row[1],
+                "rule_id": row[2],
+                "risk": row[3],
+                "personalized_tip": tip,
+                "problematic_text": text,
+                "confidence_score": row[6],
+            }
+        )
+    return list(reports.values())
+
+
+async def count_reports(db: AsyncSession) -> int:
+    """Return the number of stored analysis reports."""
+    result = await db.execute(select(func.count(models.AnalysisReport.id)))
+    return int(result.scalar_one_or_none() or 0)
 
 
 async def get_findings_summary(db: AsyncSession) -> list[dict[str, Any]]:
@@ -873,6 +1096,102 @@ async def get_total_findings_count(
     return int(result.scalar_one_or_none() or 0)
 
 
+async def iter_reports_for_export(
+    db: AsyncSession,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    include_findings: bool = True,
+    batch_size: int = 200,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield reports for export one at a time, oldest first.
+
+    Reports are paged by id (keyset pagination), so each query reads and
+    decrypts at most ``batch_size`` reports plus their findings. The read
+    transaction is committed after every page, so a long-running stream does
+    not pin one snapshot of the database; ``db`` should therefore be a
+    session dedicated to the export. The encrypted ``analysis_result``
+    payload is never selected.
+
+    Yields:
+        dict: Report fields with ``findings`` (empty unless requested) and
+        ``total_findings``
+    """
+    report = models.AnalysisReport
+    finding = models.Finding
+    # Correlated per report, so each page only counts its own reports' findings.
+    findings_count = (
+        select(func.count(finding.id))
+        .where(finding.report_id == report.id)
+        .correlate(report)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            report.id,
+            report.document_name,
+            report.analysis_date,
+            report.document_type,
+            report.compliance_score,
+            findings_count,
+        )
+        .order_by(report.id)
+        .limit(batch_size)
+    )
+    start_dt = _as_datetime(start_date)
+    end_dt = _as_datetime(end_date, end=True)
+    if start_dt is not None:
+        query = query.where(report.analysis_date >= start_dt)
+    if end_dt is not None:
+        query = query.where(report.analysis_date <= end_dt)
+
+    last_id = 0
+    while True:
+        rows = (await db.execute(query.where(report.id > last_id))).all()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+
+        findings_by_report: dict[int, list[dict[str, Any]]] = {}
+        if include_findings:
+            finding_rows = await db.execute(
+                select(
+                    finding.report_id,
+                    finding.rule_id,
+                    finding.risk,
+                    finding.problematic_text,
+                    finding.personalized_tip,
+                )
+                .where(finding.report_id.in_([row[0] for row in rows]))
+                .order_by(finding.report_id, finding.id)
+            )
+            for report_id, rule_id, risk, text, tip in finding_rows:
+                findings_by_report.setdefault(report_id, []).append(
+                    {
+                        "rule_id": rule_id,
+                        "risk": risk,
+                        "problematic_text": text,
+                        "personalized_tip": tip,
+                    }
+                )
+        # End the read transaction before handing the page to the consumer.
+        await db.commit()
+
+        for report_id, name, analysis_date, document_type, score, total in rows:
+            yield {
+                "id": report_id,
+                "document_name": name,
+                "analysis_date": analysis_date.isoformat() if analysis_date else "",
+                "document_type": document_type,
+                "compliance_score": score,
+                "findings": findings_by_report.get(report_id, []),
+                "total_findings": int(total),
+            }
+
+
+_HABIT_PERCENTAGE_COLUMNS = tuple(f"habit_{i}_percentage" for i in range(1, 8))
+
+
 async def get_team_habit_summary(
     db: AsyncSession,
     *,
@@ -882,38 +1201,52 @@ async def get_team_habit_summary(
 ) -> list[schemas.HabitSummary]:
     """Return an aggregate view of team habits based on progress snapshots."""
     # Discipline filtering is not currently tracked for snapshots; placeholder.
-    query = select(models.HabitProgressSnapshot)
+    snapshot = models.HabitProgressSnapshot
+    query = select(
+        func.count(snapshot.id),
+        *(func.avg(getattr(snapshot, column)) for column in _HABIT_PERCENTAGE_COLUMNS),
+    )
     if start_date is not None:
-        query = query.where(models.HabitProgressSnapshot.snapshot_date >= start_date)
+        query = query.where(snapshot.snapshot_date >= start_date)
     if end_date is not None:
-        query = query.where(models.HabitProgressSnapshot.snapshot_date <= end_date)
+        query = query.where(snapshot.snapshot_date <= end_date)
 
-    result = await db.execute(query)
-    snapshots = list(result.scalars().all())
-    if not snapshots:
+    snapshot_count, *averages = (await db.execute(query)).one()
+    if not snapshot_count:
         return []
 
-    aggregate: dict[str, float] = {f"habit_{i}": 0.0 for i in range(1, 8)}
-    for snapshot in snapshots:
-        aggregate["habit_1"] += snapshot.habit_1_percentage
-        aggregate["habit_2"] += snapshot.habit_2_percentage
-        aggregate["habit_3"] += snapshot.habit_3_percentage
-        aggregate["habit_4"] += snapshot.habit_4_percentage
-        aggregate["habit_5"] += snapshot.habit_5_percentage
-        aggregate["habit_6"] += snapshot.habit_6_percentage
-        aggregate["habit_7"] += snapshot.habit_7_percentage
-
-    denominator = max(len(snapshots), 1)
-    summaries: list[schemas.HabitSummary] = []
-    for habit_index in range(1, 8):
-        habit_id = f"habit_{habit_index}"
-        average = aggregate[habit_id] / denominator
-        summaries.append(
-            schemas.HabitSummary(
-                habit_name=f"Habit {habit_index}", count=int(round(average))
-            )
+    return [
+        schemas.HabitSummary(
+            habit_name=f"Habit {habit_index}", count=int(round(average or 0.0))
+        )
+        for habit_index, average in enumerate(averages, start=1)
+    ]
+
+
+def _latest_snapshots_subquery(
+    start_date: date | None, end_date: date | None
+) -> sqlalchemy.Subquery:
+    """Ids of each user's latest snapshot in the window.
+
+    Only ``id``, ``user_id`` and ``snapshot_date`` are read, so the ranking is
+    served entirely from the ``(user_id, snapshot_date)`` index.
+    """
+    snapshot = models.HabitProgressSnapshot
+    ranked = select(
+        snapshot.id,
+        func.row_number()
+        .over(
+            partition_by=snapshot.user_id,
+            order_by=(snapshot.snapshot_date.desc(), snapshot.id.desc()),
         )
-    return summaries
+        .label("position"),
+    )
+    if start_date is not None:
+        ranked = ranked.where(snapshot.snapshot_date >= start_date)
+    if end_date is not None:
+        ranked = ranked.where(snapshot.snapshot_date <= end_date)
+    ranked = ranked.subquery()
+    return select(ranked.c.id).where(ranked.c.position == 1).subquery()
 
 
 async def get_clinician_habit_breakdown(
@@ -924,46 +1257,34 @@ async def get_clinician_habit_breakdown(
     discipline: str | None = None,
 ) -> list[schemas.ClinicianHabitBreakdown]:
     """Return per-clinician habit focus based on their latest snapshots."""
+    snapshot = models.HabitProgressSnapshot
+    latest = _latest_snapshots_subquery(start_date, end_date)
     query = (
-        select(models.HabitProgressSnapshot, models.User)
-        .join(models.User, models.HabitProgressSnapshot.user_id == models.User.id)
-        .order_by(
-            models.HabitProgressSnapshot.user_id,
-            models.HabitProgressSnapshot.snapshot_date.desc(),
+        select(
+            models.User.username,
+            *(getattr(snapshot, column) for column in _HABIT_PERCENTAGE_COLUMNS),
         )
+        .select_from(latest)
+        .join(snapshot, snapshot.id == latest.c.id)
+        .join(models.User, snapshot.user_id == models.User.id)
+        .order_by(snapshot.user_id)
     )
-
-    if start_date is not None:
-        query = query.where(models.HabitProgressSnapshot.snapshot_date >= start_date)
-    if end_date is not None:
-        query = query.where(models.HabitProgressSnapshot.snapshot_date <= end_date)
+    if discipline:
+        query = query.where(models.User.license_key == discipline)
 
     result = await db.execute(query)
-    latest_snapshots: dict[int, tuple[models.HabitProgressSnapshot, models.User]] = {}
-    for snapshot, user in result.all():
-        if discipline and user.license_key != discipline:
-            continue
-        latest_snapshots.setdefault(user.id, (snapshot, user))
-
     breakdown: list[schemas.ClinicianHabitBreakdown] = []
-    for _user_id, (snapshot, user) in latest_snapshots.items():
-        habit_percentages = [
-            ("habit_1", snapshot.habit_1_percentage),
-            ("habit_2", snapshot.habit_2_percentage),
-            ("habit_3", snapshot.habit_3_percentage),
-            ("habit_4", snapshot.habit_4_percentage),
-            ("habit_5", snapshot.habit_5_percentage),
-            ("habit_6", snapshot.habit_6_percentage),
-            ("habit_7", snapshot.habit_7_percentage),
-        ]
-        habit_percentages.sort(key=lambda item: item[1], reverse=True)
-        for habit_id, percentage in habit_percentages[:3]:
+    for username, *percentages in result.all():
+        habit_percentages = sorted(
+            enumerate(percentages, start=1), key=lambda item: item[1], reverse=True
+        )
+        for habit_index, percentage in habit_percentages[:3]:
             if percentage <= 0:
                 continue
             breakdown.append(
                 schemas.ClinicianHabitBreakdown(
-                    clinician_name=user.username,
-                    habit_name=f"Habit {habit_id.split('_')[-1]}",
+                    clinician_name=username,
+                    habit_name=f"Habit {habit_index}",
                     count=int(round(percentage)),
                 )
             )
@@ -1125,24 +1446,19 @@ async def get_user_habit_statistics(
 
     achievements = await get_user_achievements(db, user_id)
 
-    snapshot_query = (
-        select(models.HabitProgressSnapshot)
-        .where(models.HabitProgressSnapshot.user_id == user_id)
-        .order_by(models.HabitProgressSnapshot.snapshot_date.desc())
-    )
-    result = await db.execute(snapshot_query)
-    snapshots = [
-        snapshot
-        for snapshot in result.scalars().all()
-        if snapshot.snapshot_date >= cutoff.date()
-    ]
-
-    total_findings = sum(snapshot.total_findings for snapshot in snapshots)
-    average_consistency = (
-        sum(snapshot.consistency_score for snapshot in snapshots) / len(snapshots)
-        if snapshots
-        else 0.0
-    )
+    snapshot = models.HabitProgressSnapshot
+    snapshots_recorded, total_findings, average_consistency = (
+        await db.execute(
+            select(
+                func.count(snapshot.id),
+                func.coalesce(func.sum(snapshot.total_findings), 0),
+                func.coalesce(func.avg(snapshot.consistency_score), 0.0),
+            ).where(
+                snapshot.user_id == user_id,
+                snapshot.snapshot_date >= cutoff.date(),
+            )
+        )
+    ).one()
 
     return {
         "summary": {
@@ -1152,8 +1468,8 @@ async def get_user_habit_statistics(
             "total_achievements": len(achievements),
         },
         "recent_activity": {
-            "snapshots_recorded": len(snapshots),
-            "total_findings": total_findings,
+            "snapshots_recorded": snapshots_recorded,
+            "total_findings": int(total_findings),
             "average_consistency_score": round(average_consistency, 2),
             "days_analyzed": days_back,
         },
@@ -1266,7 +1582,9 @@ async def get_user_reports_with_findings(
     returns all recent reports as a best-effort placeholder for the tracker.
     """
     query = select(models.AnalysisReport).options(
-        selectinload(models.AnalysisReport.findings)
+        selectinload(models.AnalysisReport.findings).undefer(
+            models.Finding.problematic_text
+        )
     )
     if start_date is not None:
         query = query.where(models.AnalysisReport.analysis_date >= start_date)
@@ -1469,6 +1787,42 @@ async def get_database_health(db: AsyncSession) -> dict[str, Any]:
         }
 
 
+async def delete_reports_older_than(db: AsyncSession, days: int) -> int:
+    """Delete analysis reports older than ``days`` and drop them from the index.
+
+    Args:
+        db: Database session
+        days: Age in days beyond which reports are deleted
+
+    Returns:
+        int: Number of reports deleted
+    """
+    if days <= 0:
+        raise ValueError("Days must be positive")
+
+    cutoff_date = datetime.datetime.now(datetime.UTC) - timedelta(days=days)
+    try:
+        result = await db.execute(
+            select(models.AnalysisReport.id).where(
+                models.AnalysisReport.analysis_date < cutoff_date
+            )
+        )
+        report_ids = list(result.scalars().all())
+        if report_ids:
+            await db.execute(
+                models.AnalysisReport.__table__.delete().where(
+                    models.AnalysisReport.analysis_date < cutoff_date
+                )
+            )
+            await db.commit()
+            await _unindex_reports(report_ids)
+        return len(report_ids)
+    except (sqlalchemy.exc.SQLAlchemyError, sqlite3.Error) as e:
+        await db.rollback()
+        logger.error("Failed to delete reports older than %d days: %s", days, e)
+        raise
+
+
 async def cleanup_old_data(
     db: AsyncSession, days_to_keep: int = 365, dry_run: bool = True
 ) -> dict[str, int]:
@@ -1504,7 +1858,19 @@ async def cleanup_old_data(
 
         if not dry_run and (old_reports_count > 0 or old_snapshots_count > 0):
             # Delete old reports (findings will be cascade deleted)
+            old_report_ids: list[int] = []
             if old_reports_count > 0:
+                old_report_ids = list(
+                    (
+                        await db.execute(
+                            select(models.AnalysisReport.id).where(
+                                models.AnalysisReport.analysis_date < cutoff_date
+                            )
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
                 await db.execute(
                     models.AnalysisReport.__table__.delete().where(
                         models.AnalysisReport.analysis_date < cutoff_date
@@ -1520,6 +1886,7 @@ async def cleanup_old_data(
                 )
 
             await db.commit()
+            await _unindex_reports(old_report_ids)
             logger.info(
                 "Cleaned up old data: %d reports, %d snapshots",
                 old_reports_count,
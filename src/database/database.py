@@ -164,6 +164,9 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips tables that already exist, so indexes added to
+        # existing tables later are created here
+        await conn.run_sync(_create_missing_indexes)
 
         # Ensure preferences column exists for user table
         if "sqlite" in DATABASE_URL:
@@ -198,9 +201,31 @@ async def init_db() -> None:
                 text("PRAGMA foreign_keys=ON")
             )  # Enable foreign key constraints
 
+    if "sqlite" in DATABASE_URL:
+        await _backfill_rollups_if_missing()
+
     logger.info("Database initialization complete")
 
 
+def _create_missing_indexes(sync_conn) -> None:
+    """Create model indexes that are missing from already existing tables."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+async def _backfill_rollups_if_missing() -> None:
+    """Build the dashboard rollups for databases that predate them."""
+    from .crud import backfill_report_rollups
+
+    async with AsyncSessionLocal() as session:
+        has_rollups = await session.scalar(text("SELECT EXISTS (SELECT 1 FROM report_rollups)"))
+        has_reports = await session.scalar(text("SELECT EXISTS (SELECT 1 FROM reports)"))
+        if has_reports and not has_rollups:
+            logger.info("Backfilling report rollups from existing reports")
+            await backfill_report_rollups(session)
+
+
 async def close_db_connections() -> None:
     """Gracefully dispose of database engine and close all connections.
 
@@ -5,8 +5,13 @@ ensuring data protection at rest in the database.
 """
 
 import base64
+import hashlib
 import logging
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, Type, TypeVar
 
 from cryptography.fernet import Fernet
@@ -19,6 +24,11 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Decrypted payloads kept by DatabaseEncryptionService.decrypt_many
+DECRYPT_CACHE_SIZE = 2048
+# Below this many cache misses a bulk decrypt runs inline
+PARALLEL_DECRYPT_THRESHOLD = 64
+
 
 class DatabaseEncryptionService:
     """Service for encrypting and decrypting database fields."""
@@ -32,6 +42,8 @@ class DatabaseEncryptionService:
         """
         self.encryption_key = self._get_or_generate_key(encryption_key)
         self.cipher = Fernet(self.encryption_key)
+        self._decrypt_cache: OrderedDict[tuple[Hashable, bytes], str] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def _get_or_generate_key(self, encryption_key: Optional[str]) -> bytes:
         """Get encryption key from environment or generate a new one."""
@@ -116,6 +128,74 @@ class DatabaseEncryptionService:
             raise ValueError(f"Database field decryption failed: {e}")
 
 
+    def decrypt_many(
+        self, items: Sequence[tuple[Hashable, Optional[str]]]
+    ) -> list[Optional[str]]:
+        """Decrypt many field values at once.
+
+        Results are cached in a small LRU keyed by the caller's row key and a
+        hash of the ciphertext, so a re-encrypted value never hits a stale
+        entry. Misses are spread across a thread pool when there are enough
+        of them to be worth it.
+
+        Args:
+            items: ``(row key, encrypted value)`` pairs, e.g. ``(("finding", 7), text)``
+
+        Returns:
+            Decrypted values in the order of ``items``
+        """
+        results: list[Optional[str]] = [None] * len(items)
+        misses: list[tuple[int, tuple[Hashable, bytes], str]] = []
+        with self._cache_lock:
+            for index, (row_key, encrypted_value) in enumerate(items):
+                if not encrypted_value:
+                    results[index] = encrypted_value
+                    continue
+                cache_key = (
+                    row_key,
+                    hashlib.blake2b(encrypted_value.encode(), digest_size=16).digest(),
+                )
+                cached = self._decrypt_cache.get(cache_key)
+                if cached is None:
+                    misses.append((index, cache_key, encrypted_value))
+                else:
+                    self._decrypt_cache.move_to_end(cache_key)
+                    results[index] = cached
+
+        if len(misses) >= PARALLEL_DECRYPT_THRESHOLD:
+            decrypted = list(
+                _get_decrypt_executor().map(
+                    self.decrypt_field, [value for _, _, value in misses]
+                )
+            )
+        else:
+            decrypted = [self.decrypt_field(value) for _, _, value in misses]
+
+        with self._cache_lock:
+            for (index, cache_key, _), plaintext in zip(misses, decrypted, strict=True):
+                results[index] = plaintext
+                self._decrypt_cache[cache_key] = plaintext
+            while len(self._decrypt_cache) > DECRYPT_CACHE_SIZE:
+                self._decrypt_cache.popitem(last=False)
+        return results
+
+
+_decrypt_executor: Optional[ThreadPoolExecutor] = None
+_decrypt_executor_lock = threading.Lock()
+
+
+def _get_decrypt_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by bulk decryption calls."""
+    global _decrypt_executor
+    with _decrypt_executor_lock:
+        if _decrypt_executor is None:
+            _decrypt_executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="db-decrypt",
+            )
+        return _decrypt_executor
+
+
 class EncryptedString(TypeDecorator):
     """SQLAlchemy type for encrypted string fields."""
 
@@ -9,16 +9,19 @@ import datetime
 from typing import Any
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
     Text,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -83,6 +86,9 @@ class ComplianceRubric(Base):
     )
 
 
+ENCRYPTED_GROUP = "encrypted"
+
+
 class AnalysisReport(Base):
     """Analysis report model for storing document analysis results with encrypted sensitive data."""
 
@@ -96,8 +102,10 @@ class AnalysisReport(Base):
     compliance_score: Mapped[float] = mapped_column(Float, index=True)
     document_type: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
     discipline: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
+    # Encrypted columns are deferred so list queries skip their decryption;
+    # load them with undefer_group(ENCRYPTED_GROUP) where they are read.
     analysis_result: Mapped[dict] = mapped_column(
-        EncryptedJSON
+        EncryptedJSON, deferred=True, deferred_group=ENCRYPTED_GROUP
     )  # Encrypt sensitive analysis data
     document_embedding: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
@@ -118,10 +126,10 @@ class Finding(Base):
     rule_id: Mapped[str] = mapped_column(String, index=True)
     risk: Mapped[str] = mapped_column(String, index=True)  # High, Medium, Low
     personalized_tip: Mapped[str] = mapped_column(
-        EncryptedText
+        EncryptedText, deferred=True, deferred_group=ENCRYPTED_GROUP
     )  # Encrypt personalized tips
     problematic_text: Mapped[str] = mapped_column(
-        EncryptedText
+        EncryptedText, deferred=True, deferred_group=ENCRYPTED_GROUP
     )  # Encrypt problematic text excerpts
     confidence_score: Mapped[float] = mapped_column(Float, default=0.0)
 
@@ -222,6 +230,10 @@ class HabitProgressSnapshot(Base):
     """Periodic snapshots of user's habit progression for trend analysis."""
 
     __tablename__ = "habit_progress_snapshots"
+    __table_args__ = (
+        # Serves latest-snapshot-per-user lookups without touching the table.
+        Index("ix_habit_progress_snapshots_user_date", "user_id", "snapshot_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
@@ -250,3 +262,88 @@ class HabitProgressSnapshot(Base):
     user: Mapped["User"] = relationship(
         "User", back_populates="habit_progress_snapshots"
     )
+
+
+class ReportRollup(Base):
+    """Pre-aggregated report statistics for dashboards and benchmarks.
+
+    One row per day, discipline, document type and one-point compliance score
+    bucket. Rows are maintained by SQLite triggers on ``reports`` and
+    ``findings`` (see ``REPORT_ROLLUP_TRIGGERS``), so every write path keeps
+    them current; ``crud.backfill_report_rollups`` rebuilds them from history.
+    Unknown disciplines and document types are stored as empty strings.
+    """
+
+    __tablename__ = "report_rollups"
+
+    day: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    discipline: Mapped[str] = mapped_column(String, primary_key=True, default="")
+    document_type: Mapped[str] = mapped_column(String, primary_key=True, default="")
+    score_bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    report_count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    score_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    score_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+    findings_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+_ROLLUP_KEY = (
+    "date({row}.analysis_date), COALESCE({row}.discipline, ''), "
+    "COALESCE({row}.document_type, ''), CAST({row}.compliance_score AS INTEGER)"
+)
+
+# Adds NEW to its rollup row, including findings already attached to it.
+_ROLLUP_ADD = (
+    "INSERT INTO report_rollups (day, discipline, document_type, score_bucket, "
+    "report_count, score_sum, score_sq_sum, score_min, score_max, findings_count) "
+    "SELECT " + _ROLLUP_KEY.format(row="NEW") + ", 1, NEW.compliance_score, "
+    "NEW.compliance_score * NEW.compliance_score, NEW.compliance_score, "
+    "NEW.compliance_score, (SELECT COUNT(*) FROM findings WHERE report_id = NEW.id) "
+    "WHERE NEW.compliance_score IS NOT NULL "
+    "ON CONFLICT (day, discipline, document_type, score_bucket) DO UPDATE SET "
+    "report_count = report_count + 1, "
+    "score_sum = score_sum + excluded.score_sum, "
+    "score_sq_sum = score_sq_sum + excluded.score_sq_sum, "
+    "score_min = min(COALESCE(score_min, excluded.score_min), excluded.score_min), "
+    "score_max = max(COALESCE(score_max, excluded.score_max), excluded.score_max), "
+    "findings_count = findings_count + excluded.findings_count;"
+)
+
+# Removes OLD from its rollup row. Minima and maxima are not lowered back;
+# they stay correct to within their one-point bucket.
+_ROLLUP_REMOVE = (
+    "UPDATE report_rollups SET report_count = report_count - 1, "
+    "score_sum = score_sum - OLD.compliance_score, "
+    "score_sq_sum = score_sq_sum - OLD.compliance_score * OLD.compliance_score, "
+    "findings_count = findings_count - "
+    "(SELECT COUNT(*) FROM findings WHERE report_id = OLD.id) "
+    "WHERE OLD.compliance_score IS NOT NULL "
+    "AND (day, discipline, document_type, score_bucket) = ("
+    + _ROLLUP_KEY.format(row="OLD")
+    + ");"
+)
+
+_FINDING_COUNT_DELTA = (
+    "UPDATE report_rollups SET findings_count = findings_count {sign} 1 "
+    "WHERE (day, discipline, document_type, score_bucket) = "
+    "(SELECT " + _ROLLUP_KEY.format(row="reports") + " FROM reports "
+    "WHERE reports.id = {row}.report_id);"
+)
+
+REPORT_ROLLUP_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS report_rollups_on_insert AFTER INSERT ON reports "
+    "BEGIN " + _ROLLUP_ADD + " END",
+    "CREATE TRIGGER IF NOT EXISTS report_rollups_on_delete AFTER DELETE ON reports "
+    "BEGIN " + _ROLLUP_REMOVE + " END",
+    "CREATE TRIGGER IF NOT EXISTS report_rollups_on_update AFTER UPDATE OF "
+    "compliance_score, analysis_date, discipline, document_type ON reports "
+    "BEGIN " + _ROLLUP_REMOVE + " " + _ROLLUP_ADD + " END",
+    "CREATE TRIGGER IF NOT EXISTS report_rollups_on_finding_insert AFTER INSERT ON findings "
+    "BEGIN " + _FINDING_COUNT_DELTA.format(sign="+", row="NEW") + " END",
+    "CREATE TRIGGER IF NOT EXISTS report_rollups_on_finding_delete AFTER DELETE ON findings "
+    "BEGIN " + _FINDING_COUNT_DELTA.format(sign="-", row="OLD") + " END",
+)
+
+for _trigger in REPORT_ROLLUP_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_trigger).execute_if(dialect="sqlite"))
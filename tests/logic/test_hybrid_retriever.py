@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from src.core.cache_service import QueryEmbeddingCache
 from src.core.hybrid_retriever import HybridRetriever
 
 np = pytest.importorskip("numpy")
@@ -95,3 +96,16 @@ async def test_rrf_ranking_logic(retriever):
 
     assert len(results_top_2) == 2
     assert [res["name"] for res in results_top_2] == ["Doc A", "Doc C"]
+
+
+def test_query_embeddings_are_cached_per_normalized_query(retriever):
+    """Repeated queries hit the in-memory cache instead of re-encoding."""
+    retriever.query_embedding_cache = QueryEmbeddingCache("test-model")
+    first = retriever._get_embedding("gait  training\tprogress")
+    second = retriever._get_embedding("gait training progress")
+
+    # One encode for the corpus at init, one for the query.
+    assert retriever.dense_retriever.encode.call_count == 2
+    assert second is first
+    assert first.dtype == np.float32
+    assert not first.flags.writeable
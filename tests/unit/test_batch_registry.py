@@ -0,0 +1,139 @@
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+from src.api.batch_registry import BatchAnalysisRegistry, read_archive
+from src.core.enhanced_worker_manager import EnhancedWorkerManager, TaskPriority
+from src.core.micro_batcher import MicroBatcher
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class FakeAnalysisService:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+
+    async def analyze_document(self, **kwargs):
+        self.calls.append(kwargs)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if kwargs["file_content"] == b"broken":
+            raise ValueError("unreadable document")
+        return {"analysis": {"compliance_score": 80, "findings": [{}]}, "report_deferred": True}
+
+
+@pytest.fixture
+async def registry():
+    manager = EnhancedWorkerManager(max_workers=2, max_queue_size=10)
+    yield BatchAnalysisRegistry(worker_manager=manager)
+    await manager.stop()
+
+
+def test_read_archive_skips_metadata_and_enforces_limits():
+    archive = _zip({"a.txt": "one", "notes/b.txt": "two", "__MACOSX/._a.txt": "x", ".DS_Store": "x"})
+    assert read_archive(archive, max_documents=5, max_total_bytes=100) == [
+        ("a.txt", b"one"),
+        ("b.txt", b"two"),
+    ]
+
+    with pytest.raises(ValueError, match="maximum of 1"):
+        read_archive(archive, max_documents=1, max_total_bytes=100)
+    with pytest.raises(ValueError, match="uncompressed size"):
+        read_archive(archive, max_documents=5, max_total_bytes=4)
+    with pytest.raises(ValueError, match="not a valid zip"):
+        read_archive(b"plain text", max_documents=5, max_total_bytes=100)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_in_throughput_mode_within_worker_limit(registry):
+    service = FakeAnalysisService()
+    documents = [(f"doc{i}.txt", b"text") for i in range(5)] + [("bad.txt", b"broken"), ("big.txt", b"x")]
+    job = registry.create(
+        documents,
+        owner_id=1,
+        discipline="pt",
+        analysis_mode="rubric",
+        strictness="standard",
+        rejected={6: "File too large"},
+    )
+    await registry.start(job, service)
+    await asyncio.wait_for(job.done.wait(), timeout=5)
+
+    snapshot = job.snapshot()
+    assert snapshot["status"] == "completed"
+    assert snapshot["progress"] == 100
+    assert snapshot["counts"] == {"queued": 0, "running": 0, "completed": 5, "failed": 2, "cancelled": 0}
+    assert snapshot["average_compliance_score"] == 80
+    assert snapshot["priority"] == "low"
+    assert job.documents[5].error == "unreadable document"
+    assert len(service.calls) == 6
+    assert all(call["throughput_mode"] for call in service.calls)
+    assert service.peak <= 2
+    assert all(document.content is None for document in job.documents)
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_remaining_documents(registry):
+    service = FakeAnalysisService(delay=0.2)
+    job = registry.create(
+        [(f"doc{i}.txt", b"text") for i in range(6)],
+        owner_id=1,
+        discipline="pt",
+        analysis_mode="rubric",
+        strictness="standard",
+        priority=TaskPriority.NORMAL,
+    )
+    await registry.start(job, service)
+    await asyncio.sleep(0.05)
+
+    assert await registry.cancel(job.batch_id) is True
+    await asyncio.wait_for(job.done.wait(), timeout=5)
+
+    assert job.status == "cancelled"
+    assert job.counts()["cancelled"] == 6
+    assert len(service.calls) == 2
+    assert await registry.cancel(job.batch_id) is False
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_coalesces_concurrent_submissions():
+    batches = []
+
+    async def upper(items):
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(upper, max_batch=3, max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(word) for word in ["a", "b", "c", "d"]))
+
+    assert results == ["A", "B", "C", "D"]
+    assert batches == [["a", "b", "c"], ["d"]]
+    assert batcher.stats == {"items": 4, "batches": 2}
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_fails_every_item_when_result_count_is_wrong():
+    async def short(items):
+        return items[:-1]
+
+    batcher = MicroBatcher(short, max_batch=2, max_wait=0.01)
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
@@ -2,8 +2,11 @@
 Unit tests for the cache service and integration.
 """
 
+import threading
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from src.core.cache_integration_service import CacheIntegrationService
 from src.core.cache_service import (
     DocumentCache,
@@ -11,6 +14,7 @@ from src.core.cache_service import (
     LLMResponseCache,
     MemoryAwareLRUCache,
     NERCache,
+    QueryEmbeddingCache,
     cleanup_all_caches,
     get_cache_stats,
 )
@@ -134,6 +138,111 @@ class TestSpecializedCaches:
         assert cached_response == response
 
 
+
+class TestLLMResponseCache:
+    """Test bounds, TTL and persistence of the LLM response cache."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self):
+        saved = (LLMResponseCache.max_entries, LLMResponseCache.max_memory_mb, LLMResponseCache.default_ttl_hours)
+        LLMResponseCache.configure(db_path=None)
+        LLMResponseCache.clear()
+        yield
+        LLMResponseCache.configure(
+            max_entries=saved[0], max_memory_mb=saved[1], default_ttl_hours=saved[2], db_path=None
+        )
+        LLMResponseCache.clear()
+
+    def test_ttl_is_honored(self):
+        with patch("src.core.cache_service.time.time", return_value=1_000.0):
+            LLMResponseCache.set_response("model", "prompt", "response", ttl_hours=1)
+        with patch("src.core.cache_service.time.time", return_value=1_000.0 + 3599):
+            assert LLMResponseCache.get_response("model", "prompt") == "response"
+        with patch("src.core.cache_service.time.time", return_value=1_000.0 + 3601):
+            assert LLMResponseCache.get_response("model", "prompt") is None
+        assert LLMResponseCache.entry_count() == 0
+
+    def test_size_bound_evicts_least_recently_used(self):
+        LLMResponseCache.configure(max_entries=2, db_path=None)
+        LLMResponseCache.set_response("model", "a", "A")
+        LLMResponseCache.set_response("model", "b", "B")
+        assert LLMResponseCache.get_response("model", "a") == "A"
+        LLMResponseCache.set_response("model", "c", "C")
+
+        assert LLMResponseCache.entry_count() == 2
+        assert LLMResponseCache.get_response("model", "b") is None
+        assert LLMResponseCache.get_response("model", "a") == "A"
+        assert LLMResponseCache.memory_usage_mb() > 0
+
+    def test_generation_params_are_part_of_the_key(self):
+        LLMResponseCache.set_response("model", "prompt", "short", params={"max_new_tokens": 8})
+
+        assert LLMResponseCache.get_response("model", "prompt", {"max_new_tokens": 8}) == "short"
+        assert LLMResponseCache.get_response("model", "prompt", {"max_new_tokens": 256}) is None
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        db_path = tmp_path / "llm_responses.sqlite3"
+        LLMResponseCache.configure(db_path=db_path)
+        LLMResponseCache.set_response("model", "prompt", "persisted")
+
+        # Simulate a restart: a fresh memory tier attached to the same file.
+        with LLMResponseCache._lock:
+            LLMResponseCache._entries.clear()
+            LLMResponseCache._size_bytes = 0
+        LLMResponseCache.configure(db_path=db_path)
+
+        assert LLMResponseCache.get_response("model", "prompt") == "persisted"
+        assert LLMResponseCache.entry_count() == 1
+        assert LLMResponseCache._disk.max_entries == LLMResponseCache.disk_max_entries
+
+    def test_concurrent_first_use_configures_once(self):
+        LLMResponseCache._configured = False
+        with patch.object(
+            LLMResponseCache, "configure", wraps=LLMResponseCache.configure
+        ) as configure:
+            threads = [
+                threading.Thread(target=LLMResponseCache.get_response, args=("model", "prompt"))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert configure.call_count == 1
+
+
+def test_query_embedding_cache_persists_float32_vectors(tmp_path):
+    db_path = tmp_path / "query_embeddings.sqlite3"
+    encode = MagicMock(return_value=[0.25, 0.5, 0.75])
+
+    cache = QueryEmbeddingCache("dense-model", max_entries=1, db_path=db_path)
+    vector = cache.get_or_compute("balance  training", encode)
+    assert vector.dtype.name == "float32"
+    assert cache.get_or_compute("balance training", encode) is vector
+
+    cache.get_or_compute("other query", encode)
+    assert len(cache) == 1
+
+    restarted = QueryEmbeddingCache("dense-model", db_path=db_path)
+    assert restarted.get("balance training").tolist() == [0.25, 0.5, 0.75]
+    assert QueryEmbeddingCache("other-model", db_path=db_path).get("balance training") is None
+    assert encode.call_count == 2
+
+
+def test_query_embedding_cache_prunes_disk_tier(tmp_path, monkeypatch):
+    db_path = tmp_path / "query_embeddings.sqlite3"
+    monkeypatch.setattr(QueryEmbeddingCache, "_PRUNE_EVERY", 2)
+    cache = QueryEmbeddingCache("dense-model", max_entries=1, db_path=db_path, disk_max_entries=2)
+
+    for n in range(4):
+        cache.put(f"query {n}", [float(n)])
+
+    restarted = QueryEmbeddingCache("dense-model", db_path=db_path, disk_max_entries=2)
+    assert restarted.get("query 0") is None
+    assert restarted.get("query 3").tolist() == [3.0]
+    assert cache._conn.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0] == 2
+
 class TestCacheIntegrationService:
     """Test the cache integration service."""
 
@@ -0,0 +1,24 @@
+from src.core.checklist_service import DeterministicChecklistService
+
+
+NOTE = (
+    "Patient seen for skilled intervention. "
+    "Progress toward short-term goal of independent transfers. "
+    "Continue plan of care 3x/week."
+)
+
+
+def test_evaluate_reports_first_sentence_with_each_item():
+    service = DeterministicChecklistService()
+
+    results = {
+        item["id"]: item
+        for item in service.evaluate(NOTE, doc_type="Progress Note", discipline="PT")
+    }
+
+    assert results["medical_necessity"]["evidence"] == "Patient seen for skilled intervention"
+    assert results["goals_progress"]["status"] == "pass"
+    assert results["goals_progress"]["evidence"].startswith("Progress toward")
+    assert results["treatment_frequency"]["evidence"] == "Continue plan of care 3x/week."
+    assert results["strength_assessment"]["status"] == "review"
+    assert "adl_assessment" not in results
@@ -1,7 +1,11 @@
+import json
+import time
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.config import get_settings
+from src.core.analysis_context import AnalysisContext
 from src.core.compliance_analyzer import ComplianceAnalyzer
 
 
@@ -57,6 +61,140 @@ async def test_analyze_document_orchestration(compliance_analyzer: ComplianceAna
     assert result == {"findings": []}
 
 
+
+@pytest.mark.asyncio
+async def test_analyze_document_reuses_shared_context(compliance_analyzer: ComplianceAnalyzer):
+    rules = [{"id": "rule-1", "name": "Transfers", "content": "Document transfer assistance."}]
+    context = AnalysisContext(
+        document_text="Patient requires assistance with transfers.",
+        discipline="PT",
+        doc_type="Progress Note",
+        entities=[{"entity_group": "ISSUE", "word": "transfers"}],
+        retrieved_rules=rules,
+    )
+
+    await compliance_analyzer.analyze_document(
+        document_text=context.document_text, discipline="PT", doc_type="Progress Note", context=context
+    )
+
+    compliance_analyzer.ner_analyzer.extract_entities.assert_not_called()
+    compliance_analyzer.retriever.retrieve.assert_not_awaited()
+    explained_rules = compliance_analyzer.explanation_engine.add_explanations.call_args.args[3]
+    assert explained_rules is rules
+
+
+@pytest.mark.asyncio
+async def test_analysis_context_runs_each_model_once():
+    ner_service = MagicMock()
+    ner_service.extract_entities.return_value = [{"entity_group": "ISSUE", "word": "gait"}]
+    retriever = MagicMock()
+    retriever.retrieve = AsyncMock(return_value=[{"id": "rule-1"}])
+    context = AnalysisContext(document_text="Gait training.", discipline="PT", doc_type="Progress Note")
+
+    for _ in range(2):
+        await context.ensure_entities(ner_service)
+        await context.ensure_rules(retriever, "PT Progress Note compliance", top_k=5)
+
+    ner_service.extract_entities.assert_called_once_with("Gait training.")
+    retriever.retrieve.assert_awaited_once_with(
+        "PT Progress Note compliance",
+        top_k=5,
+        discipline="PT",
+        document_type="Progress Note",
+        context_entities=["gait"],
+    )
+
+
+def _long_note() -> str:
+    subjective = "Subjective: " + " ".join(f"Patient reports pain level {n} of 10 today." for n in range(60))
+    plan = "Plan: " + " ".join(f"Continue gait training visit {n} with walker." for n in range(60))
+    return f"{subjective}\n{plan}"
+
+
+@pytest.mark.asyncio
+async def test_long_document_is_analyzed_per_chunk_and_merged(compliance_analyzer: ComplianceAnalyzer):
+    compliance_analyzer.prompt_manager = None
+    prompts = []
+
+    def generate(prompt):
+        prompts.append(prompt)
+        findings = [
+            {"rule_id": "signature", "evidence": "Missing therapist signature", "confidence": 0.6},
+        ]
+        if "gait training" in prompt:
+            findings.append({"rule_id": "goals", "evidence": "No measurable goals", "confidence": 0.8})
+        return json.dumps({"findings": findings, "compliance_score": 80 if "gait" in prompt else 90})
+
+    compliance_analyzer.llm_service.generate.side_effect = generate
+    compliance_analyzer.explanation_engine.add_explanations.side_effect = lambda analysis, *_: analysis
+
+    result = await compliance_analyzer.analyze_document(
+        document_text=_long_note(), discipline="PT", doc_type="Progress Note"
+    )
+
+    assert compliance_analyzer.llm_service.generate.call_count == result["chunks_total"] > 2
+    assert result["chunks_analyzed"] == result["chunks_total"]
+    assert sorted(finding["rule_id"] for finding in result["findings"]) == ["goals", "signature"]
+    assert 80 <= result["compliance_score"] <= 90
+    assert all("Rules:" in prompt and "truncated" not in prompt for prompt in prompts)
+
+
+@pytest.mark.asyncio
+async def test_map_reduce_stops_at_time_budget(compliance_analyzer: ComplianceAnalyzer, monkeypatch):
+    monkeypatch.setattr(get_settings().analysis, "map_reduce_time_budget_seconds", 0.2)
+
+    def generate(prompt):
+        time.sleep(0.15)
+        return json.dumps({"findings": [], "compliance_score": 95})
+
+    compliance_analyzer.llm_service.generate.side_effect = generate
+    compliance_analyzer.explanation_engine.add_explanations.side_effect = lambda analysis, *_: analysis
+
+    started = time.monotonic()
+    result = await compliance_analyzer.analyze_document(
+        document_text=_long_note(), discipline="PT", doc_type="Progress Note"
+    )
+
+    assert time.monotonic() - started < 1.0
+    assert result["chunks_skipped"] > 0
+    assert result["chunks_analyzed"] + result["chunks_skipped"] == result["chunks_total"]
+
+
+@pytest.mark.asyncio
+async def test_tips_share_the_document_time_budget(compliance_analyzer: ComplianceAnalyzer, monkeypatch):
+    monkeypatch.setattr(get_settings().analysis, "map_reduce_time_budget_seconds", 0.5)
+    findings = [{"issue_title": f"Issue {n}", "suggestion": f"Fix {n}", "confidence": 0.9} for n in range(5)]
+    compliance_analyzer.explanation_engine.add_explanations.return_value = {"findings": findings}
+
+    def generate_tip(finding):
+        time.sleep(0.2)
+        return "Tip"
+
+    compliance_analyzer.nlg_service.generate_personalized_tip.side_effect = generate_tip
+
+    started = time.monotonic()
+    result = await compliance_analyzer.analyze_document(
+        document_text="Patient requires assistance with transfers.", discipline="PT", doc_type="Progress Note"
+    )
+
+    assert time.monotonic() - started < 1.5
+    tips = [finding["personalized_tip"] for finding in result["findings"]]
+    assert tips[0] == "Tip"
+    assert tips[-1] == "Fix 4"
+
+def test_merge_keeps_findings_without_evidence_apart():
+    chunk = {"text": "Plan: continue gait training.", "section": "Plan"}
+    analyses = [
+        (chunk, {"findings": [{"rule_id": "goals", "evidence": "", "confidence": 0.6}]}),
+        (chunk, {"findings": [{"rule_id": "goals", "confidence": 0.7}]}),
+        (chunk, {"findings": [{"rule_id": "goals", "evidence": "No measurable goals", "confidence": 0.8}]}),
+    ]
+
+    merged = ComplianceAnalyzer._merge_chunk_analyses(analyses)
+
+    assert [finding["confidence"] for finding in merged["findings"]] == [0.6, 0.7, 0.8]
+
+
 def test_format_rules_for_prompt():
     """
     Tests the formatting of compliance rules for the LLM prompt.
@@ -21,3 +21,110 @@ class TestAggregationLevel:
 
 class TestAggregatedMetric:
     """Test aggregated metric data."""
+
+    def test_aggregated_metric_fields(self):
+        """Test aggregated metric construction."""
+        from datetime import datetime
+
+        from src.core.data_aggregator import AggregatedMetric
+
+        metric = AggregatedMetric(
+            timestamp=datetime(2024, 1, 1),
+            name="cpu_usage",
+            source="system",
+            aggregation_level=AggregationLevel.SHORT_TERM,
+            count=2,
+            min_value=1.0,
+            max_value=3.0,
+            avg_value=2.0,
+            sum_value=4.0,
+            std_dev=1.414,
+            tags={},
+            metadata={},
+        )
+        assert metric.count == 2
+
+
+class TestTimeSeriesStorage:
+    """Test batched ingest, ring buffers and SQL downsampling."""
+
+    @staticmethod
+    def _metrics(start, values, name="cpu_usage"):
+        from datetime import timedelta
+
+        return [
+            {
+                "timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+                "name": name,
+                "value": value,
+                "unit": "percent",
+                "type": "gauge",
+                "source": "system",
+                "tags": {"host": "a"},
+                "metadata": {"cpu_count": 4},
+            }
+            for i, value in enumerate(values)
+        ]
+
+    def test_hot_window_and_sql_agree(self, tmp_path):
+        from datetime import datetime, timedelta
+
+        from src.core.data_aggregator import TimeSeriesStorage
+
+        storage = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+        start = datetime.now() + timedelta(seconds=1)
+        assert storage.store_raw_metrics(self._metrics(start, [1.0, 2.0, 3.0])) == 3
+
+        window = (start - timedelta(seconds=1), start + timedelta(minutes=5))
+        from_ring = storage.query_raw_metrics(*window, metric_name="cpu_usage")
+        storage.close()
+
+        reopened = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+        from_sql = reopened.query_raw_metrics(*window, metric_name="cpu_usage")
+        assert [m["value"] for m in from_ring] == [1.0, 2.0, 3.0]
+        assert from_sql == from_ring
+        assert from_sql[0]["tags"] == {"host": "a"}
+        assert from_sql[0]["metadata"] == {"cpu_count": 4}
+        reopened.close()
+
+    def test_downsampling_cascades_through_tiers(self, tmp_path):
+        import statistics
+        from datetime import datetime, timedelta
+
+        from src.core.data_aggregator import TimeSeriesStorage
+
+        storage = TimeSeriesStorage(str(tmp_path / "metrics.db"))
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        values = [10.0, 20.0, 30.0, 40.0]
+        storage.store_raw_metrics(self._metrics(start, values))
+        now = start + timedelta(minutes=10)
+
+        for level in (
+            AggregationLevel.SHORT_TERM,
+            AggregationLevel.MEDIUM_TERM,
+            AggregationLevel.LONG_TERM,
+            AggregationLevel.DAILY,
+        ):
+            assert storage.downsample(level, now) > 0
+
+        short = storage.query_aggregated_metrics(
+            start, now, AggregationLevel.SHORT_TERM
+        )
+        assert [m.count for m in short] == [2, 2]
+        (hourly,) = storage.query_aggregated_metrics(
+            start, now, AggregationLevel.LONG_TERM
+        )
+        assert hourly.timestamp == start
+        assert (hourly.count, hourly.min_value, hourly.max_value) == (4, 10.0, 40.0)
+        assert hourly.avg_value == 25.0
+        assert abs(hourly.std_dev - statistics.stdev(values)) < 1e-9
+
+        # Later samples extend the last bucket instead of duplicating it.
+        storage.store_raw_metrics(self._metrics(start + timedelta(minutes=2), [50.0]))
+        storage.downsample(AggregationLevel.SHORT_TERM, now)
+        storage.downsample(AggregationLevel.MEDIUM_TERM, now)
+        (medium,) = storage.query_aggregated_metrics(
+            start, now, AggregationLevel.MEDIUM_TERM
+        )
+        assert medium.count == 5
+        storage.close()
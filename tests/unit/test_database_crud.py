@@ -1,9 +1,14 @@
+import datetime
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 
 pytest.importorskip("sqlalchemy")
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import crud, schemas
+from src.database import crud, models, schemas
+from src.database.encryption import DatabaseEncryptionService
 
 
 @pytest.mark.asyncio
@@ -196,12 +201,205 @@ async def test_create_analysis_report(db_session: AsyncSession):
     report = await crud.create_analysis_report(db_session, report_data, findings_data)
     assert report.document_name == "Test Report"
     assert len(report.findings) == 1
+    assert report.findings[0].personalized_tip == "Test tip"
+    assert report.analysis_result == {}
+
+
+@pytest.mark.asyncio
+async def test_report_rollups_follow_report_writes(populated_db: AsyncSession):
+    report = await crud.create_analysis_report(
+        populated_db,
+        schemas.ReportCreate(
+            document_name="Rollup Report",
+            compliance_score=60.0,
+            analysis_result={"discipline": "OT"},
+            document_type="Evaluation",
+        ),
+        [
+            schemas.FindingCreate(
+                rule_id="rollup-rule",
+                risk="High",
+                personalized_tip="Tip",
+                problematic_text="Text",
+            )
+        ],
+    )
+
+    metrics = await crud.get_organizational_metrics(populated_db, days_back=30)
+    assert metrics["total_analyses"] == 5
+    assert metrics["total_findings"] == 1
+    breakdown = await crud.get_discipline_breakdown(populated_db, days_back=30)
+    assert breakdown["OT"] == {"avg_compliance_score": pytest.approx(67.5), "user_count": 2}
+
+    await populated_db.delete(report)
+    await populated_db.commit()
+    stats = await crud.get_dashboard_statistics(populated_db)
+    assert stats["total_documents_analyzed"] == 4
+    assert stats["compliance_by_category"]["Evaluation"]["document_count"] == 1
+    metrics = await crud.get_organizational_metrics(populated_db, days_back=30)
+    assert metrics["total_findings"] == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_report_rollups_matches_triggers(populated_db: AsyncSession):
+    before = await crud.get_benchmark_data(populated_db, min_analyses=3)
+    await populated_db.execute(models.ReportRollup.__table__.delete())
+    await populated_db.commit()
+    assert (await crud.get_dashboard_statistics(populated_db))["total_documents_analyzed"] == 0
+
+    assert await crud.backfill_report_rollups(populated_db) == 4
+    after = await crud.get_benchmark_data(populated_db, min_analyses=3)
+    assert after["compliance_score_percentiles"] == before["compliance_score_percentiles"]
+    assert after["compliance_score_percentiles"]["p50"] == pytest.approx(
+        np.percentile([95.0, 85.0, 75.0, 90.0], 50)
+    )
+    assert after["score_range"] == {"min": 75.0, "max": 95.0}
+
+
+@pytest.mark.asyncio
+async def test_habit_aggregates_use_latest_snapshot_per_user(db_session: AsyncSession):
+    alice = await crud.create_user(
+        db_session, schemas.UserCreate(username="habit_alice", password="password"), "hashed_password"
+    )
+    bob = await crud.create_user(
+        db_session, schemas.UserCreate(username="habit_bob", password="password"), "hashed_password"
+    )
+    today = datetime.date.today()
+    db_session.add_all(
+        [
+            models.HabitProgressSnapshot(
+                user_id=alice.id,
+                snapshot_date=today - datetime.timedelta(days=3),
+                habit_1_percentage=80.0,
+                total_findings=4,
+                consistency_score=0.5,
+            ),
+            models.HabitProgressSnapshot(
+                user_id=alice.id,
+                snapshot_date=today,
+                habit_2_percentage=60.0,
+                habit_5_percentage=20.0,
+                total_findings=2,
+                consistency_score=1.0,
+            ),
+            models.HabitProgressSnapshot(
+                user_id=bob.id, snapshot_date=today, habit_7_percentage=40.0
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    summary = await crud.get_team_habit_summary(db_session)
+    assert [(item.habit_name, item.count) for item in summary][:2] == [
+        ("Habit 1", 27),
+        ("Habit 2", 20),
+    ]
+    assert await crud.get_team_habit_summary(
+        db_session, start_date=today + datetime.timedelta(days=1)
+    ) == []
+
+    breakdown = await crud.get_clinician_habit_breakdown(db_session)
+    assert [(item.clinician_name, item.habit_name, item.count) for item in breakdown] == [
+        ("habit_alice", "Habit 2", 60),
+        ("habit_alice", "Habit 5", 20),
+        ("habit_bob", "Habit 7", 40),
+    ]
+    earlier = await crud.get_clinician_habit_breakdown(
+        db_session, end_date=today - datetime.timedelta(days=1)
+    )
+    assert [(item.clinician_name, item.habit_name) for item in earlier] == [
+        ("habit_alice", "Habit 1")
+    ]
+
+    stats = await crud.get_user_habit_statistics(db_session, alice.id, days_back=2)
+    assert stats["recent_activity"]["snapshots_recorded"] == 1
+    assert stats["recent_activity"]["total_findings"] == 2
+    assert stats["recent_activity"]["average_consistency_score"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_iter_reports_for_export_pages_by_id(populated_db: AsyncSession):
+    exported = [
+        report
+        async for report in crud.iter_reports_for_export(populated_db, batch_size=3)
+    ]
+    assert [r["document_name"] for r in exported] == [
+        "Report 1",
+        "Report 2",
+        "Report 3",
+        "Report 4",
+    ]
+    assert all(r["findings"] == [] and r["total_findings"] == 0 for r in exported)
+
+    pages = crud.iter_reports_for_export(populated_db, batch_size=2)
+    await anext(pages)
+    assert not populated_db.in_transaction()
+    await pages.aclose()
+
+    recent = [
+        report
+        async for report in crud.iter_reports_for_export(
+            populated_db,
+            start_date=datetime.date.today() - datetime.timedelta(days=12),
+            batch_size=1,
+        )
+    ]
+    assert [r["document_name"] for r in recent] == ["Report 1", "Report 2"]
 
 
 @pytest.mark.asyncio
 async def test_get_reports(populated_db: AsyncSession):
     reports = await crud.get_reports(populated_db)
     assert len(reports) == 4
+    assert await crud.count_reports(populated_db) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_reports_bulk_decrypts_projected_rows(db_session: AsyncSession):
+    await crud.create_analysis_report(
+        db_session,
+        schemas.ReportCreate(
+            document_name="Encrypted Report",
+            compliance_score=70.0,
+            analysis_result={"discipline": "PT", "summary": "ok"},
+            document_type="Progress Note",
+        ),
+        [
+            schemas.FindingCreate(
+                rule_id="rule-1",
+                risk="High",
+                personalized_tip="Document goals",
+                problematic_text="Patient tolerated",
+                confidence_score=0.8,
+            )
+        ],
+    )
+
+    [report] = await crud.get_reports(db_session)
+    assert report["document_name"] == "Encrypted Report"
+    assert report["analysis_result"] == {"discipline": "PT", "summary": "ok"}
+    assert [
+        (f["rule_id"], f["personalized_tip"], f["problematic_text"])
+        for f in report["findings"]
+    ] == [("rule-1", "Document goals", "Patient tolerated")]
+    schemas.Report.model_validate(report)
+
+    loaded = await crud.get_report(db_session, report["id"])
+    assert loaded.analysis_result["summary"] == "ok"
+    assert loaded.findings[0].problematic_text == "Patient tolerated"
+
+
+def test_decrypt_many_caches_by_row_and_ciphertext():
+    service = DatabaseEncryptionService()
+    first, second = service.encrypt_field("alpha"), service.encrypt_field("beta")
+    items = [(("finding", 1), first), (("finding", 2), second), (("finding", 3), None)]
+    assert service.decrypt_many(items) == ["alpha", "beta", None]
+
+    with patch.object(service, "decrypt_field", side_effect=AssertionError):
+        assert service.decrypt_many(items[:2]) == ["alpha", "beta"]
+
+    # A re-encrypted value for the same row misses the cache.
+    assert service.decrypt_many([(("finding", 1), service.encrypt_field("gamma"))]) == ["gamma"]
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,67 @@
+from src.core.document_index import DocumentIndex, get_document_index
+from src.core.rubric_detector import RubricDetector
+
+NOTE = (
+    "Patient seen for PT. Goals reviewed; progress noted with gait training!  "
+    "Not ready for discharge. Plan of care continues 3x/week."
+)
+
+
+def test_substring_queries_match_str_semantics():
+    index = DocumentIndex(NOTE)
+    lowered = NOTE.lower()
+
+    for phrase in ["pt", "ot", "goal", "3x/week", "PLAN OF CARE", "missing", "e"]:
+        assert index.contains(phrase) == (phrase.lower() in lowered)
+        assert index.count(phrase) == lowered.count(phrase.lower())
+
+
+def test_token_and_phrase_lookups_respect_word_boundaries():
+    index = DocumentIndex(NOTE)
+
+    assert index.has_token("PT")
+    assert not index.has_token("ot")
+    assert index.count("ot") == 2  # inside "Not" and "noted"
+    assert index.phrase_count("ot") == 0
+    assert index.phrase_count("plan of care") == 1
+    assert index.phrase_count("care plan") == 0
+
+
+def test_sentence_lookups():
+    index = DocumentIndex(NOTE)
+
+    assert index.sentences == [
+        "Patient seen for PT",
+        "Goals reviewed; progress noted with gait training",
+        "Not ready for discharge",
+        "Plan of care continues 3x/week.",
+    ]
+    assert index.first_sentence_with(["discharge", "progress"]) == index.sentences[1]
+    assert index.first_sentence_with(["absent"]) is None
+    assert index.sentences_with_any(["for", "plan"], limit=2) == [
+        index.sentences[0],
+        index.sentences[2],
+    ]
+
+
+def test_index_is_shared_per_text():
+    assert get_document_index(NOTE) is get_document_index(NOTE)
+
+
+def test_rubric_detector_scores_keyword_frequencies():
+    detector = RubricDetector()
+    text = "Physical therapy evaluation. Range of motion and gait; physical therapy plan."
+
+    _, _, details = detector.detect_rubric(text)
+    keyword_matches = {
+        match["text"]: match["frequency"]
+        for match in details["matches"]["apta_pt"]["matches"]
+        if match["type"] == "keyword"
+    }
+
+    assert keyword_matches["physical therapy"] == 2
+    assert keyword_matches["gait"] == 1
+    assert details["matches"]["apta_pt"]["doc_type_bonus"] == 2.0
+    assert detector.detect_discipline(text)[0] == "pt"
+    index = get_document_index(text)
+    assert index.scan(detector.matcher) is index.scan(detector.matcher)
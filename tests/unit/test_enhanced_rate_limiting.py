@@ -0,0 +1,114 @@
+"""Unit tests for the GCRA-based enhanced rate limiter."""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.api.middleware.enhanced_rate_limiting import (
+    EnhancedRateLimitMiddleware,
+    InMemoryRateLimitStore,
+    RateLimit,
+    SQLiteRateLimitStore,
+    gcra_check,
+)
+
+
+class TestGCRA:
+    """Test the per-window GCRA arithmetic."""
+
+    def test_admits_burst_then_spaces_requests(self):
+        limit = RateLimit(requests_per_minute=60, requests_per_hour=1000, burst_limit=5)
+        tats, now = (), 1000.0
+        for expected_remaining in range(4, -1, -1):
+            decision = gcra_check(tats, now, limit)
+            assert decision.allowed
+            assert decision.remaining[0] == expected_remaining
+            tats = decision.tats
+
+        rejected = gcra_check(tats, now, limit)
+        assert not rejected.allowed
+        assert rejected.exceeded_window == 0
+        assert rejected.retry_after == pytest.approx(12.0)
+        assert rejected.tats == tats
+
+        assert gcra_check(tats, now + 12.0, limit).allowed
+
+    def test_hour_window_limits_independently(self):
+        limit = RateLimit(requests_per_minute=100, requests_per_hour=3, burst_limit=100)
+        tats = ()
+        for _ in range(3):
+            tats = gcra_check(tats, 0.0, limit).tats
+        decision = gcra_check(tats, 0.0, limit)
+        assert not decision.allowed
+        assert decision.exceeded_window == 2
+
+
+class TestStores:
+    """Test the in-memory and SQLite state stores."""
+
+    def test_idle_keys_are_swept(self):
+        store = InMemoryRateLimitStore(shards=1)
+        limit = RateLimit(requests_per_minute=60, requests_per_hour=3600)
+        for client in range(300):
+            store.check(f"ip:{client}", 0.0, limit)
+        assert len(store) == 300
+
+        # Every TAT has passed an hour later, so the next sweep empties the shard.
+        for _ in range(300):
+            store.check("ip:active", 7200.0, limit)
+        assert len(store) == 1
+
+    def test_sqlite_store_is_shared(self, tmp_path):
+        path = str(tmp_path / "rate_limits.db")
+        first, second = SQLiteRateLimitStore(path), SQLiteRateLimitStore(path)
+        limit = RateLimit(requests_per_minute=2, requests_per_hour=100, burst_limit=10)
+
+        assert first.check("user:1|default", 0.0, limit).allowed
+        assert second.check("user:1|default", 0.0, limit).allowed
+        assert not first.check("user:1|default", 0.0, limit).allowed
+
+    def test_sqlite_store_gives_up_quickly_under_writer_contention(self, tmp_path):
+        path = str(tmp_path / "rate_limits.db")
+        store = SQLiteRateLimitStore(path)
+        holder = sqlite3.connect(path, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        limit = RateLimit(requests_per_minute=2, requests_per_hour=100, burst_limit=10)
+
+        started = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError):
+            store.check("user:1|default", 0.0, limit)
+        assert time.monotonic() - started < 1.0
+        holder.execute("ROLLBACK")
+        assert store.check("user:1|default", 0.0, limit).allowed
+
+
+class TestEnhancedRateLimitMiddleware:
+    """Test the middleware end to end."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+
+        @app.post("/auth/register")
+        async def register():
+            return {"message": "success"}
+
+        @app.get("/items")
+        async def items():
+            return {"message": "success"}
+
+        app.add_middleware(EnhancedRateLimitMiddleware)
+        return TestClient(app)
+
+    def test_limits_per_endpoint_class(self, client):
+        with patch("src.api.middleware.enhanced_rate_limiting.time.time", return_value=0.0):
+            responses = [client.post("/auth/register") for _ in range(4)]
+            assert [r.status_code for r in responses] == [200, 200, 200, 429]
+            assert responses[0].headers["X-RateLimit-Remaining-Minute"] == "4"
+            assert responses[3].json()["retry_after"] == int(responses[3].headers["Retry-After"])
+
+            # Other endpoints use their own state under the default limits.
+            assert client.get("/items").status_code == 200
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.core.enhanced_worker_manager import EnhancedWorkerManager, TaskPriority
+
+
+@pytest.fixture
+async def manager():
+    managers = []
+
+    async def _make(**options):
+        instance = EnhancedWorkerManager(**options)
+        await instance.start()
+        managers.append(instance)
+        return instance
+
+    yield _make
+    for instance in managers:
+        await instance.stop()
+
+
+async def _wait_done(manager, task_ids, timeout=5.0):
+    async def _poll():
+        while not all(manager.tasks[t].completed_at for t in task_ids):
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_concurrently_up_to_max_workers(manager):
+    workers = await manager(max_workers=3)
+    running = 0
+    peak = 0
+
+    async def job(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return i * 2
+
+    ids = [await workers.submit_task(job, i) for i in range(6)]
+    await _wait_done(workers, ids)
+
+    assert peak == 3
+    assert [await workers.get_task_result(t) for t in ids] == [0, 2, 4, 6, 8, 10]
+    stats = await workers.get_statistics()
+    assert stats["run_time_seconds"]["count"] == 6
+    assert stats["queue_wait_seconds"]["count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_priority_order_caps_and_aging(manager):
+    workers = await manager(max_workers=1, aging_interval=0.05)
+    order = []
+
+    async def job(name):
+        order.append(name)
+        await asyncio.sleep(0.02)
+
+    # Submit before the loop gets a chance to dispatch anything.
+    ids = [
+        await workers.submit_task(job, "low", priority=TaskPriority.LOW),
+        await workers.submit_task(job, "normal", priority=TaskPriority.NORMAL),
+        await workers.submit_task(job, "critical", priority=TaskPriority.CRITICAL),
+    ]
+    await _wait_done(workers, ids)
+    assert order == ["critical", "normal", "low"]
+
+    workers.aging_interval = 0.01
+    order.clear()
+    low = await workers.submit_task(job, "old-low", priority=TaskPriority.LOW)
+    await asyncio.sleep(0)
+    workers.tasks[low].enqueued_at -= 1.0  # waited long enough to outrank HIGH
+    high = await workers.submit_task(job, "high", priority=TaskPriority.HIGH)
+    await _wait_done(workers, [low, high])
+    assert order[0] == "old-low"
+
+
+@pytest.mark.asyncio
+async def test_low_priority_cap_and_backpressure(manager):
+    workers = await manager(max_workers=4, max_queue_size=5, backpressure_threshold=0.8)
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+
+    ids = [await workers.submit_task(job, priority=TaskPriority.LOW) for _ in range(4)]
+    await asyncio.sleep(0.05)
+
+    stats = await workers.get_statistics()
+    assert stats["running_by_priority"]["LOW"] == 2
+    assert stats["queued_by_priority"]["LOW"] == 2
+    assert workers.backpressure().saturated is True
+    assert workers.backpressure().retry_after_seconds >= 1
+
+    assert await workers.cancel_task(ids[-1]) is True
+    release.set()
+    await _wait_done(workers, ids)
+    assert workers.backpressure().saturated is False
+    assert workers.backpressure(external_in_flight=4).saturated is True
@@ -0,0 +1,92 @@
+"""Unit tests for the compliance data export service."""
+
+import csv
+import io
+import json
+
+import pytest
+from src.core.export_service import ExportService
+
+REPORTS = [
+    {
+        "document_name": "Progress Note",
+        "analysis_date": "2024-01-02T10:00:00",
+        "document_type": "Progress Note",
+        "compliance_score": 88.0,
+        "findings": [
+            {
+                "rule_id": "R1",
+                "risk": "High",
+                "problematic_text": "x" * 300,
+                "personalized_tip": "Add goals",
+            },
+            {"rule_id": "R2", "risk": "Low", "problematic_text": "y", "personalized_tip": "z"},
+        ],
+    },
+    {
+        "document_name": "Evaluation",
+        "analysis_date": "2024-01-03T10:00:00",
+        "document_type": "Evaluation",
+        "compliance_score": 95.0,
+        "findings": [],
+    },
+]
+
+
+async def _reports():
+    for report in REPORTS:
+        yield report
+
+
+async def _collect(service, format_type, include_findings=True):
+    return [
+        chunk
+        async for chunk in service.stream_compliance_data(
+            _reports(), format_type, include_findings
+        )
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson_writes_one_chunk_per_report():
+    chunks = await _collect(ExportService(), "ndjson")
+    assert len(chunks) == 4
+
+    records = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [r["type"] for r in records] == [
+        "metadata",
+        "report",
+        "finding",
+        "finding",
+        "report",
+        "summary",
+    ]
+    assert records[1]["total_findings"] == 2
+    assert len(records[2]["problematic_text"]) == 200
+    assert records[-1] == {"type": "summary", "total_reports": 2, "total_findings": 2}
+
+
+@pytest.mark.asyncio
+async def test_stream_csv_matches_batch_rows():
+    service = ExportService()
+    rows = list(csv.DictReader(io.StringIO("".join(await _collect(service, "csv")))))
+    assert [(r["document_name"], r["rule_id"]) for r in rows] == [
+        ("Progress Note", "R1"),
+        ("Progress Note", "R2"),
+        ("Evaluation", ""),
+    ]
+
+    batch = service._prepare_export_data(REPORTS, include_findings=True)
+    assert rows[0]["recommendation"] == batch["findings"][0]["recommendation"]
+
+    summary_rows = list(
+        csv.DictReader(io.StringIO("".join(await _collect(service, "csv", False))))
+    )
+    assert [r["total_findings"] for r in summary_rows] == ["2", "0"]
+    assert "rule_id" not in summary_rows[0]
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_non_streaming_format():
+    with pytest.raises(ValueError):
+        await _collect(ExportService(), "excel")
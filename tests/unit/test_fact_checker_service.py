@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from src.core.fact_checker_service import FactCheckerService
+
+
+def _pipeline_service(answers):
+    service = FactCheckerService(backend="pipeline")
+    service.classifier = MagicMock(
+        side_effect=lambda prompts, **_: [{"generated_text": answers[p.split("Hypothesis: ")[1].split("\n")[0]]} for p in prompts]
+    )
+    return service
+
+
+def test_batch_packs_hypotheses_into_one_pipeline_call_and_caches():
+    service = _pipeline_service({"Goals documented": "yes", "Signature present": "no", "Frequency listed": "yes"})
+    premise = "Patient goals reviewed. Frequency is 3x/week."
+    hypotheses = ["Goals documented", "Signature present", "Frequency listed"]
+
+    assert service.check_consistency_batch(premise, hypotheses) == [True, False, True]
+    assert service.classifier.call_count == 1
+    assert len(service.classifier.call_args.args[0]) == 3
+
+    assert service.check_consistency_batch(premise, hypotheses) == [True, False, True]
+    assert service.check_consistency(premise, "Signature present") is False
+    assert service.classifier.call_count == 1
+
+
+def test_long_premise_is_narrowed_to_relevant_window():
+    service = FactCheckerService(backend="pipeline", premise_window_chars=200)
+    filler = " ".join(f"Vital signs stable on visit {n}." for n in range(40))
+    premise = f"{filler} Patient performed stair climbing with handrail and standby assist. {filler}"
+
+    window = service._select_premise_window(premise, "Stair climbing assistance documented")
+
+    assert len(window) <= 200
+    assert "stair climbing with handrail" in window
+
+
+def test_llm_backend_parses_numbered_verdicts_and_retries_missing_one_at_a_time():
+    llm = MagicMock()
+    llm.is_ready.return_value = True
+    llm.generate.side_effect = ["1: YES\n2: NO", "Unclear."]
+    service = FactCheckerService(backend="llm", llm_service=llm)
+
+    results = service.check_consistency_batch("Premise text.", ["first", "second", "third"])
+
+    # The unanswered third item is retried alone and, still unreadable, is not
+    # counted as supported; it is not cached, so it is asked again.
+    assert results == [True, False, False]
+    assert llm.generate.call_count == 2
+    assert "Hypothesis: third" in llm.generate.call_args.args[0]
+    llm.generate.side_effect = None
+    llm.generate.return_value = "YES"
+    assert service.check_consistency_batch("Premise text.", ["first", "third"]) == [True, True]
+    assert llm.generate.call_count == 3
+
+
+def test_llm_batches_are_sized_to_the_context_length():
+    llm = MagicMock()
+    llm.is_ready.return_value = True
+    llm.settings = {"context_length": 256}
+    llm.generate.side_effect = lambda prompt, **_: "YES"
+    service = FactCheckerService(backend="llm", llm_service=llm)
+    premise = " ".join(f"Therapist documented gait item {n} with cues." for n in range(200))
+
+    results = service.check_consistency_batch(
+        premise, [f"Gait item {n} documented" for n in range(4)]
+    )
+
+    assert results == [True] * 4
+    assert service.premise_window_chars < 1200
+    for call in llm.generate.call_args_list:
+        assert len(call.args[0]) // 4 <= 256
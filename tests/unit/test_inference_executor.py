@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.api.task_registry import AnalysisTaskRegistry
+from src.core.inference_executor import InferenceExecutor, current_task_id
+
+
+@pytest.mark.asyncio
+async def test_run_respects_per_model_concurrency_limit():
+    executor = InferenceExecutor(model_concurrency={"llm": 1}, default_concurrency=2)
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+    loop_thread = threading.get_ident()
+    call_threads = []
+
+    def generate(prompt):
+        call_threads.append(threading.get_ident())
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return prompt.upper()
+
+    try:
+        results = await asyncio.gather(*(executor.run("llm", generate, f"p{i}") for i in range(3)))
+    finally:
+        executor.shutdown()
+
+    assert results == ["P0", "P1", "P2"]
+    assert active["peak"] == 1
+    assert loop_thread not in call_threads
+    metrics = executor.get_metrics()["llm"]
+    assert metrics["limit"] == 1
+    assert metrics["completed"] == 3
+    assert metrics["queued"] == 0
+    assert metrics["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_task_drops_queued_calls_for_that_task():
+    executor = InferenceExecutor(model_concurrency={"ner": 1})
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(_text):
+        started.set()
+        release.wait(timeout=5)
+        return []
+
+    async def submit():
+        current_task_id.set("task-1")
+        return await executor.run("ner", blocking, "text")
+
+    try:
+        first = asyncio.create_task(submit())
+        await asyncio.to_thread(started.wait, 5)
+        queued = asyncio.create_task(submit())
+        await asyncio.sleep(0.01)
+        assert executor.get_metrics()["ner"]["queued"] == 1
+
+        assert executor.cancel_task("task-1") == 1
+        release.set()
+
+        assert await first == []
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+    finally:
+        release.set()
+        executor.shutdown()
+
+    metrics = executor.get_metrics()["ner"]
+    assert metrics["cancelled"] == 1
+    assert metrics["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_task_registry_tags_and_cancels_inference_calls():
+    registry = AnalysisTaskRegistry()
+    executor = MagicMock()
+    seen = {}
+    gate = asyncio.Event()
+
+    async def analysis():
+        seen["task_id"] = current_task_id.get()
+        await gate.wait()
+
+    with patch("src.api.task_registry.get_inference_executor", return_value=executor):
+        task = await registry.start("task-42", analysis())
+        await asyncio.sleep(0)
+        assert await registry.cancel("task-42") is True
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert seen["task_id"] == "task-42"
+    assert current_task_id.get() is None
+    executor.cancel_task.assert_called_once_with("task-42")
@@ -58,3 +58,18 @@ def test_transformers_generate_applies_stop_sequences(mocker):
     assert service.llm.generate.called
     _, kwargs = service.llm.generate.call_args
     assert "stopping_criteria" in kwargs and kwargs["stopping_criteria"] is not None
+
+
+def test_cache_identifier_distinguishes_model_files():
+    settings = {"model_type": "ctransformers", "context_length": 1024}
+    q4 = LLMService(model_repo_id="TheBloke/meditron-7B-GGUF", model_filename="meditron-7b.Q4_K_M.gguf", llm_settings=settings)
+    q8 = LLMService(model_repo_id="TheBloke/meditron-7B-GGUF", model_filename="meditron-7b.Q8_0.gguf", llm_settings=settings)
+    longer_context = LLMService(
+        model_repo_id="TheBloke/meditron-7B-GGUF",
+        model_filename="meditron-7b.Q4_K_M.gguf",
+        llm_settings={**settings, "context_length": 4096},
+    )
+
+    identifiers = {service._cache_model_identifier() for service in (q4, q8, longer_context)}
+
+    assert len(identifiers) == 3
@@ -0,0 +1,168 @@
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from src.core import multi_tier_cache
+from src.core.multi_tier_cache import (
+    CacheTier,
+    EvictionPolicy,
+    LFUIndex,
+    MultiTierCacheSystem,
+    SQLiteTierStore,
+    estimate_size,
+)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def _make(**options):
+        options.setdefault("l2_path", tmp_path / "l2.sqlite3")
+        options.setdefault("l3_path", tmp_path / "l3.sqlite3")
+        cache = MultiTierCacheSystem(l2_enabled=True, l3_enabled=True, **options)
+        caches.append(cache)
+        return cache
+
+    yield _make
+    for cache in caches:
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_l2_is_shared_between_processes_using_the_same_file(make_cache):
+    worker_a, worker_b = make_cache(), make_cache()
+
+    await worker_a.set("analysis:1", {"score": 91}, tags=["doc:1"])
+
+    assert await worker_b.get("analysis:1") == {"score": 91}
+    assert worker_b.metrics.tier_distribution == {"l2_redis": 1}
+    # Promoted to worker B's L1, with its tags.
+    assert "analysis:1" in worker_b.l1_cache
+    assert await worker_b.get("analysis:1") == {"score": 91}
+    assert worker_b.metrics.tier_distribution["l1_memory"] == 1
+
+    assert await worker_a.invalidate_by_tags(["doc:1"]) == 1
+    assert await make_cache().get("analysis:1") is None
+
+
+@pytest.mark.asyncio
+async def test_l3_hits_are_promoted_and_keep_their_ttl(make_cache):
+    cache = make_cache()
+    await cache.set("k", "v" * 1000, ttl=timedelta(seconds=60), tier=CacheTier.L3_DATABASE)
+    assert "k" not in cache.l1_cache
+
+    assert await cache.get("k") == "v" * 1000
+
+    assert cache.metrics.tier_distribution == {"l3_database": 1}
+    assert cache.l2_cache.get("k")[0] == "v" * 1000
+    assert 55 < cache.l1_cache["k"].ttl.total_seconds() <= 60
+    stats = await cache.get_cache_stats()
+    # Compressed on disk.
+    assert stats["tier_stats"]["l3"]["entries"] == 1
+    assert stats["tier_stats"]["l3"]["size_bytes"] < 100
+
+
+@pytest.mark.asyncio
+async def test_expired_lower_tier_entries_are_not_served(make_cache):
+    cache = make_cache()
+    await cache.set("k", 1, ttl=timedelta(milliseconds=10), tier=CacheTier.L3_DATABASE)
+    time.sleep(0.02)
+
+    assert await cache.get("k", default="miss") == "miss"
+    assert cache.l3_cache.stats()["entries"] == 0
+
+
+def test_l2_overflow_is_returned_for_demotion(tmp_path):
+    store = SQLiteTierStore(tmp_path / "l2.sqlite3", max_entries=10)
+    demoted = []
+    for i in range(SQLiteTierStore.PRUNE_EVERY):
+        demoted += store.set(f"k{i}", i, None, ["t"])
+
+    assert store.stats()["entries"] == 9
+    assert [row[0] for row in demoted][:3] == ["k0", "k1", "k2"]
+
+    l3 = SQLiteTierStore(tmp_path / "l3.sqlite3", max_entries=100, compression_level=6)
+    key, payload, compressed, tags, expires_at = demoted[0]
+    l3.set_encoded(key, payload, bool(compressed), expires_at, ["t"])
+    assert l3.get("k0") == (0, None, ["t"])
+
+
+def test_lfu_index_picks_least_frequent_then_oldest():
+    index = LFUIndex()
+    for key in "abc":
+        index.add(key)
+    index.touch("a")
+    index.touch("a")
+    index.touch("b")
+
+    assert index.victim() == "c"
+    index.discard("c")
+    assert index.victim() == "b"
+    index.discard("b")
+    assert index.victim() == "a"
+
+
+def test_size_estimate_samples_large_containers():
+    report = {"findings": [{"rule": "r" * 50, "text": "t" * 200} for _ in range(1000)]}
+
+    size = estimate_size(report)
+
+    assert 250_000 <= size <= 400_000
+    assert estimate_size("x" * 10) == 10
+
+
+@pytest.mark.asyncio
+async def test_lfu_eviction_keeps_hot_entries_and_is_instrumented():
+    cache = MultiTierCacheSystem(l2_enabled=False, l3_enabled=False, eviction_policy=EvictionPolicy.LFU)
+    cache.config["max_l1_entries"] = 3
+    for key in ("hot", "warm", "cold"):
+        await cache.set(key, key)
+    for _ in range(3):
+        await cache.get("hot")
+    await cache.get("warm")
+
+    await cache.set("new", "new", size_bytes=10)
+
+    assert set(cache.l1_cache) == {"hot", "warm", "new"}
+    assert cache.l1_size_used == 3 + 4 + 10
+    stats = await cache.get_cache_stats()
+    assert stats["metrics"]["evictions_by_tier"] == {"l1_memory": 1}
+    assert stats["metrics"]["eviction_time_ms"] > 0
+    assert stats["metrics"]["l1_hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_tiny_lfu_rejects_one_hit_wonders():
+    cache = MultiTierCacheSystem(
+        l2_enabled=False, l3_enabled=False, eviction_policy=EvictionPolicy.TINY_LFU
+    )
+    cache.config["max_l1_entries"] = 2
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    for _ in range(5):
+        await cache.get("a")
+        await cache.get("b")
+
+    assert await cache.set("scan", 3) is True  # still reaches the lower tiers
+    assert set(cache.l1_cache) == {"a", "b"}
+    assert cache.metrics.admission_rejections == 1
+
+    for _ in range(10):
+        await cache.get("popular")
+    await cache.set("popular", 4)
+    assert "popular" in cache.l1_cache
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX ownership checks")
+def test_default_l2_path_rejects_a_directory_that_is_not_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(multi_tier_cache.os.path, "isdir", lambda path: False)
+    monkeypatch.setattr(multi_tier_cache.tempfile, "gettempdir", lambda: str(tmp_path))
+    directory = tmp_path / f"compliance-cache-{os.getuid()}"
+
+    assert multi_tier_cache._default_l2_path() == directory / "l2.sqlite3"
+
+    directory.chmod(0o777)
+    assert multi_tier_cache._default_l2_path() is None
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, mock_open, patch
 
+from src.core import parsing
 from src.core.parsing import parse_document_content, parse_document_into_sections
 
 
@@ -72,3 +73,111 @@ def test_parse_document_into_sections_no_headers():
     assert len(sections) == 1
     assert "unclassified" in sections
     assert sections["unclassified"] == document_text
+
+
+def _in_memory_disk_cache():
+    store = {}
+    return store, patch.multiple(
+        "src.core.parsing.cache_service",
+        get_from_disk=MagicMock(side_effect=store.get),
+        set_to_disk=MagicMock(side_effect=store.__setitem__),
+    )
+
+
+def test_parse_cache_is_keyed_on_content_not_path(tmp_path):
+    store, cache_patch = _in_memory_disk_cache()
+    first = tmp_path / "temp_aaa_note.txt"
+    second = tmp_path / "temp_bbb_note.txt"
+    first.write_text("Patient tolerated treatment well.", encoding="utf-8")
+    second.write_text("Patient tolerated treatment well.", encoding="utf-8")
+
+    with cache_patch, patch.object(parsing, "_parse_txt", wraps=parsing._parse_txt) as parse_txt:
+        first_result = parse_document_content(str(first))
+        second_result = parse_document_content(str(second))
+
+    assert first_result == second_result
+    assert parse_txt.call_count == 1
+    assert len(store) == 1
+
+
+def test_parse_failures_are_not_cached(tmp_path):
+    store, cache_patch = _in_memory_disk_cache()
+    note = tmp_path / "note.txt"
+    note.write_text("Patient tolerated treatment well.", encoding="utf-8")
+    failed_page = [
+        {"sentence": "Page one text.", "source": "pdf_page_1"},
+        {"sentence": parsing.OCR_FAILED_PAGE_MESSAGE.format(page=2), "source": "parser"},
+    ]
+
+    with cache_patch:
+        with patch.object(parsing, "_parse_txt", side_effect=ValueError("disk hiccup")):
+            assert parse_document_content(str(note))[0]["sentence"].startswith("Error parsing file:")
+        with patch.object(parsing, "_parse_txt", return_value=failed_page):
+            parse_document_content(str(note))
+        assert store == {}
+
+        parse_document_content(str(note))
+    assert len(store) == 1
+
+
+def _write_pdf(path, page_texts):
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(str(path))
+    for text in page_texts:
+        pdf.drawString(72, 720, text)
+        pdf.showPage()
+    pdf.save()
+
+
+def test_pdf_pages_are_cached_individually(tmp_path):
+    original = tmp_path / "original.pdf"
+    revised = tmp_path / "revised.pdf"
+    _write_pdf(original, ["Patient ambulated 150 feet with a walker.", "Plan: continue skilled therapy twice weekly."])
+    _write_pdf(revised, ["Patient ambulated 150 feet with a walker.", "Plan: discharge to home exercise program."])
+
+    store, cache_patch = _in_memory_disk_cache()
+    inline_engine = parsing.PageExtractionEngine(max_workers=1)
+    with cache_patch, patch.object(parsing, "get_page_extraction_engine", return_value=inline_engine), patch.object(
+        parsing, "_extract_pdf_page", wraps=parsing._extract_pdf_page
+    ) as extract:
+        parse_document_content(str(original))
+        assert extract.call_count == 2
+        revised_result = parse_document_content(str(revised))
+
+    # Only the changed second page is re-extracted for the revised file.
+    assert extract.call_count == 3
+    assert [chunk["source"] for chunk in revised_result] == ["pdf_page_1", "pdf_page_2"]
+    assert "discharge" in revised_result[1]["sentence"]
+
+
+def test_page_extraction_engine_preserves_page_order_across_workers(tmp_path):
+    document = tmp_path / "multi_page.pdf"
+    page_texts = [f"Visit {number}: patient completed gait training session." for number in range(1, 5)]
+    _write_pdf(document, page_texts)
+
+    engine = parsing.PageExtractionEngine(max_workers=2)
+    try:
+        results = engine.extract_pages(str(document), [3, 0, 2, 1], ocr_dpi=150)
+    finally:
+        engine.shutdown()
+
+    assert sorted(results) == [0, 1, 2, 3]
+    for index in range(4):
+        assert results[index]["method"] == "text"
+        assert f"Visit {index + 1}:" in results[index]["sentences"][0]
+
+
+def test_iter_document_pages_streams_pages_in_order(tmp_path):
+    document = tmp_path / "streamed.pdf"
+    _write_pdf(document, ["Evaluation findings recorded on page one.", "Plan of care recorded on page two."])
+
+    _, cache_patch = _in_memory_disk_cache()
+    inline_engine = parsing.PageExtractionEngine(max_workers=1)
+    with cache_patch, patch.object(parsing, "get_page_extraction_engine", return_value=inline_engine):
+        pages = list(parsing.iter_document_pages(str(document)))
+        sentences = list(parsing.iter_document_content(str(document)))
+
+    assert [page["page"] for page in pages] == [1, 2]
+    assert [page["method"] for page in pages] == ["text", "text"]
+    assert [record["source"] for record in sentences] == ["pdf_page_1", "pdf_page_2"]
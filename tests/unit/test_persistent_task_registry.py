@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+import threading
+from datetime import date
+
+import pytest
+
+from src.core.persistent_task_registry import PersistentTaskRegistry, TaskStatus
+
+
+@pytest.fixture
+async def registry(tmp_path):
+    registry = PersistentTaskRegistry(db_path=str(tmp_path / "tasks.db"), coalesce_window=0.05)
+    yield registry
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced_into_one_write(registry):
+    await registry.create_task("t1", status=TaskStatus.PENDING, filename="note.pdf")
+
+    futures = [
+        registry.update_task_nowait("t1", status=TaskStatus.RUNNING, progress=pct, status_message=f"step {pct}")
+        for pct in range(1, 21)
+    ]
+    results = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+    assert all(results)
+    assert registry._writer.stats["coalesced"] == 19
+    task = await registry.get_task("t1")
+    assert task.status is TaskStatus.RUNNING
+    assert task.progress == 20
+    assert task.status_message == "step 20"
+
+
+@pytest.mark.asyncio
+async def test_final_status_is_not_overwritten_by_pending_progress(registry):
+    await registry.create_task("t2", status=TaskStatus.RUNNING)
+
+    registry.update_task_nowait("t2", progress=90, status_message="Finalizing")
+    assert await registry.update_task(
+        "t2", status=TaskStatus.COMPLETED, progress=100, result_data={"score": 88}
+    )
+
+    task = await registry.get_task("t2")
+    assert task.status is TaskStatus.COMPLETED
+    assert task.progress == 100
+    assert task.status_message == "Finalizing"
+    assert task.result_data == {"score": 88}
+    assert await registry.update_task("missing", progress=5) is False
+
+
+@pytest.mark.asyncio
+async def test_writes_use_one_wal_connection_off_the_event_loop(registry):
+    loop_thread = threading.get_ident()
+    await registry.create_task("t3", status=TaskStatus.PENDING)
+    await registry.update_task("t3", status=TaskStatus.FAILED, error_message="boom")
+
+    assert registry._writer._thread.ident != loop_thread
+    with sqlite3.connect(registry.db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    with pytest.raises(sqlite3.IntegrityError):
+        await registry.create_task("t3", status=TaskStatus.PENDING)
+    assert await registry.cleanup_old_tasks(days_old=0) == 1
+    assert await registry.get_task("t3") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_stop_the_writer(registry):
+    await registry.create_task("t4", status=TaskStatus.RUNNING)
+
+    def _broken(conn):
+        conn.execute("UPDATE tasks SET progress = 50 WHERE task_id = 't4'")
+        raise TypeError("not serializable")
+
+    with pytest.raises(TypeError):
+        await registry._write(_broken)
+    assert await registry.update_task("t4", progress=5)
+    assert await registry.update_task("t4", result_data={"at": date(2024, 1, 2)})
+
+    task = await registry.get_task("t4")
+    assert task.progress == 5
+    assert task.result_data == {"at": "2024-01-02"}
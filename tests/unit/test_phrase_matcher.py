@@ -0,0 +1,39 @@
+import re
+
+import pytest
+
+from src.core.phrase_matcher import MultiPatternMatcher
+
+PHRASES = ["therapy", "therapy cap", "therapy cap exceeded", "pt", "ot", "aa", "Medicare"]
+PATTERNS = [r"therapy\s+cap", r"cpt\s+codes?", r"ot\s+services?"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "Therapy cap exceeded; THERAPY  cap review with PT and OT services.",
+        "Adapt not: pt, pt, aaaa, medicare medicare part b, cpt code and CPT codes.",
+    ],
+)
+def test_scan_matches_count_and_findall(text):
+    result = MultiPatternMatcher(PHRASES, PATTERNS).scan(text)
+    lowered = text.lower()
+
+    assert result.phrase_counts == {p.lower(): lowered.count(p.lower()) for p in PHRASES}
+    assert result.pattern_matches == {
+        p: re.findall(p, lowered, re.IGNORECASE) for p in PATTERNS
+    }
+
+
+def test_find_phrases_reports_overlapping_hits():
+    matcher = MultiPatternMatcher(PHRASES)
+
+    assert matcher.find_phrases("The therapy cap exceeded notes") == {
+        "therapy",
+        "therapy cap",
+        "therapy cap exceeded",
+        "ot",
+    }
+    assert matcher.find_phrases("nothing relevant") == {"ot"}
+    assert MultiPatternMatcher().find_phrases("therapy") == set()
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.api.progress_bus import ProgressEventBus
+
+
+async def _collect(bus, task_id, **kwargs):
+    return [event async for event in bus.subscribe(task_id, **kwargs)]
+
+
+@pytest.mark.asyncio
+async def test_rapid_updates_are_coalesced_and_stream_ends_with_result():
+    bus = ProgressEventBus(min_interval=0.05)
+    bus.open("t1", owner_id=7)
+    consumer = asyncio.create_task(_collect(bus, "t1"))
+    await asyncio.sleep(0)
+
+    for pct in range(1, 50):
+        bus.publish_progress("t1", pct, "Scanning document")
+    await asyncio.sleep(0.01)
+    bus.publish_progress("t1", 80, "Generating report")
+    bus.publish_complete("t1", {"overall_score": 91})
+    events = await asyncio.wait_for(consumer, timeout=2)
+
+    assert events[0]["status"] == "queued"
+    assert len(events) < 10
+    assert events[-1]["type"] == "complete"
+    assert events[-1]["result"] == {"overall_score": 91}
+    stages = [stage["name"] for stage in events[-1]["stages"]]
+    assert stages == ["Queued for processing", "Scanning document", "Generating report"]
+    assert all(stage["duration_ms"] is not None for stage in events[-1]["stages"])
+    assert bus.owner_of("t1") == 7
+    assert bus.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_gets_last_state_replayed():
+    bus = ProgressEventBus(min_interval=0)
+    bus.open("t2")
+    bus.publish_progress("t2", 40, "Retrieving rules")
+    bus.publish_error("t2", "model unavailable")
+
+    events = await asyncio.wait_for(_collect(bus, "t2"), timeout=1)
+
+    assert len(events) == 1
+    assert events[0]["type"] == "error"
+    assert events[0]["progress"] == 40
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_yields_heartbeats():
+    bus = ProgressEventBus(min_interval=0)
+    bus.open("t3")
+    stream = bus.subscribe("t3", heartbeat_interval=0.01)
+
+    assert (await anext(stream))["status"] == "queued"
+    assert (await anext(stream))["type"] == "heartbeat"
+    bus.publish_complete("t3", {})
+    assert (await anext(stream))["type"] == "complete"
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_run_and_its_progress():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def compute(progress):
+        nonlocal calls
+        calls += 1
+        progress(10, "Parsing")
+        await release.wait()
+        progress(90, "Reporting")
+        return {"score": 88}
+
+    seen = {"a": [], "b": []}
+    first = asyncio.create_task(flight.run("k", compute, lambda *p: seen["a"].append(p)))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(flight.run("k", compute, lambda *p: seen["b"].append(p)))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == await second == {"score": 88}
+    assert calls == 1
+    assert flight.stats == {"started": 1, "joined": 1}
+    assert seen["a"] == [(10, "Parsing"), (90, "Reporting")]
+    # The late joiner is replayed the latest state first.
+    assert seen["b"] == [(10, "Parsing"), (90, "Reporting")]
+    assert not flight.in_flight("k")
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_next_call_starts_fresh():
+    flight = SingleFlight()
+
+    async def fail(progress):
+        await asyncio.sleep(0.01)
+        raise ValueError("parse failed")
+
+    results = await asyncio.gather(
+        flight.run("k", fail), flight.run("k", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats["started"] == 1
+
+    async def succeed(progress):
+        return 1
+
+    assert await flight.run("k", succeed) == 1
+    assert flight.stats["started"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_is_cancelled_only_when_every_caller_left():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def compute(progress):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    first = asyncio.create_task(flight.run("k", compute))
+    second = asyncio.create_task(flight.run("k", compute))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+    assert flight.in_flight("k")
+
+    second.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert not flight.in_flight("k")
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from src.core.vector_store import VectorStore
+
+
+@pytest.fixture
+def make_store():
+    previous = VectorStore._instance
+
+    def _make(**options):
+        VectorStore._instance = None
+        store = VectorStore(embedding_dim=8)
+        store.configure(**options)
+        store.initialize_index()
+        return store
+
+    yield _make
+    VectorStore._instance = previous
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, 8)).astype(np.float32)
+
+
+def test_search_returns_cosine_similarity_and_honours_removal(make_store):
+    store = make_store()
+    base = np.zeros((3, 8), dtype=np.float32)
+    base[0, 0] = 1.0
+    base[1, :2] = [1.0, 1.0]
+    base[2, 1] = 5.0
+    store.add_vectors(base, [10, 11, 12])
+
+    results = store.search(np.eye(8, dtype=np.float32)[0] * 3, k=3, threshold=0.5)
+
+    assert [report_id for report_id, _ in results] == [10, 11]
+    assert results[0][1] == pytest.approx(1.0)
+    assert results[1][1] == pytest.approx(2**-0.5)
+
+    assert store.remove_vectors([10, 99]) == 1
+    assert 10 not in store
+    assert [report_id for report_id, _ in store.search(base[0], k=3, threshold=0.5)] == [11]
+
+
+def test_index_is_persisted_memory_mapped_and_updated_incrementally(make_store, tmp_path):
+    path = tmp_path / "report_index.faiss"
+    vectors = _vectors(20)
+    store = make_store(index_path=path)
+    store.add_vectors(vectors, list(range(1, 21)))
+    assert store.save() is True
+
+    store = make_store(index_path=path)
+    assert len(store) == 20
+    assert store.search(vectors[4], k=1)[0][0] == 5
+
+    # Changes after startup are searchable before they reach the file.
+    store.remove_vectors([5])
+    store.add_vectors(vectors[4:5] * 2, [100])
+    assert store.search(vectors[4], k=1)[0][0] == 100
+    store.save()
+
+    store = make_store(index_path=path)
+    assert store.report_ids == [*range(1, 5), *range(6, 21), 100]
+
+
+@pytest.mark.parametrize("index_type", ["hnsw", "ivf"])
+def test_approximate_index_types_support_add_and_remove(make_store, tmp_path, index_type):
+    path = tmp_path / "report_index.faiss"
+    vectors = _vectors(120, seed=1)
+    store = make_store(index_type=index_type, index_path=path, ivf_nlist=2, hnsw_m=8)
+    store.add_vectors(vectors, list(range(120)))
+    store.save()
+    assert store._index_kind(store.index) == index_type
+
+    store.remove_vectors([7])
+    store.save()
+
+    store = make_store(index_type=index_type, index_path=path, ivf_nlist=2, hnsw_m=8)
+    assert len(store) == 119
+    assert 7 not in store
+    assert store.search(vectors[8], k=1)[0][0] == 8
+
+
+def test_small_ivf_store_stays_flat_until_it_can_be_trained(make_store, tmp_path):
+    store = make_store(index_type="ivf", index_path=tmp_path / "idx.faiss", ivf_nlist=4)
+    store.add_vectors(_vectors(10), list(range(10)))
+    store.save()
+
+    assert store._index_kind(store.index) == "flat"
+    assert store.search(_vectors(10)[3], k=1)[0][0] == 3